@@ -7,10 +7,11 @@ Main server for the content repurposing workflow.
 import os
 import re
 import json
+import shutil
 import subprocess
 import requests
 from pathlib import Path
-from flask import Flask, render_template, request, jsonify, send_from_directory, send_file, session, redirect
+from flask import Flask, render_template, request, jsonify, send_file, session, redirect, Response, stream_with_context
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -20,6 +21,10 @@ load_dotenv()
 # Allow OAuth over HTTP for local development
 os.environ['OAUTHLIB_INSECURE_TRANSPORT'] = '1'
 
+from execution import chunk_assets, gemini_gateway, project_store
+from execution.media_server import OPUS_CACHE_DIR, serve_media, versioned_url
+from execution.state_store import StateStore, create_state_backend
+
 # Import execution modules with fallback for missing dependencies
 try:
     from execution.youtube_search import discover_videos
@@ -27,7 +32,7 @@ try:
     from execution.search_news import search_news
     from execution.generate_script import generate_script
     from execution.fetch_articles import fetch_multiple_articles
-    from execution.generate_video import build_video_from_chunks, check_ffmpeg
+    from execution.generate_video import check_ffmpeg
     from execution.generate_ai_images import generate_all_images, generate_chunk_image, split_script_to_chunks
     from execution.generate_narrative_script import generate_narrative_script, DEFAULT_BEATS
     from execution.thumbnail_generator import (
@@ -37,7 +42,7 @@ try:
     # Import the new STRICT Locked Template Generator
     from execution.generate_thumbnail import generate_thumbnail_with_gemini
     from execution.title_generator import generate_title_options
-    from execution.keyword_research import research_keywords
+    from execution.keyword_research import research_keywords, iter_keyword_research
     from execution.youtube_video_info import get_video_details, get_multiple_video_details, format_duration
     from execution.youtube_upload import (
         get_auth_url, handle_oauth_callback, is_authenticated, 
@@ -53,7 +58,6 @@ except ImportError as e:
     def search_news(*args, **kwargs): return []
     def generate_script(*args, **kwargs): return ""
     def fetch_multiple_articles(*args, **kwargs): return []
-    def build_video_from_chunks(*args, **kwargs): return None
     def check_ffmpeg(): return False
     def generate_all_images(*args, **kwargs): return []
     def generate_chunk_image(*args, **kwargs): return None
@@ -79,7 +83,6 @@ except ImportError as e:
     def search_news(*args, **kwargs): return []
     def generate_script(*args, **kwargs): return ""
     def fetch_multiple_articles(*args, **kwargs): return []
-    def build_video_from_chunks(*args, **kwargs): return None
     def check_ffmpeg(): return False
     def generate_all_images(*args, **kwargs): return []
     def generate_chunk_image(*args, **kwargs): return None
@@ -93,6 +96,7 @@ except ImportError as e:
     def generate_thumbnail_with_gemini(*args, **kwargs): return None  # Added placeholder
     def generate_title_options(*args, **kwargs): return []
     def research_keywords(*args, **kwargs): return []
+    def iter_keyword_research(*args, **kwargs): return iter(())
     def get_video_details(*args, **kwargs): return {}
     def get_multiple_video_details(*args, **kwargs): return []
     def format_duration(*args, **kwargs): return ""
@@ -109,33 +113,16 @@ app.secret_key = os.getenv('FLASK_SECRET_KEY', 'dev-secret-key-change-in-prod')
 BASE_DIR = Path(__file__).parent
 TMP_DIR = BASE_DIR / '.tmp'
 SCREENSHOTS_DIR = TMP_DIR / 'screenshots'
-DATA_FILE = BASE_DIR / 'data.json'
 
 # Ensure directories exist
 TMP_DIR.mkdir(exist_ok=True)
 SCREENSHOTS_DIR.mkdir(exist_ok=True)
 
-def load_persistent_data():
-    """Load persistent data from JSON file."""
-    if DATA_FILE.exists():
-        with open(DATA_FILE, 'r') as f:
-            return json.load(f)
-    return {
-        'projects': [],
-        'current_project': None,
-        'saved_videos': {}  # project_id -> [videos]
-    }
-
-def save_persistent_data(data):
-    """Save persistent data to JSON file."""
-    with open(DATA_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+# Projects and saved videos persist in SQLite (execution/project_store.py);
+# a legacy data.json is migrated on first access.
 
-# Load persistent data
-persistent_data = load_persistent_data()
-
-# In-memory state (session-based, resets on restart)
-app_state = {
+# Editor state defaults (a reset returns every field to these)
+APP_STATE_DEFAULTS = {
     'videos': [],
     'selected_videos': [],  # Changed to list for multi-select
     'transcript': None,
@@ -145,13 +132,23 @@ app_state = {
     'claim_screenshots': []  # For Video Editor
 }
 
+# Editor state, per project. In memory by default; APP_STATE_BACKEND=redis
+# shares it across gunicorn workers and keeps it across restarts.
+# Lists/dicts read from it must be assigned back after in-place edits.
+app_state = StateStore(
+    create_state_backend(),
+    defaults=APP_STATE_DEFAULTS,
+    namespace=project_store.get_current_project
+)
+
 # Try to restore claim_screenshots from manifest if they exist
 try:
     manifest_path = TMP_DIR / 'screenshots' / 'claim_screenshots_manifest.json'
     if manifest_path.exists():
         with open(manifest_path, 'r') as f:
             saved_screenshots = json.load(f)
-            if isinstance(saved_screenshots, list) and len(saved_screenshots) > 0:
+            # A shared backend may already hold newer state
+            if isinstance(saved_screenshots, list) and len(saved_screenshots) > 0 and not app_state.get('claim_screenshots'):
                 print(f"📸 Restoring {len(saved_screenshots)} screenshots from manifest")
                 app_state['claim_screenshots'] = saved_screenshots
                 app_state['screenshots'] = saved_screenshots  # Also populate legacy key
@@ -182,7 +179,7 @@ def health_check():
 def api_full_pipeline():
     """
     Queue a full video generation pipeline.
-    Expected JSON: { url: youtube_url, topic?: optional_topic }
+    Expected JSON: { url: youtube_url, topic?: optional_topic, streaming?: bool }
     """
     try:
         from execution.job_queue import queue_full_pipeline
@@ -190,11 +187,12 @@ def api_full_pipeline():
         data = request.json
         youtube_url = data.get('url')
         topic = data.get('topic')
+        streaming = bool(data.get('streaming', False))
         
         if not youtube_url:
             return jsonify({'error': 'Missing url parameter'}), 400
         
-        job_id = queue_full_pipeline(youtube_url=youtube_url, topic=topic)
+        job_id = queue_full_pipeline(youtube_url=youtube_url, topic=topic, streaming=streaming)
         
         return jsonify({
             'success': True,
@@ -205,21 +203,72 @@ def api_full_pipeline():
         return jsonify({'error': str(e)}), 500
 
 
+def remember_job_result(status: dict):
+    """Record app_state pointers from a finished job's result (SSE and polling clients alike)."""
+    result = status.get('result') or {}
+    # Keep /api/download-srt pointing at this job's subtitles
+    if result.get('srt_path') and app_state.get('last_srt_path') != result['srt_path']:
+        app_state['last_srt_path'] = result['srt_path']
+
+
 @app.route('/api/job-status/<job_id>')
 def api_job_status(job_id):
     """Get status of a queued job."""
     try:
-        from execution.job_queue import get_job_status
+        from execution.job_queue import get_job_status, JobStatus
         
         status = get_job_status(job_id)
         if not status:
             return jsonify({'error': 'Job not found'}), 404
         
+        if status['status'] == JobStatus.COMPLETED:
+            remember_job_result(status)
         return jsonify(status)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/job-events/<job_id>')
+def api_job_events(job_id):
+    """
+    Stream job status as Server-Sent Events until the job finishes.
+    Each event's data is the same JSON as /api/job-status.
+    """
+    import time
+    from execution.job_queue import get_job_status, JobStatus
+
+    def generate():
+        last_update = None
+        while True:
+            status = get_job_status(job_id)
+            if not status:
+                yield f"event: error\ndata: {json.dumps({'error': 'Job not found'})}\n\n"
+                return
+            if status['updated_at'] != last_update:
+                last_update = status['updated_at']
+                yield f"data: {json.dumps(status)}\n\n"
+            else:
+                # Comment line keeps proxies from closing an idle connection
+                yield ": keep-alive\n\n"
+            if status['status'] in (JobStatus.COMPLETED, JobStatus.FAILED):
+                if status['status'] == JobStatus.COMPLETED:
+                    remember_job_result(status)
+                return
+            time.sleep(1)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@app.route('/api/gemini-metrics')
+def api_gemini_metrics():
+    """Gemini calls, tokens and latency per model (this web process only)."""
+    return jsonify({'success': True, 'models': gemini_gateway.metrics()})
+
+
 @app.route('/api/extract-video-info', methods=['POST'])
 def api_extract_video_info():
     """Extract video title and metadata from YouTube URL."""
@@ -240,12 +289,15 @@ def api_extract_video_info():
 @app.route('/api/state')
 def get_state():
     """Get current application state including persistent data."""
+    current_project = project_store.get_current_project()
+    state = app_state.snapshot()
     return jsonify({
-        **app_state,
-        'claimScreenshots': app_state.get('screenshots', []),  # Frontend uses this key
-        'projects': persistent_data['projects'],
-        'current_project': persistent_data['current_project'],
-        'saved_videos': persistent_data['saved_videos']
+        **state,
+        'claimScreenshots': state.get('screenshots', []),  # Frontend uses this key
+        'projects': project_store.list_projects(),
+        'current_project': current_project,
+        # Only the current project's videos; other projects load on select
+        'saved_videos': {current_project: project_store.list_saved_videos(current_project)} if current_project else {}
     })
 
 @app.route('/api/discover', methods=['POST'])
@@ -382,12 +434,13 @@ def api_transcribe_url():
 def api_search_news():
     """
     Search for related news articles.
-    Expected JSON: { transcript, num_articles, channel_focus } or { topic, num_articles }
+    Expected JSON: { transcript, num_articles, channel_focus, refresh? } or { topic, num_articles }
     """
     data = request.json
     num_articles = int(data.get('num_articles', 30))
     channel_focus = data.get('channel_focus', '')
     days_limit = int(data.get('days_limit', 7))  # Default 7 days
+    refresh = bool(data.get('refresh'))  # Regenerate cached AI search queries
     
     # Get transcript from request or app state
     transcript = data.get('transcript') or app_state.get('transcript')
@@ -406,7 +459,8 @@ def api_search_news():
         num_articles=num_articles,
         transcript=transcript,
         channel_focus=channel_focus,
-        days_limit=days_limit
+        days_limit=days_limit,
+        refresh=refresh
     )
     
     if result['success']:
@@ -451,32 +505,21 @@ REQUIREMENTS:
 Return ONLY 4 topics, one per line. No numbering, no explanations."""
 
     try:
-        api_key = os.getenv('GEMINI_API_KEY')
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={api_key}"
-        
-        payload = {
-            "contents": [{"parts": [{"text": prompt}]}],
-            "generationConfig": {
-                "temperature": 0.8,
-                "maxOutputTokens": 500
-            }
-        }
+        text = gemini_gateway.generate_text(
+            prompt,
+            model='gemini-2.0-flash',
+            temperature=0.8,
+            max_output_tokens=500,
+            timeout=30
+        )
         
-        response = requests.post(url, json=payload, timeout=30)
+        # Parse topics (one per line)
+        topics = [line.strip() for line in text.strip().split('\n') if line.strip() and len(line.strip()) > 10][:4]
         
-        if response.status_code == 200:
-            result = response.json()
-            text = result.get('candidates', [{}])[0].get('content', {}).get('parts', [{}])[0].get('text', '')
-            
-            # Parse topics (one per line)
-            topics = [line.strip() for line in text.strip().split('\n') if line.strip() and len(line.strip()) > 10][:4]
-            
-            if topics:
-                return jsonify({'success': True, 'topics': topics})
-            else:
-                return jsonify({'success': False, 'error': 'No topics generated'}), 500
+        if topics:
+            return jsonify({'success': True, 'topics': topics})
         else:
-            return jsonify({'success': False, 'error': f'API error: {response.status_code}'}), 500
+            return jsonify({'success': False, 'error': 'No topics generated'}), 500
             
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -528,7 +571,9 @@ def api_generate_script():
         transcript=transcript if script_mode == 'transcript_refined' else None,  # Only pass transcript for transcript_refined mode
         word_count=word_count,
         channel_focus=channel_focus,
-        script_mode=script_mode
+        script_mode=script_mode,
+        refresh=bool(data.get('refresh')),  # Re-run cached transcript analyses
+        parallel=bool(data.get('parallel'))  # Draft all sections at once
     )
     
     if result['success']:
@@ -667,7 +712,7 @@ def api_regenerate_beat():
         topic: str
     }
     """
-    from execution.generate_narrative_script import generate_beat, split_into_chunks
+    from execution.generate_narrative_script import generate_beat, split_into_chunks, clean_script_text
     
     data = request.json
     beat_id = data.get('beat_id')
@@ -704,6 +749,8 @@ def api_regenerate_beat():
         result['chunks'] = split_into_chunks(result['text'], max_words=12)
         result['chunk_count'] = len(result['chunks'])
         
+        previous_script = narrative_script.get('full_script')
+        
         # Update stored script
         if narrative_script.get('beats'):
             for i, b in enumerate(narrative_script['beats']):
@@ -712,17 +759,34 @@ def api_regenerate_beat():
                     break
             
             # Recombine full script
-            narrative_script['full_script'] = "\n\n".join([
+            narrative_script['full_script'] = clean_script_text("\n\n".join([
                 b['text'] for b in narrative_script['beats'] if b.get('text')
-            ])
+            ]))
             narrative_script['total_words'] = sum(
                 b.get('word_count', 0) for b in narrative_script['beats']
             )
             app_state['narrative_script'] = narrative_script
+            app_state['script'] = {
+                'raw_text': narrative_script['full_script'],
+                'word_count': narrative_script['total_words'],
+                'narrative_beats': narrative_script['beats']
+            }
+            all_chunks = []
+            for b in narrative_script['beats']:
+                for chunk in b.get('chunks', []):
+                    all_chunks.append({**chunk, 'beat_id': b['id'], 'beat_name': b.get('name', ''),
+                                       'global_index': len(all_chunks)})
+            app_state['script_chunks'] = all_chunks
+        
+        # Keep the assets of every chunk the edit didn't touch
+        relinked = None
+        if narrative_script.get('full_script'):
+            relinked = relink_ai_chunks(narrative_script['full_script'], previous_script)
         
         return jsonify({
             'success': True,
-            'beat': result
+            'beat': result,
+            'relinked': relinked
         })
         
     except Exception as e:
@@ -777,53 +841,13 @@ def api_capture_screenshots():
     if not urls_with_highlights:
         return jsonify({'success': False, 'message': 'No URLs found in script. Make sure URLs are on their own lines.'}), 400
     
-    # Write URLs to temp file
-    urls_file = TMP_DIR / 'urls_to_capture.json'
-    with open(urls_file, 'w') as f:
-        json.dump(urls_with_highlights, f)
-    
-    # Run Node.js screenshot script (STEALTH MODE)
+    # Capture on the warm browser pool (STEALTH MODE); results stream back per URL
     try:
-        result = subprocess.run(
-            ['node', 'execution/capture_screenshots_stealth.js', '--urls', str(urls_file)],
-            capture_output=True,
-            text=True,
-            cwd=str(BASE_DIR),
-            timeout=600  # Increased to 10 minutes for stealth delays
+        from execution.screenshot_service import capture_all
+        screenshots_data = capture_all(
+            'url', urls_with_highlights,
+            on_result=lambda r: print(f"  {'✅' if r.get('success') else '❌'} {r.get('url', '')[:80]}")
         )
-        
-        if result.returncode != 0:
-            print(f"Screenshot script error: {result.stderr}")
-            return jsonify({
-                'success': False,
-                'message': f'Screenshot capture failed: {result.stderr}'
-            }), 500
-        
-        # Parse output
-        output = result.stdout
-        
-        # Look for JSON between markers first (new script format)
-        import re
-        json_match = re.search(r'__JSON_START__\s*(.*)\s*__JSON_END__', output, re.DOTALL)
-        
-        if json_match:
-            try:
-                screenshots_data = json.loads(json_match.group(1))
-            except json.JSONDecodeError as e:
-                print(f"JSON Parse Error: {e}")
-                print(f"Raw output: {output}")
-                return jsonify({'success': False, 'message': 'Failed to parse screenshot results'}), 500
-        else:
-            # Fallback to finding first array
-            json_start = output.find('[')
-            json_end = output.rfind(']') + 1
-            if json_start >= 0 and json_end > json_start:
-                try:
-                    screenshots_data = json.loads(output[json_start:json_end])
-                except json.JSONDecodeError:
-                    return jsonify({'success': False, 'message': 'Failed to parse screenshot output'}), 500
-            else:
-                return jsonify({'success': False, 'message': 'No valid output from screenshot script'}), 500
 
         # Update state
         app_state['screenshots'] = screenshots_data
@@ -839,7 +863,7 @@ def api_capture_screenshots():
             'count': len(screenshots_data)
         })
         
-    except subprocess.TimeoutExpired:
+    except (subprocess.TimeoutExpired, requests.Timeout):
         return jsonify({'success': False, 'message': 'Screenshot capture timed out'}), 504
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
@@ -847,7 +871,7 @@ def api_capture_screenshots():
 @app.route('/api/screenshots/<path:filename>')
 def serve_screenshot(filename):
     """Serve captured screenshots from .tmp directory"""
-    return send_from_directory(SCREENSHOTS_DIR, filename)
+    return serve_media(SCREENSHOTS_DIR, filename)
 
 
 # AI Image Generation Directory
@@ -901,6 +925,7 @@ def api_generate_ai_images():
             
             # Store in app state
             app_state['ai_image_chunks'] = chunks
+            chunk_assets.register_batch(output_dir, [c['path'] for c in chunks])
             
             # CRITICAL: Save the script to the batch folder for recovery after restart
             try:
@@ -950,6 +975,16 @@ def api_regenerate_chunk_image():
                 rel_path = output_path.relative_to(AI_IMAGES_DIR)
             except ValueError:
                 rel_path = output_path.name
+            
+            # Point the editor's chunk at the new image (e.g. a chunk changed by a beat edit)
+            ai_chunks = app_state.get('ai_image_chunks', [])
+            if 0 <= chunk_index < len(ai_chunks) and ai_chunks[chunk_index].get('text') == chunk_text:
+                ai_chunks[chunk_index].update({
+                    'path': str(output_path),
+                    'image_url': f'/api/ai-images/{rel_path}',
+                    'metaphor': result.get('metaphor', '')
+                })
+                app_state['ai_image_chunks'] = ai_chunks
                 
             return jsonify({
                 'success': True,
@@ -970,7 +1005,7 @@ def serve_ai_image(filename):
     # Fix for double ai_images path issue
     if filename.startswith('ai_images/'):
         filename = filename.replace('ai_images/', '', 1)
-    return send_from_directory(AI_IMAGES_DIR, filename)
+    return serve_media(AI_IMAGES_DIR, filename)
 
 
 @app.route('/api/claim-screenshots', methods=['POST'])
@@ -979,7 +1014,7 @@ def api_claim_screenshots():
     Claim-Based Screenshot Generation.
     Splits script into chunks, searches for each claim, captures screenshots.
     """
-    from execution.claim_screenshots import generate_claim_screenshots_data, chunk_script
+    from execution.claim_screenshots import generate_claim_screenshots_data, capture_claim_screenshots
     
     data = request.json
     script = data.get('script') or app_state.get('script', {}).get('raw_text', '')
@@ -1008,46 +1043,9 @@ def api_claim_screenshots():
         from datetime import datetime
         video_name = f"vid_{datetime.now().strftime('%Y%m%d_%H%M')}"
     
-    # Step 2: Write data for Node.js script (include video_name)
-    data_file = TMP_DIR / 'claim_screenshots_data.json'
-    screenshot_data_with_name = {
-        'video_name': video_name,
-        'chunks': claim_data['screenshots_data']
-    }
-    with open(data_file, 'w') as f:
-        json.dump(screenshot_data_with_name, f)
-    
-    # Step 3: Run screenshot capture
+    # Step 2: Capture on the warm browser pool, several chunks at once
     try:
-        result = subprocess.run(
-            ['node', 'execution/capture_claim_screenshots.js', '--data', str(data_file)],
-            capture_output=True,
-            text=True,
-            cwd=str(BASE_DIR),
-            timeout=1800  # 30 minutes for many screenshots
-        )
-        
-        if result.returncode != 0:
-            print(f"Screenshot script error: {result.stderr}")
-            return jsonify({'success': False, 'message': f'Screenshot capture failed'}), 500
-        
-        # Parse output
-        output = result.stdout
-        json_match = re.search(r'__JSON_START__\s*(.*)\s*__JSON_END__', output, re.DOTALL)
-        
-        if json_match:
-            screenshots_data = json.loads(json_match.group(1))
-        else:
-            return jsonify({'success': False, 'message': 'No valid output from screenshot script'}), 500
-        
-        # Merge chunk text with screenshot results
-        for ss in screenshots_data:
-            chunk_index = ss.get('chunk_index')
-            for item in claim_data['screenshots_data']:
-                if item['chunk_index'] == chunk_index:
-                    ss['chunk_text'] = item['chunk_text']
-                    ss['claim'] = item['claim']
-                    break
+        screenshots_data = capture_claim_screenshots(claim_data['screenshots_data'], video_name)
         
         # Update state
         app_state['claim_screenshots'] = screenshots_data
@@ -1067,7 +1065,7 @@ def api_claim_screenshots():
             'message': f'Captured {successful} of {claim_data["total_chunks"]} screenshots'
         })
         
-    except subprocess.TimeoutExpired:
+    except (subprocess.TimeoutExpired, requests.Timeout):
         return jsonify({'success': False, 'message': 'Screenshot capture timed out'}), 504
     except Exception as e:
         print(f"Error: {e}")
@@ -1076,29 +1074,90 @@ def api_claim_screenshots():
 
 @app.route('/api/download-screenshots')
 def download_screenshots():
-    """Download all screenshots as a ZIP file"""
-    import zipfile
-    from io import BytesIO
+    """Download all screenshots as a ZIP file, streamed as it is written"""
+    from execution.zip_stream import stream_zip
     
     # Get all PNG files in screenshots directory
-    screenshots = list(SCREENSHOTS_DIR.glob('*.png'))
+    screenshots = sorted(SCREENSHOTS_DIR.glob('*.png'))
     
     if not screenshots:
         return jsonify({'success': False, 'message': 'No screenshots to download'}), 404
     
-    # Create ZIP in memory
-    memory_file = BytesIO()
-    with zipfile.ZipFile(memory_file, 'w', zipfile.ZIP_DEFLATED) as zf:
-        for filepath in screenshots:
-            zf.write(filepath, filepath.name)
+    entries = [(filepath.name, filepath) for filepath in screenshots]
+    return Response(
+        stream_zip(entries),
+        mimetype='application/zip',
+        headers={'Content-Disposition': 'attachment; filename=screenshots.zip'}
+    )
+
+
+@app.route('/api/export-project')
+def api_export_project():
+    """
+    Download the current project as one streamed ZIP.
+    
+    Contains images/ (chunk images and uploads), audio/ (current audio per chunk),
+    segments/ (final-profile video segments), subtitles/ (latest SRT/ASS) and
+    project.json (project info + editor state). Add ?video=1 to include the
+    latest final video.
+    """
+    from datetime import datetime
+    from execution.zip_stream import stream_zip
+    from execution.generate_video import VIDEO_DIR, RENDER_PROFILES
     
-    memory_file.seek(0)
+    entries = []
     
-    return send_file(
-        memory_file,
+    # Images: current AI batch, else claim screenshots; uploads override per chunk
+    ai_chunks = app_state.get('ai_image_chunks', [])
+    if ai_chunks:
+        _, batch_images = chunk_assets.get_latest_batch()
+        entries += [(f'images/{path.name}', path) for path in batch_images]
+    else:
+        for i, chunk in enumerate(app_state.get('claim_screenshots', [])):
+            path = chunk.get('filepath', chunk.get('local_path'))
+            if path:
+                entries.append((f'images/chunk_{i:03d}{Path(path).suffix}', path))
+    for i, uploads in sorted(chunk_assets.get_uploads().items()):
+        for kind, path in uploads.items():
+            entries.append((f'images/uploads/chunk_{i:03d}_{kind}{Path(path).suffix}', path))
+    
+    for i, path in sorted(chunk_assets.get_audio_map().items()):
+        entries.append((f'audio/chunk_{i:03d}{Path(path).suffix}', path))
+    
+    draft_suffixes = tuple(p['suffix'] for p in RENDER_PROFILES.values() if p['suffix'])
+    if VIDEO_DIR.exists():
+        for path in sorted(VIDEO_DIR.glob('segment_*.mp4')):
+            if not path.stem.endswith(draft_suffixes):
+                entries.append((f'segments/{path.name}', path))
+    
+    srt_path = app_state.get('last_srt_path')
+    if srt_path:
+        entries.append(('subtitles/subtitles.srt', srt_path))
+        entries.append(('subtitles/subtitles.ass', str(Path(srt_path).with_suffix('.ass'))))
+    
+    if request.args.get('video') == '1':
+        videos = [
+            v for v in (TMP_DIR / 'final_videos').glob('*.mp4')
+            if not v.name.startswith('draft_') and '_subtitled' not in v.stem
+        ]
+        if videos:
+            latest = max(videos, key=lambda p: p.stat().st_mtime)
+            entries.append((f'video/{latest.name}', latest))
+            subtitled = latest.with_name(f'{latest.stem}_subtitled.mp4')
+            entries.append((f'video/{subtitled.name}', subtitled))
+    
+    project_id = project_store.get_current_project()
+    metadata = {
+        'project': project_store.get_project(project_id) if project_id else None,
+        'exported_at': datetime.now().isoformat(),
+        'state': app_state.snapshot()
+    }
+    entries.append(('project.json', json.dumps(metadata, indent=2, default=str).encode()))
+    
+    return Response(
+        stream_zip(entries),
         mimetype='application/zip',
-        as_attachment=True,
-        download_name='screenshots.zip'
+        headers={'Content-Disposition': f'attachment; filename=project_{project_id or "export"}.zip'}
     )
 
 @app.route('/api/generate-audio', methods=['POST'])
@@ -1178,6 +1237,9 @@ def api_generate_audio():
         with open(filepath, 'wb') as f:
             f.write(audio_bytes)
         
+        # Section audio only fills chunks that have no chunk audio yet
+        chunk_assets.register_section_audio(section_index, filepath)
+        
         return jsonify({
             'success': True,
             'filename': filename,
@@ -1192,9 +1254,9 @@ def api_generate_audio():
 
 @app.route('/api/audio/<path:filename>')
 def serve_audio(filename):
-    """Serve generated audio files."""
+    """Serve generated audio files (?format=opus for a small preview copy of a WAV)."""
     audio_dir = TMP_DIR / 'audio'
-    return send_from_directory(audio_dir, filename, mimetype='audio/wav')
+    return serve_media(audio_dir, filename)
 
 
 @app.route('/api/regenerate-chunk-audio', methods=['POST'])
@@ -1282,6 +1344,7 @@ def api_regenerate_chunk_audio():
         
         with open(filepath, 'wb') as f:
             f.write(audio_bytes)
+        chunk_assets.register_audio(chunk_index, filepath)
         
         print(f"✅ Generated audio for chunk {chunk_index}: {filename}")
         
@@ -1289,7 +1352,7 @@ def api_regenerate_chunk_audio():
             'success': True,
             'chunk_index': chunk_index,
             'filename': filename,
-            'audio_url': f'/api/audio/{filename}',
+            'audio_url': versioned_url(f'/api/audio/{filename}', filepath),
             'duration_estimate': len(clean_text.split()) / 2.5
         })
         
@@ -1309,18 +1372,17 @@ def api_regenerate_chunk_audio():
 def recover_latest_ai_batch(script_text=None):
     """Scan AI_IMAGES_DIR for the latest batch and reconstruct chunks."""
     try:
-        if not AI_IMAGES_DIR.exists():
-            return []
-            
-        batch_dirs = sorted([d for d in AI_IMAGES_DIR.iterdir() if d.is_dir() and d.name.startswith('batch_')], key=lambda d: d.stat().st_mtime, reverse=True)
-        if not batch_dirs:
+        latest_batch, image_files = chunk_assets.get_latest_batch()
+        if latest_batch and not latest_batch.exists():
+            # Batch was deleted outside the app - re-index once
+            chunk_assets.rebuild()
+            latest_batch, image_files = chunk_assets.get_latest_batch()
+        if not latest_batch:
             return []
             
-        latest_batch = batch_dirs[0]
-        print(f"♻️  Scanning images from {latest_batch.name}")
+        print(f"♻️  Loading images from {latest_batch.name}")
         
         recovered_chunks = []
-        image_files = sorted(list(latest_batch.glob('*.png')))
         
         # Try to match script text
         script_chunks = []
@@ -1386,6 +1448,19 @@ def recover_latest_ai_batch(script_text=None):
                 continue
                 
         if recovered_chunks:
+            # Chunks edited since the batch was generated have no image yet
+            present = {c['index'] for c in recovered_chunks}
+            for idx, text in enumerate(script_chunks):
+                if idx not in present:
+                    recovered_chunks.append({
+                        'index': idx,
+                        'chunk_text': text,
+                        'text': text,
+                        'image_url': '',
+                        'metaphor': '',
+                        'path': None,
+                        'success': False
+                    })
             recovered_chunks.sort(key=lambda x: x['index'])
             
         return recovered_chunks
@@ -1393,6 +1468,79 @@ def recover_latest_ai_batch(script_text=None):
         print(f"⚠️ Recovery helper failed: {e}")
         return []
 
+
+def relink_ai_chunks(script_text, previous_script=None):
+    """
+    Carry the Video Editor's chunk assets over to an edited script.
+
+    Chunks are matched to the previous list by content (chunk_assets.remap_chunks);
+    unchanged chunks keep their image, audio and uploads at their new index,
+    and only changed chunks are left to regenerate. The previous list is the
+    AI image chunks, or previous_script's chunks when there is no image batch
+    (the audio is still relinked; there are just no image entries to rebuild).
+
+    Returns:
+        {'reused': [new indexes], 'changed': [new indexes], 'superseded': n,
+         'chunks': the new ai_image_chunks or None} or None if there is no
+         previous chunk list to relink against
+    """
+    from execution.generate_ai_images import split_script_to_chunks
+    
+    old_chunks = app_state.get('ai_image_chunks') or recover_latest_ai_batch()
+    if old_chunks:
+        old_texts = [c.get('text', '') for c in old_chunks]
+    elif previous_script:
+        old_texts = split_script_to_chunks(previous_script)
+    else:
+        return None
+    
+    new_texts = split_script_to_chunks(script_text)
+    mapping = chunk_assets.remap_chunks(old_texts, new_texts)
+    result = chunk_assets.relink_chunks(
+        mapping, {i: c['path'] for i, c in enumerate(old_chunks or []) if c.get('path')}
+    )
+    changed = [j for j in range(len(new_texts)) if j not in mapping]
+    print(f"♻️  Relinked chunks: {len(mapping)} reused ({result['moved']} moved), "
+          f"{len(changed)} changed, {result['superseded']} files superseded")
+    relinked = {
+        'reused': sorted(mapping),
+        'changed': changed,
+        'superseded': result['superseded'],
+        'chunks': None
+    }
+    if not old_chunks:
+        return relinked
+    
+    new_chunks = []
+    for j, text in enumerate(new_texts):
+        old = old_chunks[mapping[j]] if j in mapping else {}
+        path = result['images'].get(j)
+        image_url = ''
+        if path:
+            try:
+                rel_path = Path(path).relative_to(AI_IMAGES_DIR)
+            except ValueError:
+                rel_path = Path(path).name
+            image_url = versioned_url(f'/api/ai-images/{rel_path}', path)
+        new_chunks.append({
+            'index': j,
+            'text': text,
+            'image_url': image_url,
+            'metaphor': old.get('metaphor', ''),
+            'path': path
+        })
+    app_state['ai_image_chunks'] = new_chunks
+    
+    # Keep the batch's script in step with its renamed images for recovery
+    batch_dir, _ = chunk_assets.get_latest_batch()
+    if batch_dir and batch_dir.exists():
+        try:
+            (batch_dir / 'script.txt').write_text(script_text)
+        except Exception as e:
+            print(f"⚠️ Failed to save script: {e}")
+    
+    return {**relinked, 'chunks': new_chunks}
+
 @app.route('/api/video-chunks', methods=['GET'])
 def api_get_video_chunks():
     """Get all chunks with their audio and screenshot status.
@@ -1436,20 +1584,23 @@ def api_get_video_chunks():
             'ready_count': 0
         })
     
-    audio_dir = TMP_DIR / 'audio'
+    # Section audio shows as a fallback here, as before; build-video uses chunk audio only
+    audio_map = chunk_assets.get_audio_map(include_sections=True)
+    uploads = chunk_assets.get_uploads()
     
     video_chunks = []
     for i, chunk in enumerate(source_chunks):
         if use_ai_images:
-            # AI image chunk structure
+            # AI image chunk structure (an uploaded screenshot replaces the image)
+            uploaded = uploads.get(i, {}).get('screenshot')
             chunk_data = {
                 'id': i,
                 'chunk_index': chunk.get('index', i),
                 'text': chunk.get('text', '')[:100],
                 'full_text': chunk.get('text', ''),
-                'has_screenshot': True,
-                'screenshot_path': chunk.get('path', ''),
-                'screenshot_url': chunk.get('image_url', ''),
+                'has_screenshot': bool(uploaded or chunk.get('path')),
+                'screenshot_path': uploaded or chunk.get('path') or '',
+                'screenshot_url': versioned_url(f"/api/screenshots/{Path(uploaded).name}", uploaded) if uploaded else chunk.get('image_url', ''),
                 'has_audio': False,
                 'audio_path': '',
                 'audio_url': None,
@@ -1458,30 +1609,27 @@ def api_get_video_chunks():
             }
         else:
             # Claim screenshot chunk structure  
+            screenshot_path = chunk.get('filepath', chunk.get('local_path', ''))
             chunk_data = {
                 'id': i,
                 'chunk_index': chunk.get('chunk_index', i),
                 'text': chunk.get('chunk_text', chunk.get('claim', ''))[:100],
                 'full_text': chunk.get('chunk_text', chunk.get('claim', '')),
                 'has_screenshot': chunk.get('success', False),
-                'screenshot_path': chunk.get('filepath', chunk.get('local_path', '')),
-                'screenshot_url': f"/api/screenshots/{Path(chunk.get('filepath', chunk.get('local_path', ''))).name}" if chunk.get('filepath') or chunk.get('local_path') else None,
+                'screenshot_path': screenshot_path,
+                'screenshot_url': versioned_url(f"/api/screenshots/{Path(screenshot_path).name}", screenshot_path) if screenshot_path else None,
                 'has_audio': False,
                 'audio_path': '',
                 'audio_url': None,
                 'is_ai_image': False
             }
         
-        # Check for audio file - support both new format (chunk_X.wav) and old format (chunk_X_timestamp.wav)
-        audio_patterns = [f"chunk_{i}.wav", f"chunk_{i}.mp3", f"chunk_{i}_*.wav", f"chunk_{i}_*.mp3", f"section_{i}_*.wav"]
-        for pattern in audio_patterns:
-            audio_files = list(audio_dir.glob(pattern))
-            if audio_files:
-                latest = max(audio_files, key=lambda p: p.stat().st_mtime)
-                chunk_data['has_audio'] = True
-                chunk_data['audio_path'] = str(latest)
-                chunk_data['audio_url'] = f"/api/audio/{latest.name}"
-                break
+        # Current audio for this chunk from the asset registry
+        audio_path = audio_map.get(i)
+        if audio_path:
+            chunk_data['has_audio'] = True
+            chunk_data['audio_path'] = audio_path
+            chunk_data['audio_url'] = versioned_url(f"/api/audio/{Path(audio_path).name}", audio_path)
         
         video_chunks.append(chunk_data)
     
@@ -1587,12 +1735,13 @@ def api_generate_chunk_audio():
         
         with open(filepath, 'wb') as f:
             f.write(audio_bytes)
+        chunk_assets.register_audio(chunk_index, filepath)
         
         return jsonify({
             'success': True,
             'chunk_index': chunk_index,
             'filename': filename,
-            'audio_url': f'/api/audio/{filename}',
+            'audio_url': versioned_url(f'/api/audio/{filename}', filepath),
             'path': str(filepath)
         })
         
@@ -1602,10 +1751,11 @@ def api_generate_chunk_audio():
 
 @app.route('/api/generate-all-audio', methods=['POST'])
 def api_generate_all_audio():
-    """Generate audio for all chunks (batch TTS)."""
-    import requests
-    import base64
-    import time
+    """
+    Queue audio generation for all chunks (batch TTS).
+    Returns a job_id; follow progress via /api/job-events/<job_id>.
+    """
+    from execution.job_queue import queue_generate_all_audio
     
     # DETERMINE SOURCE
     ai_chunks = app_state.get('ai_image_chunks', [])
@@ -1627,84 +1777,32 @@ def api_generate_all_audio():
     if not api_key:
         return jsonify({'success': False, 'error': 'API key not set (need GOOGLE_CLOUD_API_KEY or GEMINI_API_KEY)'}), 500
     
-    audio_dir = TMP_DIR / 'audio'
-    audio_dir.mkdir(exist_ok=True)
+    # Handle different text keys
+    if source_type == 'ai':
+        texts = [chunk.get('text', chunk.get('chunk_text', '')) for chunk in chunks]
+    else:
+        texts = [chunk.get('chunk_text', chunk.get('claim', '')) for chunk in chunks]
     
-    results = []
-    for i, chunk in enumerate(chunks):
-        # Handle different text keys
-        if source_type == 'ai':
-            text = chunk.get('text', chunk.get('chunk_text', ''))
-        else:
-            text = chunk.get('chunk_text', chunk.get('claim', ''))
-            
-        # Clean text
-        clean_text = re.sub(r'\[.*?\]', '', text)
-        clean_text = re.sub(r'https?://\S+', '', clean_text)
-        # Strip "Shot 1:", "Chunk 1:", "Script 1:", etc from start of lines
-        clean_text = re.sub(r'(?i)^(Shot|Chunk|Script|Scene)\s+\d+[:.]?\s*', '', clean_text)
-        # Also handle potential mid-text labels if splitter failed weirdly
-        clean_text = clean_text.strip()
-        
-        # TTS pronunciation fixes for common abbreviations
-        # "US" causes awkward pause - expand to full word
-        clean_text = re.sub(r'\bUS\b(?!\s+dollars)', 'United States', clean_text)  # US but not "US dollars"
-        clean_text = re.sub(r'\bUS\s+dollars\b', 'U.S. dollars', clean_text)  # Keep "U.S. dollars" natural
-        clean_text = re.sub(r'\bUSA\b', 'United States', clean_text)
-        clean_text = re.sub(r'\bUK\b', 'United Kingdom', clean_text)
-        # Dollar amounts: "$35 trillion" sounds better as "35 trillion dollars"
-        clean_text = re.sub(r'\$(\d+(?:\.\d+)?)\s*(trillion|billion|million)', r'\1 \2 dollars', clean_text)
-        
-        if not clean_text:
-            results.append({'chunk_index': i, 'success': False, 'error': 'Empty text'})
-            continue
-        
-        tts_url = f"https://texttospeech.googleapis.com/v1beta1/text:synthesize?key={api_key}"
-        payload = {
-            "audioConfig": {
-                "audioEncoding": "LINEAR16",
-                "pitch": 0,
-                "speakingRate": 1
-            },
-            "input": {"text": clean_text},
-            "voice": {"languageCode": "en-US", "name": "en-US-Chirp3-HD-Charon"}
-        }
-        
-        try:
-            response = requests.post(tts_url, json=payload, timeout=60)
-            if response.status_code == 200:
-                audio_content = response.json().get('audioContent', '')
-                if audio_content:
-                    audio_bytes = base64.b64decode(audio_content)
-                    filename = f"chunk_{i}_{int(time.time())}.wav"
-                    filepath = audio_dir / filename
-                    with open(filepath, 'wb') as f:
-                        f.write(audio_bytes)
-                    results.append({
-                        'chunk_index': i,
-                        'success': True,
-                        'audio_url': f'/api/audio/{filename}',
-                        'path': str(filepath)
-                    })
-                else:
-                    results.append({'chunk_index': i, 'success': False, 'error': 'No audio'})
-            else:
-                error_detail = response.text[:500] if response.text else 'Unknown error'
-                print(f"TTS Error for chunk {i}: {response.status_code} - {error_detail}")
-                results.append({'chunk_index': i, 'success': False, 'error': f'API error: {response.status_code}'})
-        except Exception as e:
-            results.append({'chunk_index': i, 'success': False, 'error': str(e)})
-        
-        # Rate limiting
-        time.sleep(0.5)
+    # missing_only: just the chunks without audio (e.g. the ones a beat edit changed)
+    indexes = None
+    if (request.get_json(silent=True) or {}).get('missing_only'):
+        audio_map = chunk_assets.get_audio_map()
+        indexes = [i for i in range(len(texts)) if i not in audio_map]
+        if not indexes:
+            return jsonify({'success': True, 'job_id': None, 'total': 0,
+                            'message': 'Every chunk already has audio'})
+    
+    try:
+        job_id = queue_generate_all_audio(texts, str(TMP_DIR / 'audio'), indexes)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
     
-    successful = len([r for r in results if r.get('success')])
+    total = len(indexes) if indexes is not None else len(chunks)
     return jsonify({
         'success': True,
-        'results': results,
-        'total': len(chunks),
-        'successful': successful,
-        'message': f'Generated audio for {successful}/{len(chunks)} chunks'
+        'job_id': job_id,
+        'total': total,
+        'message': f'Audio generation started for {total} chunks'
     })
 
 
@@ -1731,6 +1829,9 @@ def api_clear_audio():
         except Exception as e:
             print(f"Failed to delete {audio_file}: {e}")
     
+    chunk_assets.clear_audio()
+    shutil.rmtree(OPUS_CACHE_DIR, ignore_errors=True)
+    
     return jsonify({
         'success': True,
         'deleted': deleted_count,
@@ -1738,14 +1839,17 @@ def api_clear_audio():
     })
 
 
-@app.route('/api/build-video', methods=['POST'])
-def api_build_video():
-    """Build final video from chunks with audio and screenshots."""
-    if not check_ffmpeg():
-        return jsonify({
-            'success': False,
-            'error': 'FFmpeg is not installed. Install with: brew install ffmpeg'
-        }), 500
+def resolve_video_chunks(chunk_stock_videos=None, only_index=None):
+    """
+    Turn the editor's chunks into build_video_from_chunks input.
+    
+    Args:
+        chunk_stock_videos: {chunk_index: {'positive'|'negative': filename}} selections
+        only_index: Resolve just this chunk (previews)
+    
+    Returns:
+        (video_chunks, error) - chunks without audio are skipped
+    """
     # Prioritize AI image chunks over claim screenshots
     ai_chunks = app_state.get('ai_image_chunks', [])
     claim_chunks = app_state.get('claim_screenshots', [])
@@ -1753,34 +1857,25 @@ def api_build_video():
     if ai_chunks:
         chunks = ai_chunks
         source_type = 'ai'
-        print(f"🎬 Building video from {len(chunks)} AI image chunks")
     elif claim_chunks:
         chunks = claim_chunks
         source_type = 'claim'
-        print(f"🎬 Building video from {len(chunks)} claim screenshot chunks")
     else:
-        return jsonify({'success': False, 'error': 'No chunks available'}), 400
-    
-    # Get stock video selections from request (if any)
-    request_data = request.get_json() or {}
-    chunk_stock_videos = {}
-    if request_data.get('chunks'):
-        for c in request_data['chunks']:
-            chunk_stock_videos[c['index']] = c.get('stock_videos', {})
+        return [], 'No chunks available'
     
-    audio_dir = TMP_DIR / 'audio'
+    chunk_stock_videos = chunk_stock_videos or {}
+    audio_map = chunk_assets.get_audio_map()
+    uploads = chunk_assets.get_uploads()
     stock_dir = TMP_DIR / 'stock'
     
     # Build chunk data for video generation
     video_chunks = []
     for i, chunk in enumerate(chunks):
-        # Find audio file for this chunk - support both formats
-        audio_path = None
-        for pattern in [f"chunk_{i}.wav", f"chunk_{i}.mp3", f"chunk_{i}_*.wav", f"chunk_{i}_*.mp3"]:
-            audio_files = list(audio_dir.glob(pattern))
-            if audio_files:
-                audio_path = str(max(audio_files, key=lambda p: p.stat().st_mtime))
-                break
+        if only_index is not None and i != only_index:
+            continue
+        
+        # Current audio for this chunk from the asset registry
+        audio_path = audio_map.get(i)
         
         if not audio_path:
             continue  # Skip chunks without audio
@@ -1799,7 +1894,7 @@ def api_build_video():
                 stock_video_path = str(potential_path)
         
         # Check for custom uploaded video (takes priority over stock videos)
-        custom_video_path = chunk.get('custom_video_path')
+        custom_video_path = chunk.get('custom_video_path') or uploads.get(i, {}).get('video')
         if custom_video_path and os.path.exists(custom_video_path):
             # Custom uploaded video takes priority
             final_video_path = custom_video_path
@@ -1817,6 +1912,7 @@ def api_build_video():
                 screenshot_path = str(TMP_DIR / 'ai_images' / rel_path)
             else:
                 screenshot_path = chunk.get('path')
+            screenshot_path = uploads.get(i, {}).get('screenshot') or screenshot_path
         else:
             chunk_text = chunk.get('chunk_text', chunk.get('claim', ''))[:50]
             screenshot_path = chunk.get('filepath', chunk.get('local_path')) if chunk.get('success') else None
@@ -1830,33 +1926,108 @@ def api_build_video():
         })
     
     if not video_chunks:
-        return jsonify({'success': False, 'error': 'No chunks with audio found'}), 400
+        return [], 'No chunks with audio found'
+    return video_chunks, None
+
+
+@app.route('/api/build-video', methods=['POST'])
+def api_build_video():
+    """
+    Queue a video build from chunks with audio and screenshots.
+    Expected JSON: { chunks?: [{index, stock_videos}], profile?: 'final' | 'draft' | 'draft_720' }
+    Drafts render at 480p/720p with ultrafast settings for quick review;
+    'final' (default) is the full 1080p render.
+    Returns a job_id; follow progress via /api/job-events/<job_id>.
+    """
+    from execution.generate_video import RENDER_PROFILES
     
-    # Build video
-    result = build_video_from_chunks(video_chunks)
+    if not check_ffmpeg():
+        return jsonify({
+            'success': False,
+            'error': 'FFmpeg is not installed. Install with: brew install ffmpeg'
+        }), 500
     
+    # Get stock video selections from request (if any)
+    request_data = request.get_json() or {}
+    chunk_stock_videos = {}
+    if request_data.get('chunks'):
+        for c in request_data['chunks']:
+            chunk_stock_videos[c['index']] = c.get('stock_videos', {})
     
-    if result['success']:
-        # Make output accessible via web
-        output_path = result['output_path']
-        filename = os.path.basename(output_path)
-        
-        return jsonify({
-            'success': True,
-            'message': result['message'],
-            'video_url': f'/api/video/{filename}',
-            'duration': result.get('duration', 0),
-            'segments_count': result.get('segments_count', 0)
-        })
-    else:
-        return jsonify({'success': False, 'error': result['message']}), 500
+    profile = request_data.get('profile', 'final')
+    if profile not in RENDER_PROFILES:
+        return jsonify({'success': False, 'error': f'Unknown profile: {profile}'}), 400
+    
+    video_chunks, error = resolve_video_chunks(chunk_stock_videos)
+    if error:
+        return jsonify({'success': False, 'error': error}), 400
+    print(f"🎬 Building {profile} video from {len(video_chunks)} chunks")
+    
+    # Build in the background; follow progress via /api/job-events/<job_id>
+    try:
+        from execution.job_queue import queue_build_video
+        job_id = queue_build_video(video_chunks, profile=profile)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+    
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'total': len(video_chunks),
+        'profile': profile,
+        'message': f'{profile.capitalize()} video build started for {len(video_chunks)} chunks'
+    })
+
+
+@app.route('/api/preview-chunk', methods=['POST'])
+def api_preview_chunk():
+    """
+    Render a single chunk as a draft clip for quick review in the editor.
+    Expected JSON: { chunk_index, stock_videos?: {positive?, negative?}, profile?: 'draft' | 'draft_720' }
+    """
+    from execution.generate_video import render_chunk_preview
+    
+    if not check_ffmpeg():
+        return jsonify({'success': False, 'error': 'FFmpeg is not installed'}), 500
+    
+    data = request.get_json() or {}
+    chunk_index = data.get('chunk_index')
+    if chunk_index is None:
+        return jsonify({'success': False, 'error': 'chunk_index required'}), 400
+    
+    profile = data.get('profile', 'draft')
+    if profile not in ('draft', 'draft_720'):
+        return jsonify({'success': False, 'error': f'Unknown preview profile: {profile}'}), 400
+    
+    video_chunks, error = resolve_video_chunks(
+        {chunk_index: data.get('stock_videos', {})}, only_index=chunk_index
+    )
+    if error:
+        return jsonify({'success': False, 'error': f'Chunk {chunk_index}: {error}'}), 400
+    
+    preview_path = render_chunk_preview(video_chunks[0], profile=profile)
+    if not preview_path:
+        return jsonify({'success': False, 'error': 'Preview render failed'}), 500
+    
+    filename = Path(preview_path).name
+    return jsonify({
+        'success': True,
+        'chunk_index': chunk_index,
+        'preview_url': versioned_url(f'/api/preview/{filename}', preview_path)
+    })
+
+
+@app.route('/api/preview/<path:filename>')
+def serve_preview(filename):
+    """Serve per-chunk draft preview clips."""
+    return serve_media(TMP_DIR / 'previews', filename, mimetype='video/mp4')
 
 
 @app.route('/api/video/<path:filename>')
 def serve_video(filename):
     """Serve generated video files."""
     output_dir = TMP_DIR / 'final_videos'
-    return send_from_directory(output_dir, filename, mimetype='video/mp4')
+    return serve_media(output_dir, filename, mimetype='video/mp4')
 
 
 @app.route('/api/list-videos')
@@ -1874,6 +2045,7 @@ def api_list_videos():
             'size_mb': round(stat.st_size / (1024 * 1024), 1),
             'modified': stat.st_mtime,
             'is_subtitled': '_subtitled' in video_file.stem,
+            'is_draft': video_file.name.startswith('draft_'),
             'url': f'/api/video/{video_file.name}'
         })
     
@@ -1890,11 +2062,12 @@ def api_list_videos():
 @app.route('/api/add-subtitles', methods=['POST'])
 def api_add_subtitles():
     """
-    Generate and burn subtitles into a video.
-    Uses Gemini for transcription, FFmpeg for burning.
-    Expected JSON: { video_filename } OR uses latest video if not specified.
+    Queue subtitle generation and burn-in for a video.
+    Uses Groq Whisper for transcription, FFmpeg for burning.
+    Expected JSON: { video_filename } OR uses latest non-draft video if not specified.
+    Returns a job_id; follow progress via /api/job-events/<job_id>.
     """
-    from execution.generate_subtitles import generate_subtitled_video
+    from execution.job_queue import queue_add_subtitles
     
     data = request.json or {}
     video_filename = data.get('video_filename')
@@ -1906,7 +2079,7 @@ def api_add_subtitles():
         video_path = output_dir / video_filename
     else:
         # Use the most recent video
-        videos = list(output_dir.glob('*.mp4'))
+        videos = [v for v in output_dir.glob('*.mp4') if not v.name.startswith('draft_')]
         # Exclude already subtitled videos
         videos = [v for v in videos if '_subtitled' not in v.stem]
         if not videos:
@@ -1918,27 +2091,18 @@ def api_add_subtitles():
     
     print(f"📝 Generating subtitles for: {video_path.name}")
     
-    result = generate_subtitled_video(
-        video_path=str(video_path),
-        output_dir=str(output_dir)
-    )
+    try:
+        job_id = queue_add_subtitles(str(video_path), str(output_dir))
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
     
-    if result['success']:
-        subtitled_filename = Path(result['subtitled_video']).name
-        # Store SRT path for download
-        if result.get('srt_path'):
-            app_state['last_srt_path'] = result['srt_path']
-        return jsonify({
-            'success': True,
-            'message': 'Subtitles generated and burned successfully',
-            'original_video': f'/api/video/{video_path.name}',
-            'subtitled_video': f'/api/video/{subtitled_filename}',
-            'srt_file': f'/api/download-srt',  # URL for download
-            'srt_path': result.get('srt_path'),
-            'ass_path': result.get('ass_path')
-        })
-    else:
-        return jsonify({'success': False, 'error': result.get('error', 'Unknown error')}), 500
+    # /api/download-srt picks up the newest SRT once the job finishes
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'original_video': f'/api/video/{video_path.name}',
+        'message': f'Subtitle generation started for {video_path.name}'
+    })
 
 
 @app.route('/api/download-srt', methods=['GET'])
@@ -1983,12 +2147,15 @@ def api_upload_chunk_screenshot():
     filepath = SCREENSHOTS_DIR / filename
     file.save(filepath)
     
+    chunk_assets.register_upload(chunk_index, 'screenshot', filepath)
+    
     # Update the chunk in app_state
     chunks = app_state.get('claim_screenshots', [])
     if chunk_index < len(chunks):
         chunks[chunk_index]['filepath'] = str(filepath)
         chunks[chunk_index]['filename'] = filename
         chunks[chunk_index]['success'] = True
+        app_state['claim_screenshots'] = chunks
         
         # Save updated manifest
         manifest_path = SCREENSHOTS_DIR / 'claim_screenshots_manifest.json'
@@ -2029,10 +2196,13 @@ def api_upload_chunk_video():
     filepath = chunk_videos_dir / filename
     file.save(filepath)
     
+    chunk_assets.register_upload(chunk_index, 'video', filepath)
+    
     # Update the chunk in app_state
     chunks = app_state.get('claim_screenshots', [])
     if chunk_index < len(chunks):
         chunks[chunk_index]['custom_video_path'] = str(filepath)
+        app_state['claim_screenshots'] = chunks
         
         # Save updated manifest
         manifest_path = SCREENSHOTS_DIR / 'claim_screenshots_manifest.json'
@@ -2051,7 +2221,7 @@ def api_upload_chunk_video():
 def serve_chunk_video(filename):
     """Serve uploaded chunk videos."""
     chunk_videos_dir = TMP_DIR / 'chunk_videos'
-    return send_from_directory(chunk_videos_dir, filename)
+    return serve_media(chunk_videos_dir, filename)
 
 
 @app.route('/api/copy-chunk-screenshot', methods=['POST'])
@@ -2087,6 +2257,7 @@ def api_copy_chunk_screenshot():
         chunks[target_index]['filename'] = new_filename
         chunks[target_index]['success'] = True
         chunks[target_index]['copied_from'] = source_index
+        app_state['claim_screenshots'] = chunks
         
         # Save manifest
         manifest_path = SCREENSHOTS_DIR / 'claim_screenshots_manifest.json'
@@ -2163,86 +2334,59 @@ def api_regenerate_chunk_screenshot():
     target_url = results[result_index]['url']
     print(f"DEBUG: Using result {result_index + 1}/{len(results)}: {target_url}")
     
-    # Capture screenshot from this specific URL
-    import subprocess
+    # Capture screenshot from this specific URL on the warm browser pool
+    from execution.screenshot_service import capture_all
     
-    # Create single-chunk data for the screenshot script
-    single_chunk_data = {
-        'video_name': 'regen',
-        'chunks': [{
-            'chunk_index': chunk_index,
-            'chunk_text': chunk_text,
-            'claim': claim,
-            'urls': [target_url],
-            'titles': [results[result_index].get('title', '')]
-        }]
+    single_chunk = {
+        'chunk_index': chunk_index,
+        'chunk_text': chunk_text,
+        'claim': claim,
+        'urls': [target_url],
+        'titles': [results[result_index].get('title', '')]
     }
     
-    data_file = TMP_DIR / 'regen_screenshot_data.json'
-    with open(data_file, 'w') as f:
-        json.dump(single_chunk_data, f)
-    
     try:
         print(f"DEBUG: Running screenshot capture for chunk {chunk_index}, URL: {target_url}")
-        result = subprocess.run(
-            ['node', 'execution/capture_claim_screenshots.js', '--data', str(data_file)],
-            capture_output=True,
-            text=True,
-            cwd=str(BASE_DIR),
-            timeout=120
-        )
-        
-        print(f"DEBUG: Node stdout length: {len(result.stdout)}")
-        print(f"DEBUG: Node stderr: {result.stderr[:500] if result.stderr else 'None'}")
+        # An explicit regenerate must re-capture, not return the cached image
+        screenshot_results = capture_all('claim', [single_chunk], video_name='regen', use_cache=False)
+        print(f"DEBUG: Screenshot results: {screenshot_results}")
         
-        # Parse result
-        output = result.stdout
-        json_match = re.search(r'__JSON_START__\s*(.*?)\s*__JSON_END__', output, re.DOTALL)
-        
-        if json_match:
-            screenshot_results = json.loads(json_match.group(1))
-            print(f"DEBUG: Screenshot results: {screenshot_results}")
+        if screenshot_results and screenshot_results[0].get('success'):
+            ss = screenshot_results[0]
             
-            if screenshot_results and screenshot_results[0].get('success'):
-                ss = screenshot_results[0]
-                
-                # Update chunk in app_state
-                chunks[chunk_index]['filepath'] = ss['filepath']
-                chunks[chunk_index]['filename'] = ss['filename']
-                chunks[chunk_index]['success'] = True
-                chunks[chunk_index]['url'] = target_url
-                chunks[chunk_index]['result_index'] = result_index
-                
-                # Save manifest
-                manifest_path = SCREENSHOTS_DIR / 'claim_screenshots_manifest.json'
-                with open(manifest_path, 'w') as f:
-                    json.dump(chunks, f, indent=2)
-                
-                return jsonify({
-                    'success': True,
-                    'screenshot_url': f"/api/screenshots/{ss['filename']}",
-                    'result_index': result_index,
-                    'source_url': target_url,
-                    'available_results': len(results)
-                })
-            else:
-                error_msg = screenshot_results[0].get('error', 'Screenshot capture failed') if screenshot_results else 'No results'
-                print(f"DEBUG: Screenshot failed: {error_msg}")
-                return jsonify({
-                    'success': False, 
-                    'error': error_msg,
-                    'available_results': len(results)
-                })
+            # Update chunk in app_state
+            chunks[chunk_index]['filepath'] = ss['filepath']
+            chunks[chunk_index]['filename'] = ss['filename']
+            chunks[chunk_index]['success'] = True
+            chunks[chunk_index]['url'] = target_url
+            chunks[chunk_index]['result_index'] = result_index
+            chunks[chunk_index]['phash'] = ss.get('phash')
+            chunks[chunk_index].pop('duplicate_of', None)
+            app_state['claim_screenshots'] = chunks
+            
+            # Save manifest
+            manifest_path = SCREENSHOTS_DIR / 'claim_screenshots_manifest.json'
+            with open(manifest_path, 'w') as f:
+                json.dump(chunks, f, indent=2)
+            
+            return jsonify({
+                'success': True,
+                'screenshot_url': versioned_url(f"/api/screenshots/{ss['filename']}", ss['filepath']),
+                'result_index': result_index,
+                'source_url': target_url,
+                'available_results': len(results)
+            })
         else:
-            print(f"DEBUG: No JSON found in output. Stdout preview: {output[:500]}")
+            error_msg = screenshot_results[0].get('error', 'Screenshot capture failed') if screenshot_results else 'No results'
+            print(f"DEBUG: Screenshot failed: {error_msg}")
             return jsonify({
                 'success': False, 
-                'error': 'No valid output from screenshot script',
+                'error': error_msg,
                 'available_results': len(results)
             })
             
-    except subprocess.TimeoutExpired:
-        return jsonify({'success': False, 'error': 'Screenshot capture timed out (120s)'}), 500
+    except (subprocess.TimeoutExpired, requests.Timeout):
+        return jsonify({'success': False, 'error': 'Screenshot capture timed out'}), 500
     except Exception as e:
         print(f"DEBUG: Exception during regenerate: {str(e)}")
         import traceback
@@ -2289,7 +2433,7 @@ def serve_stock_video(video_type, filename):
     if not video_dir.exists():
         return jsonify({'error': 'Stock video directory not found'}), 404
     
-    return send_from_directory(video_dir, filename)
+    return serve_media(video_dir, filename)
 
 
 @app.route('/api/custom-thumbnails')
@@ -2321,7 +2465,7 @@ def api_custom_thumbnails():
 def api_serve_thumbnail(filename):
     """Serve a thumbnail image from .tmp/thumbnails/."""
     thumbnails_dir = TMP_DIR / 'thumbnails'
-    return send_from_directory(thumbnails_dir, filename)
+    return serve_media(thumbnails_dir, filename)
 
 
 @app.route('/api/final-videos')
@@ -2357,40 +2501,26 @@ def api_final_videos():
 @app.route('/api/get-saved-videos', methods=['GET'])
 def api_get_saved_videos():
     """Get all saved videos with their thumbnails and current script context."""
-    # Use current_project from persistent_data (same as Saved tab)
-    current_project = persistent_data.get('current_project')
+    # Use the current project (same as Saved tab)
+    current_project = project_store.get_current_project()
     
-    # Get saved videos for current project (or all if no project)
-    all_saved = persistent_data.get('saved_videos', {})
-    unique_videos = {}  # Use dict to dedupe by ID
+    # Saved videos for current project, falling back to all projects
+    saved = project_store.list_saved_video_items(current_project) if current_project else []
+    if not saved:
+        saved = project_store.list_saved_video_items()
     
-    # If we have a current project, prioritize those videos
-    if current_project and current_project in all_saved:
-        for video in all_saved[current_project]:
-            video_id = video.get('video_id', '')
-            if video_id:
-                unique_videos[video_id] = {
-                    'id': video.get('id', video_id),
-                    'video_id': video_id,
-                    'title': video.get('title', 'Untitled'),
-                    'url': video.get('url', f'https://youtube.com/watch?v={video_id}'),
-                    'thumbnail_url': f"https://img.youtube.com/vi/{video_id}/mqdefault.jpg",
-                    'project_id': current_project
-                }
-    else:
-        # Fallback: get videos from all projects
-        for pid, videos in all_saved.items():
-            for video in videos:
-                video_id = video.get('video_id', '')
-                if video_id:
-                    unique_videos[video_id] = {
-                        'id': video.get('id', video_id),
-                        'video_id': video_id,
-                        'title': video.get('title', 'Untitled'),
-                        'url': video.get('url', f'https://youtube.com/watch?v={video_id}'),
-                        'thumbnail_url': f"https://img.youtube.com/vi/{video_id}/mqdefault.jpg",
-                        'project_id': pid
-                    }
+    unique_videos = {}  # Use dict to dedupe by ID
+    for video in saved:
+        video_id = video.get('video_id', '')
+        if video_id:
+            unique_videos[video_id] = {
+                'id': video.get('id', video_id),
+                'video_id': video_id,
+                'title': video.get('title', 'Untitled'),
+                'url': video.get('url', f'https://youtube.com/watch?v={video_id}'),
+                'thumbnail_url': f"https://img.youtube.com/vi/{video_id}/mqdefault.jpg",
+                'project_id': video['project_id']
+            }
     
     # Get current script context
     script_context = {}
@@ -2426,9 +2556,14 @@ def api_get_saved_videos():
 
 @app.route('/api/analyze-thumbnail', methods=['POST'])
 def api_analyze_thumbnail():
-    """Dissect a thumbnail into 5 structured components for editing."""
+    """
+    Dissect a thumbnail into 5 structured components for editing.
+    Repeat calls for the same thumbnail are served from the image cache;
+    pass refresh: true to re-download and re-analyze.
+    """
     data = request.json
     video_id = data.get('video_id')
+    refresh = bool(data.get('refresh'))
     
     if not video_id:
         return jsonify({'success': False, 'error': 'No video_id provided'}), 400
@@ -2438,19 +2573,20 @@ def api_analyze_thumbnail():
         return jsonify({'success': False, 'error': 'GEMINI_API_KEY not set'}), 500
     
     # Download thumbnail first
-    thumbnail_path = download_thumbnail(video_id)
+    thumbnail_path = download_thumbnail(video_id, refresh=refresh)
     if not thumbnail_path:
         return jsonify({'success': False, 'error': 'Failed to download thumbnail'}), 500
     
     # Dissect with Gemini Vision
-    result = dissect_thumbnail(thumbnail_path, api_key)
+    result = dissect_thumbnail(thumbnail_path, api_key, refresh=refresh)
     
     if result.get('success'):
         return jsonify({
             'success': True,
             'dissection': result.get('dissection'),
             'thumbnail_path': thumbnail_path,
-            'video_id': video_id
+            'video_id': video_id,
+            'cached': result.get('cached', False)
         })
     else:
         return jsonify({'success': False, 'error': result.get('error'), 'raw': result.get('raw', '')}), 500
@@ -2570,52 +2706,30 @@ def api_generate_thumbnail_image():
     prompt = "\n".join(prompt_parts)
     
     # Call Gemini with image input
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp-image-generation:generateContent?key={api_key}"
-    
-    payload = {
-        "contents": [{
-            "parts": [
-                {
-                    "inlineData": {
-                        "mimeType": "image/jpeg",
-                        "data": ref_image_base64
-                    }
-                },
-                {"text": prompt}
-            ]
-        }],
-        "generationConfig": {
-            "responseModalities": ["TEXT", "IMAGE"]
-        }
-    }
-    
     try:
-        response = requests.post(url, json=payload, timeout=120)
-        if response.status_code == 200:
-            result = response.json()
+        image_data = gemini_gateway.generate_image(
+            [{"inlineData": {"mimeType": "image/jpeg", "data": ref_image_base64}}, prompt],
+            model='gemini-2.0-flash-exp-image-generation',
+            api_key=api_key
+        )
+        if image_data:
+            filename = f"thumbnail_{int(time.time())}.png"
+            filepath = TMP_DIR / 'thumbnails' / filename
+            filepath.parent.mkdir(parents=True, exist_ok=True)
             
-            for candidate in result.get('candidates', []):
-                for part in candidate.get('content', {}).get('parts', []):
-                    if 'inlineData' in part:
-                        image_data = part['inlineData']['data']
-                        
-                        filename = f"thumbnail_{int(time.time())}.png"
-                        filepath = TMP_DIR / 'thumbnails' / filename
-                        filepath.parent.mkdir(parents=True, exist_ok=True)
-                        
-                        with open(filepath, 'wb') as f:
-                            f.write(base64.b64decode(image_data))
-                        
-                        return jsonify({
-                            'success': True,
-                            'image_url': f'/api/thumbnails/{filename}',
-                            'filepath': str(filepath),
-                            'prompt_used': prompt
-                        })
+            with open(filepath, 'wb') as f:
+                f.write(image_data)
             
-            return jsonify({'success': False, 'error': 'No image in response'})
-        else:
-            return jsonify({'success': False, 'error': f'API error: {response.status_code} - {response.text[:300]}'}), 500
+            return jsonify({
+                'success': True,
+                'image_url': f'/api/thumbnails/{filename}',
+                'filepath': str(filepath),
+                'prompt_used': prompt
+            })
+        
+        return jsonify({'success': False, 'error': 'No image in response'})
+    except gemini_gateway.GeminiError as e:
+        return jsonify({'success': False, 'error': f'API error: {e}'}), 500
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -2623,7 +2737,7 @@ def api_generate_thumbnail_image():
 @app.route('/api/thumbnails/<path:filename>')
 def serve_thumbnail(filename):
     """Serve generated thumbnail files."""
-    return send_from_directory(TMP_DIR / 'thumbnails', filename)
+    return serve_media(TMP_DIR / 'thumbnails', filename)
 
 @app.route('/api/video-info/<video_id>')
 def api_video_info(video_id):
@@ -2650,15 +2764,14 @@ def api_finalize():
         return jsonify({'success': False, 'error': 'type and value required'}), 400
     
     # Store in app_state
-    if 'finalized' not in app_state:
-        app_state['finalized'] = {}
-    
-    app_state['finalized'][item_type] = value
+    finalized = app_state.get('finalized', {})
+    finalized[item_type] = value
+    app_state['finalized'] = finalized
     
     return jsonify({
         'success': True,
         'message': f'{item_type} finalized',
-        'finalized': app_state['finalized']
+        'finalized': finalized
     })
 
 
@@ -2684,8 +2797,6 @@ def api_rewrite_description():
     if not api_key:
         return jsonify({'success': False, 'error': 'GEMINI_API_KEY not set'}), 500
     
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={api_key}"
-    
     prompt = f"""Rewrite this YouTube video description to be more engaging and optimized for search.
 Keep the same general information but make it more compelling.
 Add relevant hashtags at the end.
@@ -2697,16 +2808,10 @@ Original description:
 Write only the new description, no explanations."""
 
     try:
-        response = requests.post(url, json={
-            "contents": [{"parts": [{"text": prompt}]}]
-        }, timeout=60)
-        
-        if response.status_code == 200:
-            result = response.json()
-            rewritten = result['candidates'][0]['content']['parts'][0]['text']
-            return jsonify({'success': True, 'rewritten': rewritten})
-        else:
-            return jsonify({'success': False, 'error': 'API error'}), 500
+        rewritten = gemini_gateway.generate_text(prompt, model='gemini-2.0-flash', api_key=api_key, timeout=60)
+        return jsonify({'success': True, 'rewritten': rewritten})
+    except gemini_gateway.GeminiError:
+        return jsonify({'success': False, 'error': 'API error'}), 500
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -2899,11 +3004,18 @@ def api_generate_titles():
 
 @app.route('/api/keyword-research', methods=['POST'])
 def api_keyword_research():
-    """Research keyword difficulty and find opportunities."""
+    """
+    Research keyword difficulty and find opportunities.
+    
+    With "stream": true the response is NDJSON: one line per research event
+    (suggestions, seed, keyword) as it completes, then a final "done" line
+    carrying the same payload as the non-streaming response.
+    """
     data = request.json
     seed_keyword = data.get('keyword', '').strip()
     include_suggestions = data.get('include_suggestions', True)
     region = data.get('region', 'US')  # Default to US market
+    stream = data.get('stream', False)
     
     if not seed_keyword:
         return jsonify({'success': False, 'error': 'Keyword is required'}), 400
@@ -2912,6 +3024,32 @@ def api_keyword_research():
     if not youtube_api_key:
         return jsonify({'success': False, 'error': 'YOUTUBE_API_KEY not set in .env'}), 500
     
+    if stream:
+        def generate():
+            results = {
+                'seed_keyword': seed_keyword,
+                'region': region,
+                'seed_result': None,
+                'suggestions': [],
+                'quota_note': 'YouTube API quota: ~100 units per uncached keyword search'
+            }
+            try:
+                for event in iter_keyword_research(seed_keyword, include_suggestions, region):
+                    if event['event'] == 'seed':
+                        results['seed_result'] = event['result']
+                    elif event['event'] == 'keyword':
+                        results['suggestions'].append(event['result'])
+                    elif event['event'] == 'quota':
+                        results['quota_used'] = event['quota_used']
+                    yield json.dumps(event) + '\n'
+                
+                results['suggestions'].sort(key=lambda x: x.get('opportunity_score', 0), reverse=True)
+                yield json.dumps({'event': 'done', 'success': True, **results}) + '\n'
+            except Exception as e:
+                yield json.dumps({'event': 'done', 'success': False, 'error': str(e)}) + '\n'
+        
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    
     try:
         results = research_keywords(seed_keyword, include_suggestions=include_suggestions, region=region)
         return jsonify({
@@ -2925,15 +3063,7 @@ def api_keyword_research():
 @app.route('/api/reset', methods=['POST'])
 def api_reset():
     """Reset application state."""
-    global app_state
-    app_state = {
-        'videos': [],
-        'selected_videos': [],
-        'transcript': None,
-        'articles': [],
-        'script': None,
-        'screenshots': []
-    }
+    app_state.clear()
     return jsonify({'success': True, 'message': 'State reset'})
 
 # ============== PROJECT MANAGEMENT ==============
@@ -2943,14 +3073,13 @@ def get_projects():
     """Get all projects."""
     return jsonify({
         'success': True,
-        'projects': persistent_data['projects'],
-        'current_project': persistent_data['current_project']
+        'projects': project_store.list_projects(),
+        'current_project': project_store.get_current_project()
     })
 
 @app.route('/api/projects', methods=['POST'])
 def create_project():
     """Create a new project."""
-    global persistent_data
     data = request.json
     niche = data.get('niche', '').strip()
     
@@ -2966,25 +3095,19 @@ def create_project():
         'created_at': str(Path(__file__).stat().st_mtime)  # Simple timestamp
     }
     
-    persistent_data['projects'].append(project)
-    persistent_data['current_project'] = project_id
-    persistent_data['saved_videos'][project_id] = []
-    save_persistent_data(persistent_data)
+    project_store.create_project(project)
     
     return jsonify({'success': True, 'project': project})
 
 @app.route('/api/projects/<project_id>/select', methods=['POST'])
 def select_project(project_id):
     """Select a project as current."""
-    global persistent_data
-    
     # Check project exists
-    project = next((p for p in persistent_data['projects'] if p['id'] == project_id), None)
+    project = project_store.get_project(project_id)
     if not project:
         return jsonify({'success': False, 'message': 'Project not found'}), 404
     
-    persistent_data['current_project'] = project_id
-    save_persistent_data(persistent_data)
+    project_store.set_current_project(project_id)
     
     return jsonify({'success': True, 'project': project})
 
@@ -2992,31 +3115,27 @@ def select_project(project_id):
 
 @app.route('/api/saved-videos', methods=['GET'])
 def get_saved_videos():
-    """Get saved videos for current project, grouped by search query."""
-    project_id = persistent_data.get('current_project')
+    """
+    Get saved videos for current project, grouped by search query.
+    Optional query params: group, limit, offset (pages through the project's videos).
+    """
+    project_id = project_store.get_current_project()
     if not project_id:
         return jsonify({'success': False, 'message': 'No project selected'}), 400
     
-    saved = persistent_data['saved_videos'].get(project_id, {})
-    
-    # Handle backward compatibility: if it's a list (old format), migrate to grouped format
-    if isinstance(saved, list):
-        # Migrate old flat list to "Uncategorized" group
-        if saved:
-            persistent_data['saved_videos'][project_id] = {"Uncategorized": saved}
-            save_persistent_data(persistent_data)
-            saved = persistent_data['saved_videos'][project_id]
-        else:
-            saved = {}
+    saved = project_store.list_saved_videos(
+        project_id,
+        group_name=request.args.get('group'),
+        limit=request.args.get('limit', type=int),
+        offset=request.args.get('offset', 0, type=int)
+    )
     
     return jsonify({'success': True, 'groups': saved})
 
 @app.route('/api/saved-videos', methods=['POST'])
 def save_video():
     """Save a video to current project, grouped by search query."""
-    global persistent_data
-    
-    project_id = persistent_data.get('current_project')
+    project_id = project_store.get_current_project()
     if not project_id:
         return jsonify({'success': False, 'message': 'No project selected. Create a project first.'}), 400
     
@@ -3027,60 +3146,21 @@ def save_video():
     if not video:
         return jsonify({'success': False, 'message': 'Video data required'}), 400
     
-    # Initialize project if needed
-    if project_id not in persistent_data['saved_videos']:
-        persistent_data['saved_videos'][project_id] = {}
-    
-    # Handle backward compatibility: migrate old list format
-    saved = persistent_data['saved_videos'][project_id]
-    if isinstance(saved, list):
-        persistent_data['saved_videos'][project_id] = {"Uncategorized": saved} if saved else {}
-        saved = persistent_data['saved_videos'][project_id]
-    
-    # Initialize query group if needed
-    if search_query not in saved:
-        saved[search_query] = []
-    
-    # Check if video already exists in ANY group
-    for group_name, group_videos in saved.items():
-        if any(v['video_id'] == video['video_id'] for v in group_videos):
-            return jsonify({'success': False, 'message': f'Video already saved in "{group_name}"'}), 400
-    
-    # Add video to the query group
-    saved[search_query].append(video)
-    save_persistent_data(persistent_data)
+    # A video can only be saved once per project, in any group
+    existing_group = project_store.save_video(project_id, video, search_query)
+    if existing_group:
+        return jsonify({'success': False, 'message': f'Video already saved in "{existing_group}"'}), 400
     
     return jsonify({'success': True, 'message': f'Video saved to "{search_query}"', 'group': search_query})
 
 @app.route('/api/saved-videos/<video_id>', methods=['DELETE'])
 def remove_saved_video(video_id):
-    """Remove a video from saved list, searching across all groups."""
-    global persistent_data
-    
-    project_id = persistent_data.get('current_project')
+    """Remove a video from saved list (groups disappear with their last video)."""
+    project_id = project_store.get_current_project()
     if not project_id:
         return jsonify({'success': False, 'message': 'No project selected'}), 400
     
-    saved = persistent_data['saved_videos'].get(project_id, {})
-    
-    # Handle backward compatibility
-    if isinstance(saved, list):
-        persistent_data['saved_videos'][project_id] = {"Uncategorized": saved} if saved else {}
-        saved = persistent_data['saved_videos'][project_id]
-    
-    # Search and remove from all groups
-    removed = False
-    for group_name in list(saved.keys()):
-        original_count = len(saved[group_name])
-        saved[group_name] = [v for v in saved[group_name] if v['video_id'] != video_id]
-        if len(saved[group_name]) < original_count:
-            removed = True
-        # Clean up empty groups
-        if not saved[group_name]:
-            del saved[group_name]
-    
-    if removed:
-        save_persistent_data(persistent_data)
+    if project_store.remove_saved_video(project_id, video_id):
         return jsonify({'success': True, 'message': 'Video removed'})
     else:
         return jsonify({'success': False, 'message': 'Video not found'}), 404
@@ -3095,12 +3175,12 @@ def api_select_videos():
     
     # Find videos from either discovery results or saved videos
     selected = []
-    all_videos = app_state['videos'] + persistent_data['saved_videos'].get(
-        persistent_data.get('current_project', ''), []
-    )
+    current_project = project_store.get_current_project()
     
     for vid_id in video_ids:
-        video = next((v for v in all_videos if v['video_id'] == vid_id), None)
+        video = next((v for v in app_state['videos'] if v['video_id'] == vid_id), None)
+        if not video and current_project:
+            video = project_store.get_saved_video(current_project, vid_id)
         if video:
             selected.append(video)
     
@@ -3110,41 +3190,74 @@ def api_select_videos():
 @app.route('/api/generate-thumbnail-locked', methods=['POST'])
 def api_generate_thumbnail_locked():
     """
-    Generate a thumbnail using the LOCKED MASTER TEMPLATE (V5).
+    Generate thumbnails using the LOCKED MASTER TEMPLATE (V5).
     Crucial: Passes execution/assets/master_template.jpg as a Strict Visual Reference.
+    
+    "count" candidates (default THUMBNAIL_CANDIDATES, max 4) are generated in
+    parallel. With "stream": true the response is NDJSON: one "candidate" line
+    per image as it finishes, then a final "done" line carrying the same
+    payload as the non-streaming response.
     """
+    from execution.generate_thumbnail import generate_thumbnail_candidates, THUMBNAIL_CANDIDATES
+    
+    data = request.json
+    topic = data.get('topic')
+    if not topic:
+        return jsonify({'success': False, 'message': 'Topic is required'}), 400
     try:
-        from execution.generate_thumbnail import generate_thumbnail_with_gemini
-        
-        data = request.json
-        topic = data.get('topic')
-        if not topic:
-            return jsonify({'success': False, 'message': 'Topic is required'}), 400
-            
-        print(f"🔒 Generating LOCKED Template Thumbnail for: {topic}")
-        
-        # Hardcoded Reference Path for consistency
-        master_template_path = os.path.join("execution", "assets", "master_template.jpg")
+        count = max(1, min(int(data.get('count') or THUMBNAIL_CANDIDATES), 4))
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'message': 'count must be a number'}), 400
+    stream = data.get('stream', False)
         
-        if not os.path.exists(master_template_path):
-             return jsonify({'success': False, 'message': f'Master Template not found at {master_template_path}'}), 500
+    print(f"🔒 Generating {count} LOCKED Template Thumbnails for: {topic}")
+    
+    # Hardcoded Reference Path for consistency
+    master_template_path = os.path.join("execution", "assets", "master_template.jpg")
+    
+    if not os.path.exists(master_template_path):
+         return jsonify({'success': False, 'message': f'Master Template not found at {master_template_path}'}), 500
 
-        output_path = generate_thumbnail_with_gemini(
+    def candidate_events():
+        for candidate in generate_thumbnail_candidates(
             topic=topic,
+            count=count,
             style_reference=master_template_path  # <--- THIS IS THE KEY (Passed as Visual Ref)
-        )
+        ):
+            if candidate['success']:
+                # Convert abs path to relative for frontend
+                rel_path = os.path.relpath(candidate['path'], start=BASE_DIR)
+                candidate = {'index': candidate['index'], 'success': True, 'image_url': f"/{rel_path}"}
+            yield {'event': 'candidate', **candidate}
+
+    def summary(candidates):
+        images = [c['image_url'] for c in candidates if c['success']]
+        if not images:
+            return {'success': False, 'message': 'Generation failed inside Gemini wrapper'}
+        return {
+            'success': True,
+            'image_url': images[0],
+            'images': images,
+            'message': f'Generated {len(images)}/{count} with Locked Master Template'
+        }
+
+    if stream:
+        def generate():
+            candidates = []
+            try:
+                for event in candidate_events():
+                    candidates.append(event)
+                    yield json.dumps(event) + '\n'
+                yield json.dumps({'event': 'done', **summary(candidates)}) + '\n'
+            except Exception as e:
+                print(f"❌ Locked Gen Error: {e}")
+                yield json.dumps({'event': 'done', 'success': False, 'message': str(e)}) + '\n'
         
-        if output_path:
-             # Convert abs path to relative for frontend
-            rel_path = os.path.relpath(output_path, start=BASE_DIR)
-            return jsonify({
-                'success': True,
-                'image_url': f"/{rel_path}",
-                'message': 'Generated with Locked Master Template'
-            })
-        else:
-            return jsonify({'success': False, 'message': 'Generation failed inside Gemini wrapper'}), 500
-            
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+    try:
+        result = summary(list(candidate_events()))
+        return jsonify(result), (200 if result['success'] else 500)
     except Exception as e:
         print(f"❌ Locked Gen Error: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
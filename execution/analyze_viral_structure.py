@@ -15,20 +15,22 @@ Output: A beat map identifying:
 """
 
 import os
+import sys
 import json
+from pathlib import Path
 from typing import Dict, Optional
 from dotenv import load_dotenv
-import google.generativeai as genai
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from execution import gemini_gateway, llm_cache
 
 load_dotenv()
 
 # Configure Gemini
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY') or os.getenv('GOOGLE_API_KEY')
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
 
 
-def analyze_viral_structure(transcript: str, title: str = "", word_count: int = None) -> Dict:
+def analyze_viral_structure(transcript: str, title: str = "", word_count: int = None, refresh: bool = False) -> Dict:
     """
     Analyze viral video transcript to extract pacing structure.
     
@@ -36,6 +38,7 @@ def analyze_viral_structure(transcript: str, title: str = "", word_count: int =
         transcript: Full transcript text
         title: Video title
         word_count: Approximate word count (for timing estimation)
+        refresh: Ignore the cached analysis of this transcript
     
     Returns:
         Dict with beat map:
@@ -119,9 +122,9 @@ Output as valid JSON:
 }}"""
 
     try:
-        model = genai.GenerativeModel('gemini-2.0-flash')
-        response = model.generate_content(prompt)
-        response_text = response.text.strip()
+        response_text = gemini_gateway.generate_text(
+            prompt, model='gemini-2.0-flash', cache_ttl=llm_cache.ANALYSIS_TTL, refresh=refresh
+        ).strip()
         
         # Clean JSON markers
         if response_text.startswith("```"):
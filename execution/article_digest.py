@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Article Digest - Compact fact sheets for scraped articles.
+
+Script prompts used to embed up to 30 full article bodies in every outline
+and section call. Each article is now summarized once into a short fact
+sheet (numbers, dates, names, claims) and prompts carry the digests of the
+sources a section was assigned instead of the raw text.
+
+Digests are stored through gemini_gateway's response cache (llm_cache,
+DIGEST_TTL). The prompt embeds the article text, so re-running research or
+regenerating a script reuses them, and a page whose content changed gets a
+fresh digest. Changing the prompt misses naturally.
+
+Short content (search snippets) is used as-is; if the digest fails for any
+reason the article falls back to its truncated text and nothing is cached.
+"""
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from execution import gemini_gateway
+
+DIGEST_MODEL = 'gemini-2.0-flash'
+DIGEST_WORKERS = 6
+DIGEST_TTL = 30 * 24 * 3600
+# Below this the text is already snippet-sized
+MIN_DIGEST_CHARS = 800
+MAX_INPUT_CHARS = 15000
+FALLBACK_CHARS = 2000
+
+
+def article_text(article: Dict) -> str:
+    return (article.get('content') or article.get('snippet') or '').strip()
+
+
+def digest_article(article: Dict) -> str:
+    """Fact sheet for one article (cached). Short texts are returned unchanged."""
+    content = article_text(article)
+    if len(content) < MIN_DIGEST_CHARS:
+        return content
+
+    url = article.get('url') or article.get('link') or article.get('title', '')
+    prompt = f"""Summarize this news article into a compact FACT SHEET for a scriptwriter.
+
+TITLE: {article.get('title', 'Unknown')}
+DATE: {article.get('date', 'Unknown')}
+
+ARTICLE:
+{content[:MAX_INPUT_CHARS]}
+
+RULES:
+- First line: one-sentence summary of what happened
+- Then 5-12 bullet facts, one line each
+- Keep every specific number, percentage, dollar amount, date, name and direct claim
+- Attribute disputed claims ("X says...", "reportedly")
+- No opinions, no filler, no markdown headers
+- Skip navigation text, ads and unrelated content"""
+
+    try:
+        digest = gemini_gateway.generate_text(
+            prompt, model=DIGEST_MODEL, temperature=0.1, cache_ttl=DIGEST_TTL
+        ).strip()
+    except Exception as e:
+        # A failed digest must never abort research or script generation
+        print(f"  ⚠️ Digest failed for {url[:60]}: {e}")
+        digest = ''
+    if not digest:
+        return content[:FALLBACK_CHARS] + ('...' if len(content) > FALLBACK_CHARS else '')
+    return digest
+
+
+def digest_articles(articles: List[Dict], workers: int = DIGEST_WORKERS) -> List[Dict]:
+    """
+    Add a 'digest' to every article (in place, in parallel). Returns the list.
+    Articles that already carry a digest are skipped.
+    """
+    pending = [a for a in articles if not a.get('digest')]
+    if not pending:
+        return articles
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for article, digest in zip(pending, pool.map(digest_article, pending)):
+            article['digest'] = digest
+    raw = sum(len(article_text(a)) for a in pending)
+    compact = sum(len(a['digest']) for a in pending)
+    print(f"📰 Digested {len(pending)} articles: {raw:,} → {compact:,} chars")
+    return articles
+
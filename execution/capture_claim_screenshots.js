@@ -15,7 +15,10 @@ const StealthPlugin = require('puppeteer-extra-plugin-stealth');
 const fs = require('fs');
 const path = require('path');
 
-puppeteer.use(StealthPlugin());
+// Guarded so the screenshot service can load both capture modules
+if (!puppeteer.pluginNames.includes('stealth')) {
+    puppeteer.use(StealthPlugin());
+}
 
 // Helper: timeout wrapper for any async operation
 function withTimeout(promise, ms, fallback = null) {
@@ -291,7 +294,7 @@ async function humanLikeDelay() {
     await new Promise(r => setTimeout(r, delay));
 }
 
-async function captureWithValidation(browser, urlData, outputDir) {
+async function captureWithValidation(browser, urlData, outputDir, videoName = global.videoName) {
     // Filter out blacklisted URLs first
     const validUrls = (urlData.urls || []).filter(url => !isBlacklistedDomain(url));
 
@@ -362,7 +365,7 @@ async function captureWithValidation(browser, urlData, outputDir) {
 
                 // Use video name + chunk number for organized filenames
                 const chunkNum = String(urlData.chunk_index).padStart(2, '0');
-                const filename = `${global.videoName || 'video'}_chunk_${chunkNum}.png`;
+                const filename = `${videoName || 'video'}_chunk_${chunkNum}.png`;
                 const filepath = path.join(outputDir, filename);
 
                 await page.screenshot({ path: filepath, fullPage: false });
@@ -527,4 +530,8 @@ async function main() {
     console.log('__JSON_END__');
 }
 
-main().catch(console.error);
+module.exports = { captureWithValidation, isBlacklistedDomain, withTimeout };
+
+if (require.main === module) {
+    main().catch(console.error);
+}
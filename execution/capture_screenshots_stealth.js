@@ -4,24 +4,13 @@ const puppeteer = require('puppeteer-extra');
 const StealthPlugin = require('puppeteer-extra-plugin-stealth');
 
 // Enable stealth plugin
-puppeteer.use(StealthPlugin());
-
-// Command line arguments
-const args = process.argv.slice(2);
-const urlsIndex = args.indexOf('--urls');
-if (urlsIndex === -1 || !args[urlsIndex + 1]) {
-    console.error('Usage: node capture_screenshots_stealth.js --urls <path_to_urls_json>');
-    process.exit(1);
+// Guarded so the screenshot service can load both capture modules
+if (!puppeteer.pluginNames.includes('stealth')) {
+    puppeteer.use(StealthPlugin());
 }
 
-const urlsFile = args[urlsIndex + 1];
 const outputDir = path.join(__dirname, '../.tmp/screenshots');
 
-// Ensure output directory exists
-if (!fs.existsSync(outputDir)) {
-    fs.mkdirSync(outputDir, { recursive: true });
-}
-
 // Helper: Wait function
 const wait = (ms) => new Promise(resolve => setTimeout(resolve, ms));
 
@@ -56,8 +45,80 @@ async function humanScroll(page) {
     });
 }
 
-// Main capture function
+// Capture one URL in a new tab of an already running browser
+async function captureUrl(browser, item, outputDir) {
+    const url = item.url;
+    console.log(`Processing: ${url}`);
+
+    const page = await browser.newPage();
+
+    // Set viewport
+    await page.setViewport({ width: 1920, height: 1080 });
+
+    // Set random user agent just in case (stealth plugin does this primarily)
+    // await page.setUserAgent('Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36');
+
+    try {
+        // Navigate with longer timeout and 'networkidle2' to wait for loads
+        await page.goto(url, { waitUntil: 'networkidle2', timeout: 60000 });
+
+        // Wait a random bit like a human
+        await wait(random(1000, 3000));
+
+        // Simulate mouse movement
+        await page.mouse.move(random(100, 1000), random(100, 800));
+        await wait(random(500, 1000));
+
+        // Human-like scroll to trigger lazy loading images
+        console.log('  Scrolling...');
+        await humanScroll(page);
+
+        // Wait for any final animations/loading
+        await wait(random(1000, 2000));
+
+        // Screenshot filename
+        const filename = `${sanitizeFilename(url)}_${Date.now().toString().slice(-6)}.png`;
+        const filepath = path.join(outputDir, filename);
+        const relativePath = `.tmp/screenshots/${filename}`;
+
+        // Capture viewport (1080p) - Better for video editing than fullPage
+        await page.screenshot({ path: filepath, fullPage: false });
+
+        console.log(`  ✅ Captured: ${filename}`);
+
+        return {
+            url: url,
+            success: true,
+            screenshot_path: relativePath
+        };
+
+    } catch (error) {
+        console.error(`  ❌ Failed to capture ${url}:`, error.message);
+        return {
+            url: url,
+            success: false,
+            error: error.message
+        };
+    } finally {
+        await page.close();
+    }
+}
+
+// Main capture function (one-shot CLI; screenshot_service.js reuses captureUrl)
 async function captureScreenshots() {
+    const args = process.argv.slice(2);
+    const urlsIndex = args.indexOf('--urls');
+    if (urlsIndex === -1 || !args[urlsIndex + 1]) {
+        console.error('Usage: node capture_screenshots_stealth.js --urls <path_to_urls_json>');
+        process.exit(1);
+    }
+    const urlsFile = args[urlsIndex + 1];
+
+    // Ensure output directory exists
+    if (!fs.existsSync(outputDir)) {
+        fs.mkdirSync(outputDir, { recursive: true });
+    }
+
     let urlsToCapture = [];
     try {
         const fileContent = fs.readFileSync(urlsFile, 'utf8');
@@ -82,61 +143,7 @@ async function captureScreenshots() {
     const results = [];
 
     for (const item of urlsToCapture) {
-        const url = item.url;
-        console.log(`Processing: ${url}`);
-
-        const page = await browser.newPage();
-
-        // Set viewport
-        await page.setViewport({ width: 1920, height: 1080 });
-
-        // Set random user agent just in case (stealth plugin does this primarily)
-        // await page.setUserAgent('Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36');
-
-        try {
-            // Navigate with longer timeout and 'networkidle2' to wait for loads
-            await page.goto(url, { waitUntil: 'networkidle2', timeout: 60000 });
-
-            // Wait a random bit like a human
-            await wait(random(1000, 3000));
-
-            // Simulate mouse movement
-            await page.mouse.move(random(100, 1000), random(100, 800));
-            await wait(random(500, 1000));
-
-            // Human-like scroll to trigger lazy loading images
-            console.log('  Scrolling...');
-            await humanScroll(page);
-
-            // Wait for any final animations/loading
-            await wait(random(1000, 2000));
-
-            // Screenshot filename
-            const filename = `${sanitizeFilename(url)}_${Date.now().toString().slice(-6)}.png`;
-            const filepath = path.join(outputDir, filename);
-            const relativePath = `.tmp/screenshots/${filename}`;
-
-            // Capture viewport (1080p) - Better for video editing than fullPage
-            await page.screenshot({ path: filepath, fullPage: false });
-
-            console.log(`  ✅ Captured: ${filename}`);
-
-            results.push({
-                url: url,
-                success: true,
-                screenshot_path: relativePath
-            });
-
-        } catch (error) {
-            console.error(`  ❌ Failed to capture ${url}:`, error.message);
-            results.push({
-                url: url,
-                success: false,
-                error: error.message
-            });
-        } finally {
-            await page.close();
-        }
+        results.push(await captureUrl(browser, item, outputDir));
 
         // Random pause between processed URLs
         await wait(random(2000, 5000));
@@ -150,4 +157,8 @@ async function captureScreenshots() {
     console.log('__JSON_END__');
 }
 
-captureScreenshots();
+module.exports = { captureUrl, outputDir };
+
+if (require.main === module) {
+    captureScreenshots();
+}
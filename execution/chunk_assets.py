@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Chunk Asset Registry - Index of the Video Editor's per-chunk files.
+
+Maps chunk index -> current audio file (per-section TTS is kept in a
+separate map, since its number is not a chunk index) and remembers the
+latest AI image batch, so /api/video-chunks and the video build resolve assets with dict
+lookups instead of globbing .tmp/audio and .tmp/ai_images on every request.
+
+The write paths (chunk audio generation/regeneration, batch TTS, image
+batches) call register_*; the index is persisted to a JSON manifest next to
+the audio files so it survives restarts and is shared with the worker
+process that runs batch TTS. Updates hold an exclusive lock on
+chunk_assets.lock (fcntl, shared with the worker) and re-read the manifest
+under it, so concurrent writers don't drop each other's entries. If the
+manifest is missing it is rebuilt from one directory listing.
+
+Files are keyed by position, so an edit that adds or removes chunks would
+shift every later chunk onto the wrong assets. remap_chunks() matches the
+old and new chunk lists by content ID (a hash of the chunk text) and
+relink_chunks() moves audio, uploads and batch images to the new indexes;
+only chunks whose text changed are left without assets.
+"""
+import os
+import re
+import json
+import time
+import difflib
+import hashlib
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process locking only
+    fcntl = None
+
+TMP_DIR = Path(__file__).parent.parent / '.tmp'
+AUDIO_DIR = TMP_DIR / 'audio'
+AI_IMAGES_DIR = TMP_DIR / 'ai_images'
+MANIFEST_PATH = AUDIO_DIR / 'chunk_assets.json'
+LOCK_PATH = AUDIO_DIR / 'chunk_assets.lock'
+# Assets of chunks an edit removed are moved here (per directory), not deleted
+SUPERSEDED_DIR = 'superseded'
+
+# Chunk audio filenames the editor writes, in the order the old glob lookup preferred them:
+# chunk_X.wav, chunk_X.mp3, chunk_X_<ts>.wav, chunk_X_<ts>.mp3
+AUDIO_PATTERNS = [
+    re.compile(r'^chunk_(\d+)\.wav$'),
+    re.compile(r'^chunk_(\d+)\.mp3$'),
+    re.compile(r'^chunk_(\d+)_\d+\.wav$'),
+    re.compile(r'^chunk_(\d+)_\d+\.mp3$'),
+]
+# Per-section TTS from /api/generate-audio. X is a section number, not a chunk
+# index, so these are kept apart and never used to build the video.
+SECTION_AUDIO_PATTERNS = [
+    re.compile(r'^section_(\d+)_\d+\.wav$'),
+]
+
+_lock = threading.Lock()
+_index: Dict = {'audio': {}, 'sections': {}, 'uploads': {}, 'latest_batch': None, 'batch_images': []}
+_manifest_mtime: Optional[float] = None
+
+
+def _scan_audio(patterns: List[re.Pattern] = AUDIO_PATTERNS) -> Dict[str, str]:
+    """Build the index -> audio map from a single listing of AUDIO_DIR."""
+    best = {}  # chunk -> (pattern rank, -mtime, path)
+    if not AUDIO_DIR.exists():
+        return {}
+    for entry in os.scandir(AUDIO_DIR):
+        for rank, pattern in enumerate(patterns):
+            match = pattern.match(entry.name)
+            if match:
+                key = (rank, -entry.stat().st_mtime, entry.path)
+                # chunk_0000.mp3 (pipelines) and chunk_0.wav are the same chunk
+                chunk = str(int(match.group(1)))
+                if chunk not in best or key < best[chunk]:
+                    best[chunk] = key
+                break
+    return {chunk: key[2] for chunk, key in best.items()}
+
+
+def _scan_latest_batch() -> Dict:
+    """Find the newest batch_* directory and its images."""
+    if not AI_IMAGES_DIR.exists():
+        return {'latest_batch': None, 'batch_images': []}
+    batches = [d for d in os.scandir(AI_IMAGES_DIR) if d.is_dir() and d.name.startswith('batch_')]
+    if not batches:
+        return {'latest_batch': None, 'batch_images': []}
+    latest = max(batches, key=lambda d: d.stat().st_mtime)
+    images = sorted(f.name for f in os.scandir(latest.path) if f.name.endswith('.png'))
+    return {'latest_batch': latest.name, 'batch_images': images}
+
+
+def _scan() -> Dict:
+    """Full index from disk. Uploads aren't recoverable by name and start empty."""
+    return {'audio': _scan_audio(), 'sections': _scan_audio(SECTION_AUDIO_PATTERNS),
+            'uploads': {}, **_scan_latest_batch()}
+
+
+def _save():
+    """Write the manifest atomically and remember its mtime."""
+    global _manifest_mtime
+    AUDIO_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = MANIFEST_PATH.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(_index, f)
+    os.replace(tmp_path, MANIFEST_PATH)
+    _manifest_mtime = MANIFEST_PATH.stat().st_mtime
+
+
+def _split_sections():
+    """Move section audio out of the chunk map (manifests written before they were kept apart)."""
+    sections = _index.setdefault('sections', {})
+    for key, path in list(_index['audio'].items()):
+        if any(p.match(Path(path).name) for p in SECTION_AUDIO_PATTERNS):
+            sections.setdefault(key, path)
+            del _index['audio'][key]
+
+
+def _load(force: bool = False):
+    """Refresh the in-memory index if another process updated the manifest (always with force)."""
+    global _index, _manifest_mtime
+    try:
+        mtime = MANIFEST_PATH.stat().st_mtime
+    except FileNotFoundError:
+        # First use, or .tmp was wiped: rebuild from disk once
+        _index = _scan()
+        _save()
+        return
+
+    if force or mtime != _manifest_mtime:
+        try:
+            with open(MANIFEST_PATH, 'r') as f:
+                _index = json.load(f)
+            _manifest_mtime = mtime
+            _split_sections()
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Chunk asset manifest unreadable, rebuilding: {e}")
+            _index = _scan()
+            _save()
+
+
+@contextmanager
+def _updating():
+    """
+    Hold the manifest for a read-modify-write: the in-process lock plus an
+    exclusive lock file shared with other processes, with a fresh read of
+    the manifest (mtime alone can miss a same-tick write).
+    """
+    with _lock:
+        AUDIO_DIR.mkdir(parents=True, exist_ok=True)
+        with open(LOCK_PATH, 'a') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                _load(force=True)
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def register_audio(chunk_index: int, path: str):
+    """Record the current audio file for a chunk."""
+    with _updating():
+        _index['audio'][str(chunk_index)] = str(path)
+        _save()
+
+
+def register_section_audio(section_index: int, path: str):
+    """Record per-section audio (a fallback the editor can play, never built into the video)."""
+    with _updating():
+        _index.setdefault('sections', {})[str(section_index)] = str(path)
+        _save()
+
+
+def get_audio(chunk_index: int) -> Optional[str]:
+    """Current audio file for a chunk, or None (also if the file was deleted)."""
+    with _lock:
+        _load()
+        path = _index['audio'].get(str(chunk_index))
+    return path if path and os.path.exists(path) else None
+
+
+def get_audio_map(include_sections: bool = False) -> Dict[int, str]:
+    """
+    All chunk -> audio paths whose files still exist (one manifest check for
+    the whole request).
+
+    include_sections fills chunks without chunk audio from section audio of
+    the same number, as the editor's chunk list always has; the video build
+    must not use it.
+    """
+    with _lock:
+        _load()
+        entries = dict(_index['audio'])
+        sections = dict(_index.get('sections', {})) if include_sections else {}
+    merged = {k: v for k, v in sections.items() if os.path.exists(v)}
+    merged.update((k, v) for k, v in entries.items() if os.path.exists(v))
+    return {int(k): v for k, v in merged.items()}
+
+
+def clear_audio():
+    """Forget all audio entries (after the audio directory is emptied)."""
+    with _updating():
+        _index['audio'] = {}
+        _index['sections'] = {}
+        _save()
+
+
+def register_upload(chunk_index: int, kind: str, path: str):
+    """Record a user-uploaded asset for a chunk ('screenshot' or 'video')."""
+    with _updating():
+        _index.setdefault('uploads', {}).setdefault(str(chunk_index), {})[kind] = str(path)
+        _save()
+
+
+def get_uploads() -> Dict[int, Dict[str, str]]:
+    """All chunk -> {'screenshot'?, 'video'?} uploads."""
+    with _lock:
+        _load()
+        return {int(k): dict(v) for k, v in _index.get('uploads', {}).items()}
+
+
+def register_batch(batch_dir: str, image_paths: List[str]):
+    """Record a newly generated AI image batch as the latest one (new chunks, so uploads reset)."""
+    with _updating():
+        _index['latest_batch'] = Path(batch_dir).name
+        _index['batch_images'] = sorted(Path(p).name for p in image_paths)
+        _index['uploads'] = {}
+        _save()
+
+
+def get_latest_batch() -> tuple:
+    """
+    Latest AI image batch.
+
+    Returns:
+        (batch directory Path or None, sorted list of image Paths)
+    """
+    with _lock:
+        _load()
+        name = _index.get('latest_batch')
+        images = list(_index.get('batch_images', []))
+    if not name:
+        return None, []
+    batch_dir = AI_IMAGES_DIR / name
+    return batch_dir, [batch_dir / image for image in images]
+
+
+def rebuild():
+    """Re-scan the audio and image directories and rewrite the manifest."""
+    global _index
+    with _updating():
+        _index = _scan()
+        _save()
+
+
+# ============== CHUNK IDS / RELINKING ==============
+
+def chunk_id(text: str) -> str:
+    """Content ID of a chunk: hash of its whitespace-normalized text."""
+    return hashlib.sha1(' '.join(text.split()).encode('utf-8')).hexdigest()[:12]
+
+
+def chunk_ids(texts: List[str]) -> List[str]:
+    """chunk_id for each text; repeats of a text get a #2, #3... suffix so IDs are unique."""
+    seen = {}
+    ids = []
+    for text in texts:
+        base = chunk_id(text)
+        seen[base] = seen.get(base, 0) + 1
+        ids.append(base if seen[base] == 1 else f"{base}#{seen[base]}")
+    return ids
+
+
+def remap_chunks(old_texts: List[str], new_texts: List[str]) -> Dict[int, int]:
+    """
+    Match a new chunk list against the previous one by content.
+
+    Unchanged runs are found by diffing the ID sequences; chunks that moved
+    across an edit are then matched by ID.
+
+    Returns:
+        {new index: old index} for every new chunk whose text is unchanged
+    """
+    old_ids, new_ids = chunk_ids(old_texts), chunk_ids(new_texts)
+    mapping = {}
+    matcher = difflib.SequenceMatcher(a=old_ids, b=new_ids, autojunk=False)
+    for old_start, new_start, size in matcher.get_matching_blocks():
+        for offset in range(size):
+            mapping[new_start + offset] = old_start + offset
+
+    matched = set(mapping.values())
+    unmatched = {cid: i for i, cid in enumerate(old_ids) if i not in matched}
+    for j, cid in enumerate(new_ids):
+        if j not in mapping and cid in unmatched:
+            mapping[j] = unmatched.pop(cid)
+    return mapping
+
+
+def _unique_path(directory: Path, name: str) -> Path:
+    path = directory / name
+    counter = 1
+    while path.exists():
+        path = directory / f"{Path(name).stem}_{counter}{Path(name).suffix}"
+        counter += 1
+    return path
+
+
+def _supersede(path: str) -> Optional[str]:
+    """Move a file into its directory's superseded/ folder. Returns the new path."""
+    source = Path(path)
+    if not source.exists():
+        return None
+    target_dir = source.parent / SUPERSEDED_DIR
+    target_dir.mkdir(exist_ok=True)
+    target = _unique_path(target_dir, f"{int(time.time())}_{source.name}")
+    os.replace(source, target)
+    return str(target)
+
+
+def relink_chunks(mapping: Dict[int, int], images: Optional[Dict[int, str]] = None) -> Dict:
+    """
+    Move per-chunk assets to their chunk's new index after the chunk list changed.
+
+    Audio files that change index are renamed chunk_<new>_<ts> so a file's
+    name always matches its chunk (regenerate-chunk-audio replaces by name).
+    Uploads follow their chunk in the manifest. Audio of chunks that are
+    gone is moved to superseded/; their uploads are dropped from the index.
+
+    Args:
+        mapping: remap_chunks() result
+        images: {old index: image path} for the current AI images; those in
+            the latest batch folder are renamed to chunk_<new:03d>.png and
+            the batch's image list is updated (uploads are kept)
+
+    Returns:
+        {'images': {new index: path}, 'reused': n chunks whose assets were kept,
+         'moved': n that changed index, 'superseded': n files moved aside}
+    """
+    stamp = int(time.time())
+    superseded = 0
+    old_to_new = {old: new for new, old in mapping.items()}
+
+    with _updating():
+        audio = {}
+        for old_key, path in _index['audio'].items():
+            new = old_to_new.get(int(old_key))
+            if new is None:
+                superseded += bool(_supersede(path))
+            elif new == int(old_key) or not os.path.exists(path):
+                audio[str(new)] = path
+            else:
+                suffix = Path(path).suffix
+                target = _unique_path(Path(path).parent, f"chunk_{new}_{stamp}{suffix}")
+                os.replace(path, target)
+                audio[str(new)] = str(target)
+        _index['audio'] = audio
+
+        _index['uploads'] = {
+            str(old_to_new[int(old_key)]): kinds
+            for old_key, kinds in _index.get('uploads', {}).items()
+            if int(old_key) in old_to_new
+        }
+
+        new_images = {}
+        batch = _index.get('latest_batch')
+        batch_dir = AI_IMAGES_DIR / batch if batch else None
+        staged = []  # (new index, temp path, final path)
+        for old, path in (images or {}).items():
+            new = old_to_new.get(old)
+            in_batch = batch_dir is not None and Path(path).parent == batch_dir
+            if new is None:
+                if in_batch:
+                    superseded += bool(_supersede(path))
+            elif not in_batch or new == old or not os.path.exists(path):
+                new_images[new] = path
+            else:
+                # Two phases: a target name may still hold another chunk's image
+                temp = Path(path).with_name(f".relink_{new:03d}{Path(path).suffix}")
+                os.replace(path, temp)
+                staged.append((new, temp, batch_dir / f"chunk_{new:03d}{Path(path).suffix}"))
+        for new, temp, final in staged:
+            if final.exists():
+                superseded += bool(_supersede(str(final)))
+            os.replace(temp, final)
+            new_images[new] = str(final)
+
+        if batch_dir is not None and batch_dir.exists():
+            _index['batch_images'] = sorted(f.name for f in os.scandir(batch_dir) if f.name.endswith('.png'))
+        _save()
+
+    moved = sum(1 for new, old in mapping.items() if new != old)
+    return {
+        'images': new_images,
+        'reused': len(mapping),
+        'moved': moved,
+        'superseded': superseded
+    }
@@ -2,17 +2,22 @@
 Claim-Based Screenshot Generator
 
 Splits script into chunks, extracts claims, searches for matching sources,
-and captures screenshots with validation and fallback.
+and captures screenshots with validation and fallback (via screenshot_service).
 """
 
 import os
+import sys
 import re
 import json
-import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import List, Dict, Optional
 from dotenv import load_dotenv
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from execution import gemini_gateway
+
 load_dotenv()
 
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
@@ -24,6 +29,10 @@ MIN_CHUNK_WORDS = 25   # Minimum words per chunk
 MAX_CHUNK_WORDS = 50   # Maximum words per chunk
 MAX_FALLBACK_ATTEMPTS = 3
 
+# Pipelined processing
+CLAIM_BATCH_SIZE = 20  # Chunks per claim-extraction LLM call
+SEARCH_WORKERS = 5     # Concurrent Serper searches
+
 
 def chunk_script(script_text: str, words_per_chunk: int = WORDS_PER_CHUNK) -> List[Dict]:
     """
@@ -153,23 +162,7 @@ def chunk_section_text(text: str, words_per_chunk: int, start_index: int, sectio
     return chunks
 
 
-def extract_claim(chunk_text: str) -> str:
-    """
-    Use AI to extract the main factual claim from a chunk.
-    Returns a search-friendly query string.
-    """
-    if not GEMINI_API_KEY:
-        # Fallback: use first 10 words
-        words = chunk_text.split()[:10]
-        return ' '.join(words)
-    
-    prompt = f"""Extract the main FACTUAL CLAIM from this script segment.
-Convert it into a Google News search query (max 8 words).
-
-SEGMENT:
-{chunk_text}
-
-RULES:
+CLAIM_RULES = """RULES:
 1. Focus on the specific fact, statistic, or event mentioned
 2. Include names, numbers, locations if present
 3. Make it search-engine friendly
@@ -189,33 +182,98 @@ GOOD EXAMPLES:
 - "Trump Venezuela oil deal 50 million barrels" ✓
 - "US seizes Venezuela oil tanker Caribbean" ✓
 - "Greenland annexation Trump policy" ✓
+"""
+
+
+def _fallback_claim(chunk_text: str) -> str:
+    """First 8 meaningful words when no LLM claim is available."""
+    words = [w for w in chunk_text.split() if len(w) > 3][:8]
+    return ' '.join(words)
 
+
+def extract_claim(chunk_text: str) -> str:
+    """
+    Use AI to extract the main factual claim from a chunk.
+    Returns a search-friendly query string.
+    """
+    if not GEMINI_API_KEY:
+        # Fallback: use first 10 words
+        words = chunk_text.split()[:10]
+        return ' '.join(words)
+    
+    prompt = f"""Extract the main FACTUAL CLAIM from this script segment.
+Convert it into a Google News search query (max 8 words).
+
+SEGMENT:
+{chunk_text}
+
+{CLAIM_RULES}
 OUTPUT: Just the search query keywords, nothing else."""
 
     try:
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash-lite:generateContent?key={GEMINI_API_KEY}"
-        response = requests.post(
-            url,
-            headers={'Content-Type': 'application/json'},
-            json={
-                'contents': [{'parts': [{'text': prompt}]}],
-                'generationConfig': {'temperature': 0.3, 'maxOutputTokens': 50}
-            },
+        claim = gemini_gateway.generate_text(
+            prompt,
+            model='gemini-2.5-flash-lite',
+            temperature=0.3,
+            max_output_tokens=50,
             timeout=10
-        )
-        
-        if response.status_code == 200:
-            result = response.json()
-            claim = result['candidates'][0]['content']['parts'][0]['text'].strip()
-            # Clean up any quotes or extra formatting
-            claim = claim.strip('"\'').strip()
-            return claim
+        ).strip()
+        # Clean up any quotes or extra formatting
+        claim = claim.strip('"\'').strip()
+        return claim
     except Exception as e:
         print(f"      ⚠️ Claim extraction failed: {e}")
     
     # Fallback: first 8 meaningful words
-    words = [w for w in chunk_text.split() if len(w) > 3][:8]
-    return ' '.join(words)
+    return _fallback_claim(chunk_text)
+
+
+def extract_claims_batch(chunk_texts: List[str]) -> List[str]:
+    """
+    Extract search queries for many chunks in a single LLM call.
+    
+    Chunks the model skips or garbles fall back to extract_claim individually.
+    Returns one claim per input chunk, in order.
+    """
+    if not chunk_texts:
+        return []
+    if not GEMINI_API_KEY:
+        return [' '.join(t.split()[:10]) for t in chunk_texts]
+    
+    segments = "\n\n".join(f"[{i}] {text}" for i, text in enumerate(chunk_texts))
+    prompt = f"""Extract the main FACTUAL CLAIM from EACH numbered script segment below.
+Convert each into a Google News search query (max 8 words).
+
+SEGMENTS:
+{segments}
+
+{CLAIM_RULES}
+OUTPUT: JSON object {{"claims": ["query for [0]", "query for [1]", ...]}} with exactly {len(chunk_texts)} entries, in segment order."""
+
+    claims = [None] * len(chunk_texts)
+    try:
+        text = gemini_gateway.generate_text(
+            prompt,
+            model='gemini-2.5-flash-lite',
+            temperature=0.3,
+            max_output_tokens=60 * len(chunk_texts) + 100,
+            json_mode=True,
+            timeout=60
+        )
+        parsed = json.loads(text).get('claims', [])
+        for i, claim in enumerate(parsed[:len(chunk_texts)]):
+            if isinstance(claim, str) and claim.strip():
+                claims[i] = claim.strip().strip('"\'').strip()
+    except Exception as e:
+        print(f"      ⚠️ Batch claim extraction failed: {e}")
+    
+    missing = [i for i, c in enumerate(claims) if not c]
+    if missing:
+        print(f"      ↩️ Extracting {len(missing)} claims individually")
+        for i in missing:
+            claims[i] = extract_claim(chunk_texts[i])
+    
+    return claims
 
 
 def search_claim(claim: str, include_twitter: bool = True) -> List[Dict]:
@@ -280,49 +338,89 @@ def search_claim(claim: str, include_twitter: bool = True) -> List[Dict]:
     return results
 
 
+def assign_unique_urls(processed: List[Dict], used_urls: set) -> None:
+    """
+    Give each chunk up to MAX_FALLBACK_ATTEMPTS URLs that no other chunk uses.
+    
+    Runs after all searches finish. Chunks with the fewest candidate URLs pick
+    first (ties by chunk index) so a chunk with a single hit isn't starved by a
+    chunk that had plenty of alternatives. Deterministic for the same results.
+    Updates each item's 'search_results' and used_urls in place.
+    """
+    order = sorted(
+        range(len(processed)),
+        key=lambda i: (len(processed[i]['search_results']), processed[i]['chunk_index'])
+    )
+    
+    for i in order:
+        item = processed[i]
+        results = item['search_results']
+        fresh_results = []
+        for r in results:
+            if len(fresh_results) >= MAX_FALLBACK_ATTEMPTS:
+                break
+            if r['url'] and r['url'] not in used_urls:
+                fresh_results.append(r)
+                # Mark as used right away (so no other chunk - or this one - repeats it)
+                used_urls.add(r['url'])
+        
+        if not fresh_results:
+            print(f"      ❌ Chunk {item['chunk_index']}: no fresh URLs (all {len(results)} are already used)")
+        
+        item['search_results'] = fresh_results
+
+
 def process_chunks_for_screenshots(chunks: List[Dict], used_urls: set = None) -> List[Dict]:
     """
     Process all chunks: extract claims, search, prepare for screenshots.
     Returns list of {chunk_index, chunk_text, claim, search_results}
     
+    Pipelined: claims are extracted CLAIM_BATCH_SIZE chunks per LLM call, and
+    each batch's searches start on a worker pool as soon as it returns.
+    
     NEW RULE: Each URL can only be used ONCE across all chunks (no reuse).
+    This is resolved once all searches are in (see assign_unique_urls).
     """
     if used_urls is None:
         used_urls = set()
     
-    processed = []
+    batches = [chunks[i:i + CLAIM_BATCH_SIZE] for i in range(0, len(chunks), CLAIM_BATCH_SIZE)]
+    print(f"   {len(chunks)} chunks → {len(batches)} claim batches, {SEARCH_WORKERS} search workers")
     
-    for i, chunk in enumerate(chunks):
-        print(f"\n  [{i+1}/{len(chunks)}] Processing chunk...")
-        
-        # Extract claim
-        claim = extract_claim(chunk['text'])
-        print(f"      🔍 Claim: {claim[:50]}...")
-        
-        # Search for claim (no Twitter - it's blacklisted anyway)
-        results = search_claim(claim, include_twitter=False)
-        
-        # STRICT: Only use URLs that have NEVER been used before
-        fresh_results = [r for r in results if r['url'] not in used_urls]
-        
-        if fresh_results:
-            # Mark ALL fresh results as used (so they can't be reused by any other chunk)
-            for r in fresh_results[:MAX_FALLBACK_ATTEMPTS]:
-                used_urls.add(r['url'])
-            print(f"      ✅ Found {len(fresh_results)} fresh URLs")
-        else:
-            print(f"      ❌ No fresh URLs found (all {len(results)} are already used)")
+    claims = [None] * len(chunks)
+    search_futures = [None] * len(chunks)
+    
+    with ThreadPoolExecutor(max_workers=2) as claim_pool, \
+         ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as search_pool:
+        claim_futures = [
+            claim_pool.submit(extract_claims_batch, [c['text'] for c in batch])
+            for batch in batches
+        ]
         
-        processed.append({
-            'chunk_index': chunk['index'],
-            'chunk_text': chunk['text'],
-            'word_count': chunk['word_count'],
-            'claim': claim,
-            'search_results': fresh_results[:MAX_FALLBACK_ATTEMPTS]  # Only fresh URLs, no reuse
-        })
+        offset = 0
+        for batch, future in zip(batches, claim_futures):
+            for j, claim in enumerate(future.result()):
+                i = offset + j
+                claims[i] = claim
+                print(f"      🔍 Claim {chunks[i]['index']}: {claim[:50]}...")
+                # No Twitter - it's blacklisted anyway
+                search_futures[i] = search_pool.submit(search_claim, claim, False)
+            offset += len(batch)
         
-        # Small delay to avoid rate limits
-        time.sleep(0.3)
+        processed = [
+            {
+                'chunk_index': chunk['index'],
+                'chunk_text': chunk['text'],
+                'word_count': chunk['word_count'],
+                'claim': claim,
+                'search_results': future.result()
+            }
+            for chunk, claim, future in zip(chunks, claims, search_futures)
+        ]
+    
+    # STRICT: Only use URLs that have NEVER been used before
+    assign_unique_urls(processed, used_urls)
+    print(f"      ✅ {sum(1 for p in processed if p['search_results'])}/{len(processed)} chunks have fresh URLs")
     
     return processed
 
@@ -375,6 +473,39 @@ def generate_claim_screenshots_data(script_text: str) -> Dict:
     }
 
 
+def capture_claim_screenshots(screenshots_data: List[Dict], video_name: str = 'video') -> List[Dict]:
+    """
+    Capture screenshots for prepared chunks through the warm browser pool
+    (screenshot_service), several chunks at once.
+    
+    Returns:
+        One result per chunk, in chunk order, with chunk_text and claim merged in;
+        near-identical screenshots get duplicate_of = the earlier chunk_index
+    """
+    from execution.screenshot_service import capture_all
+    from execution.image_cache import flag_near_duplicates
+    
+    done = 0
+    
+    def report(result):
+        nonlocal done
+        done += 1
+        status = '✅' if result.get('success') else '❌'
+        print(f"   {status} [{done}/{len(screenshots_data)}] Chunk {result.get('chunk_index')}: "
+              f"{result.get('filename') or result.get('error', '')}")
+    
+    results = capture_all('claim', screenshots_data, video_name, on_result=report)
+    for item, result in zip(screenshots_data, results):
+        result['chunk_text'] = item['chunk_text']
+        result['claim'] = item['claim']
+    
+    # Different URLs can render the same-looking page (syndicated stories, mirrors)
+    duplicates = flag_near_duplicates(results)
+    if duplicates:
+        print(f"   ⚠️ {duplicates} screenshots look like an earlier chunk's (see duplicate_of)")
+    return results
+
+
 if __name__ == '__main__':
     # Test with sample text
     sample = """Venezuela holds over 300 billion barrels of proven oil reserves, making it the world's largest. 
@@ -9,27 +9,30 @@ Mines the transcript for:
 """
 
 import os
+import sys
 import json
 import re
+from pathlib import Path
 from typing import Dict, List, Optional
 from dotenv import load_dotenv
-import google.generativeai as genai
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from execution import gemini_gateway, llm_cache
 
 load_dotenv()
 
 # Configure Gemini
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY') or os.getenv('GOOGLE_API_KEY')
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
 
 
-def extract_entities_and_claims(transcript: str, title: str = "") -> Dict:
+def extract_entities_and_claims(transcript: str, title: str = "", refresh: bool = False) -> Dict:
     """
     Extract entities, claims, and generate counter-queries from a transcript.
     
     Args:
         transcript: Full transcript text
         title: Video title (for context)
+        refresh: Ignore the cached analysis of this transcript
     
     Returns:
         Dict with:
@@ -110,9 +113,9 @@ Output as valid JSON:
 }}"""
 
     try:
-        model = genai.GenerativeModel('gemini-2.0-flash')
-        response = model.generate_content(prompt)
-        response_text = response.text.strip()
+        response_text = gemini_gateway.generate_text(
+            prompt, model='gemini-2.0-flash', cache_ttl=llm_cache.ANALYSIS_TTL, refresh=refresh
+        ).strip()
         
         # Clean JSON markers if present
         if response_text.startswith("```"):
@@ -3,6 +3,10 @@
 Full Pipeline with Checkpoints - Complete video generation from YouTube URL or news.
 Chains all steps: Transcribe → Research → Script → Images → Audio → Stitch → SRT
 
+With streaming=True, Script → Images → Audio → Stitch run as one overlapped
+step (streaming_pipeline): each beat's images and audio start as soon as it
+is written, and segments render as their assets arrive.
+
 Supports resume from checkpoints to avoid wasting credits on retries.
 """
 import os
@@ -124,6 +128,19 @@ STEP_ORDER = [
     "generate_metadata",
 ]
 
+# Streaming mode: script/images/audio/stitch overlap in a single step
+STREAMED_STEPS = ["generate_script", "generate_images", "generate_audio", "stitch_video"]
+STREAMING_STEP_ORDER = (
+    STEP_ORDER[:STEP_ORDER.index(STREAMED_STEPS[0])]
+    + ["stream_production"]
+    + STEP_ORDER[STEP_ORDER.index(STREAMED_STEPS[-1]) + 1:]
+)
+
+
+def get_step_order(data: Dict) -> list:
+    """Step order for a job (fixed when it starts, so resumes follow the same path)."""
+    return STREAMING_STEP_ORDER if data.get('streaming') else STEP_ORDER
+
 
 def step_extract_info(job_id: str, data: Dict) -> Dict:
     """Step 1: Extract video information."""
@@ -180,6 +197,7 @@ def step_generate_script(job_id: str, data: Dict) -> Dict:
     )
     data['script_text'] = script_result.get('full_script', '')
     data['script_chunks'] = script_result.get('chunks', [])
+    data['script_beats'] = [b.get('text', '') for b in script_result.get('beats', [])]
     
     return data
 
@@ -231,6 +249,37 @@ def step_stitch_video(job_id: str, data: Dict) -> Dict:
     return data
 
 
+def step_stream_production(job_id: str, data: Dict) -> Dict:
+    """Steps 4-7 overlapped: beats stream into image/TTS queues, segments render as ready."""
+    set_job_status(job_id, JobStatus.RUNNING, 30, "Writing script and producing segments...")
+    
+    from execution.streaming_pipeline import produce_script_video
+    
+    def progress(rendered, queued, message):
+        # Segments finish close behind the script, so map onto the 30-80% band
+        set_job_status(job_id, JobStatus.RUNNING, 30 + int(50 * rendered / max(queued, 1)), message)
+    
+    result = produce_script_video(
+        research_data=data.get('research_data', ''),
+        topic=data['topic'],
+        output_dir=str(TMP_DIR / 'streams' / job_id),
+        target_minutes=15,
+        progress_callback=progress
+    )
+    
+    data['script_text'] = result['script'].get('full_script', '')
+    data['script_chunks'] = result['chunks']
+    data['script_beats'] = [b.get('text', '') for b in result['script'].get('beats', [])]
+    data['image_results'] = result.get('images')
+    data['audio_results'] = result.get('audio_files')
+    data['temp_video_path'] = result.get('output_path')
+    
+    if not data['temp_video_path']:
+        raise Exception(f"Streaming production failed: {result.get('message')}")
+    
+    return data
+
+
 def step_burn_subtitles(job_id: str, data: Dict) -> Dict:
     """Step 8: Generate and burn subtitles."""
     set_job_status(job_id, JobStatus.RUNNING, 88, "Burning subtitles...")
@@ -282,7 +331,9 @@ def step_generate_timestamps(job_id: str, data: Dict) -> Dict:
     srt_path = data.get('srt_path')
     if srt_path and os.path.exists(str(srt_path)):
         from execution.generate_timestamps import generate_timestamps_from_srt
-        timestamp_result = generate_timestamps_from_srt(str(srt_path), num_chapters=10)
+        timestamp_result = generate_timestamps_from_srt(
+            str(srt_path), num_chapters=10, beat_texts=data.get('script_beats')
+        )
         if timestamp_result.get('success'):
             timestamps_text = timestamp_result.get('formatted', '')
             print(f"✅ Generated {len(timestamp_result.get('chapters', []))} chapter timestamps")
@@ -320,6 +371,7 @@ STEP_FUNCTIONS = {
     "generate_images": step_generate_images,
     "generate_audio": step_generate_audio,
     "stitch_video": step_stitch_video,
+    "stream_production": step_stream_production,
     "burn_subtitles": step_burn_subtitles,
     "rename_video": step_rename_video,
     "generate_timestamps": step_generate_timestamps,
@@ -336,7 +388,8 @@ def run_full_pipeline(
     youtube_url: str,
     topic: Optional[str] = None,
     telegram_chat_id: Optional[int] = None,
-    resume: bool = True
+    resume: bool = True,
+    streaming: bool = False
 ) -> Dict[str, Any]:
     """
     Run the complete video generation pipeline with checkpoint support.
@@ -347,6 +400,8 @@ def run_full_pipeline(
         topic: Optional topic override (defaults to video title)
         telegram_chat_id: Optional Telegram chat ID for notifications
         resume: Whether to resume from checkpoint if available
+        streaming: Overlap script/images/audio/stitch (STREAMING_STEP_ORDER).
+            A resumed job keeps the mode it started with.
     
     Returns:
         Dict with paths to generated files
@@ -357,6 +412,7 @@ def run_full_pipeline(
             'job_id': job_id,
             'youtube_url': youtube_url,
             'topic': topic,
+            'streaming': streaming,
         }
         
         # Check for existing checkpoint
@@ -366,12 +422,13 @@ def run_full_pipeline(
             if checkpoint:
                 data = checkpoint['data']
                 last_step = checkpoint.get('last_completed_step')
-                if last_step and last_step in STEP_ORDER:
-                    start_step_idx = STEP_ORDER.index(last_step) + 1
+                step_order = get_step_order(data)
+                if last_step and last_step in step_order:
+                    start_step_idx = step_order.index(last_step) + 1
                     print(f"📂 Resuming from after: {last_step} (step {start_step_idx + 1})")
         
         # Execute steps from start point
-        for step_name in STEP_ORDER[start_step_idx:]:
+        for step_name in get_step_order(data)[start_step_idx:]:
             step_func = STEP_FUNCTIONS[step_name]
             data = step_func(job_id, data)
             save_checkpoint(job_id, step_name, data)
@@ -429,14 +486,15 @@ def run_full_pipeline_from_step(
     if youtube_url:
         data['youtube_url'] = youtube_url
     
-    if step_name not in STEP_ORDER:
-        raise ValueError(f"Unknown step: {step_name}. Valid steps: {STEP_ORDER}")
+    step_order = get_step_order(data)
+    if step_name not in step_order:
+        raise ValueError(f"Unknown step: {step_name}. Valid steps: {step_order}")
     
     # Find starting index
-    start_idx = STEP_ORDER.index(step_name)
+    start_idx = step_order.index(step_name)
     
     # Execute from that step
-    for step in STEP_ORDER[start_idx:]:
+    for step in step_order[start_idx:]:
         step_func = STEP_FUNCTIONS[step]
         data = step_func(job_id, data)
         save_checkpoint(job_id, step, data)
@@ -519,11 +577,15 @@ def run_news_pipeline(
         from execution.generate_srt import generate_srt
         srt_path = generate_srt()
         
-        # Generate metadata from scratch
+        # Generate metadata from scratch (tags, description and hashtags in one call)
+        from execution.tag_generator import generate_metadata as generate_tag_metadata
+        title = generate_title_from_topic(topic)
+        tag_metadata = generate_tag_metadata(title, topic, script_text)
         metadata = {
-            'title': generate_title_from_topic(topic),
-            'description': generate_description(script_text, topic),
-            'tags': generate_tags(topic)
+            'title': title,
+            'description': tag_metadata['description'],
+            'tags': tag_metadata['tags'],
+            'hashtags': tag_metadata['hashtags']
         }
         
         result = {
@@ -607,11 +669,7 @@ def generate_all_audio(chunks: list) -> list:
 
 def generate_metadata(video_info: Dict, script_text: str, topic: str) -> Dict:
     """Generate optimized metadata based on original video and script."""
-    import google.generativeai as genai
-    
-    GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
-    if GEMINI_API_KEY:
-        genai.configure(api_key=GEMINI_API_KEY)
+    from execution import gemini_gateway
     
     original_title = video_info.get('title', '')
     original_description = video_info.get('description', '')[:1000]
@@ -632,12 +690,11 @@ Return as JSON:
 {{"title": "...", "description": "...", "tags": ["tag1", "tag2", ...]}}"""
     
     try:
-        model = genai.GenerativeModel('gemini-2.0-flash')
-        response = model.generate_content(prompt)
+        text = gemini_gateway.generate_text(prompt, model='gemini-2.0-flash')
         
         # Parse JSON from response
         import re
-        json_match = re.search(r'\{.*\}', response.text, re.DOTALL)
+        json_match = re.search(r'\{.*\}', text, re.DOTALL)
         if json_match:
             return json.loads(json_match.group())
     except Exception as e:
@@ -656,18 +713,6 @@ def generate_title_from_topic(topic: str) -> str:
     return topic
 
 
-def generate_description(script_text: str, topic: str) -> str:
-    """Generate video description."""
-    # Use first 500 chars of script as description base
-    return script_text[:500] + "\n\n#" + topic.replace(' ', '')
-
-
-def generate_tags(topic: str) -> list:
-    """Generate tags from topic."""
-    words = topic.lower().split()
-    return words[:15]
-
-
 def send_telegram_notification(chat_id: int, job_id: str, result: Dict):
     """Send completion notification via Telegram."""
     import requests
@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+Gemini Gateway - Single entry point for every Gemini generateContent call.
+
+Call sites used to mix the google.generativeai SDK, the google.genai client
+and hand-rolled REST requests, each with its own connection handling and
+retry behavior (often none, or one fixed 30s sleep on 429). Everything now
+goes through generate() / generate_text(), which add:
+
+- one pooled HTTP session (keep-alive, POOL_SIZE connections per host)
+- per-model budgets: max concurrent calls, requests/minute and input
+  tokens/minute (sliding 60s window); callers wait for room instead of
+  tripping the quota
+- retries on 429/5xx and connection errors, honoring Retry-After /
+  RetryInfo; a 429 pauses the whole model so in-flight callers back off too
+- per-model metrics (calls, errors, retries, cache hits, tokens, latency
+  p50/p95), see metrics() and /api/gemini-metrics
+- an opt-in persistent response cache (cache_ttl=..., see llm_cache) for
+  deterministic analysis prompts; refresh=True bypasses it
+
+Budgets are per process. Override the defaults with GEMINI_MODEL_LIMITS, e.g.
+GEMINI_MODEL_LIMITS='{"gemini-2.5-pro": {"rpm": 5, "tpm": 250000, "concurrency": 2}}'
+(split the account quota between web and worker processes this way).
+"""
+import os
+import json
+import time
+import base64
+import random
+import sqlite3
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+from execution import llm_cache
+
+load_dotenv()
+
+API_BASE = "https://generativelanguage.googleapis.com/v1beta"
+DEFAULT_MODEL = "gemini-2.0-flash"
+
+POOL_SIZE = 32
+DEFAULT_TIMEOUT = 120
+MAX_RETRIES = 4
+MAX_RETRY_DELAY = 60
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Rough input-token estimate until the response reports usage
+CHARS_PER_TOKEN = 4
+IMAGE_TOKENS = 258
+
+DEFAULT_LIMITS = {'concurrency': 8, 'rpm': 1000, 'tpm': 1_000_000}
+MODEL_LIMITS = {
+    'gemini-2.0-flash': {'concurrency': 16, 'rpm': 2000, 'tpm': 4_000_000},
+    'gemini-2.5-flash': {'concurrency': 12, 'rpm': 1000, 'tpm': 1_000_000},
+    'gemini-2.5-flash-lite': {'concurrency': 16, 'rpm': 4000, 'tpm': 4_000_000},
+    'gemini-2.5-pro': {'concurrency': 4, 'rpm': 150, 'tpm': 2_000_000},
+    'gemini-2.5-flash-image': {'concurrency': 6, 'rpm': 500, 'tpm': 500_000},
+    'gemini-2.0-flash-exp-image-generation': {'concurrency': 4, 'rpm': 10, 'tpm': 200_000},
+    'gemini-3-pro-image-preview': {'concurrency': 4, 'rpm': 20, 'tpm': 200_000},
+}
+try:
+    for _model, _limits in json.loads(os.getenv('GEMINI_MODEL_LIMITS') or '{}').items():
+        MODEL_LIMITS[_model] = {**MODEL_LIMITS.get(_model, DEFAULT_LIMITS), **_limits}
+except (ValueError, AttributeError) as e:
+    print(f"⚠️ Ignoring invalid GEMINI_MODEL_LIMITS: {e}")
+
+# Latency samples kept per model for percentiles
+LATENCY_SAMPLES = 500
+
+Part = Union[str, Dict]
+
+
+class GeminiError(Exception):
+    """A Gemini call failed (after retries, if the error was retryable)."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+# ============== TRANSPORT ==============
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _http() -> requests.Session:
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE))
+                _session = session
+    return _session
+
+
+def _api_key(api_key: Optional[str] = None) -> Optional[str]:
+    return api_key or os.getenv('GEMINI_API_KEY') or os.getenv('GOOGLE_API_KEY')
+
+
+# ============== BUDGETS ==============
+
+class _ModelBudget:
+    """Concurrency slots plus a sliding one-minute window of requests and tokens."""
+
+    def __init__(self, limits: Dict):
+        self.slots = threading.BoundedSemaphore(limits['concurrency'])
+        self.rpm = limits['rpm']
+        self.tpm = limits['tpm']
+        self._window = deque()  # [started_at, tokens]
+        self._cond = threading.Condition()
+        self._paused_until = 0.0
+
+    def reserve(self, tokens: int) -> List:
+        """Block until the window has room, then record the request."""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                while self._window and now - self._window[0][0] >= 60:
+                    self._window.popleft()
+
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if len(self._window) >= self.rpm:
+                        wait = 60 - (now - self._window[0][0])
+                    elif self._window and sum(t for _, t in self._window) + tokens > self.tpm:
+                        wait = 60 - (now - self._window[0][0])
+                    else:
+                        entry = [now, tokens]
+                        self._window.append(entry)
+                        return entry
+                self._cond.wait(timeout=max(wait, 0.05))
+
+    def settle(self, entry: List, tokens: int):
+        """Replace a request's estimated tokens with the reported usage."""
+        with self._cond:
+            entry[1] = tokens
+            self._cond.notify_all()
+
+    def pause(self, seconds: float):
+        """Hold back every caller of this model (quota exhausted)."""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+_budgets: Dict[str, _ModelBudget] = {}
+_budgets_lock = threading.Lock()
+
+
+def _budget(model: str) -> _ModelBudget:
+    with _budgets_lock:
+        if model not in _budgets:
+            _budgets[model] = _ModelBudget(MODEL_LIMITS.get(model, DEFAULT_LIMITS))
+        return _budgets[model]
+
+
+# ============== METRICS ==============
+
+_metrics: Dict[str, Dict] = {}
+_metrics_lock = threading.Lock()
+
+
+def _record(model: str, latency: Optional[float] = None, usage: Optional[Dict] = None,
+            retries: int = 0, error: bool = False, cache_hit: bool = False):
+    with _metrics_lock:
+        stats = _metrics.setdefault(model, {
+            'calls': 0, 'errors': 0, 'retries': 0, 'cache_hits': 0,
+            'prompt_tokens': 0, 'output_tokens': 0,
+            'latencies': deque(maxlen=LATENCY_SAMPLES),
+        })
+        if cache_hit:
+            stats['cache_hits'] += 1
+            return
+        stats['calls'] += 1
+        stats['retries'] += retries
+        if error:
+            stats['errors'] += 1
+        if latency is not None:
+            stats['latencies'].append(latency)
+        if usage:
+            stats['prompt_tokens'] += usage.get('promptTokenCount', 0)
+            stats['output_tokens'] += usage.get('candidatesTokenCount', 0)
+
+
+def metrics() -> Dict[str, Dict]:
+    """Per-model call counts, token totals and latency (seconds) for this process."""
+    report = {}
+    with _metrics_lock:
+        for model, stats in _metrics.items():
+            latencies = sorted(stats['latencies'])
+            report[model] = {
+                key: value for key, value in stats.items() if key != 'latencies'
+            }
+            if latencies:
+                report[model].update({
+                    'latency_avg': round(sum(latencies) / len(latencies), 3),
+                    'latency_p50': round(latencies[len(latencies) // 2], 3),
+                    'latency_p95': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3),
+                })
+    return report
+
+
+# ============== REQUESTS ==============
+
+def image_part(source: Union[str, Path, bytes], mime_type: str = 'image/jpeg') -> Dict:
+    """Inline image part from a file path or raw bytes."""
+    if not isinstance(source, bytes):
+        with open(source, 'rb') as f:
+            source = f.read()
+    return {'inline_data': {'mime_type': mime_type, 'data': base64.b64encode(source).decode('utf-8')}}
+
+
+def _estimate_tokens(parts: List[Dict]) -> int:
+    tokens = 0
+    for part in parts:
+        if 'text' in part:
+            tokens += len(part['text']) // CHARS_PER_TOKEN
+        else:
+            tokens += IMAGE_TOKENS
+    return max(tokens, 1)
+
+
+def _retry_delay(response: Optional[requests.Response], attempt: int) -> float:
+    """Server-suggested delay if any, else exponential backoff with jitter."""
+    if response is not None:
+        retry_after = response.headers.get('Retry-After')
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), MAX_RETRY_DELAY)
+        try:
+            for detail in response.json().get('error', {}).get('details', []):
+                if detail.get('@type', '').endswith('RetryInfo'):
+                    return min(float(detail.get('retryDelay', '0s').rstrip('s')), MAX_RETRY_DELAY)
+        except ValueError:
+            pass
+    return min(2 ** attempt + random.uniform(0, 1), MAX_RETRY_DELAY)
+
+
+def generate(
+    contents: Union[Part, List[Part]],
+    model: str = DEFAULT_MODEL,
+    generation_config: Optional[Dict] = None,
+    tools: Optional[List[Dict]] = None,
+    system_instruction: Optional[str] = None,
+    api_key: Optional[str] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    max_retries: int = MAX_RETRIES,
+    cache_ttl: Optional[float] = None,
+    refresh: bool = False
+) -> Dict:
+    """
+    Call models/<model>:generateContent within the model's budget.
+
+    Args:
+        contents: Prompt string, or a list of parts (strings or part dicts,
+                  e.g. from image_part) for a single user turn
+        generation_config: generationConfig (temperature, maxOutputTokens,
+                           responseMimeType, responseModalities, ...)
+        tools: e.g. [{"google_search": {}}] for grounding
+        cache_ttl: Serve/store the response in llm_cache for this many
+                   seconds (only for prompts whose answer depends on the
+                   input alone, never grounded ones)
+        refresh: Skip the cache lookup (e.g. the user asked to regenerate)
+
+    Returns:
+        Raw response JSON
+
+    Raises:
+        GeminiError: No API key, non-retryable error, or retries exhausted
+    """
+    key = _api_key(api_key)
+    if not key:
+        raise GeminiError("GEMINI_API_KEY not set")
+
+    if not isinstance(contents, list):
+        contents = [contents]
+    parts = [{'text': part} if isinstance(part, str) else part for part in contents]
+    payload = {'contents': [{'role': 'user', 'parts': parts}]}
+    if generation_config:
+        payload['generationConfig'] = generation_config
+    if tools:
+        payload['tools'] = tools
+    if system_instruction:
+        payload['systemInstruction'] = {'parts': [{'text': system_instruction}]}
+
+    cache_key = llm_cache.cache_key(model, payload) if cache_ttl else None
+    if cache_key and not refresh:
+        try:
+            cached = llm_cache.get(cache_key, max_age=cache_ttl)
+        except sqlite3.Error as e:
+            print(f"      ⚠️ LLM cache unavailable: {e}")
+            cached = None
+        if cached:
+            _record(model, cache_hit=True)
+            return cached
+
+    url = f"{API_BASE}/models/{model}:generateContent"
+    headers = {'x-goog-api-key': key}
+    budget = _budget(model)
+    estimate = _estimate_tokens(parts)
+
+    for attempt in range(max_retries + 1):
+        with budget.slots:
+            entry = budget.reserve(estimate)
+            started = time.perf_counter()
+            try:
+                response = _http().post(url, headers=headers, json=payload, timeout=timeout)
+                failure = None
+            except requests.RequestException as e:
+                response, failure = None, str(e)
+            latency = time.perf_counter() - started
+
+        if response is not None and response.status_code == 200:
+            try:
+                result = response.json()
+            except ValueError:
+                budget.settle(entry, estimate)
+                _record(model, latency, retries=attempt, error=True)
+                raise GeminiError(f"{model} returned non-JSON response: {response.text[:300]}", 200)
+            usage = result.get('usageMetadata') or {}
+            budget.settle(entry, usage.get('promptTokenCount', estimate))
+            _record(model, latency, usage, retries=attempt)
+            if cache_key and _cacheable(result):
+                try:
+                    llm_cache.put(cache_key, model, result)
+                except sqlite3.Error as e:
+                    print(f"      ⚠️ LLM cache unavailable: {e}")
+            return result
+
+        status = response.status_code if response is not None else None
+        if failure is None:
+            failure = f"HTTP {status}: {response.text[:300]}"
+        if (status is not None and status not in RETRY_STATUSES) or attempt == max_retries:
+            _record(model, latency, retries=attempt, error=True)
+            raise GeminiError(f"{model} failed: {failure}", status)
+
+        delay = _retry_delay(response, attempt)
+        if status == 429:
+            budget.pause(delay)
+        print(f"      ⏳ {model}: {failure[:120]} - retry {attempt + 1}/{max_retries} in {delay:.1f}s")
+        time.sleep(delay)
+
+
+def _cacheable(result: Dict) -> bool:
+    """Only complete text answers are cached (not SAFETY/MAX_TOKENS/empty ones)."""
+    candidates = result.get('candidates') or []
+    if not candidates or candidates[0].get('finishReason') != 'STOP':
+        return False
+    parts = (candidates[0].get('content') or {}).get('parts') or []
+    return any(part.get('text') for part in parts)
+
+
+def response_text(result: Dict) -> str:
+    """Concatenated text parts of the first candidate."""
+    candidates = result.get('candidates') or []
+    if not candidates:
+        reason = (result.get('promptFeedback') or {}).get('blockReason', 'no candidates')
+        raise GeminiError(f"Empty response ({reason})")
+    parts = (candidates[0].get('content') or {}).get('parts') or []
+    text = ''.join(part.get('text', '') for part in parts)
+    if not text:
+        raise GeminiError(f"No text in response ({candidates[0].get('finishReason', 'unknown')})")
+    return text
+
+
+def response_images(result: Dict) -> List[bytes]:
+    """Decoded inline images from all candidates."""
+    images = []
+    for candidate in result.get('candidates') or []:
+        for part in (candidate.get('content') or {}).get('parts') or []:
+            inline = part.get('inlineData') or part.get('inline_data')
+            if inline and inline.get('data'):
+                images.append(base64.b64decode(inline['data']))
+    return images
+
+
+def generate_text(
+    contents: Union[Part, List[Part]],
+    model: str = DEFAULT_MODEL,
+    temperature: Optional[float] = None,
+    max_output_tokens: Optional[int] = None,
+    json_mode: bool = False,
+    use_grounding: bool = False,
+    response_schema: Optional[Dict] = None,
+    **kwargs
+) -> str:
+    """
+    Text completion through generate().
+
+    Args:
+        json_mode: Ask for application/json output
+        response_schema: Constrain JSON output to this schema (OpenAPI subset,
+                         e.g. {"type": "OBJECT", "properties": {...}}); implies json_mode
+        use_grounding: Enable Google Search grounding
+        **kwargs: Passed to generate() (system_instruction, api_key, timeout, ...)
+
+    Raises:
+        GeminiError
+    """
+    config = {}
+    if temperature is not None:
+        config['temperature'] = temperature
+    if max_output_tokens is not None:
+        config['maxOutputTokens'] = max_output_tokens
+    if json_mode or response_schema:
+        config['responseMimeType'] = 'application/json'
+    if response_schema:
+        config['responseSchema'] = response_schema
+    tools = [{'google_search': {}}] if use_grounding else None
+    return response_text(generate(contents, model=model, generation_config=config or None, tools=tools, **kwargs))
+
+
+def generate_image(
+    contents: Union[Part, List[Part]],
+    model: str = 'gemini-2.5-flash-image',
+    **kwargs
+) -> Optional[bytes]:
+    """
+    First image from an image-generation model, or None if it returned none.
+
+    Raises:
+        GeminiError
+    """
+    result = generate(contents, model=model,
+                      generation_config={'responseModalities': ['TEXT', 'IMAGE']}, **kwargs)
+    images = response_images(result)
+    return images[0] if images else None
+
+
+if __name__ == '__main__':
+    import sys
+    print(generate_text(' '.join(sys.argv[1:]) or 'Say hello in five words.'))
+    print(json.dumps(metrics(), indent=2))
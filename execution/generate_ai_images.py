@@ -7,22 +7,15 @@ Ensures consistent 16:9 YouTube dimensions via post-processing.
 import os
 import io
 import re
-import base64
+import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Try new SDK first, fallback to old SDK
-try:
-    from google import genai
-    from google.genai import types
-    NEW_SDK = True
-except ImportError:
-    import google.generativeai as genai
-    types = None
-    NEW_SDK = False
-
 from PIL import Image
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from execution import gemini_gateway
+
 # Import style selector
 try:
     from execution.style_selector import apply_style_to_prompt, auto_select_mood, auto_select_scene_type, DEFAULT_STYLE
@@ -45,13 +38,6 @@ api_key = os.getenv('GEMINI_API_KEY') or os.getenv('GOOGLE_API_KEY')
 if not api_key:
     print("⚠️ No GEMINI_API_KEY found. Image generation will fail.")
 
-if NEW_SDK and api_key:
-    client = genai.Client(api_key=api_key)
-else:
-    if api_key:
-        genai.configure(api_key=api_key)
-    client = None
-
 
 def crop_to_youtube(image: Image.Image) -> Image.Image:
     """
@@ -142,11 +128,7 @@ STRICT RULES:
 Respond with ONLY the visual description, nothing else. Keep it under 40 words."""
 
     try:
-        response = client.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=[prompt]
-        )
-        return response.text.strip()
+        return gemini_gateway.generate_text(prompt, model="gemini-2.0-flash").strip()
     except Exception as e:
         print(f"   ⚠️ Metaphor generation failed: {e}")
         # Fallback: use the chunk text directly  
@@ -187,38 +169,30 @@ def generate_chunk_image(chunk_text: str, output_path: str, chunk_index: int = 0
     print(f"   🎨 Generating image ({style_id}/{mood})...")
     
     try:
-        response = client.models.generate_content(
-            model="gemini-2.5-flash-image",
-            contents=[full_prompt],
-            config=types.GenerateContentConfig(
-                response_modalities=['IMAGE', 'TEXT']
-            )
-        )
+        image_bytes = gemini_gateway.generate_image(full_prompt, model="gemini-2.5-flash-image")
         
         # Extract image from response
-        for part in response.candidates[0].content.parts:
-            if part.inline_data is not None:
-                image_bytes = part.inline_data.data
-                image = Image.open(io.BytesIO(image_bytes))
-                
-                # CRITICAL: Force 16:9 YouTube dimensions
-                youtube_image = crop_to_youtube(image)
-                
-                # Ensure output directory exists
-                os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                
-                # Save as high-quality PNG
-                youtube_image.save(output_path, "PNG", optimize=True)
-                
-                print(f"   ✅ Saved: {output_path} ({youtube_image.size})")
-                
-                return {
-                    'success': True,
-                    'path': output_path,
-                    'size': youtube_image.size,
-                    'metaphor': metaphor,
-                    'chunk_text': chunk_text
-                }
+        if image_bytes:
+            image = Image.open(io.BytesIO(image_bytes))
+            
+            # CRITICAL: Force 16:9 YouTube dimensions
+            youtube_image = crop_to_youtube(image)
+            
+            # Ensure output directory exists
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            
+            # Save as high-quality PNG
+            youtube_image.save(output_path, "PNG", optimize=True)
+            
+            print(f"   ✅ Saved: {output_path} ({youtube_image.size})")
+            
+            return {
+                'success': True,
+                'path': output_path,
+                'size': youtube_image.size,
+                'metaphor': metaphor,
+                'chunk_text': chunk_text
+            }
         
         return {'success': False, 'error': 'No image in response'}
         
@@ -332,10 +306,7 @@ def generate_all_images(script: str, output_dir: str, style: str = DEFAULT_STYLE
         result['index'] = i
         result['chunk_text'] = chunk
         results.append(result)
-        
-        # Rate limiting: wait 2 seconds between successful images
-        if result.get('success') and i < len(chunks) - 1:
-            time.sleep(2)
+        # Pacing between images is left to gemini_gateway's per-model budget
     
     successful = sum(1 for r in results if r.get('success'))
     
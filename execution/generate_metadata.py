@@ -4,17 +4,57 @@ Metadata Generation - Generate optimized titles, descriptions, and tags.
 Creates modified metadata based on reference video while maintaining SEO value.
 """
 import os
+import sys
 import re
 import json
+from pathlib import Path
 from typing import Dict, List, Optional
 from dotenv import load_dotenv
-import google.generativeai as genai
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from execution import gemini_gateway
+from execution.metadata_engine import generate_fields
+from execution.tag_generator import generate_hashtags
 
 load_dotenv()
 
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY') or os.getenv('GOOGLE_API_KEY')
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
+
+
+def _clean_title(title: str) -> str:
+    # Clean up any quotes or extra formatting
+    title = title.strip().strip('"\'')
+    title = re.sub(r'^(New Title:|Title:)\s*', '', title, flags=re.IGNORECASE)
+    return title[:100]  # Max 100 chars
+
+
+def _clean_description(description: str) -> str:
+    # Remove any markdown
+    description = description.strip().replace('*', '').replace('_', '')
+    # Remove any quotes if the model wrapped it
+    return description.strip('"')
+
+
+def _clean_tags(tags: List[str], original_tags: List[str] = None) -> List[str]:
+    tags = [re.sub(r'[^\w\s-]', '', t.strip()) for t in tags]
+    tags = [t for t in tags if t and len(t) <= 30]
+    
+    # Add original tags if available
+    if original_tags:
+        for tag in original_tags[:5]:
+            if tag not in tags:
+                tags.append(tag)
+    
+    return tags[:20]  # YouTube allows max ~500 chars total
+
+
+def _clean_hashtags(hashtags: List[str]) -> List[str]:
+    cleaned = []
+    for tag in hashtags:
+        tag = re.sub(r'[^\w]', '', tag)
+        if tag and f"#{tag}" not in cleaned:
+            cleaned.append(f"#{tag}")
+    return cleaned[:8]
 
 
 def generate_modified_title(original_title: str, topic: str, script_hook: str = "") -> str:
@@ -39,13 +79,7 @@ RULES:
 NEW TITLE:"""
 
     try:
-        model = genai.GenerativeModel('gemini-2.0-flash')
-        response = model.generate_content(prompt)
-        title = response.text.strip()
-        # Clean up any quotes or extra formatting
-        title = title.strip('"\'')
-        title = re.sub(r'^(New Title:|Title:)\s*', '', title, flags=re.IGNORECASE)
-        return title[:100]  # Max 100 chars
+        return _clean_title(gemini_gateway.generate_text(prompt, model='gemini-2.0-flash'))
     except Exception as e:
         print(f"Title generation failed: {e}")
         return original_title
@@ -96,14 +130,7 @@ RULES:
 DESCRIPTION:"""
 
     try:
-        model = genai.GenerativeModel('gemini-2.0-flash')
-        response = model.generate_content(prompt)
-        description = response.text.strip()
-        # Remove any markdown
-        description = description.replace('*', '')
-        description = description.replace('_', '')
-        # Remove any quotes if the model wrapped it
-        description = description.strip('"')
+        description = _clean_description(gemini_gateway.generate_text(prompt, model='gemini-2.0-flash'))
         
         # Add timestamps if provided
         if include_timestamps and timestamps_text:
@@ -119,7 +146,6 @@ DESCRIPTION:"""
         return fallback
 
 
-
 def extract_and_generate_tags(
     topic: str,
     original_tags: List[str] = None,
@@ -141,22 +167,9 @@ Keep each tag under 30 characters.
 TAGS:"""
 
     try:
-        model = genai.GenerativeModel('gemini-2.0-flash')
-        response = model.generate_content(prompt)
-        tags_text = response.text.strip()
+        tags_text = gemini_gateway.generate_text(prompt, model='gemini-2.0-flash').strip()
         # Parse comma-separated tags
-        tags = [t.strip() for t in tags_text.split(',')]
-        # Clean tags
-        tags = [re.sub(r'[^\w\s-]', '', t) for t in tags]
-        tags = [t for t in tags if t and len(t) <= 30]
-        
-        # Add original tags if available
-        if original_tags:
-            for tag in original_tags[:5]:
-                if tag not in tags:
-                    tags.append(tag)
-        
-        return tags[:20]  # YouTube allows max ~500 chars total
+        return _clean_tags(tags_text.split(','), original_tags)
     except Exception as e:
         print(f"Tag generation failed: {e}")
         # Fallback
@@ -189,25 +202,67 @@ def generate_full_metadata(
     sentences = re.split(r'(?<=[.!?])\s+', script_text)
     hook = ' '.join(sentences[:3])
     
-    print("📝 Generating modified title...")
-    title = generate_modified_title(original_title, topic, hook)
+    prompt = f"""Write the YouTube metadata for this video.
+
+ORIGINAL TITLE: {original_title}
+TOPIC: {topic}
+ORIGINAL TAGS: {', '.join(original_tags[:10]) if original_tags else 'None'}
+FULL SCRIPT:
+{script_text}
+
+TITLE RULES:
+1. Keep 80-90% of the original title's meaning and keywords
+2. Change 2-3 words to make it unique
+3. Keep it under 60 characters
+4. Maintain urgency and curiosity
+
+DESCRIPTION RULES (match this style):
+"Why is invading the United States impossible? Even if the US military vanished overnight, the geography itself serves as an unconquerable fortress. In this video, we break down the terrifying logistical reality that any invading superpower would face—from the "liquid walls" of the Atlantic and Pacific Oceans to the natural kill zones of the Rocky Mountains.
+
+We explore why the US is geographically engineered to destroy supply lines and why the 400 million civilian firearms hidden in the suburbs create a "blade of grass" insurgency problem that no army can solve. Discover the economic, geographic, and logistical reasons why a ground invasion of America is a suicide mission."
+
+1. Write EXACTLY 2 paragraphs
+2. Paragraph 1: Opening question/statement + "In this video, we break down/explore/explain..."
+3. Paragraph 2: "We explore/discover/examine..." + specific topics covered
+4. Use the ACTUAL content from the script - summarize what's really discussed, do NOT copy it
+5. Sound journalistic and authoritative
+6. Keep under 600 characters total
+7. Do NOT include timestamps, hashtags, subscribe CTA, or anything else
+
+TAGS: 15-20 tags (topic keywords, related terms, audience keywords, trending terms), each under 30 characters
+
+HASHTAGS: 3-5 hashtags for the topic, each starting with #
+
+Use plain text only - NO asterisks, NO markdown."""
     
-    print("📝 Generating description with timestamps...")
-    description = generate_description(
-        script_text, 
-        topic, 
-        original_description,
-        timestamps_text=timestamps_text,
-        include_timestamps=True
+    print("📝 Generating title, description and tags...")
+    metadata = generate_fields(
+        prompt,
+        fallbacks={
+            'title': lambda: generate_modified_title(original_title, topic, hook),
+            'description': lambda: generate_description(
+                script_text, topic, original_description, include_timestamps=False
+            ),
+            'tags': lambda: extract_and_generate_tags(topic, original_tags, script_text),
+            'hashtags': lambda: generate_hashtags(topic),
+        },
+        cleaners={
+            'title': _clean_title,
+            'description': _clean_description,
+            'tags': lambda tags: _clean_tags(tags, original_tags),
+            'hashtags': _clean_hashtags,
+        }
     )
     
-    print("📝 Generating tags...")
-    tags = extract_and_generate_tags(topic, original_tags, script_text)
+    description = metadata['description']
+    if timestamps_text:
+        description = description + "\n\n" + timestamps_text
     
     return {
-        'title': title,
+        'title': metadata['title'],
         'description': description,
-        'tags': tags,
+        'tags': metadata['tags'],
+        'hashtags': metadata['hashtags'],
         'original_title': original_title,
         'topic': topic,
         'has_timestamps': bool(timestamps_text)
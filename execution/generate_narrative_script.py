@@ -6,18 +6,19 @@ Generates engaging, retention-optimized scripts using beat-based structure
 instead of outline-first approach.
 """
 import os
+import sys
 import re
 import json
-from typing import List, Dict, Optional
+from pathlib import Path
+from typing import Callable, List, Dict, Optional
 from dotenv import load_dotenv
-import google.generativeai as genai
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from execution import gemini_gateway
 
 load_dotenv()
 
-# Configure Gemini
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY') or os.getenv('GOOGLE_API_KEY')
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
 
 # Default narrative structure
 DEFAULT_BEATS = [
@@ -161,16 +162,12 @@ FORBIDDEN:
 """
 
 
-def get_model():
-    """Get Gemini 2.5 Pro model for script generation."""
-    model = genai.GenerativeModel(
-        'gemini-2.5-pro',
-        generation_config={
-            'temperature': 0.7,
-            'top_p': 0.95,
-        }
-    )
-    return model
+# Gemini 2.5 Pro for script generation
+SCRIPT_MODEL = 'gemini-2.5-pro'
+SCRIPT_GENERATION_CONFIG = {
+    'temperature': 0.7,
+    'topP': 0.95,
+}
 
 
 def generate_beat(
@@ -295,11 +292,8 @@ DATA INTEGRITY:
 
 Write the {beat['name']} beat now. {beat['word_target']} words. Pure prose, no metadata. Start with impact."""
 
-    model = get_model()
-    
-    # Generate with grounding enabled (built into model tools)
-    response = model.generate_content(prompt)
-    text = response.text.strip()
+    result = gemini_gateway.generate(prompt, model=SCRIPT_MODEL, generation_config=SCRIPT_GENERATION_CONFIG)
+    text = gemini_gateway.response_text(result).strip()
     
     # Clean up any markdown, headers, or asterisks
     text = re.sub(r'^#+\s+.*$', '', text, flags=re.MULTILINE)  # Remove headers
@@ -373,11 +367,19 @@ def split_into_chunks(text: str, max_words: int = 20) -> List[Dict]:
     return chunks
 
 
+def clean_script_text(text: str) -> str:
+    """Strip markdown emphasis and collapse blank lines (TTS reads symbols aloud)."""
+    text = text.replace('*', '')
+    text = re.sub(r'_([^_]+)_', r'\1', text)  # Remove _underscores_
+    return re.sub(r'\n{3,}', '\n\n', text)
+
+
 def generate_narrative_script(
     research_data: str,
     topic: str,
     target_minutes: int = 15,
-    beats: Optional[List[Dict]] = None
+    beats: Optional[List[Dict]] = None,
+    on_beat: Optional[Callable[[Dict], None]] = None
 ) -> Dict:
     """
     Generate a full narrative script using beat-based structure.
@@ -387,6 +389,8 @@ def generate_narrative_script(
         topic: Main topic/angle
         target_minutes: Target video duration in minutes
         beats: Optional custom beat structure (uses DEFAULT_BEATS if not provided)
+        on_beat: Called with each beat as soon as it is written (streaming
+            production starts its images/audio while later beats generate)
     
     Returns:
         Dict with full script, beats, and chunks
@@ -456,14 +460,16 @@ def generate_narrative_script(
                 "chunk_count": 0,
                 "error": str(e)
             })
+            continue
+        
+        if on_beat:
+            on_beat(result)
     
     # Combine all text
     full_script = "\n\n".join([b['text'] for b in generated_beats if b.get('text')])
     
     # Final cleanup - absolutely ensure no asterisks or markdown
-    full_script = full_script.replace('*', '')
-    full_script = re.sub(r'_([^_]+)_', r'\1', full_script)  # Remove _underscores_
-    full_script = re.sub(r'\n{3,}', '\n\n', full_script)
+    full_script = clean_script_text(full_script)
     
     total_words = sum(b.get('word_count', 0) for b in generated_beats)
     
@@ -5,15 +5,16 @@ Creates a 7-chapter outline following script_style.md structure.
 """
 
 import os
-import google.generativeai as genai
+import sys
+from pathlib import Path
 from typing import Dict, Optional
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from execution import gemini_gateway
+
 # Load API key
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "")
 
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
-
 
 def generate_outline(
     title: str,
@@ -149,9 +150,7 @@ RULES:
 Generate the outline now:"""
 
     try:
-        model = genai.GenerativeModel("gemini-2.0-flash")
-        response = model.generate_content(prompt)
-        outline_text = response.text
+        outline_text = gemini_gateway.generate_text(prompt, model="gemini-2.0-flash")
         
         return {
             "success": True,
@@ -6,15 +6,26 @@ Generates YouTube scripts using the same REST API approach as seo-system-main:
 2. Generate outline
 3. Write each section chunked (350-600 words each)
 4. Concatenate
+
+parallel=True writes every section at once instead: each section gets its
+outline-assigned facts plus the other sections' facts as off-limits, and a
+local reconciliation pass then drops sentences that repeat a statistic
+already made earlier in the body (see remove_repeated_facts).
 """
 
 import os
+import re
+import sys
 import json
-import requests
 import time
-from typing import Optional, List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, List, Dict, Tuple
 from dotenv import load_dotenv
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from execution import article_digest, gemini_gateway, llm_cache
+
 # Load environment variables
 load_dotenv()
 
@@ -35,62 +46,62 @@ SCRIPT_SECTIONS = [
 ]
 
 
-def call_gemini_rest(prompt: str, model: str = "gemini-2.5-flash", temperature: float = 0.7, use_grounding: bool = False) -> Optional[str]:
+# Parallel drafting: concurrent section calls (the gateway's per-model budget still applies)
+SECTION_WORKERS = len(SCRIPT_SECTIONS)
+# A body sentence repeats an earlier one if they share a statistic and at
+# least this fraction of the shorter sentence's content words
+REPEAT_OVERLAP = 0.5
+
+STAT_PATTERN = re.compile(
+    r'\$?\d[\d,]*(?:\.\d+)?(?:\s*(?:%|percent|billion|million|trillion|thousand|barrels|tons|ounces))?',
+    re.IGNORECASE
+)
+STOPWORDS = {
+    'that', 'this', 'with', 'from', 'have', 'they', 'their', 'there', 'what', 'when', 'which',
+    'will', 'would', 'about', 'into', 'just', 'more', 'than', 'then', 'been', 'were', 'your',
+    'here', 'over', 'only', 'also', 'these', 'those', 'it\'s', 'that\'s', 'because'
+}
+
+
+def call_gemini_rest(prompt: str, model: str = "gemini-2.5-flash", temperature: float = 0.7, use_grounding: bool = False,
+                     cache_ttl: Optional[float] = None, refresh: bool = False) -> Optional[str]:
     """
-    Call Gemini API directly via REST (same pattern as seo-system-main).
+    Call Gemini through the shared gateway (pooled REST, quota-aware retries).
     This approach reliably generates long-form content.
+    cache_ttl/refresh: see gemini_gateway.generate (analysis prompts only).
     """
     if not GEMINI_API_KEY:
         print("ERROR: GEMINI_API_KEY not found")
         return None
     
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={GEMINI_API_KEY}"
-    
-    headers = {"Content-Type": "application/json"}
-    
-    payload = {
-        "contents": [{"parts": [{"text": prompt}]}],
-        "generationConfig": {
-            "temperature": temperature,
-            "maxOutputTokens": 16384  # Much higher than SDK default
-        }
-    }
-    
-    if use_grounding:
-        payload["tools"] = [{"google_search": {}}]
-    
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=120)
-        
-        if response.status_code == 429:
-            print(f"      Rate limit hit, waiting 30s...")
-            time.sleep(30)
-            response = requests.post(url, headers=headers, json=payload, timeout=120)
-        
-        if response.status_code != 200:
-            print(f"      API Error {response.status_code}: {response.text[:200]}")
-            return None
-        
-        result = response.json()
-        
-        try:
-            text = result['candidates'][0]['content']['parts'][0]['text']
-            return text
-        except (KeyError, IndexError):
-            print(f"      Unexpected response structure")
-            return None
-            
-    except Exception as e:
-        print(f"      REST API error: {e}")
+        return gemini_gateway.generate_text(
+            prompt,
+            model=model,
+            temperature=temperature,
+            max_output_tokens=16384,  # Much higher than SDK default
+            use_grounding=use_grounding,
+            cache_ttl=cache_ttl,
+            refresh=refresh
+        )
+    except gemini_gateway.GeminiError as e:
+        print(f"      API Error: {e}")
         return None
 
 
-def prepare_articles_text(articles: list) -> str:
-    """Format articles with full content for AI. Include ALL sources for citation diversity."""
+def prepare_articles_text(articles: list, source_numbers: Optional[List[int]] = None) -> str:
+    """
+    Format articles for AI. Include ALL sources for citation diversity.
+    Articles with a 'digest' (article_digest) contribute it instead of the full text;
+    source_numbers (1-based, as assigned by the outline) limits the block to those sources.
+    """
     formatted = []
+    wanted = set(source_numbers) if source_numbers else None
     # Use ALL articles (up to 30 max to fit in context)
     for i, article in enumerate(articles[:30], 1):
-        content = article.get('content', article.get('snippet', ''))
+        if wanted is not None and i not in wanted:
+            continue
+        content = article.get('digest') or article.get('content', article.get('snippet', ''))
         # 8000 chars ~ 1200-1500 words (captures most full articles)
         if len(content) > 8000:
             content = content[:8000] + '... (truncated)'
@@ -105,12 +116,28 @@ KEY FACTS:
 """)
     
     # Add source count summary
-    summary = f"\n\n📊 TOTAL SOURCES AVAILABLE: {len(articles[:30])} — Prioritize the TOP 15 sources. Sources 16-30 are optional/supporting.\n"
+    if wanted is not None:
+        summary = f"\n\n📊 YOUR ASSIGNED SOURCES: {len(formatted)} — Build this section from these.\n"
+    else:
+        summary = f"\n\n📊 TOTAL SOURCES AVAILABLE: {len(articles[:30])} — Prioritize the TOP 15 sources. Sources 16-30 are optional/supporting.\n"
     return summary + "\n".join(formatted)
 
 
-def analyze_transcript(transcript_text: str) -> str:
-    """Analyze the transcript for engagement patterns."""
+def section_sources_text(articles: list, outline_info: Optional[dict]) -> str:
+    """Source block for one section: its assigned sources, or every source if none were assigned."""
+    assigned = []
+    for number in (outline_info or {}).get('assigned_sources', []):
+        try:
+            assigned.append(int(number))
+        except (TypeError, ValueError):
+            continue
+    if not any(1 <= n <= len(articles[:30]) for n in assigned):
+        assigned = None
+    return prepare_articles_text(articles, source_numbers=assigned)
+
+
+def analyze_transcript(transcript_text: str, refresh: bool = False) -> str:
+    """Analyze the transcript for engagement patterns (cached per transcript unless refresh)."""
     print("Step 1: Analyzing transcript for engagement patterns...")
     
     prompt = f"""ANALYZE THIS YOUTUBE TRANSCRIPT STYLE.
@@ -126,13 +153,15 @@ def analyze_transcript(transcript_text: str) -> str:
     
     Provide a "Style Guide" based on this analysis."""
 
-    return call_gemini_rest(prompt) or "Use engaging YouTube style."
+    return (call_gemini_rest(prompt, cache_ttl=llm_cache.ANALYSIS_TTL, refresh=refresh)
+            or "Use engaging YouTube style.")
 
 
-def extract_engagement_tactics(transcript_text: str) -> str:
+def extract_engagement_tactics(transcript_text: str, refresh: bool = False) -> str:
     """
     Extract specific engagement tactics from a high-performing video transcript.
     Returns 5-7 actionable tips that can be applied to new content.
+    Cached per transcript unless refresh.
     """
     print("Step 1b: Extracting engagement tactics from high-performer...")
     
@@ -162,7 +191,7 @@ ONLY include SPECIFIC techniques you observed in THIS transcript.
 
 OUTPUT ONLY THE 5-7 TIPS, nothing else."""
 
-    result = call_gemini_rest(prompt, temperature=0.3)
+    result = call_gemini_rest(prompt, temperature=0.3, cache_ttl=llm_cache.ANALYSIS_TTL, refresh=refresh)
     return result or ""
 
 
@@ -308,9 +337,14 @@ def generate_section(
     engagement_tips: str = "",
     channel_focus: str = "",
     script_mode: str = "original",
-    transcript: str = None
+    transcript: str = None,
+    section_plan: str = ""
 ) -> str:
-    """Generate a single section using the MoFu chunking pattern with outline guidance."""
+    """
+    Generate a single section using the MoFu chunking pattern with outline guidance.
+    section_plan (parallel drafting) replaces previous_content with what the
+    other sections are assigned to cover.
+    """
     
     # Strict tolerance: +/- 50 words only
     min_words = max(target_words - 50, 20)
@@ -389,6 +423,19 @@ Focus HEAVILY on the LATEST NEWS (Sources dated within last 3 days).
 Create urgency. "This just happened." "New development."
 """
 
+    if section_plan:
+        context_block = f"""=== WHAT THE OTHER SECTIONS COVER (WRITTEN IN PARALLEL - DO NOT COVER THESE) ===
+The rest of the script is being written at the same time. Its planned facts are below.
+Stay on your own assigned facts and leave these to their sections.
+
+{section_plan}"""
+    else:
+        context_block = f"""=== PREVIOUS SCRIPT CONTENT (READ THIS - DO NOT REPEAT) ===
+Below is what has ALREADY been written. You MUST read this to avoid repetition.
+Any fact, statistic, or point made below should NOT appear in your section.
+
+{previous_content[-5000:] if previous_content else "(Start of script)"}"""
+    
     print(f"  [{section_num}/{total_sections}] {section['title']} — Target: {target_words} words")
     
     prompt = f"""You are writing Section {section_num} of {total_sections} for a YouTube video script.
@@ -404,11 +451,7 @@ GOAL: {section['instructions']}
 {outline_guidance}
 {anti_repeat}
 
-=== PREVIOUS SCRIPT CONTENT (READ THIS - DO NOT REPEAT) ===
-Below is what has ALREADY been written. You MUST read this to avoid repetition.
-Any fact, statistic, or point made below should NOT appear in your section.
-
-{previous_content[-5000:] if previous_content else "(Start of script)"}
+{context_block}
 
 === SOURCE MATERIAL ===
 {articles_text}
@@ -523,35 +566,128 @@ Write the {section['title']} section now. ONLY the script text. {target_words} w
     return ""
 
 
-def generate_script(topic: str, articles: list, transcript: Optional[str] = None, word_count: int = 4000, channel_focus: str = "", script_mode: str = "original") -> dict:
-    """Generate a YouTube script using chunked MoFu pattern."""
+def _sentence_stats(sentence: str) -> set:
+    """Statistics in a sentence, normalized ('70 percent' -> '70%'). Bare small numbers and years don't count."""
+    stats = set()
+    for match in STAT_PATTERN.finditer(sentence):
+        token = re.sub(r'[\s,]', '', match.group().lower()).replace('percent', '%')
+        digits = re.sub(r'\D', '', token)
+        has_unit = token.startswith('$') or not token[-1].isdigit()
+        if has_unit or (len(digits) >= 3 and not re.fullmatch(r'(19|20)\d{2}', digits)):
+            stats.add(token)
+    return stats
+
+
+def _content_words(sentence: str) -> set:
+    words = re.findall(r"[a-z][a-z']+", sentence.lower())
+    return {w for w in words if len(w) > 3 and w not in STOPWORDS}
+
+
+def remove_repeated_facts(sections: List[str], exempt: List[bool]) -> Tuple[List[str], List[str]]:
+    """
+    Drop sentences that restate a statistic already made earlier in the script.
+
+    A sentence is a repeat when it shares a statistic with an earlier kept
+    sentence and REPEAT_OVERLAP of their content words. Exempt sections (the
+    fixed hook/promo/conclusion, which are meant to echo the body) are left
+    untouched and don't count as earlier mentions. A section that would be
+    left empty keeps its first sentence so no beat goes silent.
+
+    Returns:
+        (sections with repeats removed, removed sentences)
+    """
+    seen = []  # (stats, content words) of kept body sentences
+    removed = []
+    result = []
+    for text, is_exempt in zip(sections, exempt):
+        if is_exempt:
+            result.append(text)
+            continue
+        paragraphs = []
+        section_removed = []
+        for paragraph in re.split(r'\n\s*\n', text):
+            kept = []
+            for sentence in re.split(r'(?<=[.!?])\s+', paragraph.strip()):
+                stats = _sentence_stats(sentence)
+                words = _content_words(sentence)
+                if stats and any(
+                    stats & seen_stats
+                    and len(words & seen_words) >= REPEAT_OVERLAP * max(1, min(len(words), len(seen_words)))
+                    for seen_stats, seen_words in seen
+                ):
+                    section_removed.append(sentence)
+                    continue
+                kept.append(sentence)
+                if stats:
+                    seen.append((stats, words))
+            if kept:
+                paragraphs.append(' '.join(kept))
+        if not paragraphs and section_removed:
+            paragraphs.append(section_removed.pop(0))
+        removed.extend(section_removed)
+        result.append('\n\n'.join(paragraphs))
+    return result, removed
+
+
+def _section_plan(outline_sections: list, index: int) -> str:
+    """The other sections' assigned key facts, for a section drafted in parallel."""
+    lines = []
+    for i, info in enumerate(outline_sections):
+        if i == index or not info:
+            continue
+        facts = [kf.get('fact') for kf in info.get('key_facts', []) if kf.get('fact')]
+        if facts:
+            lines.append(f"- {info.get('section', f'Section {i + 1}')}: " + "; ".join(facts))
+    return "\n".join(lines) or "(No other facts assigned)"
+
+
+def generate_script(topic: str, articles: list, transcript: Optional[str] = None, word_count: int = 4000, channel_focus: str = "", script_mode: str = "original", refresh: bool = False, parallel: bool = False) -> dict:
+    """
+    Generate a YouTube script using chunked MoFu pattern.
+    refresh re-runs the cached transcript analyses instead of reusing them.
+    parallel drafts all sections concurrently, then removes repeated facts.
+    """
     
     if not GEMINI_API_KEY:
         return {'success': False, 'script': None, 'message': 'GEMINI_API_KEY not found'}
     
     print(f"\n{'='*60}")
     print(f"CHUNKED SCRIPT GENERATION (MoFu Pattern)")
-    print(f"Mode: {script_mode}")
+    print(f"Mode: {script_mode}{' (parallel sections)' if parallel else ''}")
     print(f"Target Total: {word_count} words")
     print(f"{'='*60}\n")
     
+    pool = ThreadPoolExecutor(max_workers=SECTION_WORKERS) if parallel else None
     try:
-        # Step 1: Analyze transcript (if available, used for style AND refinement in transcript mode)
         transcript_text = transcript if transcript else ""
         engagement_tips = ""
-        if transcript_text:
-            print("Analyzing transcript style...")
-            analysis = analyze_transcript(transcript_text)
-            engagement_tips = extract_engagement_tactics(transcript_text)
-        else:
-            analysis = "Use engaging YouTube style: hook in 5 seconds, build tension, end with question."
-        
-        # Step 2: Prepare articles
-        articles_text = prepare_articles_text(articles)
+        analysis = "Use engaging YouTube style: hook in 5 seconds, build tension, end with question."
+        outline_args = (articles, SCRIPT_SECTIONS, word_count)
+        outline_kwargs = {'script_mode': script_mode, 'transcript': transcript_text, 'topic': topic}
         
-        # Step 3: Generate outline (assigns sources to sections)
-        # Step 3: Generate outline (assigns sources to sections)
-        outline = generate_outline(articles, SCRIPT_SECTIONS, word_count, script_mode=script_mode, transcript=transcript_text, topic=topic)
+        if parallel:
+            # Steps 1 and 3 don't depend on each other
+            outline_future = pool.submit(generate_outline, *outline_args, **outline_kwargs)
+            digest_future = pool.submit(article_digest.digest_articles, articles[:30])
+            if transcript_text:
+                print("Analyzing transcript style...")
+                analysis_future = pool.submit(analyze_transcript, transcript_text, refresh=refresh)
+                tips_future = pool.submit(extract_engagement_tactics, transcript_text, refresh=refresh)
+                analysis, engagement_tips = analysis_future.result(), tips_future.result()
+            digest_future.result()
+            outline = outline_future.result()
+        else:
+            # Step 1: Analyze transcript (if available, used for style AND refinement in transcript mode)
+            if transcript_text:
+                print("Analyzing transcript style...")
+                analysis = analyze_transcript(transcript_text, refresh=refresh)
+                engagement_tips = extract_engagement_tactics(transcript_text, refresh=refresh)
+            
+            # Step 2: Digest articles once (section prompts carry fact sheets, not full bodies)
+            article_digest.digest_articles(articles[:30])
+            
+            # Step 3: Generate outline (assigns sources to sections)
+            outline = generate_outline(*outline_args, **outline_kwargs)
         outline_sections = outline.get('sections', [])
         
         # Step 4: Calculate word distribution
@@ -584,38 +720,66 @@ def generate_script(topic: str, articles: list, transcript: Optional[str] = None
         all_sections = []
         previous_content = ""
         used_facts = []  # Track facts already mentioned
+        removed_repeats = []
         
-        for i, section in enumerate(SCRIPT_SECTIONS):
-            # Get outline info for this section
-            outline_info = outline_sections[i] if i < len(outline_sections) else None
+        if parallel:
+            futures = [
+                pool.submit(
+                    generate_section,
+                    section=section,
+                    section_num=i + 1,
+                    total_sections=len(SCRIPT_SECTIONS),
+                    target_words=section_targets[i],
+                    articles_text=section_sources_text(
+                        articles, outline_sections[i] if i < len(outline_sections) else None
+                    ),
+                    analysis=analysis,
+                    previous_content="",
+                    outline_info=outline_sections[i] if i < len(outline_sections) else None,
+                    engagement_tips=engagement_tips,
+                    channel_focus=channel_focus,
+                    script_mode=script_mode,
+                    transcript=transcript_text,
+                    section_plan=_section_plan(outline_sections, i)
+                )
+                for i, section in enumerate(SCRIPT_SECTIONS)
+            ]
+            drafts = [future.result() for future in futures]
             
-            # Extract key facts from outline to track
-            if outline_info:
-                for kf in outline_info.get('key_facts', []):
-                    if kf.get('fact'):
-                        used_facts.append(kf.get('fact'))
-            
-            section_content = generate_section(
-                section=section,
-                section_num=i + 1,
-                total_sections=len(SCRIPT_SECTIONS),
-                target_words=section_targets[i],
-                articles_text=articles_text,
-                analysis=analysis,
-                previous_content=previous_content,
-                outline_info=outline_info,
-                engagement_tips=engagement_tips,
-                used_facts=used_facts,
-                channel_focus=channel_focus,
-                script_mode=script_mode,
-                transcript=transcript_text
+            # Step 5b: Reconcile - the outline keeps sections apart, this catches what slipped through
+            all_sections, removed_repeats = remove_repeated_facts(
+                drafts, exempt=['fixed_words' in section for section in SCRIPT_SECTIONS]
             )
+            print(f"\nReconciliation: removed {len(removed_repeats)} repeated-fact sentences")
+        else:
+            for i, section in enumerate(SCRIPT_SECTIONS):
+                # Get outline info for this section
+                outline_info = outline_sections[i] if i < len(outline_sections) else None
+            
+                # Extract key facts from outline to track
+                if outline_info:
+                    for kf in outline_info.get('key_facts', []):
+                        if kf.get('fact'):
+                            used_facts.append(kf.get('fact'))
             
-            all_sections.append(section_content)
-            previous_content += "\n\n" + section_content
+                section_content = generate_section(
+                    section=section,
+                    section_num=i + 1,
+                    total_sections=len(SCRIPT_SECTIONS),
+                    target_words=section_targets[i],
+                    articles_text=section_sources_text(articles, outline_info),
+                    analysis=analysis,
+                    previous_content=previous_content,
+                    outline_info=outline_info,
+                    engagement_tips=engagement_tips,
+                    used_facts=used_facts,
+                    channel_focus=channel_focus,
+                    script_mode=script_mode,
+                    transcript=transcript_text
+                )
             
-            # Rate limit pause
-            time.sleep(2)
+                all_sections.append(section_content)
+                previous_content += "\n\n" + section_content
         
         # Step 5: Combine with section markers for chunking
         # Add markers so chunker can keep sections like CHANNEL_PROMO as independent chunks
@@ -642,7 +806,9 @@ def generate_script(topic: str, articles: list, transcript: Optional[str] = None
                 'target_words': word_count,
                 'raw_text': full_script,  # With markers for chunking
                 'clean_text': clean_script,  # Without markers for display
-                'analysis': analysis
+                'analysis': analysis,
+                'parallel': parallel,
+                'removed_repeats': removed_repeats
             },
             'message': f"Script generated: {actual_words} words"
         }
@@ -651,6 +817,9 @@ def generate_script(topic: str, articles: list, transcript: Optional[str] = None
         import traceback
         traceback.print_exc()
         return {'success': False, 'script': None, 'message': f'Script generation failed: {str(e)}'}
+    finally:
+        if pool:
+            pool.shutdown(wait=False, cancel_futures=True)
 
 
 if __name__ == '__main__':
@@ -660,6 +829,7 @@ if __name__ == '__main__':
     parser.add_argument('--transcript', '-r')
     parser.add_argument('--words', '-w', type=int, default=4000)
     parser.add_argument('--output', '-o')
+    parser.add_argument('--parallel', action='store_true', help='Draft all sections concurrently')
     args = parser.parse_args()
     
     with open(args.articles, 'r') as f:
@@ -674,7 +844,8 @@ if __name__ == '__main__':
         topic='',
         articles=articles if isinstance(articles, list) else articles.get('articles', []),
         transcript=transcript,
-        word_count=args.words
+        word_count=args.words,
+        parallel=args.parallel
     )
     
     if args.output and result['success']:
@@ -214,8 +214,20 @@ def burn_subtitles(video_path: str, ass_path: str, output_path: str) -> bool:
         return False
 
 
-def generate_subtitled_video(video_path: str, audio_path: str = None, output_dir: str = None) -> dict:
-    """Main function: Generate subtitles and burn into video."""
+def generate_subtitled_video(video_path: str, audio_path: str = None, output_dir: str = None,
+                             progress_callback=None) -> dict:
+    """
+    Main function: Generate subtitles and burn into video.
+
+    progress_callback: Optional callable that takes (current, total, message) per step
+    """
+    def report(step, message):
+        if progress_callback:
+            try:
+                progress_callback(step, 3, message)
+            except Exception as e:
+                print(f"Progress callback error: {e}")
+
     video_path = Path(video_path)
     
     if not video_path.exists():
@@ -232,6 +244,7 @@ def generate_subtitled_video(video_path: str, audio_path: str = None, output_dir
     if not audio_path:
         audio_path = output_dir / f"{video_path.stem}_groq.mp3"
         print(f"🎵 Extracting audio for Groq...")
+        report(0, "Extracting audio...")
         extract_cmd = [
             'ffmpeg', '-y',
             '-i', str(video_path),
@@ -243,6 +256,7 @@ def generate_subtitled_video(video_path: str, audio_path: str = None, output_dir
     
     try:
         # Step 1: Transcribe using Groq (Audio -> SRT)
+        report(1, "Transcribing audio...")
         srt_content = transcribe_to_srt(str(audio_path))
         
         # Save SRT
@@ -257,6 +271,7 @@ def generate_subtitled_video(video_path: str, audio_path: str = None, output_dir
             f.write(ass_content)
         
         # Step 3: Burn subtitles into video
+        report(2, "Burning subtitles into video...")
         output_video = output_dir / f"{video_path.stem}_subtitled.mp4"
         success = burn_subtitles(str(video_path), str(ass_path), str(output_video))
         
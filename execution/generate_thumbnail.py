@@ -4,29 +4,47 @@ AI Thumbnail Generation.
 Creates thumbnails based on topic using AI image generation.
 Supports style reference for consistent branding.
 Includes compression for YouTube (<2MB) and title-based naming.
+
+generate_thumbnail_candidates() requests several images for the same prompt
+concurrently and yields each one as it finishes, so a picker can show the
+first candidate while the rest are still rendering instead of the user
+clicking regenerate one image at a time.
 """
+import io
 import os
+import sys
 import re
 import json
-import base64
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, Iterator
 from dotenv import load_dotenv
-import google.generativeai as genai
 from PIL import Image
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from execution import gemini_gateway
+
 load_dotenv()
 
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY') or os.getenv('GOOGLE_API_KEY')
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
 
 # Base directory
 BASE_DIR = Path(__file__).parent.parent
 TMP_DIR = BASE_DIR / '.tmp'
 ASSETS_DIR = BASE_DIR / 'assets'
 
+# Candidates per generate_thumbnail_candidates() call (image calls are paced
+# by gemini_gateway's per-model budget)
+THUMBNAIL_CANDIDATES = int(os.getenv('THUMBNAIL_CANDIDATES', '3'))
+MAX_THUMBNAIL_MB = 2.0
+MIN_JPEG_QUALITY = 50
+MAX_JPEG_QUALITY = 95
+# Quality used while searching for a resize factor
+RESIZE_JPEG_QUALITY = 85
+MIN_RESIZE_SCALE = 0.25
+
 
 def sanitize_filename(title: str, max_length: int = 100) -> str:
     """Convert title to safe filename."""
@@ -38,10 +56,22 @@ def sanitize_filename(title: str, max_length: int = 100) -> str:
     return safe[:max_length]
 
 
-def compress_thumbnail(image_path: str, max_size_mb: float = 2.0) -> str:
+def _jpeg_bytes(img: Image.Image, quality: int) -> bytes:
+    """Encode an RGB image as JPEG in memory."""
+    buffer = io.BytesIO()
+    img.save(buffer, 'JPEG', quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+def compress_thumbnail(image_path: str, max_size_mb: float = MAX_THUMBNAIL_MB) -> str:
     """
     Compress image to under max_size_mb for YouTube upload.
     Converts to JPEG if needed for better compression.
+
+    Binary-searches the highest JPEG quality (MIN..MAX_JPEG_QUALITY) that
+    fits; if even the lowest quality is too big, binary-searches the largest
+    downscale that fits at RESIZE_JPEG_QUALITY. Every attempt is encoded in
+    memory and only the chosen result is written.
     """
     max_size_bytes = max_size_mb * 1024 * 1024
     
@@ -57,24 +87,60 @@ def compress_thumbnail(image_path: str, max_size_mb: float = 2.0) -> str:
     img = Image.open(image_path)
     
     # Convert to RGB if necessary (for JPEG)
-    if img.mode in ('RGBA', 'P'):
+    if img.mode != 'RGB':
         img = img.convert('RGB')
     
     # Change extension to jpg for output
     output_path = str(Path(image_path).with_suffix('.jpg'))
-    
-    quality = 95
-    while quality >= 50:
-        img.save(output_path, 'JPEG', quality=quality, optimize=True)
-        new_size = os.path.getsize(output_path)
-        
-        if new_size <= max_size_bytes:
-            print(f"✅ Compressed to {new_size / 1024 / 1024:.2f}MB (quality={quality})")
-            return output_path
-        
-        quality -= 5
-    
-    print(f"⚠️ Could only compress to {new_size / 1024 / 1024:.2f}MB")
+    attempts = 0
+
+    # Highest quality that fits; the common case fits at the top quality
+    best, best_quality = None, None
+    data = _jpeg_bytes(img, MAX_JPEG_QUALITY)
+    attempts += 1
+    if len(data) <= max_size_bytes:
+        best, best_quality = data, MAX_JPEG_QUALITY
+        low, high = MAX_JPEG_QUALITY + 1, MAX_JPEG_QUALITY
+    else:
+        low, high = MIN_JPEG_QUALITY, MAX_JPEG_QUALITY - 1
+    while low <= high:
+        quality = (low + high) // 2
+        data = _jpeg_bytes(img, quality)
+        attempts += 1
+        if len(data) <= max_size_bytes:
+            best, best_quality = data, quality
+            low = quality + 1
+        else:
+            high = quality - 1
+
+    if best is not None:
+        setting = f"quality={best_quality}"
+    else:
+        # Even the lowest quality is too big: largest scale that fits
+        smallest = None
+        low, high = MIN_RESIZE_SCALE, 1.0
+        for _ in range(7):
+            scale = (low + high) / 2
+            size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+            data = _jpeg_bytes(img.resize(size, Image.LANCZOS), RESIZE_JPEG_QUALITY)
+            attempts += 1
+            if len(data) <= max_size_bytes:
+                best, setting = data, f"{size[0]}x{size[1]}, quality={RESIZE_JPEG_QUALITY}"
+                low = scale
+            else:
+                smallest = data if smallest is None or len(data) < len(smallest) else smallest
+                high = scale
+        if best is None:
+            best = smallest
+            setting = None
+
+    with open(output_path, 'wb') as f:
+        f.write(best)
+
+    if setting:
+        print(f"✅ Compressed to {len(best) / 1024 / 1024:.2f}MB ({setting}, {attempts} encodes)")
+    else:
+        print(f"⚠️ Could only compress to {len(best) / 1024 / 1024:.2f}MB")
     return output_path
 
 
@@ -203,13 +269,6 @@ def analyze_thumbnail_recipe(image_path: str, title_context: str = "") -> str:
     Returns a strict instruction set for the image generator.
     """
     try:
-        import requests
-        api_key = GEMINI_API_KEY
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={api_key}"
-        
-        with open(image_path, "rb") as image_file:
-            image_data = base64.b64encode(image_file.read()).decode("utf-8")
-            
         prompt = f"""You are a YouTube Thumbnail Reverse-Engineer.
         
         CONTEXT TITLE: "{title_context}" (The video this thumb belongs to)
@@ -233,21 +292,14 @@ def analyze_thumbnail_recipe(image_path: str, title_context: str = "") -> str:
         
         Keep it concise. Focus on the RECIPE."""
         
-        payload = {
-            "contents": [{
-                "parts": [
-                    {"text": prompt},
-                    {"inline_data": {"mime_type": "image/jpeg", "data": image_data}}
-                ]
-            }]
-        }
-        
-        response = requests.post(url, json=payload, timeout=30)
-        if response.status_code == 200:
-            return response.json()['candidates'][0]['content']['parts'][0]['text']
-        else:
-            print(f"⚠️ Recipe analysis failed: {response.text}")
-            return None
+        return gemini_gateway.generate_text(
+            [prompt, gemini_gateway.image_part(image_path)],
+            model='gemini-2.0-flash',
+            timeout=30
+        )
+    except gemini_gateway.GeminiError as e:
+        print(f"⚠️ Recipe analysis failed: {e}")
+        return None
     except Exception as e:
         print(f"⚠️ Recipe analysis error: {e}")
         return None
@@ -259,8 +311,6 @@ def refine_prompt_with_grounding(prompt: str, topic: str, recipe: str = "", key_
     Key figure (money amount) should be passed if available from transcript.
     """
     try:
-        model = genai.GenerativeModel('gemini-2.0-flash') 
-        
         # Extract or use provided key figure
         top_text = key_figure if key_figure else extract_key_figure_from_topic(topic)
         
@@ -331,10 +381,10 @@ Write a detailed image generation prompt that:
 4. Ends with: "FULL BLEED 16:9 IMAGE. NO BLACK BORDERS. Boxes must be IDENTICAL sizes."
 """
         
-        response = model.generate_content(refine_prompt)
+        refined = gemini_gateway.generate_text(refine_prompt, model='gemini-2.0-flash')
            
-        if response.text:
-            return response.text.strip()
+        if refined:
+            return refined.strip()
         return prompt
         
     except Exception as e:
@@ -448,23 +498,11 @@ def extract_key_figure_from_transcript(transcript: str, research: dict = None) -
     
     return None  # Caller should handle fallback
 
-def generate_thumbnail_with_gemini(
-    topic: str,
-    output_path: str = None,
-    style_reference: str = None
-) -> Optional[str]:
+def build_thumbnail_prompt(topic: str, style_reference: str = None) -> str:
     """
-    Generate thumbnail using Gemini's image generation.
-    Args:
-        topic: Video topic for the thumbnail
-        output_path: Where to save the image
-        style_reference: Optional path to reference image for style
+    Final image prompt for a topic: the basic prompt, or with a style
+    reference, its analyzed recipe refined against the locked template.
     """
-    if not output_path:
-        output_dir = TMP_DIR / 'thumbnails'
-        output_dir.mkdir(parents=True, exist_ok=True)
-        output_path = str(output_dir / 'thumbnail.png')
-    
     # 1. Create Base Prompt
     base_prompt = generate_thumbnail_prompt(topic, "")
     final_prompt = base_prompt
@@ -499,6 +537,28 @@ IMPORTANT ADAPTATION:
     else:
         print("⚠️ No style reference provided, using basic prompt.")
     
+    return final_prompt
+
+
+def generate_thumbnail_with_gemini(
+    topic: str,
+    output_path: str = None,
+    style_reference: str = None
+) -> Optional[str]:
+    """
+    Generate thumbnail using Gemini's image generation.
+    Args:
+        topic: Video topic for the thumbnail
+        output_path: Where to save the image
+        style_reference: Optional path to reference image for style
+    """
+    if not output_path:
+        output_dir = TMP_DIR / 'thumbnails'
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_path = str(output_dir / 'thumbnail.png')
+    
+    final_prompt = build_thumbnail_prompt(topic, style_reference)
+    
     # 4. Generate Image (PASSING THE REFERENCE IMAGE FOR VISUAL GROUNDING)
     print(f"🎨 Calling Image Generator... (Ref: {Path(style_reference).name if style_reference else 'None'})")
     success = generate_thumbnail_image_only(
@@ -510,7 +570,61 @@ IMPORTANT ADAPTATION:
     if success:
         return output_path
     return None
-    
+
+
+def generate_thumbnail_candidates(
+    topic: str,
+    count: int = THUMBNAIL_CANDIDATES,
+    output_dir: str = None,
+    style_reference: str = None,
+    auto_compress: bool = True
+) -> Iterator[Dict]:
+    """
+    Generate several thumbnails for a topic concurrently.
+
+    The prompt (recipe analysis + refinement) is built once and shared; the
+    image calls run in parallel and each result is yielded as soon as it
+    finishes, in completion order.
+
+    Args:
+        topic: Video topic for the thumbnail
+        count: Number of candidates to request
+        output_dir: Where to save them (default .tmp/thumbnails)
+        style_reference: Optional path to reference image for style
+        auto_compress: Whether to compress each candidate to <2MB for YouTube
+
+    Yields:
+        {'index': 1-based candidate number, 'success': bool, 'path' or 'error'}
+    """
+    output_dir = Path(output_dir) if output_dir else TMP_DIR / 'thumbnails'
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+    count = max(1, count)
+
+    final_prompt = build_thumbnail_prompt(topic, style_reference)
+    print(f"🎨 Requesting {count} thumbnail candidates... (Ref: {Path(style_reference).name if style_reference else 'None'})")
+
+    def make_candidate(index: int) -> Dict:
+        output_path = str(output_dir / f"thumbnail_{stamp}_{index}.png")
+        if not generate_thumbnail_image_only(final_prompt, output_path, reference_image_path=style_reference):
+            return {'index': index, 'success': False, 'error': 'Image generation failed'}
+        if auto_compress:
+            output_path = compress_thumbnail(output_path)
+        return {'index': index, 'success': True, 'path': output_path}
+
+    pool = ThreadPoolExecutor(max_workers=count, thread_name_prefix='thumbnail')
+    try:
+        futures = [pool.submit(make_candidate, i + 1) for i in range(count)]
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                yield {'index': futures.index(future) + 1, 'success': False, 'error': str(e)}
+    finally:
+        # A consumer that stops early (e.g. after picking one) drops the rest
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
 def generate_thumbnail_image_only(prompt: str, output_path: str, reference_image_path: str = None) -> bool:
     """
     Directly call the Imagen 3 / Gemini Image Generation API with a prompt.
@@ -518,60 +632,33 @@ def generate_thumbnail_image_only(prompt: str, output_path: str, reference_image
     Returns True if successful.
     """
     try:
-        import requests
-        
-        # Use Nano Banana Pro (gemini-3-pro-image-preview) for GENERATION
-        api_key = GEMINI_API_KEY
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-3-pro-image-preview:generateContent?key={api_key}"
-        
-        parts = [{"text": prompt}]
+        parts = [prompt]
         
         # Add Reference Image if provided
         if reference_image_path and Path(reference_image_path).exists():
             print(f"   👁️ Attaching Reference Image: {Path(reference_image_path).name}")
-            with open(reference_image_path, "rb") as img_file:
-                b64_data = base64.b64encode(img_file.read()).decode("utf-8")
-                parts.append({
-                    "inline_data": {
-                        "mime_type": "image/jpeg", # Assuming JPEG/PNG, API is flexible
-                        "data": b64_data
-                    }
-                })
-        
-        payload = {
-            "contents": [{
-                "parts": parts
-            }],
-            "generationConfig": {
-                "responseModalities": ["TEXT", "IMAGE"]
-            }
-        }
+            # Assuming JPEG/PNG, API is flexible
+            parts.append(gemini_gateway.image_part(reference_image_path))
         
         print("🎨 Sending generation request...")
-        response = requests.post(url, json=payload, timeout=120)
+        # Use Nano Banana Pro (gemini-3-pro-image-preview) for GENERATION
+        image_data = gemini_gateway.generate_image(parts, model='gemini-3-pro-image-preview')
         
-        if response.status_code == 200:
-            result = response.json()
+        if image_data:
+            # Ensure output directory exists
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
             
-            for candidate in result.get('candidates', []):
-                for part in candidate.get('content', {}).get('parts', []):
-                    if 'inlineData' in part:
-                        image_data = base64.b64decode(part['inlineData']['data'])
-                        
-                        # Ensure output directory exists
-                        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-                        
-                        with open(output_path, 'wb') as f:
-                            f.write(image_data)
-                        print(f"✅ Thumbnail saved: {output_path}")
-                        return True
-            
-            print("⚠️ No image in response")
-            return False
-        else:
-            print(f"❌ API error: {response.status_code} - {response.text[:200]}")
-            return False
+            with open(output_path, 'wb') as f:
+                f.write(image_data)
+            print(f"✅ Thumbnail saved: {output_path}")
+            return True
         
+        print("⚠️ No image in response")
+        return False
+        
+    except gemini_gateway.GeminiError as e:
+        print(f"❌ API error: {e}")
+        return False
     except Exception as e:
         print(f"❌ Thumbnail generation failed: {e}")
         return False
@@ -2,19 +2,49 @@
 """
 Generate YouTube Timestamps (Chapters) from SRT file.
 Creates chapter markers based on content segments using AI.
+
+Chapter cut points are found locally: either the script's known beat
+boundaries, or lexical-cohesion segmentation (TextTiling) of the subtitles,
+where a chapter starts at the deepest dips in word overlap between the
+text before and after a point. The model only titles each chapter from a
+short digest, in one batched call, so cost doesn't grow with video length.
 """
 import os
+import sys
 import re
+import json
+import math
+import bisect
+from collections import Counter
 from pathlib import Path
 from typing import List, Dict, Optional
 from dotenv import load_dotenv
-import google.generativeai as genai
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from execution import gemini_gateway
 
 load_dotenv()
 
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY') or os.getenv('GOOGLE_API_KEY')
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
+
+CHAPTER_MODEL = 'gemini-2.5-flash-lite'
+# Subtitles are grouped into ~BLOCK_SECONDS blocks; the cohesion across a
+# gap compares COHESION_BLOCKS blocks on either side
+BLOCK_SECONDS = 20
+COHESION_BLOCKS = 3
+# YouTube needs chapters of 10s+; shorter than a minute reads as noise
+MIN_CHAPTER_SECONDS = 60
+DIGEST_WORDS = 60
+KEY_TERMS = 8
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each even few for from further
+get got had has have having he her here hers him his how if in into is it its just know like more
+most my no nor not now of off on once one only or other our out over own really same she should
+so some still such than that the their them then there these they this those through to too two
+under until up very was way we were what when where which while who whom why will with would you your
+""".split())
 
 
 def parse_srt(srt_path: str) -> List[Dict]:
@@ -79,102 +109,225 @@ def seconds_to_youtube_time(seconds: float) -> str:
         return f"{h}:{m:02d}:{s:02d}"
 
 
-def generate_chapter_titles(srt_entries: List[Dict], num_chapters: int = 10) -> List[Dict]:
+def _terms(text: str) -> Counter:
+    words = re.findall(r"[a-z][a-z'-]+", text.lower())
+    return Counter(w for w in words if len(w) > 2 and w not in STOPWORDS)
+
+
+def _cosine(a: Counter, b: Counter) -> float:
+    if not a or not b:
+        return 0.0
+    dot = sum(count * b[term] for term, count in a.items() if term in b)
+    return dot / math.sqrt(sum(v * v for v in a.values()) * sum(v * v for v in b.values()))
+
+
+def _blocks(srt_entries: List[Dict]) -> List[Dict]:
+    """Group subtitles into ~BLOCK_SECONDS blocks: {start, entry (first index), terms}."""
+    blocks = []
+    for i, entry in enumerate(srt_entries):
+        start = srt_time_to_seconds(entry['start_time'])
+        if not blocks or start - blocks[-1]['start'] >= BLOCK_SECONDS:
+            blocks.append({'start': start, 'entry': i, 'terms': Counter()})
+        blocks[-1]['terms'].update(_terms(entry['text']))
+    return blocks
+
+
+def _depth_scores(blocks: List[Dict]) -> List[float]:
     """
-    Use AI to generate chapter titles based on SRT content.
-    Divides video into logical chapters based on content shifts.
-    
+    TextTiling depth score of the gap before each block (0 for the first).
+    High = vocabulary shifts here more than around it.
+    """
+    n = len(blocks)
+    similarity = [0.0] * n
+    for g in range(1, n):
+        left = sum((b['terms'] for b in blocks[max(0, g - COHESION_BLOCKS):g]), Counter())
+        right = sum((b['terms'] for b in blocks[g:g + COHESION_BLOCKS]), Counter())
+        similarity[g] = _cosine(left, right)
+
+    depths = [0.0] * n
+    for g in range(1, n):
+        left_peak = right_peak = similarity[g]
+        j = g - 1
+        while j >= 1 and similarity[j] >= left_peak:
+            left_peak = similarity[j]
+            j -= 1
+        j = g + 1
+        while j < n and similarity[j] >= right_peak:
+            right_peak = similarity[j]
+            j += 1
+        depths[g] = (left_peak - similarity[g]) + (right_peak - similarity[g])
+    return depths
+
+
+def beat_boundaries(srt_entries: List[Dict], beat_texts: List[str]) -> List[int]:
+    """
+    Subtitle index where each beat after the first starts.
+
+    The subtitles are the narrated script, so beats are aligned by
+    cumulative word count (scaled, in case cleanup changed the count).
+    """
+    entry_offsets = []
+    total = 0
+    for entry in srt_entries:
+        entry_offsets.append(total)
+        total += len(entry['text'].split())
+    beat_words = [len(text.split()) for text in beat_texts if text and text.strip()]
+    if not total or not sum(beat_words):
+        return []
+
+    scale = total / sum(beat_words)
+    cuts = []
+    offset = 0
+    for words in beat_words[:-1]:
+        offset += words
+        target = offset * scale
+        index = bisect.bisect_left(entry_offsets, target)
+        if index >= len(srt_entries):
+            break
+        if index > 0 and target - entry_offsets[index - 1] < entry_offsets[index] - target:
+            index -= 1
+        if index > 0:
+            cuts.append(index)
+    return cuts
+
+
+def detect_chapter_boundaries(
+    srt_entries: List[Dict],
+    num_chapters: int = 10,
+    beat_texts: Optional[List[str]] = None,
+    min_chapter_seconds: float = MIN_CHAPTER_SECONDS
+) -> List[int]:
+    """
+    Pick chapter start points locally (no model call).
+
     Args:
         srt_entries: Parsed SRT entries
-        num_chapters: Target number of chapters (8-12 recommended)
-    
+        num_chapters: Maximum number of chapters
+        beat_texts: Script beats in order; if given, chapters start at beat
+                    boundaries (the deepest topic shifts win if there are too many)
+
     Returns:
-        List of dicts with: time (YouTube format), title, seconds
+        Sorted subtitle indexes where chapters start (always starts with 0)
     """
     if not srt_entries:
         return []
-    
-    # Get full transcript with timestamps
-    full_text = ""
-    for entry in srt_entries:
-        seconds = srt_time_to_seconds(entry['start_time'])
-        time_str = seconds_to_youtube_time(seconds)
-        full_text += f"[{time_str}] {entry['text']}\n"
-    
-    # Limit text for API (increased from 15000 to support longer videos)
-    # ~60000 chars covers ~45 min of video
-    full_text = full_text[:60000]
-    
-    prompt = f"""Analyze this video transcript and create {num_chapters} chapter timestamps.
 
-TRANSCRIPT:
-{full_text}
+    blocks = _blocks(srt_entries)
+    depths = _depth_scores(blocks)
+    if beat_texts:
+        block_starts = [b['entry'] for b in blocks]
+        candidates = [
+            (1.0 + depths[max(0, bisect.bisect_right(block_starts, index) - 1)], index)
+            for index in beat_boundaries(srt_entries, beat_texts)
+        ]
+    else:
+        # TextTiling's cutoff: only gaps deeper than mean - stdev/2 count as shifts
+        gaps = depths[1:]
+        cutoff = 0.0
+        if gaps:
+            mean = sum(gaps) / len(gaps)
+            cutoff = max(0.0, mean - math.sqrt(sum((d - mean) ** 2 for d in gaps) / len(gaps)) / 2)
+        candidates = [(depths[g], blocks[g]['entry']) for g in range(1, len(blocks)) if depths[g] > cutoff]
+
+    video_end = srt_time_to_seconds(srt_entries[-1]['end_time'])
+    starts, times = [0], [0.0]
+    for _, index in sorted(candidates, reverse=True):
+        if len(starts) >= num_chapters:
+            break
+        seconds = srt_time_to_seconds(srt_entries[index]['start_time'])
+        if video_end - seconds < min_chapter_seconds:
+            continue
+        if any(abs(seconds - other) < min_chapter_seconds for other in times):
+            continue
+        starts.append(index)
+        times.append(seconds)
+    return sorted(starts)
+
+
+def _segment_digests(srt_entries: List[Dict], starts: List[int]) -> List[Dict]:
+    """Opening words and most distinctive terms of each chapter."""
+    bounds = list(zip(starts, starts[1:] + [len(srt_entries)]))
+    texts = [' '.join(e['text'] for e in srt_entries[a:b]) for a, b in bounds]
+    segment_terms = [_terms(text) for text in texts]
+    doc_freq = Counter(term for terms in segment_terms for term in terms)
+
+    digests = []
+    for text, terms in zip(texts, segment_terms):
+        weight = lambda t: terms[t] * math.log((1 + len(texts)) / (1 + doc_freq[t]) + 1)
+        digests.append({
+            'opening': ' '.join(text.split()[:DIGEST_WORDS]),
+            'key_terms': sorted(terms, key=weight, reverse=True)[:KEY_TERMS]
+        })
+    return digests
+
+
+def title_segments(digests: List[Dict]) -> List[str]:
+    """
+    One batched model call titling every chapter from its digest.
+    Chapters the model doesn't title are named from their key terms.
+    """
+    listing = "\n\n".join(
+        f"SEGMENT {i + 1}\nOpens with: {d['opening']}...\nKey terms: {', '.join(d['key_terms'])}"
+        for i, d in enumerate(digests)
+    )
+    prompt = f"""Write a YouTube chapter title for each of these {len(digests)} consecutive video segments.
+
+{listing}
 
 RULES:
-1. Create exactly {num_chapters} chapters
-2. First chapter MUST start at 0:00
-3. Each chapter title should be 3-7 words, descriptive but concise
-4. Identify natural topic shifts/transitions
-5. Space chapters roughly evenly, minimum 1 minute apart
-6. Use title case for chapter names
-7. Make titles engaging and click-worthy
-
-OUTPUT FORMAT (exactly like this, no extra text):
-0:00 - Introduction: [Topic Hook]
-1:45 - [Chapter Title]
-3:12 - [Chapter Title]
-...
-
-TIMESTAMPS:"""
+1. Exactly {len(digests)} titles, in segment order
+2. Each title should be 3-7 words, descriptive but concise
+3. Use title case
+4. Make titles engaging and click-worthy
+5. The first title introduces the video's hook (e.g. "Introduction: [Topic Hook]")"""
 
+    titles = []
     try:
-        model = genai.GenerativeModel('gemini-2.0-flash')
-        response = model.generate_content(prompt)
-        
-        # Parse response
-        chapters = []
-        lines = response.text.strip().split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Match pattern: "0:00 - Title" or "1:23:45 - Title"
-            match = re.match(r'^(\d{1,2}:\d{2}(?::\d{2})?)\s*[-–—]\s*(.+)$', line)
-            if match:
-                time_str = match.group(1)
-                title = match.group(2).strip()
-                
-                # Convert to seconds for sorting
-                parts = time_str.split(':')
-                if len(parts) == 2:
-                    seconds = int(parts[0]) * 60 + int(parts[1])
-                else:
-                    seconds = int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
-                
-                chapters.append({
-                    'time': time_str,
-                    'title': title,
-                    'seconds': seconds
-                })
-        
-        # Sort by time
-        chapters.sort(key=lambda x: x['seconds'])
-        
-        # Ensure first chapter is 0:00
-        if chapters and chapters[0]['seconds'] != 0:
-            chapters.insert(0, {
-                'time': '0:00',
-                'title': 'Introduction',
-                'seconds': 0
-            })
-        
-        return chapters
-        
-    except Exception as e:
-        print(f"❌ Chapter generation failed: {e}")
+        titles = json.loads(gemini_gateway.generate_text(
+            prompt, model=CHAPTER_MODEL,
+            response_schema={'type': 'ARRAY', 'items': {'type': 'STRING'}}
+        ))
+    except (gemini_gateway.GeminiError, ValueError) as e:
+        print(f"⚠️ Chapter titling failed, using key terms: {e}")
+
+    result = []
+    for i, digest in enumerate(digests):
+        title = titles[i].strip() if i < len(titles) and isinstance(titles[i], str) else ''
+        if not title:
+            title = 'Introduction' if i == 0 else ' '.join(digest['key_terms'][:3]).title() or f"Part {i + 1}"
+        result.append(title)
+    return result
+
+
+def generate_chapter_titles(srt_entries: List[Dict], num_chapters: int = 10,
+                            beat_texts: Optional[List[str]] = None) -> List[Dict]:
+    """
+    Split the video into chapters locally and title them with AI.
+    
+    Args:
+        srt_entries: Parsed SRT entries
+        num_chapters: Target number of chapters (8-12 recommended)
+        beat_texts: Script beats, to cut chapters at beat boundaries
+    
+    Returns:
+        List of dicts with: time (YouTube format), title, seconds
+    """
+    if not srt_entries:
         return []
+    
+    starts = detect_chapter_boundaries(srt_entries, num_chapters, beat_texts)
+    titles = title_segments(_segment_digests(srt_entries, starts))
+    
+    chapters = []
+    for i, (index, title) in enumerate(zip(starts, titles)):
+        # First chapter MUST start at 0:00
+        seconds = 0 if i == 0 else int(srt_time_to_seconds(srt_entries[index]['start_time']))
+        chapters.append({
+            'time': seconds_to_youtube_time(seconds),
+            'title': title,
+            'seconds': seconds
+        })
+    return chapters
 
 
 def format_timestamps_for_description(chapters: List[Dict]) -> str:
@@ -189,13 +342,15 @@ def format_timestamps_for_description(chapters: List[Dict]) -> str:
     return "\n".join(lines)
 
 
-def generate_timestamps_from_srt(srt_path: str, num_chapters: int = None) -> Dict:
+def generate_timestamps_from_srt(srt_path: str, num_chapters: int = None,
+                                 beat_texts: Optional[List[str]] = None) -> Dict:
     """
     Main function: Generate timestamps from SRT file.
     
     Args:
         srt_path: Path to SRT file
         num_chapters: Target number of chapters (auto-calculated if None)
+        beat_texts: Narrated script beats, if known (chapters follow them)
     
     Returns:
         Dict with chapters list and formatted string
@@ -226,7 +381,7 @@ def generate_timestamps_from_srt(srt_path: str, num_chapters: int = None) -> Dic
         num_chapters = max(5, min(20, int(video_duration_minutes / 1.5)))
     
     print(f"🧠 Generating {num_chapters} chapter titles for {video_duration_minutes:.1f} min video...")
-    chapters = generate_chapter_titles(entries, num_chapters)
+    chapters = generate_chapter_titles(entries, num_chapters, beat_texts)
     
     if not chapters:
         return {'chapters': [], 'formatted': '', 'success': False}
@@ -2,14 +2,22 @@
 """
 Video Generation Module
 Combines audio chunks + screenshots into video segments, then assembles final video.
-Uses FFmpeg for video processing.
+Uses FFmpeg for video processing; still frames are prepared in-process with Pillow.
 """
 
 import os
+import shutil
+import hashlib
 import subprocess
+import tempfile
+import time
 import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
+
+from PIL import Image, ImageDraw, ImageFont, ImageOps
 
 # Add Homebrew bin to PATH to ensure FFmpeg is found
 os.environ["PATH"] += os.pathsep + "/opt/homebrew/bin"
@@ -21,17 +29,63 @@ SCREENSHOTS_DIR = TMP_DIR / 'screenshots'
 AUDIO_DIR = TMP_DIR / 'audio'
 VIDEO_DIR = TMP_DIR / 'video_segments'
 OUTPUT_DIR = TMP_DIR / 'final_videos'  # Changed from 'output' to 'final_videos'
+PREVIEW_DIR = TMP_DIR / 'previews'
 
 # Video settings
 VIDEO_WIDTH = 1920
 VIDEO_HEIGHT = 1080
 VIDEO_FPS = 30
-PLACEHOLDER_COLOR = "0x1a1a2e"  # Dark blue-gray
+PLACEHOLDER_COLOR = "#1a1a2e"  # Dark blue-gray
+PLACEHOLDER_FONT = "DejaVuSans.ttf"
+
+# Frame preparation: Pillow threads (resize/encode release the GIL)
+FRAME_WORKERS = min(8, os.cpu_count() or 4)
+# Images within 1% of the profile's aspect ratio go to FFmpeg untouched
+# (the segment filters scale them anyway)
+ASPECT_TOLERANCE = 0.01
+# Finished segments are kept under a hash of their inputs, so rebuilding after
+# an edit only encodes chunks whose audio, image or position changed
+SEGMENT_CACHE_DIR = VIDEO_DIR / 'reuse'
+SEGMENT_CACHE_VERSION = 1
+# Entries unused for this long are pruned (by age, so overlapping builds -
+# worker, previews, streaming - never delete each other's segments)
+SEGMENT_CACHE_TTL = 7 * 24 * 3600
+
+# Render profiles. 'final' is the full-quality output; the draft profiles are
+# for editor previews: smaller frames, ultrafast x264, lower fps, a cheap
+# crop-based pan instead of zoompan, and stream-copy concatenation.
+RENDER_PROFILES = {
+    'final': {
+        'width': VIDEO_WIDTH, 'height': VIDEO_HEIGHT, 'fps': VIDEO_FPS,
+        'preset': 'slow', 'crf': '18', 'bitrate': ['-b:v', '8M', '-maxrate', '10M', '-bufsize', '16M'],
+        'stock_preset': 'veryfast', 'stock_crf': '23', 'stock_profile': ['-profile:v', 'high', '-level', '4.0'],
+        'audio_bitrate': '192k',
+        'motion': 'kenburns', 'suffix': '', 'output_prefix': 'video',
+    },
+    'draft': {
+        'width': 854, 'height': 480, 'fps': 15,
+        'preset': 'ultrafast', 'crf': '30', 'bitrate': [],
+        # Same encoder settings as image segments so they can be stream-copied together
+        'stock_preset': 'ultrafast', 'stock_crf': '30', 'stock_profile': [], 'audio_bitrate': '96k',
+        'motion': 'simple', 'suffix': '_draft', 'output_prefix': 'draft',
+    },
+    'draft_720': {
+        'width': 1280, 'height': 720, 'fps': 24,
+        'preset': 'ultrafast', 'crf': '28', 'bitrate': [],
+        'stock_preset': 'ultrafast', 'stock_crf': '28', 'stock_profile': [], 'audio_bitrate': '128k',
+        'motion': 'simple', 'suffix': '_draft720', 'output_prefix': 'draft',
+    },
+}
+
+
+def get_render_profile(name: Optional[str]) -> Dict:
+    """Look up a render profile by name (defaults to 'final')."""
+    return RENDER_PROFILES.get(name or 'final', RENDER_PROFILES['final'])
 
 
 def ensure_directories():
     """Ensure all required directories exist."""
-    for d in [SCREENSHOTS_DIR, AUDIO_DIR, VIDEO_DIR, OUTPUT_DIR]:
+    for d in [SCREENSHOTS_DIR, AUDIO_DIR, VIDEO_DIR, OUTPUT_DIR, PREVIEW_DIR]:
         d.mkdir(parents=True, exist_ok=True)
 
 
@@ -58,71 +112,161 @@ def get_audio_duration(audio_path: str) -> float:
         return 0.0
 
 
-def create_placeholder_image(output_path: str, text: str = "") -> bool:
+@lru_cache(maxsize=8)
+def _placeholder_base(width: int, height: int) -> Image.Image:
+    """Solid background, built once per frame size."""
+    return Image.new('RGB', (width, height), PLACEHOLDER_COLOR)
+
+
+@lru_cache(maxsize=4)
+def _placeholder_font(size: int):
+    try:
+        return ImageFont.truetype(PLACEHOLDER_FONT, size)
+    except OSError:
+        return ImageFont.load_default(size=size)
+
+
+def create_placeholder_image(output_path: str, text: str = "",
+                             width: int = VIDEO_WIDTH, height: int = VIDEO_HEIGHT) -> bool:
     """Create a placeholder image for chunks without screenshots."""
     try:
-        # Create a solid color image with optional text overlay
-        cmd = [
-            'ffmpeg', '-y',
-            '-f', 'lavfi',
-            '-i', f'color=c={PLACEHOLDER_COLOR}:s={VIDEO_WIDTH}x{VIDEO_HEIGHT}:d=1',
-            '-vframes', '1',
-            output_path
-        ]
-        
+        image = _placeholder_base(width, height)
         if text:
-            # Escape special characters for FFmpeg drawtext filter
-            escaped_text = text[:50].replace("\\", "\\\\").replace("'", "'\\''").replace(":", "\\:")
-            # Add text overlay (simplified - just center text)
-            cmd = [
-                'ffmpeg', '-y',
-                '-f', 'lavfi',
-                '-i', f'color=c={PLACEHOLDER_COLOR}:s={VIDEO_WIDTH}x{VIDEO_HEIGHT}:d=1',
-                '-vf', f"drawtext=text='{escaped_text}':fontcolor=white:fontsize=32:x=(w-text_w)/2:y=(h-text_h)/2",
-                '-vframes', '1',
-                output_path
-            ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        return result.returncode == 0
+            # Simplified - just center text
+            image = image.copy()
+            draw = ImageDraw.Draw(image)
+            draw.text((width / 2, height / 2), text[:50], fill='white',
+                      font=_placeholder_font(max(12, height * 32 // VIDEO_HEIGHT)), anchor='mm')
+        image.save(output_path, compress_level=1)
+        return True
     except Exception as e:
         print(f"Error creating placeholder: {e}")
         return False
 
 
-def resize_image_for_video(input_path: str, output_path: str) -> bool:
+def resize_image_for_video(input_path: str, output_path: str,
+                           width: int = VIDEO_WIDTH, height: int = VIDEO_HEIGHT) -> bool:
     """Resize and CENTER-CROP image to fill video dimensions (16:9). No black bars."""
     try:
-        # Scale to cover the entire frame, then center-crop to exact dimensions
-        # force_original_aspect_ratio=increase scales up to fill
-        # crop=w:h centers the crop
-        cmd = [
-            'ffmpeg', '-y',
-            '-i', input_path,
-            '-vf', f'scale={VIDEO_WIDTH}:{VIDEO_HEIGHT}:force_original_aspect_ratio=increase,crop={VIDEO_WIDTH}:{VIDEO_HEIGHT}',
-            '-frames:v', '1',
-            output_path
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        return result.returncode == 0
+        with Image.open(input_path) as image:
+            # Scale to cover the entire frame, then center-crop to exact dimensions
+            frame = ImageOps.fit(image.convert('RGB'), (width, height), Image.LANCZOS)
+        frame.save(output_path, compress_level=1)
+        return True
     except Exception as e:
         print(f"Error resizing image: {e}")
         return False
 
 
+def _frame_conforms(image_path: str, width: int, height: int) -> bool:
+    """True if FFmpeg can take the image as-is: a PNG/JPEG at the frame's aspect ratio."""
+    try:
+        # Only reads the header
+        with Image.open(image_path) as image:
+            image_width, image_height = image.size
+            image_format = image.format
+    except Exception:
+        return False
+    target_aspect = width / height
+    return (image_format in ('PNG', 'JPEG')
+            and abs(image_width / image_height - target_aspect) <= ASPECT_TOLERANCE * target_aspect)
+
+
+def prepare_frame(chunk_id: int, screenshot_path: Optional[str], chunk_text: str = "",
+                  profile: str = 'final', temp_dir: Optional[str] = None) -> Tuple[str, bool]:
+    """
+    Still image for a screenshot segment.
+
+    Conforming screenshots (e.g. the 1920x1080 AI images) are used directly;
+    anything else is cover-cropped with Pillow; missing or unreadable
+    screenshots get a placeholder. Text-less placeholders are shared.
+
+    temp_dir is the calling build's private frame directory (new_frame_dir()),
+    so builds never share temp frames and one can't delete another's; without
+    it the temp frame gets a unique name in VIDEO_DIR.
+
+    Returns:
+        (image path, True if it is a temp file the caller should delete)
+    """
+    settings = get_render_profile(profile)
+    width, height = settings['width'], settings['height']
+    if temp_dir:
+        temp_image = str(Path(temp_dir) / f"temp_img_{chunk_id}{settings['suffix']}.png")
+    else:
+        temp_image = str(VIDEO_DIR / f"temp_img_{chunk_id}{settings['suffix']}_{os.getpid()}_{time.time_ns()}.png")
+
+    if screenshot_path and os.path.exists(screenshot_path):
+        if _frame_conforms(screenshot_path, width, height):
+            return screenshot_path, False
+        if resize_image_for_video(screenshot_path, temp_image, width, height):
+            return temp_image, True
+        print(f"  ⚠️ Failed to resize image, using placeholder")
+
+    text = chunk_text[:30] if chunk_text else ""
+    if not text:
+        shared = str(VIDEO_DIR / f"placeholder_{width}x{height}.png")
+        if os.path.exists(shared) or create_placeholder_image(shared, "", width, height):
+            return shared, False
+    create_placeholder_image(temp_image, text, width, height)
+    return temp_image, True
+
+
+def new_frame_dir() -> str:
+    """Private temp directory for one build's frames (remove it when the build is done)."""
+    ensure_directories()
+    return tempfile.mkdtemp(prefix='frames_', dir=VIDEO_DIR)
+
+
+def prepare_frames(chunks: List[Dict], profile: str = 'final', temp_dir: Optional[str] = None,
+                   workers: int = FRAME_WORKERS) -> Dict[int, Tuple[str, bool]]:
+    """
+    prepare_frame for every chunk that will render from a still, on a thread pool.
+
+    Chunks with an existing stock/custom video are skipped (create_video_segment
+    prepares a frame itself if that video fails). Temp frames go to temp_dir
+    (see prepare_frame).
+
+    Returns:
+        {chunk_id: (image path, is_temp)}
+    """
+    ensure_directories()
+    jobs = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for i, chunk in enumerate(chunks):
+            stock_video_path = chunk.get('stock_video_path')
+            if stock_video_path and os.path.exists(stock_video_path):
+                continue
+            chunk_id = chunk.get('id', i)
+            jobs[chunk_id] = pool.submit(
+                prepare_frame, chunk_id, chunk.get('screenshot_path'), chunk.get('text', ''), profile, temp_dir
+            )
+    frames = {chunk_id: future.result() for chunk_id, future in jobs.items()}
+    reused = sum(1 for _, is_temp in frames.values() if not is_temp)
+    print(f"🖼️ Prepared {len(frames)} frames ({reused} used as-is or shared)")
+    return frames
+
+
 def create_video_segment(
     chunk_id: int,
     audio_path: str,
     screenshot_path: Optional[str],
     chunk_text: str = "",
-    stock_video_path: Optional[str] = None
+    stock_video_path: Optional[str] = None,
+    profile: str = 'final',
+    output_path: Optional[str] = None,
+    frame: Optional[Tuple[str, bool]] = None
 ) -> Optional[str]:
     """
     Create a single video segment from audio + screenshot (or stock video).
     If stock_video_path is provided, uses that instead of the static screenshot.
+    profile selects a RENDER_PROFILES entry; output_path overrides the segment path.
+    frame is this chunk's prepare_frames entry, if already prepared; otherwise
+    the frame is made in a private temp directory removed before returning.
     Returns path to output segment or None if failed.
     """
     ensure_directories()
+    settings = get_render_profile(profile)
+    width, height, fps = settings['width'], settings['height'], settings['fps']
     
     if not os.path.exists(audio_path):
         print(f"  ❌ Audio not found: {audio_path}")
@@ -134,7 +278,7 @@ def create_video_segment(
         print(f"  ❌ Could not determine audio duration")
         return None
     
-    output_path = str(VIDEO_DIR / f'segment_{chunk_id:04d}.mp4')
+    output_path = output_path or str(VIDEO_DIR / f"segment_{chunk_id:04d}{settings['suffix']}.mp4")
     
     # Use custom/stock video if provided and exists
     # NOTE: For now, only custom uploaded videos work reliably
@@ -151,15 +295,14 @@ def create_video_segment(
                 '-map', '0:v',  # Video from stock video
                 '-map', '1:a',  # Audio from audio file
                 '-c:v', 'libx264',
-                '-preset', 'veryfast',  # Much faster (was 'slow')
-                '-crf', '23',  # Slightly lower quality but faster (was 18)
-                '-profile:v', 'high',  # QuickTime compatible
-                '-level', '4.0',
-                '-r', '30',  # Force constant 30fps
+                '-preset', settings['stock_preset'],  # veryfast for final (was 'slow')
+                '-crf', settings['stock_crf'],  # 23 for final (was 18)
+                *settings['stock_profile'],  # QuickTime compatible
+                '-r', str(fps),  # Force constant frame rate
                 '-vsync', 'cfr',  # Constant frame rate sync
-                '-vf', f'scale={VIDEO_WIDTH}:{VIDEO_HEIGHT}:force_original_aspect_ratio=decrease,pad={VIDEO_WIDTH}:{VIDEO_HEIGHT}:(ow-iw)/2:(oh-ih)/2',
+                '-vf', f'scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2',
                 '-c:a', 'aac',
-                '-b:a', '192k',
+                '-b:a', settings['audio_bitrate'],
                 '-af', f'apad=whole_dur={duration}',  # Pad audio to exact duration
                 '-pix_fmt', 'yuv420p',
                 '-t', str(duration),  # Cut at exact audio duration
@@ -181,16 +324,11 @@ def create_video_segment(
             # Fall through to screenshot logic
     
     # Standard path: use screenshot or placeholder
-    temp_image = str(VIDEO_DIR / f'temp_img_{chunk_id}.png')
-    
-    if screenshot_path and os.path.exists(screenshot_path):
-        # Resize existing screenshot
-        if not resize_image_for_video(screenshot_path, temp_image):
-            print(f"  ⚠️ Failed to resize image, using placeholder")
-            create_placeholder_image(temp_image, chunk_text[:30])
-    else:
-        # Create placeholder
-        create_placeholder_image(temp_image, chunk_text[:30] if chunk_text else "")
+    own_frame_dir = None
+    if frame is None:
+        own_frame_dir = new_frame_dir()
+        frame = prepare_frame(chunk_id, screenshot_path, chunk_text, profile, own_frame_dir)
+    frame_image, frame_is_temp = frame
     
     print(f"  📷 Creating screenshot segment: target duration {duration:.2f}s")
     
@@ -228,31 +366,40 @@ def create_video_segment(
     print(f"  {direction_icon} Pan direction: {pan_direction}")
     
     try:
-        # Create segment with SMOOTH Ken Burns pan effect
-        # zoompan at 60fps internally, then output at 30fps for smooth motion
-        vf_filter = (
-            f"scale=8000:-1,"  # Scale up image first for quality
-            f"zoompan=z={zoom}:x='(iw-iw/zoom)/2':y='{y_expr}':"
-            f"d={total_frames}:s={VIDEO_WIDTH}x{VIDEO_HEIGHT}:fps={internal_fps},"
-            f"fps={30}"  # Output at 30fps
-        )
+        if settings['motion'] == 'kenburns':
+            # Create segment with SMOOTH Ken Burns pan effect
+            # zoompan at 60fps internally, then output at 30fps for smooth motion
+            vf_filter = (
+                f"scale=8000:-1,"  # Scale up image first for quality
+                f"zoompan=z={zoom}:x='(iw-iw/zoom)/2':y='{y_expr}':"
+                f"d={total_frames}:s={width}x{height}:fps={internal_fps},"
+                f"fps={fps}"  # Output at 30fps
+            )
+        else:
+            # Draft: same pan direction and speed, done as a moving crop over a
+            # slightly enlarged frame (no 8000px upscale, no zoompan)
+            crop_progress = f"min(t/{pan_duration},1)"
+            crop_y = f"(ih-oh)*(1-{crop_progress})" if pan_direction == "up" else f"(ih-oh)*{crop_progress}"
+            vf_filter = (
+                f"scale={int(width * zoom)}:{int(height * zoom)},"
+                f"crop={width}:{height}:(iw-ow)/2:'{crop_y}',"
+                f"fps={fps}"
+            )
         
         cmd = [
             'ffmpeg', '-y',
             '-loop', '1',
-            '-i', temp_image,
+            '-i', frame_image,
             '-i', audio_path,
             '-vf', vf_filter,
             '-c:v', 'libx264',
-            '-preset', 'slow',
-            '-crf', '18',
-            '-r', '30',
+            '-preset', settings['preset'],
+            '-crf', settings['crf'],
+            '-r', str(fps),
             '-vsync', 'cfr',
-            '-b:v', '8M',
-            '-maxrate', '10M',
-            '-bufsize', '16M',
+            *settings['bitrate'],
             '-c:a', 'aac',
-            '-b:a', '192k',
+            '-b:a', settings['audio_bitrate'],
             '-pix_fmt', 'yuv420p',
             '-t', str(duration),
             output_path
@@ -264,9 +411,9 @@ def create_video_segment(
             # Verify segment duration
             segment_duration = get_audio_duration(output_path)
             print(f"  ✅ Screenshot segment created: {segment_duration:.2f}s (target: {duration:.2f}s)")
-            # Clean up temp image
-            if os.path.exists(temp_image):
-                os.remove(temp_image)
+            # Clean up temp image (never the source screenshot or shared placeholder)
+            if frame_is_temp and os.path.exists(frame_image):
+                os.remove(frame_image)
             return output_path
         else:
             print(f"  ❌ FFmpeg error: {result.stderr[:200]}")
@@ -275,10 +422,16 @@ def create_video_segment(
     except Exception as e:
         print(f"  ❌ Error creating segment: {e}")
         return None
+    finally:
+        if own_frame_dir:
+            shutil.rmtree(own_frame_dir, ignore_errors=True)
 
 
-def concatenate_segments(segment_paths: List[str], output_path: str) -> bool:
-    """Concatenate all video segments into final video."""
+def concatenate_segments(segment_paths: List[str], output_path: str, profile: str = 'final') -> bool:
+    """
+    Concatenate all video segments into final video.
+    Draft profiles stream-copy (segments share one encoding); final re-encodes.
+    """
     if not segment_paths:
         print("No segments to concatenate")
         return False
@@ -304,6 +457,24 @@ def concatenate_segments(segment_paths: List[str], output_path: str) -> bool:
             f.write(f"file '{escaped_path}'\n")
     
     try:
+        if profile != 'final':
+            cmd = [
+                'ffmpeg', '-y',
+                '-f', 'concat',
+                '-safe', '0',
+                '-i', concat_file,
+                '-c', 'copy',
+                '-movflags', '+faststart',
+                output_path
+            ]
+            print(f"   Joining draft segments (stream copy)...")
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            if os.path.exists(concat_file):
+                os.remove(concat_file)
+            if result.returncode != 0:
+                print(f"   ❌ Concat error: {result.stderr[:500]}")
+            return result.returncode == 0
+        
         # Re-encode during concatenation to ensure consistent timing
         # Use fast preset for speed, baseline profile for QuickTime compatibility
         cmd = [
@@ -345,7 +516,54 @@ def concatenate_segments(segment_paths: List[str], output_path: str) -> bool:
         return False
 
 
-def build_video_from_chunks(chunks: List[Dict], progress_callback=None) -> Dict:
+def _file_identity(path: Optional[str]) -> Optional[List[int]]:
+    if not path or not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def segment_render_key(chunk_id: int, chunk: Dict, profile: str = 'final') -> Optional[str]:
+    """
+    Hash of everything that shapes a chunk's segment, or None if it has no audio.
+
+    Files are identified by size and mtime, so relinked (renamed) assets still
+    match. Stills pan up or down by position, so that is part of the key too.
+    """
+    audio = _file_identity(chunk.get('audio_path'))
+    if audio is None:
+        return None
+    screenshot = _file_identity(chunk.get('screenshot_path'))
+    key = {
+        'version': SEGMENT_CACHE_VERSION,
+        'profile': get_render_profile(profile),
+        'audio': audio,
+        'screenshot': screenshot,
+        'stock_video': _file_identity(chunk.get('stock_video_path')),
+        'pan': (chunk_id // 2) % 2,
+        # Only drawn when there is no screenshot (placeholder)
+        'text': None if screenshot else (chunk.get('text') or '')[:30],
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()[:24]
+
+
+def _link_file(source: str, target: str) -> bool:
+    """Hard-link (or copy) source to target, replacing it. Returns success."""
+    try:
+        if os.path.exists(target):
+            os.remove(target)
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copyfile(source, target)
+        return True
+    except OSError as e:
+        print(f"  ⚠️ Could not link {source} -> {target}: {e}")
+        return False
+
+
+def build_video_from_chunks(chunks: List[Dict], progress_callback=None, progress_every: int = 20,
+                            profile: str = 'final') -> Dict:
     """
     Build complete video from chunk data.
     
@@ -357,6 +575,8 @@ def build_video_from_chunks(chunks: List[Dict], progress_callback=None) -> Dict:
     
     Args:
         progress_callback: Optional callable that takes (current, total, message) for progress updates
+        progress_every: Call progress_callback every N segments (1 = every segment)
+        profile: Render profile - 'final' (1080p) or 'draft'/'draft_720' for fast previews
     
     Returns dict with success status and output path.
     """
@@ -370,13 +590,31 @@ def build_video_from_chunks(chunks: List[Dict], progress_callback=None) -> Dict:
     ensure_directories()
     
     print(f"\n{'='*60}")
-    print(f"VIDEO GENERATION")
+    print(f"VIDEO GENERATION ({profile})")
     print(f"Processing {len(chunks)} chunks...")
     print(f"{'='*60}\n")
     
     segment_paths = []
     errors = []
     
+    # Segments whose inputs are unchanged since an earlier build are reused
+    settings = get_render_profile(profile)
+    cache_dir = SEGMENT_CACHE_DIR / (profile or 'final')
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    render_keys = {chunk.get('id', i): segment_render_key(chunk.get('id', i), chunk, profile)
+                   for i, chunk in enumerate(chunks)}
+    cached = {chunk_id for chunk_id, key in render_keys.items()
+              if key and (cache_dir / f"{key}.mp4").exists()}
+    if cached:
+        print(f"♻️  Reusing {len(cached)}/{len(chunks)} unchanged segments")
+    
+    # All still frames up front, in-process and in parallel, in this build's own directory
+    frame_dir = new_frame_dir()
+    frames = prepare_frames([
+        {**chunk, 'id': chunk.get('id', i)}
+        for i, chunk in enumerate(chunks) if chunk.get('id', i) not in cached
+    ], profile, temp_dir=frame_dir)
+    
     for i, chunk in enumerate(chunks):
         chunk_id = chunk.get('id', i)
         text = chunk.get('text', '')
@@ -386,22 +624,42 @@ def build_video_from_chunks(chunks: List[Dict], progress_callback=None) -> Dict:
         
         print(f"  [{i+1}/{len(chunks)}] Processing chunk {chunk_id}...")
         
-        # Progress callback every 20 segments
-        if progress_callback and (i + 1) % 20 == 0:
+        # Progress callback every N segments
+        if progress_callback and (i + 1) % progress_every == 0:
             try:
                 progress_callback(i + 1, len(chunks), f"⏳ Assembling video: {i + 1}/{len(chunks)} segments...")
             except Exception as e:
                 print(f"Progress callback error: {e}")
         
+        output_path = str(VIDEO_DIR / f"segment_{chunk_id:04d}{settings['suffix']}.mp4")
+        key = render_keys[chunk_id]
+        cache_path = str(cache_dir / f"{key}.mp4") if key else None
+        if chunk_id in cached and _link_file(cache_path, output_path):
+            try:
+                os.utime(cache_path)  # Still in use: keep it past the TTL
+            except OSError:
+                pass
+            segment_paths.append(output_path)
+            print(f"      ♻️ Reused segment")
+            continue
+        
+        # Never encode into a file that is still linked to a cached segment
+        if os.path.exists(output_path):
+            os.remove(output_path)
         segment_path = create_video_segment(
             chunk_id=chunk_id,
             audio_path=audio_path,
             screenshot_path=screenshot_path,
             chunk_text=text,
-            stock_video_path=stock_video_path
+            stock_video_path=stock_video_path,
+            profile=profile,
+            output_path=output_path,
+            frame=frames.get(chunk_id)
         )
         
         if segment_path:
+            if cache_path:
+                _link_file(segment_path, cache_path)
             segment_paths.append(segment_path)
             status = "✅" if screenshot_path and os.path.exists(screenshot_path) else "⚠️ (placeholder)"
             print(f"      {status} Created segment")
@@ -409,6 +667,17 @@ def build_video_from_chunks(chunks: List[Dict], progress_callback=None) -> Dict:
             errors.append(f"Chunk {chunk_id}")
             print(f"      ❌ Failed")
     
+    shutil.rmtree(frame_dir, ignore_errors=True)
+    
+    # Drop segments no build has used within the TTL (superseded edits)
+    cutoff = time.time() - SEGMENT_CACHE_TTL
+    for entry in os.scandir(cache_dir):
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass
+    
     if not segment_paths:
         return {
             'success': False,
@@ -419,10 +688,10 @@ def build_video_from_chunks(chunks: List[Dict], progress_callback=None) -> Dict:
     # Concatenate all segments - use timestamp for unique filenames
     from datetime import datetime
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    output_path = str(OUTPUT_DIR / f'video_{timestamp}.mp4')
+    output_path = str(OUTPUT_DIR / f"{get_render_profile(profile)['output_prefix']}_{timestamp}.mp4")
     print(f"\nConcatenating {len(segment_paths)} segments...")
     
-    if concatenate_segments(segment_paths, output_path):
+    if concatenate_segments(segment_paths, output_path, profile=profile):
         # Get final video duration
         duration = get_audio_duration(output_path)
         
@@ -436,7 +705,8 @@ def build_video_from_chunks(chunks: List[Dict], progress_callback=None) -> Dict:
             'output_path': output_path,
             'duration': duration,
             'segments_count': len(segment_paths),
-            'errors': errors
+            'errors': errors,
+            'profile': profile
         }
     else:
         return {
@@ -446,6 +716,29 @@ def build_video_from_chunks(chunks: List[Dict], progress_callback=None) -> Dict:
         }
 
 
+def render_chunk_preview(chunk: Dict, profile: str = 'draft') -> Optional[str]:
+    """
+    Render one chunk on its own as a draft clip for the editor.
+
+    Takes the same chunk dict as build_video_from_chunks and writes
+    PREVIEW_DIR/chunk_<id>_preview.mp4 (overwritten on each preview).
+    Returns the clip path or None if rendering failed.
+    """
+    if not check_ffmpeg():
+        return None
+    ensure_directories()
+    chunk_id = chunk.get('id', 0)
+    return create_video_segment(
+        chunk_id=chunk_id,
+        audio_path=chunk.get('audio_path', ''),
+        screenshot_path=chunk.get('screenshot_path'),
+        chunk_text=chunk.get('text', ''),
+        stock_video_path=chunk.get('stock_video_path'),
+        profile=profile,
+        output_path=str(PREVIEW_DIR / f'chunk_{chunk_id}_preview.mp4')
+    )
+
+
 def cleanup_segments():
     """Remove temporary video segments."""
     for f in VIDEO_DIR.glob('segment_*.mp4'):
@@ -453,11 +746,7 @@ def cleanup_segments():
             os.remove(f)
         except:
             pass
-    for f in VIDEO_DIR.glob('temp_img_*.png'):
-        try:
-            os.remove(f)
-        except:
-            pass
+    shutil.rmtree(SEGMENT_CACHE_DIR, ignore_errors=True)
 
 
 if __name__ == '__main__':
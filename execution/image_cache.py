@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Image Cache - Content cache for captured screenshots and reference thumbnails.
+
+Remembers which file was produced for a source (a page URL, a YouTube video
+ID) together with its SHA-256 and a 64-bit perceptual hash, so:
+
+- a URL screenshotted in the last SCREENSHOT_TTL is reused instead of
+  opening it in the browser again
+- a YouTube thumbnail downloaded in the last THUMBNAIL_TTL is reused
+- analyses of an image (e.g. the Gemini thumbnail dissection) are stored
+  against its SHA-256 and served locally until the image changes
+- near-identical images (perceptual hashes within DUPLICATE_DISTANCE bits)
+  can be flagged, so a video doesn't show the same-looking page twice
+
+Stored in .tmp/image_cache.db (SQLite, WAL) next to the files it indexes.
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+TMP_DIR = Path(__file__).parent.parent / '.tmp'
+DB_PATH = TMP_DIR / 'image_cache.db'
+
+SCREENSHOT_TTL = 7 * 24 * 3600
+THUMBNAIL_TTL = 24 * 3600
+# Max differing bits (of 64) for two images to count as near-identical
+DUPLICATE_DISTANCE = 6
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    path TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    phash TEXT,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (kind, key)
+);
+CREATE TABLE IF NOT EXISTS analyses (
+    sha256 TEXT NOT NULL,
+    name TEXT NOT NULL,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (sha256, name)
+);
+"""
+
+_local = threading.local()
+
+
+def _db() -> sqlite3.Connection:
+    """Per-thread connection with the schema in place."""
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        TMP_DIR.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(DB_PATH), timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        _local.conn = conn
+    return conn
+
+
+# ============== HASHING ==============
+
+def file_sha256(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    """Orthonormal DCT-II basis, so dct(x) = C @ x (and C @ X @ C.T in 2D)."""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    matrix = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+_DCT_32 = _dct_matrix(32)
+
+
+def perceptual_hash(path) -> Optional[str]:
+    """
+    64-bit pHash as 16 hex chars: 32x32 grayscale -> 2D DCT -> the 8x8
+    lowest frequencies compared against their median.
+
+    Returns None if the image can't be read.
+    """
+    from PIL import Image
+
+    try:
+        with Image.open(path) as image:
+            pixels = np.asarray(image.convert('L').resize((32, 32), Image.LANCZOS), dtype=np.float64)
+    except Exception as e:
+        print(f"⚠️ Could not hash {path}: {e}")
+        return None
+
+    low = (_DCT_32 @ pixels @ _DCT_32.T)[:8, :8].flatten()
+    # Skip the DC term (overall brightness) when picking the threshold
+    bits = low > np.median(low[1:])
+    return f"{int(''.join('1' if b else '0' for b in bits), 2):016x}"
+
+
+def hamming_distance(hash_a: str, hash_b: str) -> int:
+    return bin(int(hash_a, 16) ^ int(hash_b, 16)).count('1')
+
+
+# ============== IMAGES ==============
+
+def get(kind: str, key: str, max_age: Optional[float] = None) -> Optional[Dict]:
+    """
+    Cached image for a source, if its file is unchanged and fresh enough.
+
+    Returns:
+        {kind, key, path, sha256, phash, created_at} or None
+    """
+    row = _db().execute("SELECT * FROM images WHERE kind = ? AND key = ?", (kind, key)).fetchone()
+    if not row:
+        return None
+    if max_age is not None and time.time() - row['created_at'] > max_age:
+        return None
+    # Files are named per video/chunk and can be overwritten by a later capture
+    if not os.path.isfile(row['path']) or file_sha256(row['path']) != row['sha256']:
+        return None
+    return dict(row)
+
+
+def put(kind: str, key: str, path) -> Dict:
+    """Record (or replace) the image produced for a source and hash it."""
+    entry = {
+        'kind': kind,
+        'key': key,
+        'path': str(path),
+        'sha256': file_sha256(path),
+        'phash': perceptual_hash(path),
+        'created_at': time.time(),
+    }
+    conn = _db()
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO images (kind, key, path, sha256, phash, created_at) "
+            "VALUES (:kind, :key, :path, :sha256, :phash, :created_at)",
+            entry
+        )
+    return entry
+
+
+def find_similar(kind: str, phash: str, max_distance: int = DUPLICATE_DISTANCE) -> List[Dict]:
+    """Cached images of a kind whose perceptual hash is within max_distance bits."""
+    rows = _db().execute(
+        "SELECT * FROM images WHERE kind = ? AND phash IS NOT NULL", (kind,)
+    ).fetchall()
+    return [
+        {**dict(row), 'distance': distance}
+        for row in rows
+        if (distance := hamming_distance(phash, row['phash'])) <= max_distance
+    ]
+
+
+def flag_near_duplicates(results: List[Dict], id_key: str = 'chunk_index',
+                         max_distance: int = DUPLICATE_DISTANCE) -> int:
+    """
+    Mark results whose image looks like an earlier one in the same batch.
+
+    Each result needs a 'phash'; later near-duplicates get
+    'duplicate_of' = the earlier result's id_key.
+
+    Returns:
+        Number of results flagged
+    """
+    seen = []  # (phash, id)
+    flagged = 0
+    for result in results:
+        phash = result.get('phash')
+        if not result.get('success') or not phash:
+            continue
+        match = next((rid for h, rid in seen if hamming_distance(phash, h) <= max_distance), None)
+        if match is not None:
+            result['duplicate_of'] = match
+            flagged += 1
+        else:
+            seen.append((phash, result.get(id_key)))
+    return flagged
+
+
+# ============== ANALYSES ==============
+
+def get_analysis(sha256: str, name: str) -> Optional[Dict]:
+    """Stored analysis (e.g. 'thumbnail_dissection') of an image's exact content."""
+    row = _db().execute(
+        "SELECT result FROM analyses WHERE sha256 = ? AND name = ?", (sha256, name)
+    ).fetchone()
+    return json.loads(row['result']) if row else None
+
+
+def put_analysis(sha256: str, name: str, result: Dict):
+    conn = _db()
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO analyses (sha256, name, result, created_at) VALUES (?, ?, ?, ?)",
+            (sha256, name, json.dumps(result), time.time())
+        )
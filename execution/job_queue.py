@@ -6,6 +6,7 @@ Uses Redis Queue (RQ) for async job processing.
 import os
 import json
 import uuid
+import threading
 from datetime import datetime
 from typing import Optional, Dict, Any
 from redis import Redis
@@ -25,6 +26,10 @@ def get_queue(name: str = 'default'):
     """Get a queue by name."""
     return Queue(name, connection=get_redis_connection())
 
+# Dashboard media jobs read/write .tmp, so only workers sharing that volume
+# should listen on this queue (docker-compose does; separate Railway services don't)
+MEDIA_QUEUE = 'media'
+
 # Job status tracking (stored in Redis)
 class JobStatus:
     PENDING = 'pending'
@@ -66,7 +71,7 @@ def cancel_job(job_id: str) -> bool:
         redis = get_redis_connection()
         
         # Try to find and cancel the RQ job
-        for queue_name in ['high', 'default', 'low']:
+        for queue_name in ['high', 'default', 'low', MEDIA_QUEUE]:
             queue = get_queue(queue_name)
             for job in queue.jobs:
                 if job_id in str(job.args) or job_id in str(job.kwargs):
@@ -86,7 +91,7 @@ def cancel_job(job_id: str) -> bool:
         return False
 
 def queue_full_pipeline(youtube_url: str, topic: Optional[str] = None,
-                        telegram_chat_id: Optional[int] = None) -> str:
+                        telegram_chat_id: Optional[int] = None, streaming: bool = False) -> str:
     """
     Queue a full pipeline job for background processing.
     
@@ -94,6 +99,7 @@ def queue_full_pipeline(youtube_url: str, topic: Optional[str] = None,
         youtube_url: YouTube video URL to use as reference
         topic: Optional topic override (defaults to video title)
         telegram_chat_id: Optional Telegram chat ID for notifications
+        streaming: Overlap script/images/audio/stitch (see full_pipeline)
     
     Returns:
         Job ID for tracking
@@ -110,7 +116,7 @@ def queue_full_pipeline(youtube_url: str, topic: Optional[str] = None,
     queue.enqueue(
         run_full_pipeline,
         args=(job_id, youtube_url),
-        kwargs={'topic': topic, 'telegram_chat_id': telegram_chat_id},
+        kwargs={'topic': topic, 'telegram_chat_id': telegram_chat_id, 'streaming': streaming},
         job_timeout='30m',  # 30 minute timeout
         result_ttl=86400,   # Keep result for 24h
         failure_ttl=86400
@@ -182,6 +188,100 @@ def queue_step_pipeline(youtube_url: str, topic: Optional[str] = None,
     return job_id
 
 
+def _run_media_job(func, job_id: str, *args):
+    """Run a media job, marking it failed if it raises."""
+    try:
+        return func(job_id, *args)
+    except Exception as e:
+        set_job_status(job_id, JobStatus.FAILED, 0, str(e), {'success': False, 'error': str(e)})
+        raise
+
+
+def _media_worker_available() -> bool:
+    """True if any RQ worker is listening on the media queue."""
+    from rq import Worker
+    return bool(Worker.all(queue=get_queue(MEDIA_QUEUE)))
+
+
+def _queue_media_job(func, args: tuple, message: str, job_timeout: str) -> str:
+    """
+    Start a dashboard media job and return its ID immediately.
+
+    Goes to the media queue when a worker serves it, otherwise runs on a
+    background thread in this process. Either way progress is reported
+    through set_job_status.
+    """
+    job_id = create_job_id()
+    set_job_status(job_id, JobStatus.PENDING, 0, message)
+
+    if _media_worker_available():
+        get_queue(MEDIA_QUEUE).enqueue(
+            _run_media_job,
+            args=(func, job_id) + args,
+            job_timeout=job_timeout,
+            result_ttl=86400,
+            failure_ttl=86400
+        )
+    else:
+        threading.Thread(
+            target=_run_media_job,
+            args=(func, job_id) + args,
+            name=f"media-{job_id}",
+            daemon=True
+        ).start()
+
+    return job_id
+
+
+def queue_generate_all_audio(texts: list, audio_dir: str, indexes: list = None) -> str:
+    """
+    Queue batch TTS for the Video Editor chunks.
+
+    Args:
+        texts: Chunk texts in chunk order
+        audio_dir: Directory for the generated WAV files
+        indexes: Only voice these chunks (default: all)
+
+    Returns:
+        Job ID for tracking
+    """
+    from execution.media_jobs import run_generate_all_audio
+    return _queue_media_job(run_generate_all_audio, (texts, audio_dir, indexes),
+                            "Audio generation queued...", job_timeout='1h')
+
+
+def queue_build_video(video_chunks: list, profile: str = 'final') -> str:
+    """
+    Queue video assembly for the Video Editor chunks.
+
+    Args:
+        video_chunks: Chunk dicts as accepted by build_video_from_chunks
+        profile: Render profile name ('final' or a draft profile)
+
+    Returns:
+        Job ID for tracking
+    """
+    from execution.media_jobs import run_build_video
+    return _queue_media_job(run_build_video, (video_chunks, profile),
+                            f"Video build ({profile}) queued...", job_timeout='2h')
+
+
+def queue_add_subtitles(video_path: str, output_dir: str) -> str:
+    """
+    Queue subtitle transcription and burn-in for a finished video.
+
+    Args:
+        video_path: Video to subtitle
+        output_dir: Directory for the subtitle files and subtitled video
+
+    Returns:
+        Job ID for tracking
+    """
+    from execution.media_jobs import run_add_subtitles
+    return _queue_media_job(run_add_subtitles, (video_path, output_dir),
+                            "Subtitle generation queued...", job_timeout='1h')
+
+
 def approve_step(job_id: str, step_name: str) -> bool:
     """Approve a step in step-by-step pipeline."""
     redis = get_redis_connection()
@@ -5,16 +5,33 @@ Uses YouTube Data API to analyze keyword difficulty and find opportunities.
 """
 
 import os
+import sys
 import requests
 import json
-from typing import List, Dict, Optional
+from pathlib import Path
+from typing import List, Dict, Optional, Iterator
 from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from execution import youtube_api
+
+# Vectorized scoring (falls back to calculate_keyword_difficulty below)
+try:
+    from execution import video_scoring
+except ImportError:
+    video_scoring = None
+
 YOUTUBE_API_KEY = os.getenv('YOUTUBE_API_KEY')
 
+# Keywords researched in parallel (each does one search + stats lookups)
+RESEARCH_WORKERS = 6
+
 def get_autocomplete_suggestions(seed_keyword: str, region: str = 'US') -> List[str]:
     """
     Get YouTube autocomplete suggestions for a seed keyword.
@@ -139,37 +156,13 @@ def search_youtube_videos(keyword: str, max_results: int = 15, region: str = 'US
         return []
     
     try:
-        url = "https://www.googleapis.com/youtube/v3/search"
-        params = {
-            'key': YOUTUBE_API_KEY,
-            'q': keyword,
-            'part': 'snippet',
-            'type': 'video',
-            'maxResults': max_results,
-            'order': 'relevance',
-            'regionCode': region,
-            'relevanceLanguage': 'en' if region in ['US', 'GB', 'CA', 'AU'] else None
-        }
-        # Remove None values
-        params = {k: v for k, v in params.items() if v is not None}
-        
-        response = requests.get(url, params=params, timeout=15)
-        
-        if response.status_code == 200:
-            data = response.json()
-            videos = []
-            for item in data.get('items', []):
-                videos.append({
-                    'video_id': item['id']['videoId'],
-                    'title': item['snippet']['title'],
-                    'channel_id': item['snippet']['channelId'],
-                    'channel_title': item['snippet']['channelTitle'],
-                    'published_at': item['snippet']['publishedAt']
-                })
-            return videos
-        else:
-            print(f"Search API error: {response.status_code} - {response.text[:200]}")
-            return []
+        return youtube_api.search(
+            keyword,
+            max_results=max_results,
+            order='relevance',
+            region=region,
+            relevance_language='en' if region in ['US', 'GB', 'CA', 'AU'] else None
+        )
             
     except Exception as e:
         print(f"Search error: {e}")
@@ -184,30 +177,7 @@ def get_video_statistics(video_ids: List[str]) -> Dict[str, Dict]:
         return {}
     
     try:
-        url = "https://www.googleapis.com/youtube/v3/videos"
-        params = {
-            'key': YOUTUBE_API_KEY,
-            'id': ','.join(video_ids[:50]),  # Max 50 per request
-            'part': 'statistics,contentDetails'
-        }
-        
-        response = requests.get(url, params=params, timeout=15)
-        
-        if response.status_code == 200:
-            data = response.json()
-            stats = {}
-            for item in data.get('items', []):
-                vid = item['id']
-                s = item.get('statistics', {})
-                stats[vid] = {
-                    'view_count': int(s.get('viewCount', 0)),
-                    'like_count': int(s.get('likeCount', 0)),
-                    'comment_count': int(s.get('commentCount', 0)),
-                    'duration': item.get('contentDetails', {}).get('duration', '')
-                }
-            return stats
-        
-        return {}
+        return youtube_api.get_videos(video_ids)
     except Exception as e:
         print(f"Video stats error: {e}")
         return {}
@@ -221,31 +191,7 @@ def get_channel_statistics(channel_ids: List[str]) -> Dict[str, Dict]:
         return {}
     
     try:
-        # Deduplicate
-        unique_ids = list(set(channel_ids))
-        
-        url = "https://www.googleapis.com/youtube/v3/channels"
-        params = {
-            'key': YOUTUBE_API_KEY,
-            'id': ','.join(unique_ids[:50]),
-            'part': 'statistics'
-        }
-        
-        response = requests.get(url, params=params, timeout=15)
-        
-        if response.status_code == 200:
-            data = response.json()
-            stats = {}
-            for item in data.get('items', []):
-                cid = item['id']
-                s = item.get('statistics', {})
-                stats[cid] = {
-                    'subscriber_count': int(s.get('subscriberCount', 0)),
-                    'video_count': int(s.get('videoCount', 0))
-                }
-            return stats
-        
-        return {}
+        return youtube_api.get_channels(channel_ids)
     except Exception as e:
         print(f"Channel stats error: {e}")
         return {}
@@ -413,12 +359,18 @@ def research_keyword(keyword: str, region: str = 'US') -> Dict:
     video_ids = [v['video_id'] for v in videos]
     channel_ids = [v['channel_id'] for v in videos]
     
-    # Fetch statistics
-    video_stats = get_video_statistics(video_ids)
-    channel_stats = get_channel_statistics(channel_ids)
+    # Fetch statistics (both lookups in flight at once, cached across keywords)
+    try:
+        video_stats, channel_stats = youtube_api.get_videos_and_channels(video_ids, channel_ids)
+    except Exception as e:
+        print(f"Stats error: {e}")
+        video_stats, channel_stats = {}, {}
     
     # Calculate difficulty
-    metrics = calculate_keyword_difficulty(videos, video_stats, channel_stats)
+    if video_scoring:
+        metrics = video_scoring.keyword_difficulty(videos, video_stats, channel_stats)
+    else:
+        metrics = calculate_keyword_difficulty(videos, video_stats, channel_stats)
     
     return {
         'keyword': keyword,
@@ -426,6 +378,60 @@ def research_keyword(keyword: str, region: str = 'US') -> Dict:
     }
 
 
+def iter_keyword_research(seed_keyword: str, include_suggestions: bool = True,
+                          region: str = 'US') -> Iterator[Dict]:
+    """
+    Research a seed keyword and its suggestions concurrently, yielding results as they land.
+    
+    The seed search and autocomplete start together; each suggestion then runs
+    search → stats → difficulty scoring on a bounded worker pool, so stages of
+    different keywords overlap instead of running back to back.
+    
+    Yields events:
+        - {'event': 'suggestions', 'keywords': [...]}   once autocomplete returns
+        - {'event': 'seed', 'result': {...}}            seed keyword scored
+        - {'event': 'keyword', 'result': {...}}         one suggestion scored
+        - {'event': 'quota', 'quota_used': n}           last, YouTube API units spent
+    """
+    quota_before = youtube_api.get_quota_usage()['total_units']
+    pool = ThreadPoolExecutor(max_workers=RESEARCH_WORKERS, thread_name_prefix='keyword_research')
+    try:
+        seed_future = pool.submit(research_keyword, seed_keyword, region)
+        futures = {seed_future: ('seed', seed_keyword)}
+        
+        if include_suggestions:
+            print("🔍 Getting related keywords...")
+            suggestions = get_autocomplete_suggestions(seed_keyword, region=region)
+            
+            # Filter out the seed keyword itself, research up to 20
+            suggestions = [s for s in suggestions if s.lower() != seed_keyword.lower()][:20]
+            print(f"   Found {len(suggestions)} suggestions")
+            yield {'event': 'suggestions', 'keywords': suggestions}
+            
+            for suggestion in suggestions:
+                futures[pool.submit(research_keyword, suggestion, region)] = ('keyword', suggestion)
+        
+        for future in as_completed(futures):
+            keyword_type, keyword = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"Keyword research error for '{keyword}': {e}")
+                result = {
+                    'keyword': keyword,
+                    'error': str(e),
+                    'difficulty_score': 0,
+                    'difficulty_level': 'Unknown',
+                    'multiplier': 0
+                }
+            yield {'event': keyword_type, 'result': result}
+        
+        yield {'event': 'quota', 'quota_used': youtube_api.get_quota_usage()['total_units'] - quota_before}
+    finally:
+        # Caller may stop early (client disconnected); don't start queued keywords
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
 def research_keywords(seed_keyword: str, include_suggestions: bool = True, region: str = 'US') -> Dict:
     """
     Research a seed keyword and its related suggestions.
@@ -448,29 +454,16 @@ def research_keywords(seed_keyword: str, include_suggestions: bool = True, regio
         'region': region,
         'seed_result': None,
         'suggestions': [],
-        'quota_note': 'YouTube API quota: ~100 units used per keyword researched'
+        'quota_note': 'YouTube API quota: ~100 units per uncached keyword search'
     }
     
-    # Research the seed keyword
-    print("📊 Analyzing seed keyword...")
-    results['seed_result'] = research_keyword(seed_keyword, region=region)
-    
-    # Get suggestions if requested
-    if include_suggestions:
-        print("\n🔍 Getting related keywords...")
-        suggestions = get_autocomplete_suggestions(seed_keyword, region=region)
-        
-        # Filter out the seed keyword itself
-        suggestions = [s for s in suggestions if s.lower() != seed_keyword.lower()]
-        
-        print(f"   Found {len(suggestions)} suggestions")
-        
-        # Research each suggestion (up to 20)
-        max_to_research = min(len(suggestions), 20)
-        for i, suggestion in enumerate(suggestions[:20]):
-            print(f"\n   [{i+1}/{max_to_research}] ", end='')
-            result = research_keyword(suggestion, region=region)
-            results['suggestions'].append(result)
+    for event in iter_keyword_research(seed_keyword, include_suggestions, region):
+        if event['event'] == 'seed':
+            results['seed_result'] = event['result']
+        elif event['event'] == 'keyword':
+            results['suggestions'].append(event['result'])
+        elif event['event'] == 'quota':
+            results['quota_used'] = event['quota_used']
     
     # Sort suggestions by opportunity score
     results['suggestions'].sort(key=lambda x: x.get('opportunity_score', 0), reverse=True)
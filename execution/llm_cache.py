@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+LLM Cache - Persistent response cache for deterministic analysis prompts.
+
+Steps like transcript entity extraction, viral-structure analysis and
+style analysis are pure functions of their input, yet resume/regenerate
+flows used to call Gemini again for the same reference video. Callers
+opt in per call (gemini_gateway.generate(..., cache_ttl=...)); the raw
+response is stored under a hash of everything that shapes it:
+
+    CACHE_VERSION + model + request payload (prompt parts, generation
+    config, tools, system instruction)
+
+so changing the prompt template, model or settings misses naturally.
+Bump CACHE_VERSION to drop every entry at once; pass refresh=True to
+skip the lookup (the fresh response replaces the old one).
+
+Stored in .tmp/llm_cache.db (SQLite, WAL). Entries older than ANALYSIS_TTL
+are pruned from put() at most once per PRUNE_INTERVAL per process.
+"""
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+TMP_DIR = Path(__file__).parent.parent / '.tmp'
+DB_PATH = TMP_DIR / 'llm_cache.db'
+
+CACHE_VERSION = 1
+# Default lifetime for analysis responses
+ANALYSIS_TTL = 30 * 24 * 3600
+PRUNE_INTERVAL = 24 * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+_local = threading.local()
+_last_prune = 0.0
+
+
+def _db() -> sqlite3.Connection:
+    """Per-thread connection with the schema in place."""
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        TMP_DIR.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(DB_PATH), timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        _local.conn = conn
+    return conn
+
+
+def cache_key(model: str, payload: Dict) -> str:
+    """Stable hash of a generateContent request."""
+    canonical = json.dumps(
+        {'version': CACHE_VERSION, 'model': model, 'payload': payload},
+        sort_keys=True, separators=(',', ':'), ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def get(key: str, max_age: Optional[float] = None) -> Optional[Dict]:
+    """Cached response JSON, if present and fresh enough."""
+    row = _db().execute("SELECT result, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+    if not row:
+        return None
+    if max_age is not None and time.time() - row['created_at'] > max_age:
+        return None
+    return json.loads(row['result'])
+
+
+def put(key: str, model: str, result: Dict):
+    global _last_prune
+    conn = _db()
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, model, result, created_at) VALUES (?, ?, ?, ?)",
+            (key, model, json.dumps(result), time.time())
+        )
+    if time.time() - _last_prune > PRUNE_INTERVAL:
+        _last_prune = time.time()
+        removed = prune()
+        if removed:
+            print(f"🧹 LLM cache: pruned {removed} expired responses")
+
+
+def prune(max_age: float = ANALYSIS_TTL) -> int:
+    """Delete entries older than max_age. Returns the number removed."""
+    conn = _db()
+    with conn:
+        cursor = conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - max_age,))
+    return cursor.rowcount
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Media Jobs - Background versions of the Video Editor's long-running steps.
+
+The dashboard endpoints (/api/generate-all-audio, /api/build-video,
+/api/add-subtitles) resolve their inputs from app_state, hand them to one of
+these functions through job_queue, and return a job ID straight away.
+Progress is written with set_job_status after every chunk/segment/step so
+/api/job-events/<job_id> can stream it to the browser.
+
+Each function works only on plain paths and text, so it can run on an RQ
+worker that shares the .tmp volume or on a thread in the web process.
+"""
+import os
+import re
+import sys
+import time
+import base64
+from pathlib import Path
+from typing import List, Dict, Optional
+import requests
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from execution.job_queue import set_job_status, JobStatus
+from execution import chunk_assets
+from execution.media_server import versioned_url
+
+TTS_URL = "https://texttospeech.googleapis.com/v1beta1/text:synthesize"
+TTS_VOICE = {"languageCode": "en-US", "name": "en-US-Chirp3-HD-Charon"}
+
+
+def clean_tts_text(text: str) -> str:
+    """Strip references, URLs and shot labels and expand abbreviations TTS mispronounces."""
+    clean_text = re.sub(r'\[.*?\]', '', text)
+    clean_text = re.sub(r'https?://\S+', '', clean_text)
+    # Strip "Shot 1:", "Chunk 1:", "Script 1:", etc from start of lines
+    clean_text = re.sub(r'(?i)^(Shot|Chunk|Script|Scene)\s+\d+[:.]?\s*', '', clean_text)
+    clean_text = clean_text.strip()
+
+    # "US" causes awkward pause - expand to full word
+    clean_text = re.sub(r'\bUS\b(?!\s+dollars)', 'United States', clean_text)  # US but not "US dollars"
+    clean_text = re.sub(r'\bUS\s+dollars\b', 'U.S. dollars', clean_text)  # Keep "U.S. dollars" natural
+    clean_text = re.sub(r'\bUSA\b', 'United States', clean_text)
+    clean_text = re.sub(r'\bUK\b', 'United Kingdom', clean_text)
+    # Dollar amounts: "$35 trillion" sounds better as "35 trillion dollars"
+    clean_text = re.sub(r'\$(\d+(?:\.\d+)?)\s*(trillion|billion|million)', r'\1 \2 dollars', clean_text)
+    return clean_text
+
+
+def _progress_callback(job_id: str, start: int, end: int):
+    """Map a (current, total, message) callback onto the start..end progress band."""
+    def callback(current, total, message):
+        progress = start + int((end - start) * current / max(total, 1))
+        set_job_status(job_id, JobStatus.RUNNING, progress, message)
+    return callback
+
+
+def run_generate_all_audio(job_id: str, texts: List[str], audio_dir: str,
+                           indexes: Optional[List[int]] = None) -> Dict:
+    """
+    Job: batch TTS for every chunk text, one WAV per chunk.
+
+    Args:
+        job_id: Job ID for status updates
+        texts: Chunk texts in chunk order
+        audio_dir: Directory the chunk_<i>_<ts>.wav files are written to
+        indexes: Only voice these chunks (default: all)
+
+    Returns:
+        Same shape as the old synchronous /api/generate-all-audio response
+    """
+    api_key = os.getenv('GOOGLE_CLOUD_API_KEY') or os.getenv('GEMINI_API_KEY', '')
+    audio_dir = Path(audio_dir)
+    audio_dir.mkdir(parents=True, exist_ok=True)
+    report = _progress_callback(job_id, 0, 100)
+
+    targets = list(range(len(texts))) if indexes is None else [i for i in indexes if 0 <= i < len(texts)]
+    set_job_status(job_id, JobStatus.RUNNING, 0, f"Generating audio for {len(targets)} chunks...")
+
+    results = []
+    for done, i in enumerate(targets, 1):
+        text = texts[i]
+        clean_text = clean_tts_text(text)
+        if not clean_text:
+            results.append({'chunk_index': i, 'success': False, 'error': 'Empty text'})
+            report(done, len(targets), f"Audio {done}/{len(targets)} (skipped, empty text)")
+            continue
+
+        payload = {
+            "audioConfig": {
+                "audioEncoding": "LINEAR16",
+                "pitch": 0,
+                "speakingRate": 1
+            },
+            "input": {"text": clean_text},
+            "voice": TTS_VOICE
+        }
+
+        try:
+            response = requests.post(f"{TTS_URL}?key={api_key}", json=payload, timeout=60)
+            if response.status_code == 200:
+                audio_content = response.json().get('audioContent', '')
+                if audio_content:
+                    filename = f"chunk_{i}_{int(time.time())}.wav"
+                    filepath = audio_dir / filename
+                    with open(filepath, 'wb') as f:
+                        f.write(base64.b64decode(audio_content))
+                    chunk_assets.register_audio(i, filepath)
+                    results.append({
+                        'chunk_index': i,
+                        'success': True,
+                        'audio_url': versioned_url(f'/api/audio/{filename}', filepath),
+                        'path': str(filepath)
+                    })
+                else:
+                    results.append({'chunk_index': i, 'success': False, 'error': 'No audio'})
+            else:
+                error_detail = response.text[:500] if response.text else 'Unknown error'
+                print(f"TTS Error for chunk {i}: {response.status_code} - {error_detail}")
+                results.append({'chunk_index': i, 'success': False, 'error': f'API error: {response.status_code}'})
+        except Exception as e:
+            results.append({'chunk_index': i, 'success': False, 'error': str(e)})
+
+        report(done, len(targets), f"Audio {done}/{len(targets)}")
+
+        # Rate limiting
+        time.sleep(0.5)
+
+    successful = len([r for r in results if r.get('success')])
+    result = {
+        'success': True,
+        'results': results,
+        'total': len(targets),
+        'successful': successful,
+        'message': f'Generated audio for {successful}/{len(targets)} chunks'
+    }
+    set_job_status(job_id, JobStatus.COMPLETED, 100, result['message'], result)
+    return result
+
+
+def run_build_video(job_id: str, video_chunks: List[Dict], profile: str = 'final') -> Dict:
+    """
+    Job: assemble the video, reporting progress after every segment.
+
+    Args:
+        job_id: Job ID for status updates
+        video_chunks: Chunk dicts as accepted by build_video_from_chunks
+        profile: Render profile ('final' or a draft profile)
+
+    Returns:
+        Same shape as the old synchronous /api/build-video response
+    """
+    from execution.generate_video import build_video_from_chunks
+
+    set_job_status(job_id, JobStatus.RUNNING, 0, f"Building {profile} video from {len(video_chunks)} chunks...")
+
+    # Segments take up to 90%, concatenation the rest
+    build = build_video_from_chunks(
+        video_chunks,
+        progress_callback=_progress_callback(job_id, 0, 90),
+        progress_every=1,
+        profile=profile
+    )
+
+    if not build['success']:
+        result = {'success': False, 'error': build['message']}
+        set_job_status(job_id, JobStatus.FAILED, 0, build['message'], result)
+        return result
+
+    result = {
+        'success': True,
+        'message': build['message'],
+        'video_url': versioned_url(f"/api/video/{os.path.basename(build['output_path'])}", build['output_path']),
+        'duration': build.get('duration', 0),
+        'segments_count': build.get('segments_count', 0),
+        'profile': profile
+    }
+    set_job_status(job_id, JobStatus.COMPLETED, 100, build['message'], result)
+    return result
+
+
+def run_add_subtitles(job_id: str, video_path: str, output_dir: str) -> Dict:
+    """
+    Job: transcribe a video and burn styled subtitles into it.
+
+    Args:
+        job_id: Job ID for status updates
+        video_path: Video to subtitle
+        output_dir: Directory for the SRT/ASS files and subtitled video
+
+    Returns:
+        Same shape as the old synchronous /api/add-subtitles response
+    """
+    from execution.generate_subtitles import generate_subtitled_video
+
+    set_job_status(job_id, JobStatus.RUNNING, 0, f"Generating subtitles for {Path(video_path).name}...")
+
+    subtitles = generate_subtitled_video(
+        video_path=video_path,
+        output_dir=output_dir,
+        progress_callback=_progress_callback(job_id, 0, 100)
+    )
+
+    if not subtitles['success']:
+        error = subtitles.get('error', 'Unknown error')
+        set_job_status(job_id, JobStatus.FAILED, 0, error, {'success': False, 'error': error})
+        return subtitles
+
+    result = {
+        'success': True,
+        'message': 'Subtitles generated and burned successfully',
+        'original_video': f'/api/video/{Path(video_path).name}',
+        'subtitled_video': f"/api/video/{Path(subtitles['subtitled_video']).name}",
+        'srt_file': '/api/download-srt',
+        'srt_path': subtitles.get('srt_path'),
+        'ass_path': subtitles.get('ass_path')
+    }
+    set_job_status(job_id, JobStatus.COMPLETED, 100, result['message'], result)
+    return result
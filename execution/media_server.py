@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Media Server - Cache-aware serving for the dashboard's generated assets.
+
+The /api/audio, /api/video, /api/ai-images, ... routes used to call
+send_from_directory with no validators, so the editor re-downloaded every
+image and WAV on each reload. serve_media adds:
+
+- strong ETags from a content hash (cached per path/size/mtime, so each
+  file version is hashed once) -> If-None-Match gets a 304
+- HTTP Range / If-Range -> 206 partial responses for scrubbing long MP4s
+- Cache-Control: immutable for URLs built with versioned_url(), whose
+  ?v=<hash> changes whenever the file does; unversioned URLs are
+  served with no-cache and revalidated against the ETag
+- optional WAV -> Opus previews (?format=opus on audio routes), transcoded
+  once per audio version with FFmpeg and cached next to the audio
+"""
+import os
+import hashlib
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from flask import abort, request, send_file
+from werkzeug.security import safe_join
+
+TMP_DIR = Path(__file__).parent.parent / '.tmp'
+OPUS_CACHE_DIR = TMP_DIR / 'audio' / 'opus'
+
+# Versioned URLs never change content, so they can be cached for a year
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+# Characters of the content hash used in ?v=
+VERSION_LENGTH = 16
+OPUS_BITRATE = '48k'
+
+HASH_BLOCK_SIZE = 1024 * 1024
+MAX_CACHED_ETAGS = 4096
+
+_etags: Dict[str, Tuple[int, int, str]] = {}  # path -> (size, mtime_ns, digest)
+_etag_lock = threading.Lock()
+
+
+def file_etag(path) -> str:
+    """Content hash of a file, recomputed only when its size or mtime changes."""
+    path = str(path)
+    stat = os.stat(path)
+    with _etag_lock:
+        cached = _etags.get(path)
+    if cached and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+        return cached[2]
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    etag = digest.hexdigest()
+
+    with _etag_lock:
+        if len(_etags) >= MAX_CACHED_ETAGS:
+            _etags.clear()
+        _etags[path] = (stat.st_size, stat.st_mtime_ns, etag)
+    return etag
+
+
+def versioned_url(url: str, path) -> str:
+    """
+    Add ?v=<content hash> to a media URL so the browser may cache it forever.
+
+    Falls back to the plain URL if the file can't be read.
+    """
+    if not url or not path:
+        return url
+    try:
+        version = file_etag(path)[:VERSION_LENGTH]
+    except OSError:
+        return url
+    separator = '&' if '?' in url else '?'
+    return f"{url}{separator}v={version}"
+
+
+def send_media(path, mimetype: Optional[str] = None, source=None):
+    """
+    Send a file with ETag, Range and Cache-Control handling.
+
+    Args:
+        path: File to send
+        mimetype: Content type (guessed from the name if omitted)
+        source: File the request's ?v= refers to, if not path itself
+                (e.g. the WAV behind a transcoded Opus preview)
+    """
+    etag = file_etag(path)
+    response = send_file(path, mimetype=mimetype, conditional=True, etag=etag)
+
+    version = request.args.get('v')
+    source_etag = etag if source is None else file_etag(source)
+    if version and source_etag.startswith(version):
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        # Stale or unversioned URL: always revalidate (a 304 costs no body)
+        response.cache_control.no_cache = True
+    return response
+
+
+def serve_media(directory, filename: str, mimetype: Optional[str] = None):
+    """Cache-aware replacement for send_from_directory."""
+    path = safe_join(str(directory), filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+
+    if request.args.get('format') == 'opus' and path.endswith('.wav'):
+        opus_path = opus_preview(path)
+        if opus_path:
+            return send_media(opus_path, mimetype='audio/ogg', source=path)
+
+    return send_media(path, mimetype=mimetype)
+
+
+def opus_preview(wav_path) -> Optional[Path]:
+    """
+    Opus copy of a WAV for in-browser previews, cached by content hash.
+
+    Returns:
+        Path to the .opus file, or None if FFmpeg isn't available or failed
+        (the caller then serves the WAV)
+    """
+    try:
+        output_path = OPUS_CACHE_DIR / f"{file_etag(wav_path)}.opus"
+    except OSError:
+        return None
+    if output_path.exists():
+        return output_path
+
+    OPUS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # Unique temp name so concurrent requests don't write the same file
+    temp_path = output_path.with_name(f"{output_path.stem}.{os.getpid()}.{threading.get_ident()}.part.opus")
+    cmd = [
+        'ffmpeg', '-y', '-loglevel', 'error',
+        '-i', str(wav_path),
+        '-c:a', 'libopus', '-b:a', OPUS_BITRATE,
+        '-vbr', 'on', '-application', 'voip',
+        str(temp_path)
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print(f"⚠️ Opus transcode unavailable: {e}")
+        return None
+
+    if result.returncode != 0 or not temp_path.exists():
+        print(f"⚠️ Opus transcode failed: {result.stderr[:200]}")
+        temp_path.unlink(missing_ok=True)
+        return None
+
+    os.replace(temp_path, output_path)
+    return output_path
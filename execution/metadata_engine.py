@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Metadata Engine - Title, description, tags and hashtags in one Gemini call.
+
+The metadata step used to make a separate request per field, each re-sending
+the same script context. generate_fields() asks for every field at once with
+a JSON response schema, so the step is a single round trip. Any field that
+comes back missing, empty or unusable is produced by its per-field fallback
+(the old single-field generators), and those run concurrently.
+
+Used by generate_metadata.generate_full_metadata and
+tag_generator.generate_metadata (the Telegram news pipeline's metadata).
+"""
+import sys
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from execution import gemini_gateway
+
+METADATA_MODEL = 'gemini-2.0-flash'
+
+FIELD_SCHEMAS = {
+    'title': {'type': 'STRING'},
+    'description': {'type': 'STRING'},
+    'tags': {'type': 'ARRAY', 'items': {'type': 'STRING'}},
+    'hashtags': {'type': 'ARRAY', 'items': {'type': 'STRING'}},
+}
+
+
+def metadata_schema(fields) -> Dict:
+    """Response schema requiring the given FIELD_SCHEMAS fields."""
+    return {
+        'type': 'OBJECT',
+        'properties': {field: FIELD_SCHEMAS[field] for field in fields},
+        'required': list(fields),
+        'propertyOrdering': list(fields),
+    }
+
+
+def generate_fields(
+    prompt: str,
+    fallbacks: Dict[str, Callable[[], Any]],
+    cleaners: Optional[Dict[str, Callable[[Any], Any]]] = None,
+    model: str = METADATA_MODEL
+) -> Dict:
+    """
+    Generate several metadata fields with one schema-constrained call.
+
+    Args:
+        prompt: Instructions for every field (the schema fixes the JSON shape)
+        fallbacks: {field: zero-argument callable} for each wanted field; used
+                   when the combined call doesn't deliver that field
+        cleaners: {field: callable} normalizing a raw value; returning a
+                  falsy value counts as missing
+
+    Returns:
+        {field: value, ..., 'fallback_fields': [fields that used their fallback]}
+    """
+    cleaners = cleaners or {}
+    fields = list(fallbacks)
+
+    raw = {}
+    try:
+        text = gemini_gateway.generate_text(prompt, model=model, response_schema=metadata_schema(fields))
+        raw = json.loads(text)
+        if not isinstance(raw, dict):
+            raw = {}
+    except (gemini_gateway.GeminiError, ValueError) as e:
+        print(f"⚠️ Combined metadata call failed: {e}")
+
+    result = {}
+    missing = []
+    for field in fields:
+        value = raw.get(field)
+        if value and field in cleaners:
+            try:
+                value = cleaners[field](value)
+            except Exception as e:
+                print(f"⚠️ Unusable {field} in metadata response: {e}")
+                value = None
+        if value:
+            result[field] = value
+        else:
+            missing.append(field)
+
+    if missing:
+        print(f"📝 Falling back for: {', '.join(missing)}")
+        with ThreadPoolExecutor(max_workers=len(missing)) as pool:
+            futures = {field: pool.submit(fallbacks[field]) for field in missing}
+            for field, future in futures.items():
+                result[field] = future.result()
+
+    result['fallback_fields'] = missing
+    return result
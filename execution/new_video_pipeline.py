@@ -14,7 +14,9 @@ This is the primary pipeline with:
 10. File renaming
 11. YouTube upload
 
-All steps require Telegram approval.
+All steps require Telegram approval, except in auto-produce mode: approving
+the outline with "Auto-produce" streams script → images → audio → video
+(streaming_pipeline) and stops again at video approval.
 """
 
 import os
@@ -30,6 +32,10 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 # Import pipeline components
 from execution.trend_scanner import scan_trending_topics, get_evergreen_topics
+from execution.topic_index import (
+    get_indexed_topics, index_topics, is_index_fresh, watch_country,
+    ensure_trend_ingestion_scheduled
+)
 from execution.research_agent import deep_research, format_research_for_script
 from execution.style_selector import get_style_options, apply_style_to_prompt, DEFAULT_STYLE
 from execution.file_renamer import rename_output_files, generate_topic_slug, extract_topic_from_title
@@ -59,6 +65,11 @@ try:
 except ImportError:
     build_video_from_chunks = None
 
+try:
+    from execution.streaming_pipeline import produce_script_video
+except ImportError:
+    produce_script_video = None
+
 try:
     from execution.generate_subtitles import generate_subtitled_video
 except ImportError:
@@ -560,6 +571,10 @@ class NewVideoPipeline:
             await self._generate_script()
             return True
         
+        elif callback_data == "newvideo_outline_autoproduce":
+            await self._stream_production()
+            return True
+        
         elif callback_data == "newvideo_outline_regen":
             await self._regenerate_outline()
             return True
@@ -639,7 +654,13 @@ class NewVideoPipeline:
         """Scan news for trending topics."""
         await self.send_message("🔍 Scanning trending topics...")
         
-        topics = scan_trending_topics("economics")
+        # Served from the background-ingested index; live scan only on a cold index
+        topics = get_indexed_topics()
+        if not topics or not is_index_fresh():
+            ensure_trend_ingestion_scheduled()
+        if not topics:
+            topics = scan_trending_topics("economics")
+            index_topics(topics)
         
         if not topics:
             await self.send_message("No trending topics found. Showing evergreen options...")
@@ -670,9 +691,20 @@ class NewVideoPipeline:
         # Store country for later use in title regeneration
         self.state["country"] = country
         
-        # Import the country-specific search
-        from execution.trend_scanner import scan_by_country
-        topics = scan_by_country(country)
+        # Keep this country fresh in future background ingestions
+        already_watched = watch_country(country)
+        
+        # Only a watched country has had its own scan; otherwise the index
+        # holds at most a few incidental mentions
+        limit = 10  # scan_by_country returns up to 10
+        topics = get_indexed_topics(country=country, limit=limit)
+        if not already_watched or len(topics) < limit:
+            # Import the country-specific search
+            from execution.trend_scanner import scan_by_country
+            live_topics = scan_by_country(country)
+            if live_topics:
+                index_topics(live_topics, country_forced=True)
+                topics = live_topics
         
         if not topics:
             await self.send_message(f"No trending topics found for {country}. Try a different country.")
@@ -891,6 +923,7 @@ class NewVideoPipeline:
             outline_text,
             [
                 ("✅ Approve Outline", "newvideo_outline_approve"),
+                ("⚡ Approve & Auto-produce", "newvideo_outline_autoproduce"),
                 ("🔄 Regenerate", "newvideo_outline_regen"),
                 ("❌ Cancel", "newvideo_cancel")
             ]
@@ -908,24 +941,11 @@ class NewVideoPipeline:
         await self.send_message("📝 Generating 4,500-word script (~30 min video)...")
         self.state["step"] = "generating_script"
         
-        research_text = format_research_for_script(self.state["research"])
-        
-        # Include approved outline in the context
-        outline_text = ""
-        if self.state.get("outline"):
-            outline_text = f"\n\n### APPROVED OUTLINE (follow this structure EXACTLY):\n{self.state['outline']}"
-        
-        full_context = research_text + outline_text
+        full_context = self._script_context()
         
         try:
-            # Check for test mode - topic starting with "TEST:" uses short script
             topic = self.state["title"]
-            if self.state.get("test_mode") or (self.state.get("raw_topic", "").upper().startswith("TEST")):
-                target_mins = 1  # ~150 words / ~6 images for quick testing
-                self.state["test_mode"] = True
-                await self.send_message("🧪 **TEST MODE**: Generating ultra-short ~150 word script (~6 images)")
-            else:
-                target_mins = 30  # 4500 words (150 words/min × 30 min)
+            target_mins = await self._script_target_minutes()
             
             # Generate script using narrative engine (accepts research_data: str)
             result = generate_narrative_script(
@@ -999,6 +1019,90 @@ class NewVideoPipeline:
         except Exception as e:
             await self.send_message(f"❌ Script generation error: {str(e)}\n\nUse the Regenerate button to retry.")
     
+    def _script_context(self) -> str:
+        """Research plus the approved outline, as script generation context."""
+        research_text = format_research_for_script(self.state["research"])
+        
+        # Include approved outline in the context
+        outline_text = ""
+        if self.state.get("outline"):
+            outline_text = f"\n\n### APPROVED OUTLINE (follow this structure EXACTLY):\n{self.state['outline']}"
+        
+        return research_text + outline_text
+    
+    async def _script_target_minutes(self) -> int:
+        """Target script length; topics starting with "TEST" get an ultra-short script."""
+        if self.state.get("test_mode") or (self.state.get("raw_topic", "").upper().startswith("TEST")):
+            self.state["test_mode"] = True
+            await self.send_message("🧪 **TEST MODE**: Generating ultra-short ~150 word script (~6 images)")
+            return 1  # ~150 words / ~6 images for quick testing
+        return 30  # 4500 words (150 words/min × 30 min)
+    
+    async def _stream_production(self):
+        """
+        Auto-produce: write the script and stream it into images, audio and video
+        in one pass, skipping the script/style/image approvals.
+        """
+        if not produce_script_video:
+            await self.send_message("❌ Streaming production module not loaded. Use Approve Outline instead.")
+            return
+        
+        self.state["auto_approve"] = True
+        self.state["step"] = "generating_video"
+        style_id = self.state.get("style") or DEFAULT_STYLE
+        await self.send_message(
+            f"⚡ Auto-producing with style {style_id}...\n\n"
+            f"Images and audio start as each section is written; segments render as they finish."
+        )
+        
+        try:
+            target_mins = await self._script_target_minutes()
+            loop = asyncio.get_event_loop()
+            result = await loop.run_in_executor(
+                None,
+                lambda: produce_script_video(
+                    research_data=self._script_context(),
+                    topic=self.state["title"],
+                    output_dir=self.output_dir,
+                    target_minutes=target_mins,
+                    style_id=style_id
+                )
+            )
+        except Exception as e:
+            await self.send_message(f"❌ Auto-produce error: {str(e)}\n\nUse the Approve Outline button to run step by step.")
+            return
+        
+        script = result["script"].get("full_script", "")
+        if script:
+            script_path = os.path.join(self.output_dir, "script.txt")
+            with open(script_path, "w") as f:
+                f.write(script)
+            self.state["script"] = script
+            self.state["script_path"] = script_path
+        self.state["images"] = result.get("images", {})
+        self.save_state()
+        
+        if not result.get("success"):
+            await self.send_message(f"❌ Video assembly failed: {result.get('message')}")
+            return
+        
+        self.state["video_path"] = result["output_path"]
+        images = result.get("images", {})
+        await self.send_keyboard(
+            f"🎬 **Video Auto-produced**\n\n"
+            f"Duration: {result.get('duration', 0)/60:.1f} minutes\n"
+            f"Words: {result['script'].get('total_words', len(script.split()))}\n"
+            f"Images: {images.get('successful', 0)}/{images.get('total_chunks', 0)}\n"
+            f"Segments: {result.get('segments_count', 0)}\n\n"
+            f"Approve video?",
+            [
+                ("✅ Approve Video", "newvideo_video_approve"),
+                ("🔄 Regenerate", "newvideo_video_regen")
+            ]
+        )
+        self.state["step"] = "approving_video"
+        self.save_state()
+    
     async def _regenerate_script(self):
         """Regenerate script with different approach."""
         await self.send_message("🔄 Regenerating script...")
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Project Store - SQLite persistence for projects and saved videos.
+
+Replaces the whole-file data.json store. Each save/delete touches one row,
+listings read one project's rows through an index, and WAL mode lets several
+gunicorn workers read and write the same file safely.
+
+Tables:
+- projects      id, niche, created_at (insertion order = rowid)
+- saved_videos  (project_id, video_id) primary key, group_name, video JSON
+- settings      key/value (current_project)
+
+On first use an existing data.json is imported once and renamed to
+data.json.migrated.
+"""
+import os
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+BASE_DIR = Path(__file__).parent.parent
+DB_PATH = Path(os.getenv('DATA_DB_PATH', str(BASE_DIR / 'data.db')))
+LEGACY_DATA_FILE = BASE_DIR / 'data.json'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id TEXT PRIMARY KEY,
+    niche TEXT NOT NULL,
+    created_at TEXT
+);
+CREATE TABLE IF NOT EXISTS saved_videos (
+    project_id TEXT NOT NULL,
+    video_id TEXT NOT NULL,
+    group_name TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (project_id, video_id)
+);
+CREATE INDEX IF NOT EXISTS idx_saved_videos_group ON saved_videos (project_id, group_name);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+DEFAULT_GROUP = 'Uncategorized'
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = False
+
+
+def _connect() -> sqlite3.Connection:
+    """Per-thread connection (sqlite3 connections aren't shareable across threads)."""
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(str(DB_PATH), timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _local.conn = conn
+    return conn
+
+
+def _db() -> sqlite3.Connection:
+    """Connection with the schema created and data.json migrated."""
+    global _initialized
+    if not _initialized:
+        with _init_lock:
+            if not _initialized:
+                conn = _connect()
+                conn.executescript(SCHEMA)
+                _migrate_legacy_json(conn)
+                _initialized = True
+    return _connect()
+
+
+def _migrate_legacy_json(conn: sqlite3.Connection):
+    """One-time import of data.json (old flat lists become the default group)."""
+    if not LEGACY_DATA_FILE.exists():
+        return
+
+    with open(LEGACY_DATA_FILE, 'r') as f:
+        data = json.load(f)
+
+    # BEGIN IMMEDIATE so only one process imports; the rest see the rename
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if not LEGACY_DATA_FILE.exists():
+            conn.rollback()
+            return
+
+        for project in data.get('projects', []):
+            conn.execute(
+                "INSERT OR IGNORE INTO projects (id, niche, created_at) VALUES (?, ?, ?)",
+                (project['id'], project.get('niche', ''), project.get('created_at'))
+            )
+
+        for project_id, saved in data.get('saved_videos', {}).items():
+            groups = {DEFAULT_GROUP: saved} if isinstance(saved, list) else saved
+            for group_name, videos in groups.items():
+                for video in videos:
+                    conn.execute(
+                        "INSERT OR IGNORE INTO saved_videos (project_id, video_id, group_name, data) "
+                        "VALUES (?, ?, ?, ?)",
+                        (project_id, video['video_id'], group_name, json.dumps(video))
+                    )
+
+        if data.get('current_project'):
+            conn.execute(
+                "INSERT OR REPLACE INTO settings (key, value) VALUES ('current_project', ?)",
+                (data['current_project'],)
+            )
+        # Rename while still holding the write lock so no other process re-imports
+        LEGACY_DATA_FILE.rename(LEGACY_DATA_FILE.with_name('data.json.migrated'))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    print(f"📦 Migrated data.json into {DB_PATH.name}")
+
+
+# ============== PROJECTS ==============
+
+def list_projects() -> List[Dict]:
+    """All projects in creation order."""
+    rows = _db().execute("SELECT id, niche, created_at FROM projects ORDER BY rowid").fetchall()
+    return [dict(row) for row in rows]
+
+
+def get_project(project_id: str) -> Optional[Dict]:
+    row = _db().execute(
+        "SELECT id, niche, created_at FROM projects WHERE id = ?", (project_id,)
+    ).fetchone()
+    return dict(row) if row else None
+
+
+def create_project(project: Dict):
+    """Insert a project and make it current."""
+    conn = _db()
+    with conn:
+        conn.execute(
+            "INSERT INTO projects (id, niche, created_at) VALUES (?, ?, ?)",
+            (project['id'], project['niche'], project.get('created_at'))
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO settings (key, value) VALUES ('current_project', ?)",
+            (project['id'],)
+        )
+
+
+def get_current_project() -> Optional[str]:
+    row = _db().execute("SELECT value FROM settings WHERE key = 'current_project'").fetchone()
+    return row['value'] if row else None
+
+
+def set_current_project(project_id: str):
+    conn = _db()
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO settings (key, value) VALUES ('current_project', ?)",
+            (project_id,)
+        )
+
+
+# ============== SAVED VIDEOS ==============
+
+def list_saved_videos(project_id: str, group_name: Optional[str] = None,
+                      limit: Optional[int] = None, offset: int = 0) -> Dict[str, List[Dict]]:
+    """
+    Saved videos for a project, grouped by search query, in save order.
+
+    Args:
+        project_id: Project to list
+        group_name: Only this group
+        limit/offset: Page through the project's videos
+
+    Returns:
+        {group_name: [video, ...]}
+    """
+    query = "SELECT group_name, data FROM saved_videos WHERE project_id = ?"
+    params = [project_id]
+    if group_name is not None:
+        query += " AND group_name = ?"
+        params.append(group_name)
+    query += " ORDER BY rowid"
+    if limit is not None:
+        query += " LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+
+    groups: Dict[str, List[Dict]] = {}
+    for row in _db().execute(query, params):
+        groups.setdefault(row['group_name'], []).append(json.loads(row['data']))
+    return groups
+
+
+def list_saved_video_items(project_id: Optional[str] = None) -> List[Dict]:
+    """Flat list of saved videos for one project (or every project), each with project_id."""
+    if project_id:
+        rows = _db().execute(
+            "SELECT project_id, data FROM saved_videos WHERE project_id = ? ORDER BY rowid", (project_id,)
+        )
+    else:
+        rows = _db().execute("SELECT project_id, data FROM saved_videos ORDER BY rowid")
+    return [{**json.loads(row['data']), 'project_id': row['project_id']} for row in rows]
+
+
+def get_saved_video(project_id: str, video_id: str) -> Optional[Dict]:
+    row = _db().execute(
+        "SELECT data FROM saved_videos WHERE project_id = ? AND video_id = ?", (project_id, video_id)
+    ).fetchone()
+    return json.loads(row['data']) if row else None
+
+
+def save_video(project_id: str, video: Dict, group_name: str = DEFAULT_GROUP) -> Optional[str]:
+    """
+    Save a video under a group.
+
+    Returns:
+        None if saved, or the name of the group that already holds this video
+    """
+    conn = _db()
+    try:
+        with conn:
+            conn.execute(
+                "INSERT INTO saved_videos (project_id, video_id, group_name, data) VALUES (?, ?, ?, ?)",
+                (project_id, video['video_id'], group_name, json.dumps(video))
+            )
+        return None
+    except sqlite3.IntegrityError:
+        row = conn.execute(
+            "SELECT group_name FROM saved_videos WHERE project_id = ? AND video_id = ?",
+            (project_id, video['video_id'])
+        ).fetchone()
+        return row['group_name'] if row else group_name
+
+
+def remove_saved_video(project_id: str, video_id: str) -> bool:
+    """Delete a saved video. Returns True if it existed."""
+    conn = _db()
+    with conn:
+        cursor = conn.execute(
+            "DELETE FROM saved_videos WHERE project_id = ? AND video_id = ?", (project_id, video_id)
+        )
+    return cursor.rowcount > 0
@@ -8,13 +8,17 @@ Gathers comprehensive information from multiple sources:
 """
 
 import os
+import sys
 import json
 import requests
+from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime
-import google.generativeai as genai
 from dotenv import load_dotenv
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from execution import article_digest, gemini_gateway
+
 # Load .env file
 load_dotenv()
 
@@ -30,9 +34,6 @@ except ImportError:
 SERPER_API_KEY = os.environ.get("SERPER_API_KEY", "")
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "")
 
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
-
 
 def deep_research(
     topic: str, 
@@ -136,6 +137,14 @@ def deep_research(
             for article in research.get("counter_facts", []):
                 if article.get("url") in url_to_content:
                     article["content"] = url_to_content[article["url"]]
+            
+            # Digest each scraped article once; script prompts carry the fact sheets
+            article_digest.digest_articles([
+                article
+                for section in ("recent_news", "historical_context", "expert_analysis", "counter_facts")
+                for article in research.get(section, [])
+                if article.get("content")
+            ])
     
     # 6. Generate RAW FACTS compilation (no narrative, just facts)
     research["raw_facts"] = _compile_raw_facts(research)
@@ -384,9 +393,7 @@ Format as:
 - Fact 1..."""
 
     try:
-        model = genai.GenerativeModel("gemini-2.0-flash")
-        response = model.generate_content(prompt)
-        return response.text
+        return gemini_gateway.generate_text(prompt, model="gemini-2.0-flash")
     except Exception as e:
         print(f"AI facts compilation error: {e}")
         return "Research compiled. AI processing failed."
@@ -395,7 +402,8 @@ Format as:
 def format_research_for_script(research: Dict) -> str:
     """Format research into a prompt-ready string for script generation.
     
-    Now includes FULL ARTICLE CONTENT (scraped via Camoufox) for better source material.
+    Includes each scraped article's digest (article_digest fact sheet), falling
+    back to the scraped content or snippet for research saved before digests.
     """
     output = f"""# Research: {research['topic']}
 Country: {research.get('country', 'N/A')}
@@ -410,7 +418,7 @@ Date: {research['timestamp']}
     for i, news in enumerate(research["recent_news"][:15]):  # Increased from 8
         date = news.get('date', '')
         title = news.get('title', 'No title')
-        content = news.get('content', news.get('snippet', ''))
+        content = news.get('digest') or news.get('content', news.get('snippet', ''))
         
         # Include full content if available - increased limit
         if content and len(content) > 100:
@@ -422,7 +430,7 @@ Date: {research['timestamp']}
     output += f"\n## Historical Context ({len(research['historical_context'])} sources)\n"
     for i, ctx in enumerate(research["historical_context"][:5]):
         title = ctx.get('title', 'No title')
-        content = ctx.get('content', ctx.get('snippet', ''))
+        content = ctx.get('digest') or ctx.get('content', ctx.get('snippet', ''))
         
         if content and len(content) > 100:
             content_preview = content[:1500] + '...' if len(content) > 1500 else content
@@ -438,7 +446,7 @@ Date: {research['timestamp']}
     output += f"\n## Expert Analysis ({len(research.get('expert_analysis', []))} sources)\n"
     for exp in research.get("expert_analysis", [])[:3]:
         title = exp.get('title', 'No title')
-        content = exp.get('content', exp.get('snippet', ''))
+        content = exp.get('digest') or exp.get('content', exp.get('snippet', ''))
         
         if content and len(content) > 100:
             content_preview = content[:1500] + '...' if len(content) > 1500 else content
@@ -452,7 +460,7 @@ Date: {research['timestamp']}
         output += f"\n## Counter-Arguments & Opposing Views ({len(counter_facts)} sources)\n"
         for cf in counter_facts[:4]:
             title = cf.get('title', 'No title')
-            content = cf.get('content', cf.get('snippet', ''))
+            content = cf.get('digest') or cf.get('content', cf.get('snippet', ''))
             
             if content and len(content) > 100:
                 content_preview = content[:1500] + '...' if len(content) > 1500 else content
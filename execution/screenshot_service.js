@@ -0,0 +1,212 @@
+/**
+ * Screenshot Service - Long-lived browser pool for screenshot capture
+ *
+ * The capture scripts used to be spawned once per request, paying a browser
+ * cold start every time and processing URLs one after another. This service
+ * keeps one stealth Chromium warm and runs up to SCREENSHOT_CONCURRENCY tabs
+ * at once, shared by all requests, so one slow site only holds its own tab.
+ *
+ * Endpoints (localhost only):
+ *   POST /capture  { mode: 'claim' | 'url', items: [...], video_name? }
+ *                  -> application/x-ndjson, one result per line as each
+ *                     item finishes, each tagged with its input `index`
+ *   GET  /health   -> { ok, active, queued, concurrency }
+ *
+ * 'claim' items are capture_claim_screenshots.js chunks ({chunk_index, urls, ...});
+ * 'url' items are capture_screenshots_stealth.js entries ({url, ...}).
+ *
+ * Started on demand by execution/screenshot_service.py.
+ */
+
+const http = require('http');
+const fs = require('fs');
+const puppeteer = require('puppeteer-extra');
+const StealthPlugin = require('puppeteer-extra-plugin-stealth');
+
+const { captureWithValidation, withTimeout } = require('./capture_claim_screenshots');
+const { captureUrl, outputDir } = require('./capture_screenshots_stealth');
+
+// Stealth is registered once even though both capture modules are loaded
+if (!puppeteer.pluginNames.includes('stealth')) {
+    puppeteer.use(StealthPlugin());
+}
+
+const HOST = '127.0.0.1';
+const PORT = parseInt(process.env.SCREENSHOT_SERVICE_PORT || '3939', 10);
+const CONCURRENCY = parseInt(process.env.SCREENSHOT_CONCURRENCY || '4', 10);
+const ITEM_TIMEOUT_MS = 150000;  // Claim items try up to 3 URLs at 45s each
+
+// ============== BROWSER ==============
+
+let browserPromise = null;
+
+// One warm browser; relaunched lazily if it crashes or disconnects
+function getBrowser() {
+    if (!browserPromise) {
+        console.log('🌐 Launching browser...');
+        browserPromise = puppeteer.launch({
+            headless: 'new',
+            args: [
+                '--no-sandbox',
+                '--disable-setuid-sandbox',
+                '--window-size=1920,1080',
+                '--disable-blink-features=AutomationControlled'
+            ]
+        }).then(browser => {
+            browser.on('disconnected', () => {
+                console.log('⚠️ Browser disconnected, will relaunch on next capture');
+                browserPromise = null;
+            });
+            return browser;
+        }).catch(error => {
+            browserPromise = null;
+            throw error;
+        });
+    }
+    return browserPromise;
+}
+
+// ============== TAB SLOTS ==============
+
+let active = 0;
+const waiting = [];
+
+function acquireSlot() {
+    if (active < CONCURRENCY) {
+        active++;
+        return Promise.resolve();
+    }
+    return new Promise(resolve => waiting.push(resolve));
+}
+
+function releaseSlot() {
+    const next = waiting.shift();
+    if (next) {
+        next();  // Hand the slot straight to the next waiter
+    } else {
+        active--;
+    }
+}
+
+// ============== CAPTURE ==============
+
+function failure(mode, item, error) {
+    if (mode === 'claim') {
+        return { success: false, chunk_index: item.chunk_index, url: item.urls?.[0] || null, error };
+    }
+    return { success: false, url: item.url, error };
+}
+
+async function runItem(mode, item, videoName, isCancelled) {
+    if (mode === 'claim' && (!item.urls || item.urls.length === 0)) {
+        return failure(mode, item, 'No URLs provided');
+    }
+
+    await acquireSlot();
+    try {
+        // Client went away while this item was queued
+        if (isCancelled()) {
+            return failure(mode, item, 'Cancelled');
+        }
+        const browser = await getBrowser();
+        const capture = mode === 'claim'
+            ? captureWithValidation(browser, item, outputDir, videoName)
+            : captureUrl(browser, item, outputDir);
+        return await withTimeout(capture, ITEM_TIMEOUT_MS, failure(mode, item, 'Capture timeout'));
+    } catch (error) {
+        return failure(mode, item, error.message);
+    } finally {
+        releaseSlot();
+    }
+}
+
+// ============== HTTP ==============
+
+function readBody(req) {
+    return new Promise((resolve, reject) => {
+        const chunks = [];
+        req.on('data', chunk => chunks.push(chunk));
+        req.on('end', () => resolve(Buffer.concat(chunks).toString('utf8')));
+        req.on('error', reject);
+    });
+}
+
+async function handleCapture(req, res) {
+    let body;
+    try {
+        body = JSON.parse(await readBody(req));
+    } catch {
+        res.writeHead(400, { 'Content-Type': 'application/json' });
+        res.end(JSON.stringify({ error: 'Invalid JSON body' }));
+        return;
+    }
+
+    const mode = body.mode === 'claim' ? 'claim' : 'url';
+    const items = Array.isArray(body.items) ? body.items : [];
+    const videoName = body.video_name || 'video';
+
+    let closed = false;
+    res.on('close', () => { closed = true; });
+
+    res.writeHead(200, { 'Content-Type': 'application/x-ndjson', 'Cache-Control': 'no-cache' });
+    console.log(`📸 Batch: ${items.length} ${mode} items (${active} tabs busy, ${waiting.length} queued)`);
+
+    // Every item is queued at once; results are written in completion order
+    await Promise.all(items.map(async (item, index) => {
+        const result = await runItem(mode, item, videoName, () => closed);
+        if (!closed) {
+            res.write(JSON.stringify({ index, ...result }) + '\n');
+        }
+    }));
+    res.end();
+}
+
+const server = http.createServer((req, res) => {
+    if (req.method === 'GET' && req.url === '/health') {
+        res.writeHead(200, { 'Content-Type': 'application/json' });
+        res.end(JSON.stringify({ ok: true, active, queued: waiting.length, concurrency: CONCURRENCY }));
+        return;
+    }
+    if (req.method === 'POST' && req.url === '/capture') {
+        handleCapture(req, res).catch(error => {
+            console.error('Capture request failed:', error);
+            if (!res.headersSent) {
+                res.writeHead(500, { 'Content-Type': 'application/json' });
+            }
+            res.end();
+        });
+        return;
+    }
+    res.writeHead(404);
+    res.end();
+});
+
+server.on('error', error => {
+    // Another worker already started the service
+    if (error.code === 'EADDRINUSE') {
+        console.log(`Screenshot service already running on port ${PORT}`);
+        process.exit(0);
+    }
+    throw error;
+});
+
+async function shutdown() {
+    server.close();
+    if (browserPromise) {
+        try { await (await browserPromise).close(); } catch { }
+    }
+    process.exit(0);
+}
+
+process.on('SIGTERM', shutdown);
+process.on('SIGINT', shutdown);
+
+if (!fs.existsSync(outputDir)) {
+    fs.mkdirSync(outputDir, { recursive: true });
+}
+
+server.listen(PORT, HOST, () => {
+    console.log(`📸 Screenshot service on http://${HOST}:${PORT} (${CONCURRENCY} tabs)`);
+    // Warm the browser before the first request arrives
+    getBrowser().catch(error => console.error('Browser launch failed:', error.message));
+});
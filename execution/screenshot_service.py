@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Screenshot Service Client - Submit URL batches to the warm browser pool.
+
+screenshot_service.js keeps a stealth Chromium running with a fixed number
+of tabs and streams one NDJSON result per item as soon as it is captured.
+This module starts it on first use (one per host; extra gunicorn workers
+find the port taken and reuse it), submits batches and yields results in
+completion order.
+
+If Node/puppeteer can't start the service, the one-shot capture scripts
+are run instead, so callers get the same results either way (just slower).
+
+URLs captured within image_cache.SCREENSHOT_TTL are served from the image
+cache without opening a tab, and every successful result carries the
+image's perceptual hash ('phash') for duplicate checks.
+
+Modes:
+- 'claim': capture_claim_screenshots.js chunks {chunk_index, urls, claim, ...}
+- 'url':   capture_screenshots_stealth.js entries {url, highlight_text}
+"""
+import os
+import re
+import sys
+import json
+import time
+import subprocess
+import shutil
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+import requests
+
+from execution import image_cache
+
+BASE_DIR = Path(__file__).parent.parent
+TMP_DIR = BASE_DIR / '.tmp'
+SERVICE_SCRIPT = 'execution/screenshot_service.js'
+SERVICE_LOG = TMP_DIR / 'screenshot_service.log'
+SCREENSHOTS_DIR = TMP_DIR / 'screenshots'
+
+SERVICE_PORT = int(os.getenv('SCREENSHOT_SERVICE_PORT', '3939'))
+SERVICE_URL = os.getenv('SCREENSHOT_SERVICE_URL', f'http://127.0.0.1:{SERVICE_PORT}')
+AUTOSTART = os.getenv('SCREENSHOT_SERVICE_AUTOSTART', '1') == '1'
+
+STARTUP_TIMEOUT = 30
+# Longest gap between two streamed results (one item's worst case plus slack)
+READ_TIMEOUT = 200
+
+# One-shot fallbacks: (script, argument flag, overall timeout)
+FALLBACK_SCRIPTS = {
+    'claim': ('execution/capture_claim_screenshots.js', '--data', 1800),
+    'url': ('execution/capture_screenshots_stealth.js', '--urls', 600),
+}
+
+_start_lock = threading.Lock()
+
+
+def is_running() -> bool:
+    try:
+        return requests.get(f'{SERVICE_URL}/health', timeout=1).ok
+    except requests.RequestException:
+        return False
+
+
+def ensure_running() -> bool:
+    """Start screenshot_service.js if it isn't up. Returns True once it answers /health."""
+    if is_running():
+        return True
+    if not AUTOSTART:
+        return False
+
+    with _start_lock:
+        if is_running():
+            return True
+        TMP_DIR.mkdir(parents=True, exist_ok=True)
+        env = {**os.environ, 'SCREENSHOT_SERVICE_PORT': str(SERVICE_PORT)}
+        try:
+            with open(SERVICE_LOG, 'a') as log:
+                # New session so the service outlives this request/worker
+                subprocess.Popen(
+                    ['node', SERVICE_SCRIPT],
+                    cwd=str(BASE_DIR),
+                    env=env,
+                    stdout=log,
+                    stderr=subprocess.STDOUT,
+                    start_new_session=True
+                )
+        except OSError as e:
+            print(f"⚠️ Could not start screenshot service: {e}")
+            return False
+
+        deadline = time.time() + STARTUP_TIMEOUT
+        while time.time() < deadline:
+            if is_running():
+                print(f"📸 Screenshot service started on {SERVICE_URL}")
+                return True
+            time.sleep(0.5)
+
+    print(f"⚠️ Screenshot service did not come up (see {SERVICE_LOG})")
+    return False
+
+
+def _capture_with_script(mode: str, items: List[Dict], video_name: Optional[str]) -> List[Dict]:
+    """Run the one-shot capture script for a batch (service unavailable)."""
+    script, flag, timeout = FALLBACK_SCRIPTS[mode]
+    data_file = TMP_DIR / f'{mode}_capture_{os.getpid()}_{threading.get_ident()}.json'
+    payload = {'video_name': video_name or 'video', 'chunks': items} if mode == 'claim' else items
+    with open(data_file, 'w') as f:
+        json.dump(payload, f)
+
+    try:
+        result = subprocess.run(
+            ['node', script, flag, str(data_file)],
+            capture_output=True,
+            text=True,
+            cwd=str(BASE_DIR),
+            timeout=timeout
+        )
+    finally:
+        data_file.unlink(missing_ok=True)
+
+    json_match = re.search(r'__JSON_START__\s*(.*?)\s*__JSON_END__', result.stdout, re.DOTALL)
+    if result.returncode != 0 or not json_match:
+        raise RuntimeError(f"Screenshot script failed: {result.stderr[-500:] or 'no output'}")
+    return json.loads(json_match.group(1))
+
+
+def capture(mode: str, items: List[Dict], video_name: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Capture a batch, yielding each result as soon as it is ready.
+
+    Args:
+        mode: 'claim' or 'url'
+        items: Batch items (see module docstring)
+        video_name: Filename prefix for claim screenshots
+
+    Yields:
+        Result dicts, each with 'index' = position of its item in `items`
+    """
+    if mode not in FALLBACK_SCRIPTS:
+        raise ValueError(f"Unknown capture mode: {mode}")
+    if not items:
+        return
+
+    if not ensure_running():
+        for index, result in enumerate(_capture_with_script(mode, items, video_name)):
+            yield {'index': index, **result}
+        return
+
+    with requests.post(
+        f'{SERVICE_URL}/capture',
+        json={'mode': mode, 'items': items, 'video_name': video_name},
+        stream=True,
+        timeout=(5, READ_TIMEOUT)
+    ) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if line:
+                yield json.loads(line)
+
+
+def _cached_result(mode: str, item: Dict, video_name: Optional[str]) -> Optional[Dict]:
+    """Result for an item from a recent capture of (one of) its URLs, or None."""
+    urls = [item['url']] if mode == 'url' else (item.get('urls') or [])[:3]
+    for url in urls:
+        entry = image_cache.get('screenshot', url, max_age=image_cache.SCREENSHOT_TTL)
+        if not entry:
+            continue
+        if mode == 'url':
+            return {
+                'url': url,
+                'success': True,
+                'screenshot_path': os.path.relpath(entry['path'], BASE_DIR),
+                'phash': entry['phash'],
+                'cached': True
+            }
+        # Claim screenshots are named per video/chunk; copy under this batch's name
+        filename = f"{video_name or 'video'}_chunk_{item['chunk_index']:02d}.png"
+        filepath = SCREENSHOTS_DIR / filename
+        if Path(entry['path']).resolve() != filepath.resolve():
+            shutil.copyfile(entry['path'], filepath)
+        return {
+            'success': True,
+            'chunk_index': item['chunk_index'],
+            'url': url,
+            'filename': filename,
+            'filepath': str(filepath),
+            'attempt': 1,
+            'phash': entry['phash'],
+            'cached': True
+        }
+    return None
+
+
+def _remember(mode: str, result: Dict):
+    """Add a fresh capture to the image cache and tag the result with its phash."""
+    if not result.get('success') or not result.get('url'):
+        return
+    path = BASE_DIR / result['screenshot_path'] if mode == 'url' else Path(result['filepath'])
+    try:
+        result['phash'] = image_cache.put('screenshot', result['url'], path)['phash']
+    except OSError as e:
+        print(f"⚠️ Could not cache screenshot for {result['url']}: {e}")
+
+
+def capture_all(mode: str, items: List[Dict], video_name: Optional[str] = None,
+                on_result: Optional[Callable[[Dict], None]] = None,
+                use_cache: bool = True) -> List[Dict]:
+    """
+    Capture a batch and return the results in input order.
+
+    Args:
+        on_result: Called with each result as it streams in (progress/logging)
+        use_cache: Reuse recent captures of the same URLs
+    """
+    results: List[Optional[Dict]] = [None] * len(items)
+
+    pending = []  # indexes that still need the browser
+    for index, item in enumerate(items):
+        cached = _cached_result(mode, item, video_name) if use_cache else None
+        if cached:
+            results[index] = cached
+            if on_result:
+                on_result(cached)
+        else:
+            pending.append(index)
+    if len(pending) < len(items):
+        print(f"📸 {len(items) - len(pending)}/{len(items)} screenshots served from cache")
+
+    for result in capture(mode, [items[i] for i in pending], video_name):
+        index = pending[result.pop('index')]
+        _remember(mode, result)
+        results[index] = result
+        if on_result:
+            on_result(result)
+
+    # Items the service never reported (stream cut short)
+    for index, result in enumerate(results):
+        if result is None:
+            item = items[index]
+            results[index] = {
+                'success': False,
+                'chunk_index': item.get('chunk_index'),
+                'url': item.get('url') or (item.get('urls') or [None])[0],
+                'error': 'No result from screenshot service'
+            }
+    return results
+
+
+if __name__ == '__main__':
+    urls = sys.argv[1:] or ['https://example.com']
+    for r in capture('url', [{'url': u, 'highlight_text': ''} for u in urls]):
+        print(json.dumps(r))
@@ -7,13 +7,17 @@ Filters for recency.
 """
 
 import os
+import sys
 import json
 import argparse
 import requests
+from pathlib import Path
 from typing import Optional
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-import google.generativeai as genai
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from execution import gemini_gateway, llm_cache
 
 # Load environment variables
 load_dotenv()
@@ -22,19 +26,17 @@ SERPER_API_KEY = os.getenv('SERPER_API_KEY')
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
 
 
-def extract_search_queries_with_ai(transcript: str, channel_focus: str = "") -> list:
+def extract_search_queries_with_ai(transcript: str, channel_focus: str = "", refresh: bool = False) -> list:
     """
     Use Gemini to analyze transcript and extract key search queries.
     Returns a list of diverse, targeted search queries.
     If channel_focus is provided, adds 3 extra queries prioritizing that angle.
+    Queries for the same transcript/focus are reused unless refresh.
     """
     if not GEMINI_API_KEY:
         print("No Gemini API key, falling back to basic extraction")
         return extract_basic_queries(transcript)
     
-    genai.configure(api_key=GEMINI_API_KEY)
-    model = genai.GenerativeModel('gemini-2.5-flash-lite')
-    
     # Add channel focus instructions if provided
     channel_focus_instruction = ""
     if channel_focus:
@@ -66,8 +68,9 @@ Goal: Find REAL news articles with EMPIRICAL DATA and FACTS that confirm or debu
 Return ONLY a JSON array of {13 if channel_focus else 10} search query strings."""
     
     try:
-        response = model.generate_content(prompt)
-        text = response.text.strip()
+        text = gemini_gateway.generate_text(
+            prompt, model='gemini-2.5-flash-lite', cache_ttl=llm_cache.ANALYSIS_TTL, refresh=refresh
+        ).strip()
         
         # Parse JSON from response
         if text.startswith('['):
@@ -259,13 +262,14 @@ def filter_invalid_sources(articles: list) -> list:
     
     return valid
 
-def search_news(topic: str, num_articles: int = 30, transcript: Optional[str] = None, channel_focus: str = "", days_limit: int = 3) -> dict:
+def search_news(topic: str, num_articles: int = 30, transcript: Optional[str] = None, channel_focus: str = "", days_limit: int = 3, refresh: bool = False) -> dict:
     """
     Main function to search for news articles.
     Uses AI to analyze transcript and generate targeted queries.
     Searches news and general web (Twitter disabled).
     If channel_focus is provided, generates extra queries for that angle.
     days_limit: Number of days to look back (default 7). uses qdr:d{N} or qdr:w format.
+    refresh: Regenerate the AI search queries instead of reusing cached ones.
     """
     try:
         print("="*50)
@@ -278,7 +282,7 @@ def search_news(topic: str, num_articles: int = 30, transcript: Optional[str] =
         # Generate AI-powered search queries from transcript
         # Reverted to 4,000 chars as requested (sufficient for keywords)
         if transcript:
-            queries = extract_search_queries_with_ai(transcript[:4000], channel_focus=channel_focus)
+            queries = extract_search_queries_with_ai(transcript[:4000], channel_focus=channel_focus, refresh=refresh)
         else:
             queries = [topic, f"{topic} news", f"{topic} latest"]
             if channel_focus:
@@ -387,9 +391,7 @@ Example: [14, 2, 5, 0, ...]
 
 Return ONLY the JSON array."""
 
-        model = genai.GenerativeModel('gemini-2.5-flash-lite')
-        response = model.generate_content(prompt)
-        text = response.text.strip()
+        text = gemini_gateway.generate_text(prompt, model='gemini-2.5-flash-lite').strip()
         
         # Parse output
         import re
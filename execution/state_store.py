@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+State Store - Pluggable backend for the dashboard's editor state (app_state).
+
+app_state used to be a module-global dict in app.py, which tied the web app
+to a single process and lost everything on restart. StateStore keeps the
+same dict-style interface but reads and writes one field at a time through a
+backend, namespaced per project:
+
+- memory (default): plain dicts in this process, same behaviour as before
+- redis:            one hash per namespace (app_state:<project_id>), each
+                    field stored as JSON; shared by all gunicorn workers and
+                    kept across restarts
+
+Select with APP_STATE_BACKEND=redis (uses REDIS_URL).
+
+Values returned by the redis backend are fresh copies, so code that mutates
+a list/dict from the state must assign it back (app_state[key] = value).
+"""
+import os
+import sys
+import json
+import copy
+import threading
+from pathlib import Path
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterator, Optional
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+APP_STATE_BACKEND = os.getenv('APP_STATE_BACKEND', 'memory').lower()
+DEFAULT_NAMESPACE = 'default'
+
+_MISSING = object()
+
+
+class MemoryStateBackend:
+    """Per-process dict storage (single-worker deployments and local dev)."""
+
+    def __init__(self):
+        self._data: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, field: str) -> Any:
+        return self._data.get(namespace, {}).get(field, _MISSING)
+
+    def set(self, namespace: str, field: str, value: Any):
+        with self._lock:
+            self._data.setdefault(namespace, {})[field] = value
+
+    def delete(self, namespace: str, field: str):
+        with self._lock:
+            self._data.get(namespace, {}).pop(field, None)
+
+    def fields(self, namespace: str) -> list:
+        return list(self._data.get(namespace, {}))
+
+    def get_all(self, namespace: str) -> Dict[str, Any]:
+        return dict(self._data.get(namespace, {}))
+
+    def clear(self, namespace: str):
+        with self._lock:
+            self._data.pop(namespace, None)
+
+
+class RedisStateBackend:
+    """One Redis hash per namespace, one JSON-encoded field per state key."""
+
+    KEY_PREFIX = 'app_state:'
+
+    def __init__(self, redis=None):
+        if redis is None:
+            from execution.job_queue import get_redis_connection
+            redis = get_redis_connection()
+        self.redis = redis
+
+    def _key(self, namespace: str) -> str:
+        return f"{self.KEY_PREFIX}{namespace}"
+
+    def get(self, namespace: str, field: str) -> Any:
+        raw = self.redis.hget(self._key(namespace), field)
+        return _MISSING if raw is None else json.loads(raw)
+
+    def set(self, namespace: str, field: str, value: Any):
+        self.redis.hset(self._key(namespace), field, json.dumps(value, default=str))
+
+    def delete(self, namespace: str, field: str):
+        self.redis.hdel(self._key(namespace), field)
+
+    def fields(self, namespace: str) -> list:
+        return [f.decode() if isinstance(f, bytes) else f for f in self.redis.hkeys(self._key(namespace))]
+
+    def get_all(self, namespace: str) -> Dict[str, Any]:
+        return {
+            (f.decode() if isinstance(f, bytes) else f): json.loads(raw)
+            for f, raw in self.redis.hgetall(self._key(namespace)).items()
+        }
+
+    def clear(self, namespace: str):
+        self.redis.delete(self._key(namespace))
+
+
+class StateStore(MutableMapping):
+    """
+    Dict-like view of the editor state for the current namespace.
+
+    Every access resolves the namespace (the current project) and reads or
+    writes only the field asked for. Missing fields fall back to a copy of
+    their default.
+    """
+
+    def __init__(self, backend, defaults: Optional[Dict[str, Any]] = None,
+                 namespace: Optional[Callable[[], Optional[str]]] = None):
+        self.backend = backend
+        self.defaults = defaults or {}
+        self._namespace = namespace
+
+    @property
+    def namespace(self) -> str:
+        if self._namespace:
+            return self._namespace() or DEFAULT_NAMESPACE
+        return DEFAULT_NAMESPACE
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.backend.get(self.namespace, key)
+        if value is _MISSING:
+            if key in self.defaults:
+                return copy.deepcopy(self.defaults[key])
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        self.backend.set(self.namespace, key, value)
+
+    def __delitem__(self, key: str):
+        self.backend.delete(self.namespace, key)
+
+    def __contains__(self, key: object) -> bool:
+        return self.backend.get(self.namespace, key) is not _MISSING or key in self.defaults
+
+    def __iter__(self) -> Iterator[str]:
+        fields = self.backend.fields(self.namespace)
+        return iter(list(dict.fromkeys(list(self.defaults) + fields)))
+
+    def __len__(self) -> int:
+        return len(set(self.defaults) | set(self.backend.fields(self.namespace)))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All fields (defaults filled in) with a single backend read."""
+        state = copy.deepcopy(self.defaults)
+        state.update(self.backend.get_all(self.namespace))
+        return state
+
+    def clear(self):
+        """Drop every field in the current namespace (reads fall back to defaults)."""
+        self.backend.clear(self.namespace)
+
+
+def create_state_backend(name: str = APP_STATE_BACKEND):
+    """Backend for APP_STATE_BACKEND ('memory' or 'redis')."""
+    if name == 'redis':
+        return RedisStateBackend()
+    if name != 'memory':
+        print(f"⚠️ Unknown APP_STATE_BACKEND '{name}', using memory")
+    return MemoryStateBackend()
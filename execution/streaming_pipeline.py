@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Streaming Pipeline - Overlap script, image, audio and render stages.
+
+The staged pipelines wait for the whole script before generating images,
+for every image before TTS, and for all audio before assembling the video,
+so a run takes the sum of the stages. StreamingProduction instead queues a
+beat's chunks for image generation and TTS as soon as the beat is written,
+and renders a chunk's segment as soon as both its image and audio exist.
+Only the final concatenation waits for everything, so a run takes roughly
+as long as its slowest stage.
+
+    production = StreamingProduction(output_dir, style_id=style)
+    script = generate_narrative_script(research, topic, on_beat=production.add_beat)
+    result = production.finish()
+
+(produce_script_video() wraps exactly that.)
+
+Used by full_pipeline (streaming=True) and the Telegram pipelines'
+auto-approve mode. Files use the staged path's names
+(images/chunk_000.png, audio/chunk_000.wav), but chunks are split per beat
+rather than over the whole script, so counts and boundaries can differ from
+split_script_to_chunks(full_script). Later steps must pair files with the
+chunk texts in images_result()['chunks'] (or finish()'s 'chunks'), never
+re-split the script.
+"""
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from execution.generate_ai_images import generate_chunk_image, split_script_to_chunks, DEFAULT_STYLE
+from execution.generate_audio import generate_chunk_audio
+from execution.generate_narrative_script import clean_script_text, generate_narrative_script
+from execution.generate_video import (
+    OUTPUT_DIR, check_ffmpeg, concatenate_segments, create_video_segment,
+    ensure_directories, get_audio_duration, get_render_profile
+)
+
+# Image calls are paced by gemini_gateway's per-model budget; these only cap
+# how many requests each stage keeps in flight
+IMAGE_WORKERS = int(os.getenv('STREAM_IMAGE_WORKERS', '4'))
+AUDIO_WORKERS = int(os.getenv('STREAM_AUDIO_WORKERS', '4'))
+# FFmpeg segment encodes are CPU-bound
+RENDER_WORKERS = max(1, min(4, (os.cpu_count() or 2) // 2))
+IMAGE_ATTEMPTS = 3
+
+
+class StreamingProduction:
+    """
+    Produces video segments for chunks as they are added.
+
+    Call add_beat()/add_text() as script text arrives (from any thread),
+    then finish() once the script is complete.
+    """
+
+    def __init__(self, output_dir: str, style_id: str = DEFAULT_STYLE, profile: str = 'final',
+                 progress_callback: Optional[Callable[[int, int, str], None]] = None,
+                 progress_every: int = 20):
+        """
+        Args:
+            output_dir: Job directory; images/, audio/ and segments/ go inside
+            style_id: Image style (style_selector)
+            profile: Render profile (generate_video.RENDER_PROFILES)
+            progress_callback: Called with (rendered, queued, message) as segments finish
+            progress_every: Call progress_callback every N segments
+        """
+        if not check_ffmpeg():
+            raise RuntimeError('FFmpeg is not installed. Please install FFmpeg to generate videos.')
+        ensure_directories()
+
+        self.output_dir = Path(output_dir)
+        self.image_dir = self.output_dir / 'images'
+        self.audio_dir = self.output_dir / 'audio'
+        self.segment_dir = self.output_dir / 'segments'
+        for directory in (self.image_dir, self.audio_dir, self.segment_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+
+        self.style_id = style_id
+        self.profile = profile
+        self.progress_callback = progress_callback
+        self.progress_every = progress_every
+
+        self.chunks: List[Dict] = []
+        self._lock = threading.Lock()
+        self._all_rendered = threading.Condition(self._lock)
+        self._outstanding = 0
+        self._rendered = 0
+        self._started = datetime.now()
+
+        self._image_pool = ThreadPoolExecutor(IMAGE_WORKERS, thread_name_prefix='stream-image')
+        self._audio_pool = ThreadPoolExecutor(AUDIO_WORKERS, thread_name_prefix='stream-audio')
+        self._render_pool = ThreadPoolExecutor(RENDER_WORKERS, thread_name_prefix='stream-render')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(cancel=exc_type is not None)
+
+    # ============== INPUT ==============
+
+    def add_beat(self, beat: Dict) -> List[int]:
+        """on_beat callback for generate_narrative_script."""
+        return self.add_text(beat.get('text', ''), beat_id=beat.get('id'))
+
+    def add_text(self, text: str, beat_id: Optional[str] = None) -> List[int]:
+        """Split a finished piece of script into chunks and queue them. Returns their indexes."""
+        indexes = []
+        for chunk_text in split_script_to_chunks(clean_script_text(text)):
+            indexes.append(self._add_chunk(chunk_text, beat_id))
+        return indexes
+
+    def _add_chunk(self, text: str, beat_id: Optional[str]) -> int:
+        with self._lock:
+            index = len(self.chunks)
+            chunk = {
+                'index': index,
+                'text': text,
+                'beat_id': beat_id,
+                'image': None,
+                'audio_path': None,
+                'segment_path': None,
+                '_pending': 2,  # image + audio
+            }
+            self.chunks.append(chunk)
+            self._outstanding += 1
+
+        self._image_pool.submit(self._make_image, chunk).add_done_callback(
+            lambda _future: self._asset_done(chunk))
+        self._audio_pool.submit(self._make_audio, chunk).add_done_callback(
+            lambda _future: self._asset_done(chunk))
+        return index
+
+    # ============== STAGES ==============
+
+    def _make_image(self, chunk: Dict):
+        output_path = str(self.image_dir / f"chunk_{chunk['index']:03d}.png")
+        result = {'success': False, 'error': 'Not attempted'}
+        for attempt in range(IMAGE_ATTEMPTS):
+            try:
+                result = generate_chunk_image(chunk['text'], output_path, chunk['index'], style_id=self.style_id)
+            except Exception as e:
+                result = {'success': False, 'error': str(e)}
+            if result.get('success'):
+                break
+            print(f"   ⚠️ Image {chunk['index']} attempt {attempt + 1}/{IMAGE_ATTEMPTS} failed: {result.get('error')}")
+        result['index'] = chunk['index']
+        result['chunk_text'] = chunk['text']
+        chunk['image'] = result
+
+    def _make_audio(self, chunk: Dict):
+        audio_path = str(self.audio_dir / f"chunk_{chunk['index']:03d}.wav")
+        try:
+            result = generate_chunk_audio(chunk['text'], audio_path, chunk['index'])
+        except Exception as e:
+            result = {'success': False, 'error': str(e)}
+        if result.get('success'):
+            chunk['audio_path'] = audio_path
+        else:
+            chunk['error'] = f"Audio failed: {result.get('error')}"
+
+    def _asset_done(self, chunk: Dict):
+        """Image or audio finished; the second one to finish queues the render."""
+        with self._lock:
+            chunk['_pending'] -= 1
+            ready = chunk['_pending'] == 0
+        if ready:
+            try:
+                self._render_pool.submit(self._render, chunk)
+            except RuntimeError:
+                pass  # Closed after a failure; nothing will wait for this chunk
+
+    def _render(self, chunk: Dict):
+        try:
+            if chunk['audio_path']:
+                image = chunk['image'] or {}
+                chunk['segment_path'] = create_video_segment(
+                    chunk_id=chunk['index'],
+                    audio_path=chunk['audio_path'],
+                    # Failed images render as a placeholder rather than dropping the narration
+                    screenshot_path=image.get('path') if image.get('success') else None,
+                    chunk_text=chunk['text'],
+                    profile=self.profile,
+                    output_path=str(self.segment_dir / f"segment_{chunk['index']:04d}.mp4")
+                )
+                if not chunk['segment_path']:
+                    chunk['error'] = 'Segment render failed'
+        except Exception as e:
+            chunk['error'] = f"Segment render failed: {e}"
+        finally:
+            with self._lock:
+                self._outstanding -= 1
+                self._rendered += 1
+                rendered, queued = self._rendered, len(self.chunks)
+                self._all_rendered.notify_all()
+            if self.progress_callback and rendered % self.progress_every == 0:
+                try:
+                    self.progress_callback(rendered, queued, f"⏳ Rendered {rendered}/{queued} segments...")
+                except Exception as e:
+                    print(f"Progress callback error: {e}")
+
+    # ============== OUTPUT ==============
+
+    def images_result(self) -> Dict:
+        """Image results in generate_all_images' format (for pipeline state and resume)."""
+        results = [
+            chunk['image'] or {'success': False, 'error': 'Not generated', 'index': chunk['index'],
+                               'chunk_text': chunk['text']}
+            for chunk in self.chunks
+        ]
+        successful = sum(1 for r in results if r.get('success'))
+        return {
+            'success': successful == len(results),
+            'total_chunks': len(results),
+            'successful': successful,
+            'failed': len(results) - successful,
+            'chunks': results,
+            'output_dir': str(self.image_dir)
+        }
+
+    def finish(self) -> Dict:
+        """
+        Wait for every queued chunk, then concatenate the segments in script order.
+
+        Returns:
+            build_video_from_chunks-style result plus 'images' (images_result())
+            and 'audio_files' ([{index, path}])
+        """
+        with self._all_rendered:
+            while self._outstanding:
+                self._all_rendered.wait()
+        self.close()
+
+        segment_paths = [c['segment_path'] for c in self.chunks if c['segment_path']]
+        errors = [f"Chunk {c['index']}: {c['error']}" for c in self.chunks if c.get('error')]
+        result = {
+            'images': self.images_result(),
+            'audio_files': [{'index': c['index'], 'path': c['audio_path']} for c in self.chunks if c['audio_path']],
+            'segments_count': len(segment_paths),
+            'errors': errors,
+            'profile': self.profile
+        }
+        if not segment_paths:
+            return {**result, 'success': False, 'message': 'No video segments were created', 'output_path': None}
+
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output_path = str(OUTPUT_DIR / f"{get_render_profile(self.profile)['output_prefix']}_{timestamp}.mp4")
+        if not concatenate_segments(segment_paths, output_path, profile=self.profile):
+            return {**result, 'success': False, 'message': 'Failed to concatenate video segments', 'output_path': None}
+
+        duration = get_audio_duration(output_path)
+        elapsed = (datetime.now() - self._started).total_seconds()
+        print(f"\n✅ Streamed video: {len(segment_paths)}/{len(self.chunks)} segments, "
+              f"{duration:.1f}s of video in {elapsed:.0f}s")
+        return {
+            **result,
+            'success': True,
+            'message': f'Video generated: {len(segment_paths)} segments, {duration:.1f}s total',
+            'output_path': output_path,
+            'duration': duration
+        }
+
+    def close(self, cancel: bool = False):
+        """Shut the worker pools down (cancel=True drops queued work)."""
+        for pool in (self._image_pool, self._audio_pool, self._render_pool):
+            pool.shutdown(wait=not cancel, cancel_futures=cancel)
+
+
+def produce_script_video(research_data: str, topic: str, output_dir: str, target_minutes: int = 15,
+                         style_id: str = DEFAULT_STYLE, profile: str = 'final',
+                         progress_callback: Optional[Callable[[int, int, str], None]] = None) -> Dict:
+    """
+    Write a narrative script and stream it into a finished video.
+
+    Returns:
+        finish() result plus 'script' (the generate_narrative_script result)
+        and 'chunks' ([{index, text, beat_id}] in script order)
+    """
+    with StreamingProduction(output_dir, style_id=style_id, profile=profile,
+                             progress_callback=progress_callback) as production:
+        script_result = generate_narrative_script(
+            research_data=research_data,
+            topic=topic,
+            target_minutes=target_minutes,
+            on_beat=production.add_beat
+        )
+        result = production.finish()
+    return {
+        **result,
+        'script': script_result,
+        'chunks': [{'index': c['index'], 'text': c['text'], 'beat_id': c['beat_id']} for c in production.chunks]
+    }
@@ -5,13 +5,16 @@ Uses patterns from metadata_style.md directive.
 """
 
 import os
+import sys
 import re
-from typing import List, Optional
-import google.generativeai as genai
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from execution import gemini_gateway
+from execution.metadata_engine import generate_fields
 
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "")
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
 
 
 def generate_tags(
@@ -57,18 +60,9 @@ Return ONLY the tags, comma-separated, lowercase, no hashtags.
 Example: france,french economy,why france is poor,economic collapse,geopolitics"""
 
     try:
-        model = genai.GenerativeModel("gemini-2.0-flash")
-        response = model.generate_content(prompt)
-        
         # Parse tags
-        tags_text = response.text.strip()
-        tags = [t.strip().lower() for t in tags_text.split(',')]
-        
-        # Clean tags
-        tags = [re.sub(r'[^\w\s-]', '', t) for t in tags]
-        tags = [t for t in tags if t and len(t) > 2]
-        
-        return tags[:35]
+        tags_text = gemini_gateway.generate_text(prompt, model="gemini-2.0-flash").strip()
+        return _clean_ai_tags(tags_text.split(','))
     except Exception as e:
         print(f"AI tag generation error: {e}")
         return _generate_tags_fallback(title, topic, country)
@@ -184,18 +178,10 @@ Format the bullet points like:
 Keep it under 800 words."""
 
     try:
-        model = genai.GenerativeModel("gemini-2.0-flash")
-        response = model.generate_content(prompt)
-        
-        description = response.text.strip()
+        description = gemini_gateway.generate_text(prompt, model="gemini-2.0-flash").strip()
         
         # Insert timestamps if provided
-        if timestamps:
-            description = description.replace("[TIMESTAMPS]", f"CHAPTERS:\n{timestamps}")
-        else:
-            description = description.replace("[TIMESTAMPS]", "")
-        
-        return description
+        return _insert_timestamps(description, timestamps)
     except Exception as e:
         print(f"AI description generation error: {e}")
         return _generate_description_fallback(title, topic, timestamps)
@@ -229,6 +215,87 @@ In this video, we cover:
     return description
 
 
+def _clean_ai_tags(tags: List[str]) -> List[str]:
+    tags = [re.sub(r'[^\w\s-]', '', t.strip().lower()) for t in tags]
+    return [t for t in tags if t and len(t) > 2][:35]
+
+
+def _insert_timestamps(description: str, timestamps: Optional[str]) -> str:
+    if timestamps:
+        return description.replace("[TIMESTAMPS]", f"CHAPTERS:\n{timestamps}")
+    return description.replace("[TIMESTAMPS]", "")
+
+
+def generate_metadata(
+    title: str,
+    topic: str,
+    script: str,
+    timestamps: Optional[str] = None,
+    country: Optional[str] = None
+) -> Dict:
+    """
+    Tags, description and hashtags for a video in one AI call.
+    
+    Fields the combined call misses fall back to generate_tags /
+    generate_description / generate_hashtags.
+    
+    Returns:
+        Dict with tags, description, hashtags, fallback_fields
+    """
+    fallbacks = {
+        'tags': lambda: generate_tags(title, topic, country, script[:500] if script else None),
+        'description': lambda: generate_description(title, topic, script, timestamps, country),
+        'hashtags': lambda: generate_hashtags(topic, country),
+    }
+    if not GEMINI_API_KEY:
+        return {**{field: fallback() for field, fallback in fallbacks.items()},
+                'fallback_fields': list(fallbacks)}
+    
+    script_excerpt = script[:2000] if script else ""
+    prompt = f"""Write the YouTube metadata for this video:
+
+TITLE: {title}
+TOPIC: {topic}
+COUNTRY: {country or 'N/A'}
+
+SCRIPT EXCERPT:
+{script_excerpt}
+
+TAGS: 30 tags, lowercase, no hashtags, following these patterns:
+1. Primary Topic (3-5 tags): Main subject and specific aspects
+2. Related Concepts (5-8 tags): Economic/geopolitical/financial terms
+3. Searchable Phrases (5-8 tags): "why X is", "X vs Y", "X explained"
+4. Trending/Discovery (3-5 tags): Year-based, categories
+5. Long-tail Keywords (5-10 tags): Very specific terms, person names
+
+DESCRIPTION with:
+1. Hook (1-2 sentences - question or bold statement)
+2. Context paragraph (2-3 sentences about what we cover)
+3. "In this video, we cover:" section with 5 emoji bullet points
+4. Leave "[TIMESTAMPS]" placeholder for chapters
+5. 8 hashtags at the end
+6. Disclaimer for financial content
+
+Format the bullet points like:
+📉 [Topic]: [Brief description]
+🏭 [Topic]: [Brief description]
+
+Keep it under 800 words.
+
+HASHTAGS: the same 8 hashtags as a list, each starting with #"""
+    
+    metadata = generate_fields(
+        prompt,
+        fallbacks=fallbacks,
+        cleaners={
+            'tags': _clean_ai_tags,
+            'description': lambda d: _insert_timestamps(d.strip(), timestamps),
+            'hashtags': lambda tags: [f"#{t.lstrip('#').strip()}" for t in tags if t.strip('# ')][:10],
+        }
+    )
+    return metadata
+
+
 def generate_hashtags(topic: str, country: Optional[str] = None) -> List[str]:
     """Generate hashtags for end of description."""
     hashtags = ["#Economics", "#Geopolitics", "#Finance"]
@@ -1191,6 +1191,11 @@ def main():
     application.add_handler(CallbackQueryHandler(handle_resume_callback, pattern="^resume_"))
     application.add_handler(CallbackQueryHandler(handle_viral_callback, pattern="^viral_"))
     
+    # Kick off background trend ingestion so "Scan News" reads a warm index
+    from execution.topic_index import ensure_trend_ingestion_scheduled
+    if ensure_trend_ingestion_scheduled():
+        print("📥 Trend ingestion scheduled")
+    
     print("🤖 Bot started! Listening for messages...")
     
     # Run the bot
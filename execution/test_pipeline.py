@@ -181,6 +181,98 @@ def test_pipeline_init():
         log_result("Pipeline Init", False, str(e))
 
 
+def test_vectorized_scoring():
+    """Test NumPy scoring matches the loop implementations - no API calls."""
+    try:
+        import copy
+        import random
+        from datetime import datetime, timedelta, timezone
+        from execution import video_scoring
+        from execution.youtube_search import filter_by_multiplier
+        from execution.keyword_research import calculate_keyword_difficulty
+        
+        rng = random.Random(42)
+        now = datetime.now(timezone.utc)
+        
+        videos, video_stats, channel_subs = [], {}, {}
+        kw_video_stats, kw_channel_stats = {}, {}
+        for i in range(3000):
+            vid, cid = f"v{i}", f"c{rng.randrange(800)}"
+            published = now - timedelta(days=rng.randrange(0, 400), hours=rng.randrange(24))
+            videos.append({
+                'video_id': vid, 'channel_id': cid, 'title': f"Video {i}",
+                'channel_title': f"Channel {cid}",
+                'published_at': published.strftime('%Y-%m-%dT%H:%M:%SZ') if i % 97 else 'bad-date'
+            })
+            views = rng.choice([0, 500, 10000, 10001, rng.randrange(5_000_000)])
+            if i % 13:  # some videos missing stats
+                video_stats[vid] = {'viewCount': views, 'duration': rng.randrange(3600)}
+                kw_video_stats[vid] = {'view_count': views}
+            subs = rng.choice([None, 0, 10000, rng.randrange(1, 3_000_000)])
+            channel_subs.setdefault(cid, subs)
+            kw_channel_stats.setdefault(cid, {'subscriber_count': subs or 0})
+        
+        for args in [(1.0, 0, 0, 0), (0.5, 1000, 60, 500000), (3.0, 0, 300, 0)]:
+            expected = filter_by_multiplier(copy.deepcopy(videos), video_stats, channel_subs, *args[:1],
+                                            min_views=args[1], min_duration_sec=args[2], max_subs=args[3])
+            actual = video_scoring.filter_by_multiplier(copy.deepcopy(videos), video_stats, channel_subs, *args[:1],
+                                                        min_views=args[1], min_duration_sec=args[2], max_subs=args[3])
+            if expected != actual:
+                log_result("Vectorized Scoring (Filter)", False, f"Mismatch for {args}")
+                return
+        log_result("Vectorized Scoring (Filter)", True, f"{len(videos)} candidates match loop output")
+        
+        keyword_videos = [videos[i:i + rng.randrange(0, 16)] for i in range(0, 3000, 15)]
+        expected = [calculate_keyword_difficulty(v, kw_video_stats, kw_channel_stats) for v in keyword_videos]
+        actual = video_scoring.keyword_difficulty_batch(keyword_videos, kw_video_stats, kw_channel_stats)
+        if expected == actual:
+            log_result("Vectorized Scoring (Difficulty)", True, f"{len(keyword_videos)} keywords match loop output")
+        else:
+            bad = next(i for i, (e, a) in enumerate(zip(expected, actual)) if e != a)
+            log_result("Vectorized Scoring (Difficulty)", False, f"Keyword {bad}: {expected[bad]} != {actual[bad]}")
+            
+    except ImportError as e:
+        if "numpy" in str(e).lower():
+            log_result("Vectorized Scoring", True, "Skipped (numpy not installed)")
+        else:
+            log_result("Vectorized Scoring", False, str(e))
+    except Exception as e:
+        log_result("Vectorized Scoring", False, str(e))
+
+
+def test_repeated_fact_removal():
+    """Test parallel-draft reconciliation drops repeats without emptying sections - no API calls."""
+    try:
+        from execution.generate_script import remove_repeated_facts
+
+        hook = "Inflation hit 9.1% last summer, the highest in four decades."
+        body = ("Consumer prices rose 9.1% in June, the fastest inflation pace in four decades. "
+                "Rents climbed faster than wages.")
+        repeat = ("Remember, consumer prices rose 9.1% in June, the fastest inflation pace in decades. "
+                  "Meanwhile the Fed raised rates four times.")
+        only_repeat = "Consumer prices jumped 9.1% in June, the fastest inflation pace in four decades."
+        sections, removed = remove_repeated_facts(
+            [hook, body, repeat, only_repeat, hook],
+            exempt=[True, False, False, False, True]
+        )
+
+        checks = [
+            ("exempt sections untouched", sections[0] == hook and sections[4] == hook),
+            ("first mention kept", sections[1] == body),
+            ("repeat removed", sections[2] == "Meanwhile the Fed raised rates four times."),
+            ("emptied section keeps first sentence", sections[3] == only_repeat),
+            ("removed list", removed == [repeat.split(". ")[0] + "."]),
+        ]
+        failed = [name for name, ok in checks if not ok]
+        if failed:
+            log_result("Repeated Fact Removal", False, ", ".join(failed))
+        else:
+            log_result("Repeated Fact Removal", True, f"{len(removed)} repeat removed, no section emptied")
+
+    except Exception as e:
+        log_result("Repeated Fact Removal", False, str(e))
+
+
 def test_existing_generators():
     """Test existing generator imports work."""
     # Test imports only - no actual generation
@@ -258,6 +350,8 @@ if __name__ == "__main__":
     test_style_selector()  # No API
     test_file_renamer()    # No API
     test_pipeline_init()   # No API
+    test_vectorized_scoring()  # No API
+    test_repeated_fact_removal()  # No API
     test_existing_generators()  # Just imports
     test_telegram_bot_imports()  # Just imports
     
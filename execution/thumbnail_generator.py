@@ -5,15 +5,24 @@ Extracts, downloads, and analyzes YouTube thumbnails for recreation.
 """
 
 import os
+import sys
 import requests
 import json
 from pathlib import Path
 from typing import Optional, Dict, List
 
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from execution import gemini_gateway, image_cache
+
 # Paths
 TMP_DIR = Path(__file__).parent.parent / '.tmp'
 THUMBNAILS_DIR = TMP_DIR / 'thumbnails'
 
+# image_cache analysis name for dissect_thumbnail results
+DISSECTION_ANALYSIS = 'thumbnail_dissection'
+
 
 def ensure_directories():
     """Ensure thumbnail directory exists."""
@@ -50,15 +59,23 @@ def get_thumbnail_url(video_id: str, quality: str = 'maxresdefault') -> str:
     return f"https://img.youtube.com/vi/{video_id}/{quality}.jpg"
 
 
-def download_thumbnail(video_id: str, output_dir: Optional[Path] = None) -> Optional[str]:
+def download_thumbnail(video_id: str, output_dir: Optional[Path] = None, refresh: bool = False) -> Optional[str]:
     """
     Download thumbnail for a YouTube video.
     Tries maxresdefault first, falls back to hqdefault.
+    Reuses a copy downloaded within image_cache.THUMBNAIL_TTL unless refresh=True.
     Returns path to downloaded file or None if failed.
     """
     ensure_directories()
     output_dir = output_dir or THUMBNAILS_DIR
     
+    cache_key = f"youtube:{video_id}"
+    if not refresh:
+        cached = image_cache.get('thumbnail', cache_key, max_age=image_cache.THUMBNAIL_TTL)
+        if cached:
+            print(f"✅ Thumbnail from cache: {Path(cached['path']).name}")
+            return cached['path']
+    
     # Try different quality levels
     for quality in ['maxresdefault', 'sddefault', 'hqdefault']:
         url = get_thumbnail_url(video_id, quality)
@@ -70,6 +87,7 @@ def download_thumbnail(video_id: str, output_dir: Optional[Path] = None) -> Opti
                 with open(filepath, 'wb') as f:
                     f.write(response.content)
                 print(f"✅ Downloaded thumbnail: {quality}")
+                image_cache.put('thumbnail', cache_key, filepath)
                 return str(filepath)
         except Exception as e:
             print(f"⚠️ Failed to download {quality}: {e}")
@@ -78,19 +96,19 @@ def download_thumbnail(video_id: str, output_dir: Optional[Path] = None) -> Opti
     return None
 
 
-def dissect_thumbnail(image_path: str, api_key: str) -> Dict:
+def dissect_thumbnail(image_path: str, api_key: str, refresh: bool = False) -> Dict:
     """
     Dissect thumbnail into 5 structured components for editing.
     Returns structured JSON with: person, expression, text, colors, graphics
+    A previous dissection of the exact same image is returned without calling
+    Gemini unless refresh=True.
     """
-    import base64
-    
-    # Read and encode image
-    with open(image_path, 'rb') as f:
-        image_data = base64.b64encode(f.read()).decode('utf-8')
-    
-    # Gemini Vision API
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={api_key}"
+    content_hash = image_cache.file_sha256(image_path)
+    if not refresh:
+        cached = image_cache.get_analysis(content_hash, DISSECTION_ANALYSIS)
+        if cached:
+            print("✅ Thumbnail dissection from cache")
+            return {**cached, 'cached': True}
     
     prompt = """Analyze this YouTube thumbnail and extract these 5 components as JSON:
 
@@ -128,46 +146,34 @@ Return ONLY valid JSON, no markdown formatting:
   "graphics": {"description": "...", "elements": ["...", "..."]}
 }"""
 
-    payload = {
-        "contents": [{
-            "parts": [
-                {"text": prompt},
-                {
-                    "inline_data": {
-                        "mime_type": "image/jpeg",
-                        "data": image_data
-                    }
-                }
-            ]
-        }],
-        "generationConfig": {
-            "temperature": 0.1  # Low temperature for consistent structured output
-        }
-    }
-    
     try:
-        response = requests.post(url, json=payload, timeout=60)
-        if response.status_code == 200:
-            result = response.json()
-            text = result['candidates'][0]['content']['parts'][0]['text']
-            # Parse JSON from response
-            try:
-                # Clean up response - remove markdown if present
-                json_str = text.strip()
-                if json_str.startswith('```'):
-                    json_str = json_str.split('```')[1]
-                    if json_str.startswith('json'):
-                        json_str = json_str[4:]
-                    json_str = json_str.strip()
-                
-                dissection = json.loads(json_str)
-                return {'success': True, 'dissection': dissection, 'raw': text}
-            except json.JSONDecodeError as e:
-                return {'success': False, 'error': f'Failed to parse JSON: {e}', 'raw': text}
-        else:
-            return {'success': False, 'error': f'API error: {response.status_code}'}
-    except Exception as e:
+        # Gemini Vision; low temperature for consistent structured output
+        text = gemini_gateway.generate_text(
+            [prompt, gemini_gateway.image_part(image_path)],
+            model='gemini-2.0-flash',
+            temperature=0.1,
+            api_key=api_key,
+            timeout=60
+        )
+    except gemini_gateway.GeminiError as e:
         return {'success': False, 'error': str(e)}
+    
+    # Parse JSON from response
+    try:
+        # Clean up response - remove markdown if present
+        json_str = text.strip()
+        if json_str.startswith('```'):
+            json_str = json_str.split('```')[1]
+            if json_str.startswith('json'):
+                json_str = json_str[4:]
+            json_str = json_str.strip()
+        
+        dissection = json.loads(json_str)
+        result = {'success': True, 'dissection': dissection, 'raw': text}
+        image_cache.put_analysis(content_hash, DISSECTION_ANALYSIS, result)
+        return result
+    except json.JSONDecodeError as e:
+        return {'success': False, 'error': f'Failed to parse JSON: {e}', 'raw': text}
 
 
 def generate_thumbnail_prompt(
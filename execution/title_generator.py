@@ -5,10 +5,14 @@ Generates high-CTR YouTube titles based on inspiration and content.
 """
 
 import os
-import requests
+import sys
 import json
+from pathlib import Path
 from typing import List, Dict, Optional
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from execution import gemini_gateway
+
 
 def generate_title_options(
     topic: str,
@@ -35,8 +39,6 @@ def generate_title_options(
         Dict with success status and list of title options
     """
     
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={api_key}"
-    
     # Calculate reference title length for matching
     ref_char_count = len(inspiration_title) if inspiration_title else 50
     
@@ -90,62 +92,57 @@ Return exactly {num_options} titles as a JSON array:
 
 Only output the JSON array, nothing else."""
 
-    payload = {
-        "contents": [{
-            "parts": [{"text": prompt}]
-        }],
-        "generationConfig": {
-            "temperature": 0.8,
-            "topP": 0.95,
-            "maxOutputTokens": 500
-        }
-    }
-    
     try:
-        response = requests.post(url, json=payload, timeout=30)
-        if response.status_code == 200:
-            result = response.json()
-            text = result['candidates'][0]['content']['parts'][0]['text']
-            
-            # Parse JSON from response
-            try:
-                # Clean up response
-                text = text.strip()
-                if text.startswith('```json'):
-                    text = text[7:]
-                if text.startswith('```'):
-                    text = text[3:]
-                if text.endswith('```'):
-                    text = text[:-3]
-                text = text.strip()
-                
-                titles = json.loads(text)
-                if isinstance(titles, list):
-                    return {
-                        'success': True,
-                        'titles': titles[:num_options],
-                        'inspiration': inspiration_title
-                    }
-            except json.JSONDecodeError:
-                # Fallback: try to extract titles from text
-                lines = [l.strip() for l in text.split('\n') if l.strip()]
-                titles = []
-                for line in lines:
-                    # Remove numbering like "1.", "2.", etc.
-                    clean = line.lstrip('0123456789.-) ').strip('"\'')
-                    if clean and len(clean) > 10:
-                        titles.append(clean)
-                if titles:
-                    return {
-                        'success': True,
-                        'titles': titles[:num_options],
-                        'inspiration': inspiration_title
-                    }
-                return {'success': False, 'error': 'Failed to parse titles', 'raw': text}
-        else:
-            return {'success': False, 'error': f'API error: {response.status_code}'}
-    except Exception as e:
+        result = gemini_gateway.generate(
+            prompt,
+            model="gemini-2.0-flash",
+            generation_config={
+                "temperature": 0.8,
+                "topP": 0.95,
+                "maxOutputTokens": 500
+            },
+            api_key=api_key,
+            timeout=30
+        )
+        text = gemini_gateway.response_text(result)
+    except gemini_gateway.GeminiError as e:
         return {'success': False, 'error': str(e)}
+    
+    # Parse JSON from response
+    try:
+        # Clean up response
+        text = text.strip()
+        if text.startswith('```json'):
+            text = text[7:]
+        if text.startswith('```'):
+            text = text[3:]
+        if text.endswith('```'):
+            text = text[:-3]
+        text = text.strip()
+        
+        titles = json.loads(text)
+        if isinstance(titles, list):
+            return {
+                'success': True,
+                'titles': titles[:num_options],
+                'inspiration': inspiration_title
+            }
+    except json.JSONDecodeError:
+        # Fallback: try to extract titles from text
+        lines = [l.strip() for l in text.split('\n') if l.strip()]
+        titles = []
+        for line in lines:
+            # Remove numbering like "1.", "2.", etc.
+            clean = line.lstrip('0123456789.-) ').strip('"\'')
+            if clean and len(clean) > 10:
+                titles.append(clean)
+        if titles:
+            return {
+                'success': True,
+                'titles': titles[:num_options],
+                'inspiration': inspiration_title
+            }
+        return {'success': False, 'error': 'Failed to parse titles', 'raw': text}
 
 
 def analyze_title_pattern(title: str, api_key: str) -> Dict:
@@ -153,8 +150,6 @@ def analyze_title_pattern(title: str, api_key: str) -> Dict:
     Analyze what makes a title effective.
     Returns patterns and elements that make it click-worthy.
     """
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={api_key}"
-    
     prompt = f"""Analyze this YouTube title and explain what makes it effective:
 
 Title: "{title}"
@@ -168,31 +163,21 @@ Identify:
 
 Format as JSON with keys: power_words, emotional_triggers, pattern, curiosity_element, target_emotion"""
 
-    payload = {
-        "contents": [{
-            "parts": [{"text": prompt}]
-        }]
-    }
+    try:
+        text = gemini_gateway.generate_text(prompt, model="gemini-2.0-flash", api_key=api_key, timeout=30)
+    except gemini_gateway.GeminiError as e:
+        return {'success': False, 'error': str(e)}
     
     try:
-        response = requests.post(url, json=payload, timeout=30)
-        if response.status_code == 200:
-            result = response.json()
-            text = result['candidates'][0]['content']['parts'][0]['text']
-            try:
-                if '```json' in text:
-                    json_str = text.split('```json')[1].split('```')[0].strip()
-                elif '```' in text:
-                    json_str = text.split('```')[1].split('```')[0].strip()
-                else:
-                    json_str = text
-                return {'success': True, 'analysis': json.loads(json_str)}
-            except:
-                return {'success': True, 'analysis': None, 'raw': text}
+        if '```json' in text:
+            json_str = text.split('```json')[1].split('```')[0].strip()
+        elif '```' in text:
+            json_str = text.split('```')[1].split('```')[0].strip()
         else:
-            return {'success': False, 'error': response.text}
-    except Exception as e:
-        return {'success': False, 'error': str(e)}
+            json_str = text
+        return {'success': True, 'analysis': json.loads(json_str)}
+    except:
+        return {'success': True, 'analysis': None, 'raw': text}
 
 
 if __name__ == '__main__':
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Topic Index - Persistent, deduplicated store of scored trending topics.
+
+A background RQ job (run_trend_ingestion) polls the priority/category news
+queries on a schedule and merges the results into Redis. The Telegram bot
+reads from the index instead of running Serper searches on every "Scan News"
+tap, so topic lists come back in milliseconds.
+
+Redis layout:
+- topic_index:items       hash  headline_key -> topic JSON
+- topic_index:countries   zset  normalized country -> last requested (watchlist)
+- topic_index:country_names hash normalized country -> name as the user typed it
+- topic_index:last_run    str   ISO timestamp of last completed ingestion
+- topic_index:scheduled   str   guard so only one ingestion chain is queued
+"""
+import os
+import sys
+import json
+import time
+from pathlib import Path
+from typing import List, Dict, Optional
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from execution.job_queue import get_redis_connection, get_queue
+from execution.trend_scanner import (
+    PRIORITY_QUERIES,
+    CATEGORY_QUERIES,
+    country_queries,
+    headline_key,
+    _search_news,
+    _build_topic,
+)
+
+# How often the worker polls news (minutes)
+INGEST_INTERVAL_MINUTES = int(os.getenv('TREND_INGEST_INTERVAL_MINUTES', '60'))
+
+# Topics not seen again within this window drop out (Serper searches the last week)
+TOPIC_TTL_SECONDS = 7 * 86400
+
+# Max countries kept on the watchlist (refreshed on each ingestion)
+MAX_WATCHED_COUNTRIES = 10
+
+ITEMS_KEY = "topic_index:items"
+COUNTRIES_KEY = "topic_index:countries"
+COUNTRY_NAMES_KEY = "topic_index:country_names"
+LAST_RUN_KEY = "topic_index:last_run"
+SCHEDULED_KEY = "topic_index:scheduled"
+
+
+def _merge_topics(redis, topics: List[Dict]) -> int:
+    """
+    Upsert topics into the index.
+
+    Existing entries keep their first_seen time and suggested title (so the
+    list doesn't reshuffle under the user), and a country forced by a country
+    scan (country_forced) over a later extracted one; everything else is
+    refreshed.
+
+    Returns:
+        Number of new topics added
+    """
+    if not topics:
+        return 0
+
+    now = time.time()
+    keys = [headline_key(t["headline"]) for t in topics]
+    existing = redis.hmget(ITEMS_KEY, keys)
+
+    updates = {}
+    added = 0
+    for key, topic, raw in zip(keys, topics, existing):
+        if key in updates:
+            # Same headline from two queries in this batch
+            updates[key]["seen_count"] += 1
+            continue
+
+        entry = dict(topic)
+        entry["first_seen"] = now
+        entry["seen_count"] = 1
+
+        if raw:
+            old = json.loads(raw)
+            entry["first_seen"] = old.get("first_seen", now)
+            entry["suggested_topic"] = old.get("suggested_topic", entry["suggested_topic"])
+            entry["seen_count"] = old.get("seen_count", 0) + 1
+            # A country-forced result is more specific than an extracted one
+            if old.get("country_forced") and not entry.get("country_forced"):
+                entry["country"] = old.get("country")
+                entry["country_forced"] = True
+            else:
+                entry["country"] = entry["country"] or old.get("country")
+        else:
+            added += 1
+
+        entry["last_seen"] = now
+        updates[key] = entry
+
+    redis.hset(ITEMS_KEY, mapping={k: json.dumps(v) for k, v in updates.items()})
+    return added
+
+
+def _prune_expired(redis) -> int:
+    """Remove topics that haven't shown up in searches for TOPIC_TTL_SECONDS."""
+    cutoff = time.time() - TOPIC_TTL_SECONDS
+    expired = [
+        key for key, raw in redis.hgetall(ITEMS_KEY).items()
+        if json.loads(raw).get("last_seen", 0) < cutoff
+    ]
+    if expired:
+        redis.hdel(ITEMS_KEY, *expired)
+    return len(expired)
+
+
+def _normalize_country(country: str) -> str:
+    """Case-insensitive country key so 'uk' and 'UK' share index entries."""
+    return country.strip().lower()
+
+
+def index_topics(topics: List[Dict], country_forced: bool = False) -> int:
+    """
+    Merge topics from a live scan into the index (best effort).
+
+    country_forced marks a country scan's results (see _merge_topics) so a
+    later generic ingestion can't move them to another country.
+    """
+    if country_forced:
+        topics = [{**topic, "country_forced": True} for topic in topics]
+    try:
+        return _merge_topics(get_redis_connection(), topics)
+    except Exception as e:
+        print(f"Topic index write error: {e}")
+        return 0
+
+
+def ingest_queries(queries: List[str], country: Optional[str] = None) -> int:
+    """
+    Run news searches and merge the scored results into the index.
+
+    Args:
+        queries: Serper news queries
+        country: Force this country on every result (country scans)
+
+    Returns:
+        Number of new topics added
+    """
+    news_items = []
+    for query in queries:
+        news_items.extend(_search_news(query))
+
+    topics = [_build_topic(item, country=country) for item in news_items if item.get("title")]
+    if country:
+        for topic in topics:
+            topic["country_forced"] = True
+    return _merge_topics(get_redis_connection(), topics)
+
+
+def ingest_trending_topics() -> Dict:
+    """
+    Poll all priority, category and watched-country queries once.
+
+    Returns:
+        Summary dict with added/pruned counts
+    """
+    redis = get_redis_connection()
+
+    queries = list(PRIORITY_QUERIES)
+    for category_queries in CATEGORY_QUERIES.values():
+        queries.extend(category_queries)
+
+    added = ingest_queries(queries)
+
+    names = {(k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+             for k, v in redis.hgetall(COUNTRY_NAMES_KEY).items()}
+    watched = [names.get(key, key) for key in
+               (c.decode() if isinstance(c, bytes) else c
+                for c in redis.zrevrange(COUNTRIES_KEY, 0, MAX_WATCHED_COUNTRIES - 1))]
+    for country in watched:
+        added += ingest_queries(country_queries(country), country=country)
+
+    pruned = _prune_expired(redis)
+    redis.set(LAST_RUN_KEY, datetime.now().isoformat())
+
+    print(f"📥 Topic index: +{added} new, -{pruned} expired, {redis.hlen(ITEMS_KEY)} total")
+    return {"added": added, "pruned": pruned, "countries": watched}
+
+
+def get_indexed_topics(country: Optional[str] = None, limit: int = 10) -> List[Dict]:
+    """
+    Read ranked topics from the index.
+
+    Without a country this mirrors scan_trending_topics (only viral topics,
+    one per country). With a country it mirrors scan_by_country.
+
+    Args:
+        country: Restrict to one country
+        limit: Max topics to return
+
+    Returns:
+        List of topic dicts, best first
+    """
+    try:
+        redis = get_redis_connection()
+        raw_items = redis.hvals(ITEMS_KEY)
+    except Exception as e:
+        print(f"Topic index read error: {e}")
+        return []
+
+    cutoff = time.time() - TOPIC_TTL_SECONDS
+    items = [json.loads(raw) for raw in raw_items]
+    items = [t for t in items if t.get("last_seen", 0) >= cutoff]
+    items.sort(key=lambda t: (t["viral_score"], t["last_seen"]), reverse=True)
+
+    if country:
+        wanted = _normalize_country(country)
+        return [t for t in items if _normalize_country(t.get("country") or "") == wanted][:limit]
+
+    topics = []
+    seen_countries = set()
+    for topic in items:
+        if topic["viral_score"] <= 0:
+            continue
+        topic_country = topic.get("country")
+        if topic_country:
+            if topic_country in seen_countries:
+                continue
+            seen_countries.add(topic_country)
+        topics.append(topic)
+        if len(topics) >= limit:
+            break
+    return topics
+
+
+def watch_country(country: str) -> bool:
+    """
+    Add a country to the watchlist so future ingestions keep it fresh.
+
+    Returns:
+        True if it was already watched (the index has country-scan results for it)
+    """
+    key = _normalize_country(country)
+    try:
+        redis = get_redis_connection()
+        already_watched = redis.zscore(COUNTRIES_KEY, key) is not None
+        redis.zadd(COUNTRIES_KEY, {key: time.time()})
+        redis.hset(COUNTRY_NAMES_KEY, key, country.strip())
+        # Keep only the most recently requested countries
+        redis.zremrangebyrank(COUNTRIES_KEY, 0, -(MAX_WATCHED_COUNTRIES + 1))
+        return already_watched
+    except Exception as e:
+        print(f"Topic index watchlist error: {e}")
+        return False
+
+
+def is_index_fresh() -> bool:
+    """True if an ingestion completed within two polling intervals."""
+    try:
+        last_run = get_redis_connection().get(LAST_RUN_KEY)
+    except Exception:
+        return False
+    if not last_run:
+        return False
+    if isinstance(last_run, bytes):
+        last_run = last_run.decode()
+    age = datetime.now() - datetime.fromisoformat(last_run)
+    return age < timedelta(minutes=INGEST_INTERVAL_MINUTES * 2)
+
+
+def run_trend_ingestion():
+    """
+    RQ job: ingest once, then schedule the next run.
+
+    Requires the worker to run with --with-scheduler for the delayed re-enqueue.
+    """
+    try:
+        return ingest_trending_topics()
+    finally:
+        _schedule_next_run()
+
+
+def _schedule_next_run():
+    """Queue the next ingestion and refresh the single-chain guard."""
+    interval = timedelta(minutes=INGEST_INTERVAL_MINUTES)
+    redis = get_redis_connection()
+    # Guard outlives the delay; if the scheduler isn't running it expires and
+    # ensure_trend_ingestion_scheduled() will restart the chain.
+    redis.set(SCHEDULED_KEY, datetime.now().isoformat(), ex=int(interval.total_seconds() * 2))
+    get_queue('low').enqueue_in(
+        interval,
+        run_trend_ingestion,
+        job_timeout='15m',
+        result_ttl=3600,
+        failure_ttl=86400
+    )
+
+
+def ensure_trend_ingestion_scheduled() -> bool:
+    """
+    Start the ingestion chain if it isn't already running.
+
+    Safe to call from every process; only one caller wins the guard.
+
+    Returns:
+        True if a new ingestion job was queued
+    """
+    try:
+        redis = get_redis_connection()
+        interval_seconds = INGEST_INTERVAL_MINUTES * 60
+        if not redis.set(SCHEDULED_KEY, datetime.now().isoformat(), nx=True, ex=interval_seconds * 2):
+            return False
+        get_queue('low').enqueue(
+            run_trend_ingestion,
+            job_timeout='15m',
+            result_ttl=3600,
+            failure_ttl=86400
+        )
+        return True
+    except Exception as e:
+        print(f"Could not schedule trend ingestion: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    # Run one ingestion pass in the foreground
+    summary = ingest_trending_topics()
+    print(json.dumps(summary, indent=2))
+
+    for i, t in enumerate(get_indexed_topics(), 1):
+        print(f"\n{i}. {t['suggested_topic']}")
+        print(f"   └ {t['headline'][:60]}...")
+        print(f"   Country: {t.get('country', 'N/A')} | Score: {t.get('viral_score', 0)}")
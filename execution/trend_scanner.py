@@ -45,6 +45,45 @@ TRIGGER_WORDS = [
 ]
 
 
+# Priority country/political searches run on every scan
+PRIORITY_QUERIES = [
+    # Major economies in crisis
+    "France economy crisis OR collapse OR failing",
+    "Italy economy crisis OR debt OR failing",
+    "Germany economy recession OR crisis",
+    "UK Britain economy crisis OR collapse",
+    "United States economy recession OR crisis",
+    "Venezuela Maduro economy OR crisis OR collapse",
+    # Political drama
+    "country leader arrested OR coup OR overthrow",
+    "government collapse OR crisis",
+    # Trade/sanctions
+    "tariff trade war impact economy",
+    "sanctions country economy impact",
+]
+
+# Category-specific searches
+CATEGORY_QUERIES = {
+    "economics": [
+        "economy collapsing country 2025",
+        "debt crisis trillion country",
+        "currency crisis country",
+        "hyperinflation country",
+    ],
+    "geopolitics": [
+        "country invasion threat",
+        "sanctions impact country economy",
+        "trade war escalation",
+        "border conflict",
+    ],
+    "energy": [
+        "energy crisis country",
+        "oil price impact economy",
+        "gas shortage impact",
+    ]
+}
+
+
 def scan_trending_topics(category: str = "economics") -> List[Dict]:
     """
     Scan news for HIGH-POTENTIAL video opportunities.
@@ -53,48 +92,10 @@ def scan_trending_topics(category: str = "economics") -> List[Dict]:
     """
     all_results = []
     
-    # 1. Priority country-specific searches
-    priority_queries = [
-        # Major economies in crisis
-        "France economy crisis OR collapse OR failing",
-        "Italy economy crisis OR debt OR failing",
-        "Germany economy recession OR crisis",
-        "UK Britain economy crisis OR collapse",
-        "United States economy recession OR crisis",
-        "Venezuela Maduro economy OR crisis OR collapse",
-        # Political drama
-        "country leader arrested OR coup OR overthrow",
-        "government collapse OR crisis",
-        # Trade/sanctions
-        "tariff trade war impact economy",
-        "sanctions country economy impact",
-    ]
-    
-    # 2. Category-specific searches
-    category_queries = {
-        "economics": [
-            "economy collapsing country 2025",
-            "debt crisis trillion country",
-            "currency crisis country",
-            "hyperinflation country",
-        ],
-        "geopolitics": [
-            "country invasion threat",
-            "sanctions impact country economy",
-            "trade war escalation",
-            "border conflict",
-        ],
-        "energy": [
-            "energy crisis country",
-            "oil price impact economy",
-            "gas shortage impact",
-        ]
-    }
-    
-    selected_category = category_queries.get(category, category_queries["economics"])
+    selected_category = CATEGORY_QUERIES.get(category, CATEGORY_QUERIES["economics"])
     
     # Run priority searches first
-    for query in priority_queries[:6]:  # Top 6 priority searches
+    for query in PRIORITY_QUERIES[:6]:  # Top 6 priority searches
         results = _search_news(query)
         all_results.extend(results)
     
@@ -153,23 +154,16 @@ def _extract_topics(news_items: List[Dict]) -> List[Dict]:
     seen_headlines = set()
     
     for item in news_items:
-        title = item.get("title", "")
-        snippet = item.get("snippet", "")
-        link = item.get("link", "")
-        
         # Skip duplicate headlines
-        title_key = title.lower()[:50]
+        title_key = headline_key(item.get("title", ""))
         if title_key in seen_headlines:
             continue
         seen_headlines.add(title_key)
         
-        combined = f"{title} {snippet}".lower()
+        topic = _build_topic(item)
         
-        # Calculate viral score
-        viral_score = _calculate_viral_score(combined)
-        
-        if viral_score > 0:
-            country = _extract_country(combined)
+        if topic["viral_score"] > 0:
+            country = topic["country"]
             
             # Only one topic per country (highest scored)
             if country and country in seen_countries:
@@ -177,38 +171,52 @@ def _extract_topics(news_items: List[Dict]) -> List[Dict]:
             if country:
                 seen_countries.add(country)
             
-            # Generate dramatic title
-            suggested_title = _generate_dramatic_title(title, country, combined)
-            
-            topics.append({
-                "headline": title,
-                "snippet": snippet[:200],
-                "source_url": link,
-                "country": country,
-                "suggested_topic": suggested_title,
-                "category": _categorize_news(combined),
-                "viral_score": viral_score
-            })
+            topics.append(topic)
     
     # Sort by viral score
     topics.sort(key=lambda x: x["viral_score"], reverse=True)
     return topics
 
 
-def scan_by_country(country: str) -> List[Dict]:
+def headline_key(title: str) -> str:
+    """Normalized key used to deduplicate headlines across searches."""
+    return title.lower()[:50]
+
+
+def _build_topic(item: Dict, country: Optional[str] = None) -> Dict:
     """
-    Scan news for topics specific to a country.
+    Score a Serper news item and turn it into a topic suggestion.
     
     Args:
-        country: Country name (e.g., "Venezuela", "France", "UK")
-    
-    Returns:
-        List of 10 topic opportunities for that country
+        item: Raw news result (title, snippet, link)
+        country: Force this country instead of extracting one from the text
     """
-    all_results = []
-    
-    # Country-specific queries - more varied for better results
-    queries = [
+    title = item.get("title", "")
+    snippet = item.get("snippet", "")
+    link = item.get("link", "")
+    
+    combined = f"{title} {snippet}".lower()
+    
+    # Calculate viral score
+    viral_score = _calculate_viral_score(combined)
+    
+    if country is None:
+        country = _extract_country(combined)
+    
+    return {
+        "headline": title,
+        "snippet": snippet[:200],
+        "source_url": link,
+        "country": country,
+        "suggested_topic": _generate_dramatic_title(title, country, combined),
+        "category": _categorize_news(combined),
+        "viral_score": viral_score
+    }
+
+
+def country_queries(country: str) -> List[str]:
+    """Country-specific queries - more varied for better results."""
+    return [
         f"{country} economy crisis OR collapse 2025",
         f"{country} economy latest news today",
         f"{country} financial crisis OR debt OR deficit",
@@ -216,8 +224,21 @@ def scan_by_country(country: str) -> List[Dict]:
         f"{country} currency crisis OR inflation OR recession",
         f"{country} trade sanctions tariff",
     ]
+
+
+def scan_by_country(country: str) -> List[Dict]:
+    """
+    Scan news for topics specific to a country.
     
-    for query in queries:
+    Args:
+        country: Country name (e.g., "Venezuela", "France", "UK")
+    
+    Returns:
+        List of 10 topic opportunities for that country
+    """
+    all_results = []
+    
+    for query in country_queries(country):
         results = _search_news(query)
         all_results.extend(results)
     
@@ -226,31 +247,14 @@ def scan_by_country(country: str) -> List[Dict]:
     seen_headlines = set()
     
     for item in all_results:
-        title = item.get("title", "")
-        snippet = item.get("snippet", "")
-        link = item.get("link", "")
-        
         # Skip duplicates
-        title_key = title.lower()[:50]
+        title_key = headline_key(item.get("title", ""))
         if title_key in seen_headlines:
             continue
         seen_headlines.add(title_key)
         
-        combined = f"{title} {snippet}".lower()
-        viral_score = _calculate_viral_score(combined)
-        
         # Force the country for these results
-        suggested_title = _generate_dramatic_title(title, country, combined)
-        
-        topics.append({
-            "headline": title,
-            "snippet": snippet[:200],
-            "source_url": link,
-            "country": country,
-            "suggested_topic": suggested_title,
-            "category": _categorize_news(combined),
-            "viral_score": viral_score
-        })
+        topics.append(_build_topic(item, country=country))
     
     # Sort by viral score and limit to 10
     topics.sort(key=lambda x: x["viral_score"], reverse=True)
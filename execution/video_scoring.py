@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Video Scoring Module
+Columnar (NumPy) versions of the per-video scoring loops in youtube_search.py
+and keyword_research.py, for scoring thousands of candidates in one pass.
+
+- score_candidates: views/subscriber multiplier, multiplier percentile,
+  views per day and recency decay for a whole candidate pool
+- filter_by_multiplier: drop-in for youtube_search.filter_by_multiplier
+- keyword_difficulty / keyword_difficulty_batch: drop-in for
+  keyword_research.calculate_keyword_difficulty (one keyword or many)
+
+Outputs match the loop implementations exactly; test_pipeline.py checks this.
+"""
+
+from datetime import datetime, timezone
+from typing import List, Dict, Optional
+import numpy as np
+
+# Tier thresholds from calculate_keyword_difficulty (score applies when value > threshold)
+VIEWS_THRESHOLDS = np.array([10000, 50000, 100000, 500000, 1000000])
+VIEWS_SCORES = np.array([5, 12, 20, 28, 35, 40])
+SUBS_THRESHOLDS = np.array([10000, 50000, 100000, 500000, 1000000])
+SUBS_SCORES = np.array([5, 10, 16, 24, 32, 40])
+VELOCITY_THRESHOLDS = np.array([100, 1000, 5000, 10000])
+VELOCITY_SCORES = np.array([2, 5, 10, 15, 20])
+
+# Videos analyzed per keyword
+TOP_N = 10
+
+# Recency decay half-life for score_candidates
+DEFAULT_HALF_LIFE_DAYS = 30.0
+
+
+def _tier(values: np.ndarray, thresholds: np.ndarray, scores: np.ndarray) -> np.ndarray:
+    """Map values onto tier scores; a value scores a tier only if strictly above its threshold."""
+    return scores[np.searchsorted(thresholds, values, side='left')]
+
+
+def _age_days(published_at: List[Optional[str]]) -> np.ndarray:
+    """
+    Whole days since publish (timedelta.days semantics, 0 becomes 1).
+
+    Unparseable dates come back as NaN.
+    """
+    now = datetime.now(timezone.utc)
+    days = np.full(len(published_at), np.nan)
+    for i, value in enumerate(published_at):
+        try:
+            pub_date = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            days[i] = (now - pub_date).days or 1
+        except Exception:
+            pass
+    return days
+
+
+def score_candidates(views, subs, published_at: Optional[List[str]] = None,
+                     half_life_days: float = DEFAULT_HALF_LIFE_DAYS) -> Dict[str, np.ndarray]:
+    """
+    Score a pool of candidate videos column-wise.
+
+    Args:
+        views: View counts
+        subs: Channel subscriber counts (0 = hidden/unknown)
+        published_at: ISO publish timestamps (optional)
+        half_life_days: Age at which recency_decay reaches 0.5
+
+    Returns:
+        Dict of arrays aligned with the inputs:
+        multiplier (0 where subs unknown), multiplier_percentile (0-100 among
+        videos with known subs), views_per_day and recency_decay (only when
+        published_at is given)
+    """
+    views = np.asarray(views, dtype=np.int64)
+    subs = np.asarray(subs, dtype=np.int64)
+    known = subs != 0
+
+    multiplier = np.divide(views, subs, out=np.zeros(len(views)), where=known)
+
+    percentile = np.zeros(len(views))
+    if known.any():
+        ranked = np.sort(multiplier[known])
+        # Share of known-sub videos at or below each multiplier
+        percentile[known] = np.searchsorted(ranked, multiplier[known], side='right') / len(ranked) * 100
+
+    scores = {
+        'views': views,
+        'subs': subs,
+        'multiplier': multiplier,
+        'multiplier_percentile': percentile,
+    }
+
+    if published_at is not None:
+        age = _age_days(published_at)
+        parsed = ~np.isnan(age)
+        scores['age_days'] = age
+        scores['views_per_day'] = np.divide(views, age, out=np.zeros(len(views)), where=parsed)
+        scores['recency_decay'] = np.where(parsed, 0.5 ** (np.maximum(age, 0) / half_life_days), 0.0)
+
+    return scores
+
+
+def filter_by_multiplier(videos: list, video_stats: dict, channel_subs: dict,
+                         min_multiplier: float, min_views: int = 0, min_duration_sec: int = 0,
+                         max_subs: int = 0) -> list:
+    """
+    Filter videos by view-to-subscriber multiplier, min views, duration, and max subs.
+    Same contract as youtube_search.filter_by_multiplier.
+    """
+    count = len(videos)
+    default = {'viewCount': 0, 'duration': 0}
+    stats = [video_stats.get(v['video_id'], default) for v in videos]
+
+    views = np.fromiter((s['viewCount'] for s in stats), dtype=np.int64, count=count)
+    durations = np.fromiter((s['duration'] for s in stats), dtype=np.int64, count=count)
+    # Hidden (None) and missing subscriber counts become 0 and are skipped
+    subs = np.fromiter((channel_subs.get(v['channel_id']) or 0 for v in videos),
+                       dtype=np.int64, count=count)
+
+    multiplier = score_candidates(views, subs)['multiplier']
+
+    keep = (views >= min_views) & (durations >= min_duration_sec) & (subs != 0)
+    if max_subs > 0:
+        keep &= subs <= max_subs
+    keep &= multiplier >= min_multiplier
+
+    indices = np.flatnonzero(keep)
+    # Python round() per survivor so values match the loop version exactly
+    rounded = np.array([round(float(multiplier[i]), 2) for i in indices])
+
+    filtered = []
+    # Stable descending sort, same tie order as list.sort(reverse=True)
+    for j in np.argsort(-rounded, kind='stable'):
+        i = indices[j]
+        video = videos[i]
+        video['view_count'] = int(views[i])
+        video['subscriber_count'] = int(subs[i])
+        video['duration_sec'] = int(durations[i])
+        video['multiplier'] = float(rounded[j])
+        filtered.append(video)
+
+    return filtered
+
+
+def keyword_difficulty_batch(keyword_videos: List[List[Dict]], video_stats: Dict,
+                             channel_stats: Dict) -> List[Dict]:
+    """
+    Difficulty scores for many keywords at once.
+
+    Args:
+        keyword_videos: One search result list per keyword
+        video_stats: {video_id: {'view_count', ...}} covering all keywords
+        channel_stats: {channel_id: {'subscriber_count', ...}} covering all keywords
+
+    Returns:
+        One calculate_keyword_difficulty-shaped dict per keyword
+    """
+    rows = len(keyword_videos)
+    views = np.zeros((rows, TOP_N), dtype=np.int64)
+    subs = np.full((rows, TOP_N), np.iinfo(np.int64).max, dtype=np.int64)
+    present = np.zeros((rows, TOP_N), dtype=bool)
+    published = np.full((rows, TOP_N), None, dtype=object)
+
+    for r, videos in enumerate(keyword_videos):
+        for c, video in enumerate(videos[:TOP_N]):
+            views[r, c] = video_stats.get(video['video_id'], {}).get('view_count', 0)
+            subs[r, c] = channel_stats.get(video['channel_id'], {}).get('subscriber_count', 0)
+            present[r, c] = True
+            published[r, c] = video.get('published_at')
+
+    counts = present.sum(axis=1)
+    safe_counts = np.maximum(counts, 1)
+
+    # Views per day for every present cell (unparseable dates count as 0)
+    vpd = np.zeros((rows, TOP_N))
+    vpd[present] = score_candidates(views[present], subs[present], list(published[present]))['views_per_day']
+
+    # cumsum adds left to right, matching sum() over the same values
+    avg_views = np.cumsum(np.where(present, views, 0), axis=1)[:, -1] / safe_counts
+    avg_vpd = np.cumsum(np.where(present, vpd, 0.0), axis=1)[:, -1] / safe_counts
+    median_subs = np.sort(subs, axis=1)[np.arange(rows), counts // 2] if rows else np.zeros(0, dtype=np.int64)
+
+    difficulty = (
+        _tier(avg_views, VIEWS_THRESHOLDS, VIEWS_SCORES)
+        + _tier(median_subs, SUBS_THRESHOLDS, SUBS_SCORES)
+        + _tier(avg_vpd, VELOCITY_THRESHOLDS, VELOCITY_SCORES)
+    )
+
+    results = []
+    for r, videos in enumerate(keyword_videos):
+        if not videos:
+            results.append({
+                'difficulty_score': 0,
+                'difficulty_level': 'Unknown',
+                'avg_views': 0,
+                'median_subs': 0,
+                'opportunity_score': 0,
+                'top_videos': []
+            })
+            continue
+
+        score = int(difficulty[r])
+        if score >= 70:
+            level = 'High'
+        elif score >= 40:
+            level = 'Medium'
+        else:
+            level = 'Low'
+
+        avg = float(avg_views[r])
+        median = int(median_subs[r])
+
+        results.append({
+            'difficulty_score': score,
+            'difficulty_level': level,
+            'avg_views': int(avg),
+            'median_subs': median,
+            'avg_views_per_day': int(avg_vpd[r]),
+            'opportunity_score': max(0, 100 - score),
+            'multiplier': round(avg / median, 1) if median > 0 else 0,
+            'top_videos': [
+                {
+                    'title': video['title'][:60],
+                    'channel': video['channel_title'],
+                    'views': int(views[r, c]),
+                    'subs': int(subs[r, c]),
+                    'video_id': video['video_id']
+                }
+                for c, video in enumerate(videos[:5])
+            ]
+        })
+
+    return results
+
+
+def keyword_difficulty(videos: List[Dict], video_stats: Dict, channel_stats: Dict) -> Dict:
+    """Same contract as keyword_research.calculate_keyword_difficulty."""
+    return keyword_difficulty_batch([videos], video_stats, channel_stats)[0]
@@ -20,6 +20,10 @@ Flow (with approvals):
 9. Generate metadata → Show title/desc/tags → Approve
 10. Generate thumbnail → Show preview → Approve
 11. Upload → Confirm → Upload
+
+"Auto-produce" at step 4 runs steps 5-8 as one streamed pass
+(streaming_pipeline): images and audio start as each script section is
+written, and the flow stops again at video approval.
 """
 
 import os
@@ -28,11 +32,11 @@ from typing import Dict, Optional, Callable, List
 from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
-import google.generativeai as genai
 
 load_dotenv()
 
 # Import existing modules
+from execution import gemini_gateway
 from execution.youtube_video_info import get_video_details
 from execution.transcribe_video import transcribe_video
 from execution.research_agent import deep_research, format_research_for_script
@@ -48,6 +52,7 @@ from execution.generate_narrative_script import generate_narrative_script
 from execution.generate_audio import generate_all_audio
 from execution.generate_ai_images import generate_images_for_script, split_script_to_chunks
 from execution.generate_video import build_video_from_chunks
+from execution.streaming_pipeline import produce_script_video
 from execution.youtube_upload import upload_video, upload_video_with_captions
 
 # NEW: Import Locked Template Generator
@@ -78,10 +83,7 @@ except ImportError:
     upload_state = None
     download_file = None
 
-# Configure Gemini
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
 
 # Available styles (same as new_video_pipeline)
 STYLES = {
@@ -247,15 +249,10 @@ class ViralVideoPipeline:
 
     async def _generate_paraphrased_title(self):
         """Generate a paraphrased title (90% similar) and extract 3 key words for file naming."""
-        import google.generativeai as genai
-        
         original_title = self.state["original"]["title"]
         await self.send_message(f"✏️ Generating paraphrased title from:\n`{original_title}`")
         
         try:
-            genai.configure(api_key=os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY"))
-            model = genai.GenerativeModel('gemini-2.0-flash')
-            
             prompt = f"""You are a YouTube title expert. Generate 5 paraphrased versions of this title.
 
 ORIGINAL TITLE: "{original_title}"
@@ -282,8 +279,11 @@ ALSO: Extract the 3 MOST IMPORTANT words from the first option for file naming (
 Return ONLY valid JSON:
 {{"options": ["Title 1", "Title 2", "Title 3", "Title 4", "Title 5"], "keywords": ["word1", "word2", "word3"]}}"""
 
-            response = model.generate_content(prompt)
-            response_text = response.text.strip()
+            loop = asyncio.get_event_loop()
+            response_text = await loop.run_in_executor(
+                None, lambda: gemini_gateway.generate_text(prompt, model='gemini-2.0-flash')
+            )
+            response_text = response_text.strip()
             
             # Clean JSON markers if present
             if response_text.startswith("```"):
@@ -417,7 +417,7 @@ Return ONLY valid JSON:
             return True
         
         elif callback_data == "viral_research_regen":
-            await self._start_research()
+            await self._start_research(refresh=True)
             return True
         
         # Outline approval (NEW)
@@ -425,6 +425,10 @@ Return ONLY valid JSON:
             await self._generate_script()
             return True
         
+        elif callback_data == "viral_outline_autoproduce":
+            await self._stream_production()
+            return True
+        
         elif callback_data == "viral_outline_regen":
             await self._generate_outline()
             return True
@@ -495,6 +499,16 @@ Return ONLY valid JSON:
             await self._generate_thumbnail()
             return True
         
+        elif callback_data.startswith("viral_thumbnail_pick_"):
+            candidates = self.state.get("thumbnail_candidates", [])
+            index = int(callback_data.rsplit("_", 1)[1]) - 1
+            if 0 <= index < len(candidates) and os.path.exists(candidates[index]):
+                self.state["thumbnail_path"] = candidates[index]
+                await self._prepare_upload()
+            else:
+                await self.send_message("⚠️ That thumbnail is no longer available")
+            return True
+        
         # Upload confirmation
         elif callback_data == "viral_upload_confirm":
             await self._upload_to_youtube()
@@ -591,15 +605,19 @@ Return ONLY valid JSON:
             ]
         )
     
-    async def _start_research(self):
-        """Research deeper using transcript entities and structure analysis."""
+    async def _start_research(self, refresh: bool = False):
+        """
+        Research deeper using transcript entities and structure analysis.
+        The transcript analyses are cached; refresh=True (Regenerate) re-runs them.
+        """
         
         # Step 1: Extract entities from transcript
         await self.send_message("🔬 Extracting entities and claims from transcript...")
         
         extracted = extract_entities_and_claims(
             transcript=self.state["transcript"],
-            title=self.state["original"]["title"]
+            title=self.state["original"]["title"],
+            refresh=refresh
         )
         
         if extracted.get("success"):
@@ -616,7 +634,8 @@ Return ONLY valid JSON:
         
         beat_map = analyze_viral_structure(
             transcript=self.state["transcript"],
-            title=self.state["original"]["title"]
+            title=self.state["original"]["title"],
+            refresh=refresh
         )
         
         if beat_map.get("success"):
@@ -700,6 +719,7 @@ Return ONLY valid JSON:
             outline_text,
             [
                 [("✅ Approve Outline", "viral_outline_approve")],
+                [("⚡ Approve & Auto-produce", "viral_outline_autoproduce")],
                 [("🔄 Regenerate", "viral_outline_regen")],
                 [("❌ Cancel", "viral_cancel")]
             ]
@@ -711,15 +731,10 @@ Return ONLY valid JSON:
         """Generate script using generate_narrative_script (NEW - no headers, TTS-ready)."""
         await self.send_message("✍️ Generating 4,500-word script (~30 min video)...\n\n_Using narrative engine (no headers, TTS-optimized)_")
         
-        # Combine research + outline for context
-        research_text = format_research_for_script(self.state["research"])
-        outline_context = format_outline_for_script({"success": True, "outline": self.state["outline"]})
-        full_context = research_text + "\n\n" + outline_context
-        
         try:
             # Use generate_narrative_script (same as new_video_pipeline)
             result = generate_narrative_script(
-                research_data=full_context,
+                research_data=self._script_context(),
                 topic=self.state["title"],
                 target_minutes=30  # 4500 words
             )
@@ -780,6 +795,76 @@ Return ONLY valid JSON:
         except Exception as e:
             await self.send_message(f"❌ Script generation error: {str(e)}")
     
+    def _script_context(self) -> str:
+        """Research + outline, as script generation context."""
+        research_text = format_research_for_script(self.state["research"])
+        outline_context = format_outline_for_script({"success": True, "outline": self.state["outline"]})
+        return research_text + "\n\n" + outline_context
+    
+    async def _stream_production(self):
+        """
+        Auto-produce: write the script and stream it into images, audio and video
+        in one pass, skipping the script/style/image approvals.
+        """
+        self.state["auto_approve"] = True
+        style_id = self.state.get("style") or DEFAULT_STYLE
+        await self.send_message(
+            f"⚡ Auto-producing with style {STYLES.get(style_id, {}).get('name', style_id)}...\n\n"
+            "_Images and audio start as each section is written; segments render as they finish._"
+        )
+        
+        try:
+            loop = asyncio.get_event_loop()
+            result = await loop.run_in_executor(
+                None,
+                lambda: produce_script_video(
+                    research_data=self._script_context(),
+                    topic=self.state["title"],
+                    output_dir=self.output_dir,
+                    target_minutes=30,  # 4500 words
+                    style_id=style_id
+                )
+            )
+        except Exception as e:
+            await self.send_message(f"❌ Auto-produce error: {str(e)}")
+            return
+        
+        script = result["script"].get("full_script", "")
+        if script:
+            self.state["script"] = script
+            with open(Path(self.output_dir) / "script.txt", "w") as f:
+                f.write(script)
+        self.state["images"] = result.get("images", {})
+        self.state["audio_result"] = {"audio_files": result.get("audio_files", [])}
+        self.save_checkpoint("generate_images")
+        
+        if not result.get("success"):
+            await self.send_message(f"❌ Video generation failed: {result.get('message')}")
+            return
+        
+        self.state["video_path"] = result["output_path"]
+        self.save_checkpoint("generate_video")
+        
+        images = result.get("images", {})
+        await self.send_message(
+            f"🎥 *Video Auto-produced*\n\n"
+            f"Duration: {result.get('duration', 0)/60:.1f} minutes\n"
+            f"Words: {result['script'].get('total_words', len(script.split()))}\n"
+            f"Images: {images.get('successful', 0)}/{images.get('total_chunks', 0)}\n"
+            f"Segments: {result.get('segments_count', 0)}\n\n"
+            "Approve video?"
+        )
+        
+        self.state["step"] = "approving_video"
+        
+        await self.send_keyboard(
+            "Approve video?",
+            [
+                [("✅ Approve Video", "viral_video_approve")],
+                [("🔄 Regenerate", "viral_video_regen")]
+            ]
+        )
+    
     async def _select_style(self):
         """Show style options for user to select."""
         style_text = "🎨 *Select Video Style:*\n\n"
@@ -900,30 +985,34 @@ Return ONLY valid JSON:
         """Generate audio and video, show preview."""
         await self.send_message("🎬 Generating video...\n\n⏳ Generating audio and stitching video. This may take several minutes.")
         
+        # Pair narration with the chunks the images were made for. Auto-produce
+        # splits per beat, so re-splitting the full script can shift them.
+        images_data = self.state.get("images") or {}
+        image_chunks = images_data.get("chunks", []) if isinstance(images_data, dict) else images_data
+        if image_chunks:
+            script_chunks = [c.get("chunk_text", "") for c in image_chunks]
+            image_paths = [c.get("path") if c.get("success") else None for c in image_chunks]
+        else:
+            script_chunks = split_script_to_chunks(self.state["script"])
+            image_paths = []
+        
         # Generate audio
         await self.send_message("🎙️ Generating voiceover...")
-        audio_result = generate_all_audio(self.state["script"], self.output_dir)
+        audio_result = generate_all_audio(self.state["script"], self.output_dir, chunks=script_chunks)
         self.state["audio_result"] = audio_result
         
         # Build video
         await self.send_message("🎬 Stitching video...")
         
-        audio_files = audio_result.get("audio_files", [])
-        images_dir = Path(self.output_dir) / "images"
-        image_files = sorted(images_dir.glob("*.png")) if images_dir.exists() else []
+        audio_by_index = {a.get("index"): a.get("path") for a in audio_result.get("audio_files", [])}
         
         chunks = []
-        script_chunks = split_script_to_chunks(self.state["script"])
-        
         for i, chunk_text in enumerate(script_chunks):
-            audio_file = audio_files[i] if i < len(audio_files) else None
-            image_file = image_files[i] if i < len(image_files) else None
-            
             chunks.append({
                 "id": i,
                 "text": chunk_text,
-                "audio_path": audio_file.get("path") if audio_file else None,
-                "screenshot_path": str(image_file) if image_file else None
+                "audio_path": audio_by_index.get(i),
+                "screenshot_path": image_paths[i] if i < len(image_paths) else None
             })
         
         result = build_video_from_chunks(chunks)
@@ -1064,8 +1153,6 @@ Return ONLY valid JSON:
         """Generate description for approval. Title and tags are already set."""
         await self.send_message("📋 Creating description with timestamps...")
         
-        model = genai.GenerativeModel("gemini-2.0-flash")
-        
         original_desc = self.state["original"]["description"]
         
         # Title is already set from title selection step
@@ -1088,8 +1175,11 @@ Rules:
 
 Return ONLY the paraphrased description, nothing else."""
 
-        desc_response = model.generate_content(desc_prompt)
-        paraphrased_desc = desc_response.text.strip()
+        loop = asyncio.get_event_loop()
+        paraphrased_desc = await loop.run_in_executor(
+            None, lambda: gemini_gateway.generate_text(desc_prompt, model="gemini-2.0-flash")
+        )
+        paraphrased_desc = paraphrased_desc.strip()
         
         # Generate timestamps from SRT
         timestamps_text = ""
@@ -1154,53 +1244,54 @@ Return ONLY the paraphrased description, nothing else."""
             except Exception as e:
                 print(f"Failed to download original thumbnail: {e}")
 
-        # Generate actual thumbnail with correct parameters
+        # Generate candidates in parallel and preview each as it finishes
+        candidates = []
         try:
-            from execution.generate_thumbnail import generate_thumbnail
-            
-            # Create output path
-            thumb_output = os.path.join(self.output_dir, "thumbnail.jpg")
+            from execution.generate_thumbnail import generate_thumbnail_candidates
             
-            result_path = generate_thumbnail(
+            candidate_iter = generate_thumbnail_candidates(
                 topic=self.state["title"],  # Use title as topic
-                title=self.state["title"],
-                output_path=thumb_output,
+                output_dir=self.output_dir,
                 style_reference=style_reference_path, # Pass original thumb as reference
                 auto_compress=True
             )
-            
-            if result_path and os.path.exists(result_path):
-                self.state["thumbnail_path"] = result_path
-                await self.send_message(f"✅ Thumbnail created: `{Path(result_path).name}`")
-            else:
-                await self.send_message("⚠️ Thumbnail generation returned no path")
+            loop = asyncio.get_event_loop()
+            while True:
+                # Run in thread executor to avoid blocking asyncio loop
+                candidate = await loop.run_in_executor(None, next, candidate_iter, None)
+                if candidate is None:
+                    break
+                if not candidate["success"] or not os.path.exists(candidate["path"]):
+                    print(f"Thumbnail candidate {candidate['index']} failed: {candidate.get('error')}")
+                    continue
+                
+                candidates.append(candidate["path"])
+                if self.bot:
+                    try:
+                        with open(candidate["path"], 'rb') as f:
+                            await self.bot.send_photo(self.chat_id, f, caption=f"🖼️ Thumbnail #{len(candidates)}")
+                    except Exception as e:
+                        await self.send_message(f"⚠️ Could not send thumbnail preview: {e}")
         except Exception as e:
             await self.send_message(f"⚠️ Thumbnail generation issue: {e}")
             import traceback
             traceback.print_exc()
         
-        self.save_checkpoint("generate_thumbnail")
-        
-        # Send thumbnail preview (KEY FIX - show actual image)
-        if self.bot and self.state.get("thumbnail_path") and os.path.exists(self.state["thumbnail_path"]):
-            try:
-                with open(self.state["thumbnail_path"], 'rb') as f:
-                    await self.bot.send_photo(self.chat_id, f, caption="🖼️ Thumbnail Generated")
-            except Exception as e:
-                await self.send_message(f"⚠️ Could not send thumbnail preview: {e}")
+        if candidates:
+            self.state["thumbnail_candidates"] = candidates
+            self.state["thumbnail_path"] = candidates[0]
         else:
             await self.send_message("⚠️ No thumbnail file to preview")
         
-        await self.send_message("🖼️ Thumbnail generated\n\nApprove thumbnail?")
+        self.save_checkpoint("generate_thumbnail")
         
         self.state["step"] = "approving_thumbnail"
         
         await self.send_keyboard(
-            "Approve thumbnail?",
-            [
-                [("✅ Approve Thumbnail", "viral_thumbnail_approve")],
-                [("🔄 Regenerate", "viral_thumbnail_regen")]
-            ]
+            f"🖼️ {len(candidates)} thumbnail(s) generated\n\nPick a thumbnail?",
+            [[(f"✅ Use #{i}", f"viral_thumbnail_pick_{i}") for i in range(1, len(candidates) + 1)],
+             [("🔄 Regenerate", "viral_thumbnail_regen")]] if candidates else
+            [[("🔄 Regenerate", "viral_thumbnail_regen")]]
         )
     
     def _extract_seo_keywords(self, title: str) -> str:
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+YouTube Data API Client
+Shared client for search, videos.list and channels.list used by discovery
+(youtube_search.py) and keyword research (keyword_research.py).
+
+- Pooled HTTP session (thread-safe, reused connections)
+- videos/channels lookups batched 50 IDs per request, batches run concurrently
+- Video/channel stats and search results memoized across calls with a TTL
+- Quota units tracked per call type (search = 100, videos/channels = 1)
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+load_dotenv()
+
+YOUTUBE_API_KEY = os.getenv('YOUTUBE_API_KEY')
+API_BASE = "https://www.googleapis.com/youtube/v3"
+
+# Max IDs the API accepts per videos.list / channels.list request
+BATCH_SIZE = 50
+
+# Cache lifetimes (seconds)
+STATS_CACHE_TTL = int(os.getenv('YOUTUBE_STATS_CACHE_TTL', '3600'))
+SEARCH_CACHE_TTL = int(os.getenv('YOUTUBE_SEARCH_CACHE_TTL', '1800'))
+
+# Quota cost per call type (https://developers.google.com/youtube/v3/determine_quota_cost)
+QUOTA_COSTS = {
+    'search': 100,
+    'videos': 1,
+    'channels': 1,
+}
+
+MAX_WORKERS = 8
+
+
+class YouTubeAPIError(Exception):
+    """Non-200 response from the YouTube Data API."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"YouTube API error {status}: {message}")
+        self.status = status
+
+
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=MAX_WORKERS))
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='youtube_api')
+
+_lock = threading.Lock()
+_video_cache: Dict[str, tuple] = {}    # video_id -> (expires_at, stats)
+_channel_cache: Dict[str, tuple] = {}  # channel_id -> (expires_at, stats)
+_search_cache: Dict[tuple, tuple] = {} # params key -> (expires_at, videos)
+_quota = {name: {'calls': 0, 'units': 0, 'cache_hits': 0} for name in QUOTA_COSTS}
+
+
+def _get(endpoint: str, params: Dict) -> Dict:
+    """GET an API endpoint, record quota usage and raise on errors."""
+    if not YOUTUBE_API_KEY:
+        raise ValueError("YOUTUBE_API_KEY not found in .env file")
+
+    params = {k: v for k, v in params.items() if v is not None}
+    params['key'] = YOUTUBE_API_KEY
+
+    response = _session.get(f"{API_BASE}/{endpoint}", params=params, timeout=15)
+
+    with _lock:
+        _quota[endpoint]['calls'] += 1
+        _quota[endpoint]['units'] += QUOTA_COSTS[endpoint]
+
+    if response.status_code != 200:
+        raise YouTubeAPIError(response.status_code, response.text[:200])
+    return response.json()
+
+
+def _record_hits(endpoint: str, count: int):
+    if count:
+        with _lock:
+            _quota[endpoint]['cache_hits'] += count
+
+
+def _cached(cache: Dict, ids: List[str]) -> tuple:
+    """Split IDs into (fresh cached results, IDs that need fetching)."""
+    now = time.time()
+    found, missing = {}, []
+    with _lock:
+        for item_id in ids:
+            entry = cache.get(item_id)
+            if entry and entry[0] > now:
+                found[item_id] = entry[1]
+            else:
+                missing.append(item_id)
+    return found, missing
+
+
+def _submit_batches(endpoint: str, part: str, ids: List[str]) -> list:
+    """Start 50-ID batch requests on the shared pool. Returns futures."""
+    batches = [ids[i:i + BATCH_SIZE] for i in range(0, len(ids), BATCH_SIZE)]
+    return [
+        _executor.submit(_get, endpoint, {'part': part, 'id': ','.join(batch)})
+        for batch in batches
+    ]
+
+
+def _parse_video(item: Dict) -> Dict:
+    s = item.get('statistics', {})
+    return {
+        'view_count': int(s.get('viewCount', 0)),
+        'like_count': int(s.get('likeCount', 0)),
+        'comment_count': int(s.get('commentCount', 0)),
+        'duration': item.get('contentDetails', {}).get('duration', '')
+    }
+
+
+def _parse_channel(item: Dict) -> Dict:
+    s = item.get('statistics', {})
+    return {
+        'subscriber_count': int(s.get('subscriberCount', 0)),
+        'hidden_subscriber_count': bool(s.get('hiddenSubscriberCount', False)),
+        'video_count': int(s.get('videoCount', 0))
+    }
+
+
+class _Lookup:
+    """In-flight cached lookup: cache hits resolved now, misses fetched on the pool."""
+
+    def __init__(self, endpoint: str, part: str, cache: Dict, parse, ids: List[str]):
+        self.cache = cache
+        self.parse = parse
+        self.stats, missing = _cached(cache, list(dict.fromkeys(ids)))
+        _record_hits(endpoint, len(self.stats))
+        self.futures = _submit_batches(endpoint, part, missing) if missing else []
+
+    def result(self) -> Dict[str, Dict]:
+        fetched = {}
+        for future in self.futures:
+            for item in future.result().get('items', []):
+                fetched[item['id']] = self.parse(item)
+
+        expires_at = time.time() + STATS_CACHE_TTL
+        with _lock:
+            for item_id, item in fetched.items():
+                self.cache[item_id] = (expires_at, item)
+
+        self.stats.update(fetched)
+        return self.stats
+
+
+def _lookup_videos(video_ids: List[str]) -> _Lookup:
+    return _Lookup('videos', 'statistics,contentDetails', _video_cache, _parse_video, video_ids)
+
+
+def _lookup_channels(channel_ids: List[str]) -> _Lookup:
+    return _Lookup('channels', 'statistics', _channel_cache, _parse_channel, channel_ids)
+
+
+def get_videos(video_ids: List[str]) -> Dict[str, Dict]:
+    """
+    Get statistics and duration for videos, served from cache where possible.
+
+    Returns:
+        {video_id: {'view_count', 'like_count', 'comment_count', 'duration' (ISO 8601)}}
+    """
+    return _lookup_videos(video_ids).result()
+
+
+def get_channels(channel_ids: List[str]) -> Dict[str, Dict]:
+    """
+    Get subscriber/video counts for channels, served from cache where possible.
+
+    Returns:
+        {channel_id: {'subscriber_count', 'hidden_subscriber_count', 'video_count'}}
+    """
+    return _lookup_channels(channel_ids).result()
+
+
+def search(query: str, max_results: int = 50, order: str = 'relevance',
+           published_after: Optional[str] = None, region: Optional[str] = None,
+           relevance_language: Optional[str] = None) -> List[Dict]:
+    """
+    Search for videos, following page tokens up to max_results.
+
+    Returns:
+        List of {'video_id', 'title', 'channel_id', 'channel_title',
+                 'published_at', 'thumbnail_url'}
+    """
+    key = (query, max_results, order, published_after, region, relevance_language)
+    with _lock:
+        entry = _search_cache.get(key)
+    if entry and entry[0] > time.time():
+        _record_hits('search', 1)
+        return [dict(v) for v in entry[1]]
+
+    videos = []
+    page_token = None
+    while len(videos) < max_results:
+        data = _get('search', {
+            'q': query,
+            'part': 'snippet',
+            'type': 'video',
+            'order': order,
+            'publishedAfter': published_after,
+            'regionCode': region,
+            'relevanceLanguage': relevance_language,
+            'maxResults': min(50, max_results - len(videos)),
+            'pageToken': page_token
+        })
+
+        for item in data.get('items', []):
+            snippet = item['snippet']
+            videos.append({
+                'video_id': item['id']['videoId'],
+                'title': snippet['title'],
+                'channel_id': snippet['channelId'],
+                'channel_title': snippet['channelTitle'],
+                'published_at': snippet['publishedAt'],
+                'thumbnail_url': snippet.get('thumbnails', {}).get('high', {}).get('url', '')
+            })
+
+        page_token = data.get('nextPageToken')
+        if not page_token:
+            break
+
+    with _lock:
+        _search_cache[key] = (time.time() + SEARCH_CACHE_TTL, videos)
+    # Callers annotate results in place; keep the cached copies clean
+    return [dict(v) for v in videos]
+
+
+def get_videos_and_channels(video_ids: List[str], channel_ids: List[str]) -> tuple:
+    """Fetch video and channel stats concurrently. Returns (video_stats, channel_stats)."""
+    videos = _lookup_videos(video_ids)
+    channels = _lookup_channels(channel_ids)
+    return videos.result(), channels.result()
+
+
+def get_quota_usage() -> Dict:
+    """Quota units, API calls and cache hits per call type since process start."""
+    with _lock:
+        usage = {name: dict(counts) for name, counts in _quota.items()}
+    usage['total_units'] = sum(counts['units'] for counts in _quota.values())
+    return usage
+
+
+def clear_cache():
+    """Drop all memoized search results and stats."""
+    with _lock:
+        _video_cache.clear()
+        _channel_cache.clear()
+        _search_cache.clear()
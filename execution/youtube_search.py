@@ -4,65 +4,51 @@ YouTube Video Discovery Script
 Searches YouTube for videos and filters by view-to-subscriber multiplier.
 """
 
-import os
+import sys
 import json
 import argparse
+from pathlib import Path
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
 
-# Load environment variables
-load_dotenv()
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from execution import youtube_api
+from execution.youtube_api import YouTubeAPIError
 
-YOUTUBE_API_KEY = os.getenv('YOUTUBE_API_KEY')
+# Vectorized scoring for large candidate pools (falls back to the loop below)
+try:
+    from execution import video_scoring
+except ImportError:
+    video_scoring = None
 
-def get_youtube_client():
-    """Initialize YouTube API client."""
-    if not YOUTUBE_API_KEY:
-        raise ValueError("YOUTUBE_API_KEY not found in .env file")
-    return build('youtube', 'v3', developerKey=YOUTUBE_API_KEY)
+# Load environment variables
+load_dotenv()
 
-def search_videos(youtube, query: str, days: int = 30, max_results: int = 50) -> list:
+def search_videos(query: str, days: int = 30, max_results: int = 50) -> list:
     """
     Search YouTube for videos matching query, published within last N days.
     Returns list of video IDs with basic info.
     """
-    published_after = (datetime.utcnow() - timedelta(days=days)).isoformat() + 'Z'
+    # Day granularity so repeat searches within a day hit the search cache
+    published_after = (datetime.utcnow() - timedelta(days=days)).strftime('%Y-%m-%dT00:00:00Z')
     
-    videos = []
-    next_page_token = None
+    try:
+        videos = youtube_api.search(
+            query,
+            max_results=max_results,
+            order='viewCount',
+            published_after=published_after
+        )
+    except YouTubeAPIError as e:
+        if e.status == 403:
+            raise
+        print(f"YouTube API error: {e}")
+        return []
     
-    while len(videos) < max_results:
-        try:
-            request = youtube.search().list(
-                q=query,
-                part='snippet',
-                type='video',
-                order='viewCount',
-                publishedAfter=published_after,
-                maxResults=min(50, max_results - len(videos)),
-                pageToken=next_page_token
-            )
-            response = request.execute()
-            
-            for item in response.get('items', []):
-                videos.append({
-                    'video_id': item['id']['videoId'],
-                    'title': item['snippet']['title'],
-                    'channel_id': item['snippet']['channelId'],
-                    'channel_name': item['snippet']['channelTitle'],
-                    'published_at': item['snippet']['publishedAt'],
-                    'thumbnail_url': item['snippet']['thumbnails'].get('high', {}).get('url', '')
-                })
-            
-            next_page_token = response.get('nextPageToken')
-            if not next_page_token:
-                break
-                
-        except HttpError as e:
-            print(f"YouTube API error: {e}")
-            break
+    for video in videos:
+        video['channel_name'] = video.pop('channel_title')
     
     return videos
 
@@ -79,68 +65,41 @@ def parse_duration(duration_str: str) -> int:
     
     return hours * 3600 + minutes * 60 + seconds
 
-def get_video_stats(youtube, video_ids: list) -> dict:
+def get_video_stats(video_ids: list) -> dict:
     """
     Get view counts and duration for a list of video IDs.
     Returns dict: {video_id: {'viewCount': int, 'duration': int_seconds}}
     """
-    stats = {}
-    
-    # YouTube API allows max 50 IDs per request
-    for i in range(0, len(video_ids), 50):
-        batch = video_ids[i:i+50]
-        try:
-            request = youtube.videos().list(
-                part='statistics,contentDetails',
-                id=','.join(batch)
-            )
-            response = request.execute()
-            
-            for item in response.get('items', []):
-                view_count = int(item['statistics'].get('viewCount', 0))
-                duration_iso = item['contentDetails'].get('duration', 'PT0S')
-                duration_sec = parse_duration(duration_iso)
-                
-                stats[item['id']] = {
-                    'viewCount': view_count,
-                    'duration': duration_sec
-                }
-                
-        except HttpError as e:
-            print(f"Error fetching video stats: {e}")
-    
-    return stats
+    try:
+        items = youtube_api.get_videos(video_ids)
+    except YouTubeAPIError as e:
+        print(f"Error fetching video stats: {e}")
+        return {}
+    
+    return {
+        video_id: {
+            'viewCount': item['view_count'],
+            'duration': parse_duration(item['duration'] or 'PT0S')
+        }
+        for video_id, item in items.items()
+    }
 
-def get_channel_subscribers(youtube, channel_ids: list) -> dict:
+def get_channel_subscribers(channel_ids: list) -> dict:
     """
     Get subscriber counts for a list of channel IDs.
     Returns dict: {channel_id: subscriber_count}
     """
-    subscribers = {}
-    
-    # Remove duplicates and batch
-    unique_channels = list(set(channel_ids))
-    
-    for i in range(0, len(unique_channels), 50):
-        batch = unique_channels[i:i+50]
-        try:
-            request = youtube.channels().list(
-                part='statistics',
-                id=','.join(batch)
-            )
-            response = request.execute()
-            
-            for item in response.get('items', []):
-                # hiddenSubscriberCount means we can't get the count
-                if item['statistics'].get('hiddenSubscriberCount', False):
-                    subscribers[item['id']] = None
-                else:
-                    subscribers[item['id']] = int(item['statistics'].get('subscriberCount', 0))
-                    
-        except HttpError as e:
-            print(f"Error fetching channel stats: {e}")
-    
-    return subscribers
+    try:
+        items = youtube_api.get_channels(channel_ids)
+    except YouTubeAPIError as e:
+        print(f"Error fetching channel stats: {e}")
+        return {}
+    
+    # hiddenSubscriberCount means we can't get the count
+    return {
+        channel_id: None if item['hidden_subscriber_count'] else item['subscriber_count']
+        for channel_id, item in items.items()
+    }
 
 def filter_by_multiplier(videos: list, video_stats: dict, channel_subs: dict, 
                         min_multiplier: float, min_views: int = 0, min_duration_sec: int = 0,
@@ -205,11 +164,9 @@ def discover_videos(query: str, min_multiplier: float = 1.0, days: int = 30, max
         Dict with 'success', 'videos', and 'message' keys
     """
     try:
-        youtube = get_youtube_client()
-        
         # Step 1: Search for videos
         print(f"Searching for videos: '{query}' (past {days} days)...")
-        videos = search_videos(youtube, query, days, max_results)
+        videos = search_videos(query, days, max_results)
         
         if not videos:
             return {
@@ -222,15 +179,16 @@ def discover_videos(query: str, min_multiplier: float = 1.0, days: int = 30, max
         
         # Step 2: Get video view counts
         video_ids = [v['video_id'] for v in videos]
-        video_stats = get_video_stats(youtube, video_ids)
+        video_stats = get_video_stats(video_ids)
         
         # Step 3: Get channel subscriber counts
         channel_ids = [v['channel_id'] for v in videos]
-        channel_subs = get_channel_subscribers(youtube, channel_ids)
+        channel_subs = get_channel_subscribers(channel_ids)
         
         # Step 4: Filter by multiplier and other criteria
         print(f"Filtering with min_multiplier={min_multiplier}, min_views={min_views}, max_subs={max_subs}...")
-        filtered_videos = filter_by_multiplier(
+        filter_fn = video_scoring.filter_by_multiplier if video_scoring else filter_by_multiplier
+        filtered_videos = filter_fn(
             videos, 
             video_stats, 
             channel_subs, 
@@ -252,8 +210,8 @@ def discover_videos(query: str, min_multiplier: float = 1.0, days: int = 30, max
             'videos': [],
             'message': str(e)
         }
-    except HttpError as e:
-        if e.resp.status == 403:
+    except YouTubeAPIError as e:
+        if e.status == 403:
             return {
                 'success': False,
                 'videos': [],
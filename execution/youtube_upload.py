@@ -2,14 +2,23 @@
 """
 YouTube Upload Module
 Handles OAuth 2.0 authentication and video upload to YouTube.
+
+Video uploads are resumable across process restarts: the session URI and
+committed byte offset are saved (Redis, else .tmp/youtube_uploads) after
+every chunk, and a later upload_video() call for the same file asks YouTube
+how far it got and continues from there. Chunk size adapts to the measured
+throughput.
 """
 
 import os
 import json
+import time
 import pickle
 import base64
+import hashlib
 import tempfile
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Optional, List
 
@@ -21,6 +30,7 @@ try:
     from google.oauth2.credentials import Credentials
     from google_auth_oauthlib.flow import Flow
     from googleapiclient.discovery import build
+    from googleapiclient.errors import HttpError
     from googleapiclient.http import MediaFileUpload
     GOOGLE_API_AVAILABLE = True
 except ImportError:
@@ -54,6 +64,19 @@ REDIS_TOKEN_KEY = 'youtube_oauth_credentials'
 # OAuth scopes for YouTube upload
 SCOPES = ['https://www.googleapis.com/auth/youtube.upload']
 
+# Resumable upload sessions (YouTube keeps an unfinished session for about a week)
+UPLOAD_SESSION_DIR = BASE_DIR / '.tmp' / 'youtube_uploads'
+REDIS_SESSION_PREFIX = 'youtube_upload_session:'
+UPLOAD_SESSION_TTL = 6 * 24 * 3600
+
+# Chunk sizes must be multiples of 256 KB; each chunk is one HTTP request,
+# sized so it takes about CHUNK_TARGET_SECONDS at the measured throughput
+CHUNK_UNIT = 256 * 1024
+MIN_CHUNK_SIZE = 4 * CHUNK_UNIT       # 1 MB
+INITIAL_CHUNK_SIZE = 32 * CHUNK_UNIT  # 8 MB
+MAX_CHUNK_SIZE = 256 * CHUNK_UNIT     # 64 MB
+CHUNK_TARGET_SECONDS = 10
+
 
 def _get_client_config() -> Optional[Dict]:
     """Get client config from file or environment variable."""
@@ -242,6 +265,102 @@ def is_authenticated() -> bool:
     return result
 
 
+def _session_key(video_path: str) -> str:
+    """Identify an upload by the file's path, size and mtime (a re-render starts fresh)."""
+    stat = os.stat(video_path)
+    identity = f"{os.path.abspath(video_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    return hashlib.sha1(identity.encode('utf-8')).hexdigest()
+
+
+def _load_session(key: str) -> Optional[Dict]:
+    """Saved resumable session for an upload, or None."""
+    if REDIS_AVAILABLE and redis_client:
+        try:
+            data = redis_client.get(REDIS_SESSION_PREFIX + key)
+            return json.loads(data) if data else None
+        except Exception as e:
+            logger.warning(f"YouTube Upload: Could not load session from Redis: {e}")
+    path = UPLOAD_SESSION_DIR / f"{key}.json"
+    try:
+        with open(path) as f:
+            session = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - session.get('updated_at', 0) > UPLOAD_SESSION_TTL:
+        return None
+    return session
+
+
+def _save_session(key: str, session: Dict):
+    session = {**session, 'updated_at': time.time()}
+    if REDIS_AVAILABLE and redis_client:
+        try:
+            redis_client.set(REDIS_SESSION_PREFIX + key, json.dumps(session), ex=UPLOAD_SESSION_TTL)
+            return
+        except Exception as e:
+            logger.warning(f"YouTube Upload: Could not save session to Redis: {e}")
+    UPLOAD_SESSION_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = UPLOAD_SESSION_DIR / f"{key}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(session, f)
+    os.replace(tmp_path, UPLOAD_SESSION_DIR / f"{key}.json")
+
+
+def _clear_session(key: str):
+    if REDIS_AVAILABLE and redis_client:
+        try:
+            redis_client.delete(REDIS_SESSION_PREFIX + key)
+        except Exception as e:
+            logger.warning(f"YouTube Upload: Could not clear session in Redis: {e}")
+    try:
+        os.remove(UPLOAD_SESSION_DIR / f"{key}.json")
+    except OSError:
+        pass
+
+
+def _next_chunk_size(current: int, sent_bytes: int, elapsed: float) -> int:
+    """Chunk size that would take about CHUNK_TARGET_SECONDS at the last chunk's throughput."""
+    if sent_bytes <= 0 or elapsed <= 0:
+        return current
+    ideal = sent_bytes / elapsed * CHUNK_TARGET_SECONDS
+    # At most 2x per step, so one unusually slow or fast chunk doesn't swing it
+    ideal = max(current / 2, min(current * 2, ideal))
+    size = int(ideal // CHUNK_UNIT) * CHUNK_UNIT
+    return max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, size))
+
+
+def set_thumbnail(video_id: str, thumbnail_path: str) -> Dict:
+    """
+    Set a custom thumbnail on an uploaded video.
+    
+    Returns:
+        Dict with success status
+    """
+    if not GOOGLE_API_AVAILABLE:
+        return {'success': False, 'error': 'Google API libraries not installed'}
+    
+    credentials = get_credentials()
+    if not credentials:
+        return {'success': False, 'error': 'Not authenticated'}
+    
+    if not thumbnail_path or not os.path.exists(thumbnail_path):
+        return {'success': False, 'error': f'Thumbnail not found: {thumbnail_path}'}
+    
+    try:
+        # Own client: API clients aren't thread-safe and this may run next to captions
+        youtube = build('youtube', 'v3', credentials=credentials)
+        print(f"Uploading thumbnail: {thumbnail_path}")
+        youtube.thumbnails().set(
+            videoId=video_id,
+            media_body=MediaFileUpload(thumbnail_path)
+        ).execute()
+        print("Thumbnail set successfully")
+        return {'success': True}
+    except Exception as e:
+        print(f"Warning: Failed to set thumbnail: {e}")
+        return {'success': False, 'error': str(e)}
+
+
 def upload_video(
     video_path: str,
     title: str,
@@ -254,6 +373,10 @@ def upload_video(
     """
     Upload a video to YouTube.
     
+    If an earlier call for the same file was interrupted (error, crash,
+    restart), the upload resumes from the last byte YouTube committed; the
+    metadata of the original call is kept in that case.
+    
     Args:
         video_path: Path to the video file
         title: Video title
@@ -293,45 +416,75 @@ def upload_video(
             }
         }
         
-        # Upload video with smaller chunk size (256KB multiple) for better reliability
-        # 256KB is minimum, but we'll try 512KB to balance speed/reliability
-        chunk_size = 256 * 1024
+        file_size = os.path.getsize(video_path)
+        session_key = _session_key(video_path)
+        session = _load_session(session_key)
         
-        media = MediaFileUpload(
-            video_path,
-            chunksize=chunk_size, 
-            resumable=True
-        )
-        
-        print(f"Starting resumable upload for: {video_path} ({os.path.getsize(video_path)} bytes)")
+        def new_request(chunk_size):
+            media = MediaFileUpload(video_path, chunksize=chunk_size, resumable=True)
+            return media, youtube.videos().insert(
+                part='snippet,status',
+                body=body,
+                media_body=media
+            )
         
-        request = youtube.videos().insert(
-            part='snippet,status',
-            body=body,
-            media_body=media
-        )
+        media, request = new_request(session.get('chunk_size', INITIAL_CHUNK_SIZE) if session else INITIAL_CHUNK_SIZE)
+        if session:
+            # In the error state next_chunk first asks YouTube which bytes it has
+            # committed (empty PUT, Content-Range: bytes */size) and continues from there
+            request.resumable_uri = session['uri']
+            request._in_error_state = True
+            print(f"Resuming upload for: {video_path} from byte {session.get('offset', 0)} of {file_size}")
+        else:
+            print(f"Starting resumable upload for: {video_path} ({file_size} bytes)")
         
         response = None
-        error = None
         retry_count = 0
         max_retries = 10
         
         while response is None:
+            started = time.time()
+            offset_before = request.resumable_progress
             try:
                 status, response = request.next_chunk()
-                if status:
-                    progress = int(status.progress() * 100)
-                    print(f"Upload progress: {progress}%")
             except Exception as e:
+                if session and isinstance(e, HttpError) and e.resp.status in (404, 410):
+                    # Saved session expired on YouTube's side - start a new one
+                    print("Saved upload session expired, starting over")
+                    _clear_session(session_key)
+                    session = None
+                    media, request = new_request(INITIAL_CHUNK_SIZE)
+                    continue
+                
                 # Handle retries with exponential backoff
                 retry_count += 1
                 if retry_count > max_retries:
                     raise e
                 
+                # Smaller requests are more likely to get through a flaky connection
+                # (MediaFileUpload has no setter; next_chunk reads _chunksize)
+                media._chunksize = max(MIN_CHUNK_SIZE, media.chunksize() // 2 // CHUNK_UNIT * CHUNK_UNIT)
                 sleep_time = (2 ** retry_count) + (retry_count * 0.5)
                 print(f"Upload error: {e}. Retrying in {sleep_time:.1f}s...")
-                import time
                 time.sleep(sleep_time)
+                continue
+            
+            retry_count = 0
+            if response is None:
+                media._chunksize = _next_chunk_size(
+                    media.chunksize(), request.resumable_progress - offset_before, time.time() - started
+                )
+                session = {
+                    'uri': request.resumable_uri,
+                    'offset': request.resumable_progress,
+                    'chunk_size': media.chunksize()
+                }
+                _save_session(session_key, session)
+                if status:
+                    progress = int(status.progress() * 100)
+                    print(f"Upload progress: {progress}% (chunk {media.chunksize() // (1024 * 1024)} MB)")
+        
+        _clear_session(session_key)
 
         if response is not None and 'id' in response:
             video_id = response['id']
@@ -339,21 +492,15 @@ def upload_video(
             print(f"Upload complete! Video ID: {video_id}")
             
             # Set custom thumbnail if provided
+            thumbnail_set = False
             if thumbnail_path and os.path.exists(thumbnail_path):
-                try:
-                    print(f"Uploading thumbnail: {thumbnail_path}")
-                    youtube.thumbnails().set(
-                        videoId=video_id,
-                        media_body=MediaFileUpload(thumbnail_path)
-                    ).execute()
-                    print("Thumbnail set successfully")
-                except Exception as e:
-                    print(f"Warning: Failed to set thumbnail: {e}")
+                thumbnail_set = set_thumbnail(video_id, thumbnail_path)['success']
             
             return {
                 'success': True,
                 'video_id': video_id,
                 'video_url': video_url,
+                'thumbnail_set': thumbnail_set,
                 'message': f'Video uploaded successfully!'
             }
         else:
@@ -454,14 +601,13 @@ def upload_video_with_captions(
     Returns:
         Dict with video_id, video_url, success status
     """
-    # First upload the video
+    # First upload the video (thumbnail and captions need its ID)
     result = upload_video(
         video_path=video_path,
         title=title,
         description=description,
         tags=tags,
         privacy_status=privacy_status,
-        thumbnail_path=thumbnail_path,
         category_id=category_id
     )
     
@@ -470,12 +616,22 @@ def upload_video_with_captions(
     
     video_id = result.get('video_id')
     
-    # Upload captions if SRT provided
-    if srt_path and os.path.exists(srt_path):
-        caption_result = upload_captions(video_id, srt_path)
-        result['captions_uploaded'] = caption_result.get('success', False)
-        if not caption_result.get('success'):
-            result['caption_error'] = caption_result.get('error')
+    # Thumbnail and captions are independent - upload them side by side
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        thumbnail_future = None
+        caption_future = None
+        if thumbnail_path and os.path.exists(thumbnail_path):
+            thumbnail_future = pool.submit(set_thumbnail, video_id, thumbnail_path)
+        if srt_path and os.path.exists(srt_path):
+            caption_future = pool.submit(upload_captions, video_id, srt_path)
+        
+        if thumbnail_future:
+            result['thumbnail_set'] = thumbnail_future.result().get('success', False)
+        if caption_future:
+            caption_result = caption_future.result()
+            result['captions_uploaded'] = caption_result.get('success', False)
+            if not caption_result.get('success'):
+                result['caption_error'] = caption_result.get('error')
     
     return result
 
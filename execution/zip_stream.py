@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Zip Stream - Write ZIP archives straight into an HTTP response.
+
+zipfile can write to a non-seekable stream (sizes and CRCs go into data
+descriptors after each entry), so stream_zip hands it a small in-memory
+sink and yields whatever has been written after every block. Only one
+block of one file is held in memory at a time, however large the archive.
+
+Already-compressed media (PNG, JPG, MP4, WAV, MP3, ...) is stored as-is;
+text (SRT, JSON, TXT) is deflated.
+"""
+import io
+import os
+import time
+import zipfile
+from pathlib import Path
+from typing import Iterable, Iterator, Tuple, Union
+
+BLOCK_SIZE = 256 * 1024
+
+# Deflating these costs CPU for little or no gain
+STORED_EXTENSIONS = {
+    '.png', '.jpg', '.jpeg', '.webp', '.gif',
+    '.mp4', '.mov', '.webm', '.mkv',
+    '.wav', '.mp3', '.opus', '.ogg', '.m4a',
+    '.zip',
+}
+
+ZipSource = Union[str, Path, bytes]
+
+
+class _StreamSink(io.RawIOBase):
+    """Write-only sink that zipfile writes into and stream_zip drains."""
+
+    def __init__(self):
+        self._chunks = []
+        self._offset = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _compress_type(arcname: str) -> int:
+    if Path(arcname).suffix.lower() in STORED_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def stream_zip(entries: Iterable[Tuple[str, ZipSource]]) -> Iterator[bytes]:
+    """
+    Yield a ZIP archive piece by piece.
+
+    Args:
+        entries: (name in archive, file path or bytes) pairs; missing files
+                 are skipped
+
+    Yields:
+        Archive bytes, suitable for a Flask streaming Response
+    """
+    sink = _StreamSink()
+    with zipfile.ZipFile(sink, 'w') as zf:
+        for arcname, source in entries:
+            if isinstance(source, bytes):
+                info = zipfile.ZipInfo(arcname, date_time=time.localtime()[:6])
+                info.compress_type = _compress_type(arcname)
+                info.file_size = len(source)
+                with zf.open(info, 'w') as dest:
+                    dest.write(source)
+                yield sink.drain()
+                continue
+
+            if not os.path.isfile(source):
+                continue
+            info = zipfile.ZipInfo.from_file(source, arcname)
+            info.compress_type = _compress_type(arcname)
+            # from_file sets file_size, which also switches on ZIP64 for >2GB files
+            with open(source, 'rb') as src, zf.open(info, 'w') as dest:
+                for block in iter(lambda: src.read(BLOCK_SIZE), b''):
+                    dest.write(block)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            yield sink.drain()
+    # Central directory is written on close
+    yield sink.drain()
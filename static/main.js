@@ -11,6 +11,10 @@ const state = {
     transcript: null,
     articles: [],
     script: null,
+    // Transcript last analyzed by each step; running a step again for the same
+    // transcript sends refresh so the server re-runs its cached AI analyses
+    scriptAnalyzedTranscript: null,
+    newsAnalyzedTranscript: null,
     screenshots: [],
     currentStep: 1,
     projects: [],
@@ -120,6 +124,77 @@ function hideLoading() {
     }, 500);  // Short delay so user can see final log
 }
 
+// Background Jobs
+// Follow a queued job over Server-Sent Events, falling back to polling
+// /api/job-status if the stream drops. Resolves with the final status.
+function followJob(jobId, onProgress) {
+    return new Promise((resolve) => {
+        let lastUpdate = null;
+        const handle = (status) => {
+            if (status.updated_at !== lastUpdate) {
+                lastUpdate = status.updated_at;
+                if (onProgress) onProgress(status);
+            }
+            if (status.status === 'completed' || status.status === 'failed') {
+                resolve(status);
+                return true;
+            }
+            return false;
+        };
+
+        const poll = async () => {
+            try {
+                const response = await fetch(`/api/job-status/${jobId}`);
+                const status = await response.json();
+                if (!response.ok) {
+                    resolve({ status: 'failed', message: status.error || 'Job not found' });
+                    return;
+                }
+                if (handle(status)) return;
+            } catch (error) {
+                console.warn('Job status poll failed:', error);
+            }
+            setTimeout(poll, 2000);
+        };
+
+        const source = new EventSource(`/api/job-events/${jobId}`);
+        source.onmessage = (event) => {
+            if (handle(JSON.parse(event.data))) source.close();
+        };
+        source.onerror = () => {
+            // Stream closed or unsupported by a proxy - switch to polling
+            source.close();
+            poll();
+        };
+    });
+}
+
+// Turn a job-submission response into the job's final result,
+// mirroring progress into the loading overlay and logs
+async function followJobResponse(response) {
+    const started = await response.json();
+    if (!started.success || !started.job_id) return started;
+
+    addLog(started.message, 'info');
+    const status = await followJob(started.job_id, (update) => {
+        loadingText.textContent = `${update.message} (${update.progress}%)`;
+        addLog(update.message, 'info');
+    });
+
+    if (status.result) return status.result;
+    return status.status === 'completed'
+        ? { success: true, message: status.message }
+        : { success: false, error: status.message || 'Job failed' };
+}
+
+// Media
+// WAV chunk audio is served as a much smaller Opus copy where the browser can play it
+const OPUS_SUPPORTED = !!document.createElement('audio').canPlayType('audio/ogg; codecs=opus');
+function previewAudioUrl(url) {
+    if (!url || !OPUS_SUPPORTED || !url.split('?')[0].endsWith('.wav')) return url;
+    return url + (url.includes('?') ? '&' : '?') + 'format=opus';
+}
+
 // Toast Notifications
 function showToast(message, type = 'success') {
     const toast = document.createElement('div');
@@ -1069,9 +1144,11 @@ async function searchNewsFromTranscript() {
             body: JSON.stringify({
                 transcript: state.transcript,
                 num_articles: 30,
-                days_limit: daysLimit
+                days_limit: daysLimit,
+                refresh: state.newsAnalyzedTranscript === state.transcript
             })
         });
+        state.newsAnalyzedTranscript = state.transcript;
 
         const result = await response.json();
         addLog(`Response: ${result.message}`, result.success ? 'success' : 'error');
@@ -1430,7 +1507,14 @@ async function regenerateBeat(beatId) {
                 });
             }
 
-            showToast(`${beatId} beat regenerated!`);
+            if (result.relinked) {
+                // Unchanged chunks kept their assets; only the changed ones need regenerating
+                if (result.relinked.chunks) state.aiImageChunks = result.relinked.chunks;
+                showToast(`${beatId} beat regenerated! ${result.relinked.reused.length} chunks kept their assets, ` +
+                    `${result.relinked.changed.length} need new ${result.relinked.chunks ? 'images/audio' : 'audio'}`);
+            } else {
+                showToast(`${beatId} beat regenerated!`);
+            }
         } else {
             showToast(result.message, 'error');
         }
@@ -1499,9 +1583,11 @@ async function generateScriptAuto() {
                 channel_focus: channelFocus,
                 script_mode: scriptMode,
                 selected_topic: selectedTopic,
-                reference_video_id: referenceVideoId
+                reference_video_id: referenceVideoId,
+                refresh: Boolean(state.transcript) && state.scriptAnalyzedTranscript === state.transcript
             })
         });
+        state.scriptAnalyzedTranscript = state.transcript;
 
         const result = await response.json();
         addLog(`Response: ${result.message}`, result.success ? 'success' : 'error');
@@ -2135,6 +2221,11 @@ function downloadScreenshots() {
     showToast('Downloading screenshots...');
 }
 
+function exportProject(includeVideo = false) {
+    window.location.href = `/api/export-project${includeVideo ? '?video=1' : ''}`;
+    showToast('Exporting project bundle...');
+}
+
 function renderClaimScreenshots(screenshots) {
     const container = document.getElementById('screenshots-container');
 
@@ -2191,6 +2282,9 @@ function renderClaimScreenshots(screenshots) {
                                 id="audio-btn-${index}">
                             ${hasAudio ? '🔄 Regenerate' : '🎙️ Create'} Audio
                         </button>
+                        ${item.duplicate_of !== undefined && item.duplicate_of !== null
+                ? `<span title="Near-identical to another section's screenshot - consider regenerating" style="font-size: 11px; color: var(--warning, orange);">⚠️ Looks like section ${screenshots.findIndex(s => s.chunk_index === item.duplicate_of) + 1}</span>`
+                : ''}
                         ${item.success ? '✅' : '❌'}
                     </div>
                 </div>
@@ -2816,7 +2910,7 @@ function previewChunk(index) {
             <h4 style="margin-bottom: 8px;">🔊 Audio</h4>
             <div id="chunk-audio-player-${index}">
             ${chunk.has_audio && chunk.audio_url
-            ? `<audio controls src="${chunk.audio_url}" style="width: 100%;"></audio>`
+            ? `<audio controls src="${previewAudioUrl(chunk.audio_url)}" style="width: 100%;"></audio>`
             : `<p style="color: var(--text-muted);">No audio generated yet.</p>`
         }
             </div>
@@ -2827,6 +2921,16 @@ function previewChunk(index) {
             </div>
         </div>
         
+        <div style="margin-bottom: 16px;">
+            <h4 style="margin-bottom: 8px;">🎞️ Draft Preview</h4>
+            <div id="chunk-draft-preview-${index}"></div>
+            <div style="margin-top: 8px;">
+                <button class="btn-secondary" onclick="renderChunkPreview(${index})" style="display: inline-flex; align-items: center; gap: 6px;">
+                    ▶️ Preview (draft)
+                </button>
+            </div>
+        </div>
+        
         <div style="display: flex; gap: 8px; justify-content: flex-end;">
             <button class="btn-secondary" onclick="closeChunkEditor()">Close</button>
         </div>
@@ -2841,6 +2945,32 @@ function previewChunk(index) {
     updateStockVideoIndicator(index);
 }
 
+async function renderChunkPreview(index) {
+    const container = document.getElementById(`chunk-draft-preview-${index}`);
+    if (!container) return;
+    container.innerHTML = '<p style="color: var(--text-muted);">⏳ Rendering 480p draft...</p>';
+
+    try {
+        const response = await fetch('/api/preview-chunk', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                chunk_index: index,
+                stock_videos: videoChunks[index]?.stock_videos || {}
+            })
+        });
+        const result = await response.json();
+
+        if (result.success) {
+            container.innerHTML = `<video controls autoplay src="${result.preview_url}" style="width: 100%; border-radius: 8px;"></video>`;
+        } else {
+            container.innerHTML = `<p style="color: var(--error);">❌ ${result.error}</p>`;
+        }
+    } catch (error) {
+        container.innerHTML = `<p style="color: var(--error);">❌ ${error.message}</p>`;
+    }
+}
+
 function closeChunkEditor() {
     const overlay = document.getElementById('chunk-editor-overlay');
     if (overlay) {
@@ -2920,7 +3050,7 @@ async function regenerateChunkAudio(chunkIndex) {
             // Update the audio player in the modal
             const playerContainer = document.getElementById(`chunk-audio-player-${chunkIndex}`);
             if (playerContainer) {
-                playerContainer.innerHTML = `<audio controls src="${result.audio_url}?t=${Date.now()}" style="width: 100%;"></audio>`;
+                playerContainer.innerHTML = `<audio controls src="${previewAudioUrl(result.audio_url)}" style="width: 100%;"></audio>`;
             }
 
             // Re-render timeline to show updated status
@@ -3272,17 +3402,20 @@ function updateStockVideoIndicator(chunkIndex) {
     }
 }
 
-async function generateAllAudio() {
-    showLoading('Generating audio for all chunks (this may take a while)...');
+async function generateAllAudio(missingOnly = false) {
+    showLoading(missingOnly
+        ? 'Generating audio for chunks without audio...'
+        : 'Generating audio for all chunks (this may take a while)...');
     addLog('Starting batch TTS generation...', 'info');
 
     try {
         const response = await fetch('/api/generate-all-audio', {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' }
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ missing_only: missingOnly })
         });
 
-        const result = await response.json();
+        const result = await followJobResponse(response);
 
         if (result.success) {
             addLog(result.message, 'success');
@@ -3302,9 +3435,10 @@ async function generateAllAudio() {
     hideLoading();
 }
 
-async function buildVideo() {
-    showLoading('Building video (this may take several minutes)...');
-    addLog('Starting video assembly...', 'info');
+async function buildVideo(profile = 'final') {
+    const isDraft = profile !== 'final';
+    showLoading(isDraft ? 'Building quick draft (480p)...' : 'Building video (this may take several minutes)...');
+    addLog(isDraft ? 'Starting draft video assembly...' : 'Starting video assembly...', 'info');
 
     try {
         // Send chunk data including stock video selections
@@ -3315,15 +3449,16 @@ async function buildVideo() {
                 chunks: videoChunks.map((chunk, i) => ({
                     index: i,
                     stock_videos: chunk.stock_videos || {}
-                }))
+                })),
+                profile
             })
         });
 
-        const result = await response.json();
+        const result = await followJobResponse(response);
 
         if (result.success) {
             addLog(result.message, 'success');
-            showToast('Video built successfully!');
+            showToast(isDraft ? 'Draft built - review before the final render' : 'Video built successfully!');
 
             // Show video preview
             const previewDiv = document.getElementById('video-preview');
@@ -3339,9 +3474,9 @@ async function buildVideo() {
 
             addLog(`Video: ${result.segments_count} segments, ${(result.duration / 60).toFixed(1)} min`, 'success');
 
-            // Show/enable subtitle button
+            // Show/enable subtitle button (final renders only)
             const subtitleBtn = document.getElementById('add-subtitles-btn');
-            if (subtitleBtn) {
+            if (subtitleBtn && !isDraft) {
                 subtitleBtn.style.display = 'inline-block';
                 subtitleBtn.disabled = false;
             }
@@ -3368,7 +3503,7 @@ async function generateSubtitles() {
             body: JSON.stringify({})  // Uses latest video
         });
 
-        const result = await response.json();
+        const result = await followJobResponse(response);
 
         if (result.success) {
             addLog('Subtitles generated and burned successfully!', 'success');
@@ -3588,7 +3723,7 @@ async function addSubtitlesToSelected() {
             body: JSON.stringify({ video_filename: filename })
         });
 
-        const result = await response.json();
+        const result = await followJobResponse(response);
 
         if (result.success) {
             addLog('Subtitles burned successfully!', 'success');
@@ -3993,6 +4128,10 @@ async function researchKeywords() {
     showLoading(`Researching keywords in ${region}...`);
     addLog(`Researching: ${seedKeyword} (Region: ${region})`, 'info');
 
+    // Results stream in as NDJSON lines; render each one as it lands
+    const suggestions = [];
+    let result = null;
+
     try {
         const response = await fetch('/api/keyword-research', {
             method: 'POST',
@@ -4000,95 +4139,59 @@ async function researchKeywords() {
             body: JSON.stringify({
                 keyword: seedKeyword,
                 include_suggestions: true,
-                region: region
+                region: region,
+                stream: true
             })
         });
 
-        const result = await response.json();
+        if (!response.ok) {
+            result = await response.json();
+        } else {
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+
+            while (true) {
+                const { done, value } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+
+                const lines = buffer.split('\n');
+                buffer = lines.pop();
+
+                for (const line of lines) {
+                    if (!line.trim()) continue;
+                    const event = JSON.parse(line);
+
+                    if (event.event === 'suggestions') {
+                        addLog(`Analyzing ${event.keywords.length} related keywords...`, 'info');
+                    } else if (event.event === 'seed') {
+                        renderKeywordSeed(event.result, region);
+                        hideLoading();
+                    } else if (event.event === 'keyword') {
+                        suggestions.push(event.result);
+                        suggestions.sort((a, b) => (b.opportunity_score || 0) - (a.opportunity_score || 0));
+                        renderKeywordSuggestions(suggestions);
+                    } else if (event.event === 'done') {
+                        result = event;
+                    }
+                }
+            }
+        }
 
-        if (result.success) {
+        if (result && result.success) {
             // Store for export
             lastKeywordResults = result;
 
-            // Show seed result
-            const seedResult = result.seed_result;
-            const seedContent = document.getElementById('keyword-seed-content');
-            const difficultyColor = getDifficultyColor(seedResult.difficulty_level);
-            const multiplierColor = seedResult.multiplier >= 5 ? 'var(--success-color)' : seedResult.multiplier >= 2 ? 'var(--warning-color)' : 'var(--text-muted)';
-
-            seedContent.innerHTML = `
-                <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(120px, 1fr)); gap: 16px; margin-bottom: 12px;">
-                    <div style="text-align: center; padding: 12px; background: var(--bg-tertiary); border-radius: 8px;">
-                        <div style="font-size: 24px; font-weight: bold; color: ${difficultyColor};">${seedResult.difficulty_score}</div>
-                        <div style="font-size: 12px; color: var(--text-muted);">Difficulty</div>
-                    </div>
-                    <div style="text-align: center; padding: 12px; background: var(--bg-tertiary); border-radius: 8px;">
-                        <div style="font-size: 24px; font-weight: bold;">${formatNumber(seedResult.avg_views)}</div>
-                        <div style="font-size: 12px; color: var(--text-muted);">Avg Views</div>
-                    </div>
-                    <div style="text-align: center; padding: 12px; background: var(--bg-tertiary); border-radius: 8px;">
-                        <div style="font-size: 24px; font-weight: bold;">${formatNumber(seedResult.median_subs)}</div>
-                        <div style="font-size: 12px; color: var(--text-muted);">Median Subs</div>
-                    </div>
-                    <div style="text-align: center; padding: 12px; background: var(--bg-tertiary); border-radius: 8px;">
-                        <div style="font-size: 24px; font-weight: bold; color: ${multiplierColor};">${seedResult.multiplier || 0}x</div>
-                        <div style="font-size: 12px; color: var(--text-muted);">Multiplier</div>
-                    </div>
-                    <div style="text-align: center; padding: 12px; background: var(--bg-tertiary); border-radius: 8px;">
-                        <div style="font-size: 24px; font-weight: bold; color: var(--success-color);">${seedResult.opportunity_score}</div>
-                        <div style="font-size: 12px; color: var(--text-muted);">Opportunity</div>
-                    </div>
-                </div>
-                <p style="margin-bottom: 8px;"><strong>Difficulty:</strong> <span style="color: ${difficultyColor};">${seedResult.difficulty_level}</span> | <strong>Region:</strong> ${region}</p>
-                ${seedResult.top_videos ? `
-                    <details style="margin-top: 12px;">
-                        <summary style="cursor: pointer; color: var(--accent);">Top Competing Videos</summary>
-                        <ul style="margin-top: 8px; padding-left: 20px;">
-                            ${seedResult.top_videos.map(v => `
-                                <li style="margin-bottom: 6px;">
-                                    <a href="https://youtube.com/watch?v=${v.video_id}" target="_blank" style="color: var(--text-primary);">${v.title}</a>
-                                    <span style="color: var(--text-muted);"> - ${formatNumber(v.views)} views, ${formatNumber(v.subs)} subs</span>
-                                </li>
-                            `).join('')}
-                        </ul>
-                    </details>
-                ` : ''}
-            `;
-            document.getElementById('keyword-seed-result').style.display = 'block';
-
-            // Show suggestions
-            if (result.suggestions && result.suggestions.length > 0) {
-                const tbody = document.getElementById('keywords-tbody');
-                tbody.innerHTML = result.suggestions.map(s => {
-                    const color = getDifficultyColor(s.difficulty_level);
-                    const multColor = s.multiplier >= 5 ? 'var(--success-color)' : s.multiplier >= 2 ? 'var(--warning-color)' : 'var(--text-muted)';
-                    return `
-                        <tr style="border-bottom: 1px solid var(--border-color);">
-                            <td style="padding: 12px;">${s.keyword}</td>
-                            <td style="padding: 12px; text-align: center;">
-                                <span style="display: inline-block; padding: 4px 10px; border-radius: 4px; background: ${color}; color: white; font-size: 12px;">
-                                    ${s.difficulty_level} (${s.difficulty_score})
-                                </span>
-                            </td>
-                            <td style="padding: 12px; text-align: right;">${formatNumber(s.avg_views)}</td>
-                            <td style="padding: 12px; text-align: right;">${formatNumber(s.median_subs)}</td>
-                            <td style="padding: 12px; text-align: center;">
-                                <span style="font-weight: bold; color: ${multColor};">${s.multiplier || 0}x</span>
-                            </td>
-                            <td style="padding: 12px; text-align: center;">
-                                <span style="font-weight: bold; color: ${s.opportunity_score > 60 ? 'var(--success-color)' : s.opportunity_score > 30 ? 'var(--warning-color)' : 'var(--error)'}">${s.opportunity_score}</span>
-                            </td>
-                        </tr>
-                    `;
-                }).join('');
-                document.getElementById('keyword-suggestions').style.display = 'block';
-            }
+            renderKeywordSeed(result.seed_result, region);
+            renderKeywordSuggestions(result.suggestions || []);
 
             addLog(`Found ${result.suggestions?.length || 0} related keywords`, 'success');
             showToast('Keyword research complete!');
         } else {
-            showToast(result.error || 'Research failed', 'error');
-            addLog(`Error: ${result.error}`, 'error');
+            const error = result?.error || 'Research failed';
+            showToast(error, 'error');
+            addLog(`Error: ${error}`, 'error');
         }
     } catch (error) {
         showToast('Failed to research keywords', 'error');
@@ -4098,6 +4201,81 @@ async function researchKeywords() {
     hideLoading();
 }
 
+function renderKeywordSeed(seedResult, region) {
+    if (!seedResult) return;
+    const seedContent = document.getElementById('keyword-seed-content');
+    const difficultyColor = getDifficultyColor(seedResult.difficulty_level);
+    const multiplierColor = seedResult.multiplier >= 5 ? 'var(--success-color)' : seedResult.multiplier >= 2 ? 'var(--warning-color)' : 'var(--text-muted)';
+
+    seedContent.innerHTML = `
+        <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(120px, 1fr)); gap: 16px; margin-bottom: 12px;">
+            <div style="text-align: center; padding: 12px; background: var(--bg-tertiary); border-radius: 8px;">
+                <div style="font-size: 24px; font-weight: bold; color: ${difficultyColor};">${seedResult.difficulty_score}</div>
+                <div style="font-size: 12px; color: var(--text-muted);">Difficulty</div>
+            </div>
+            <div style="text-align: center; padding: 12px; background: var(--bg-tertiary); border-radius: 8px;">
+                <div style="font-size: 24px; font-weight: bold;">${formatNumber(seedResult.avg_views)}</div>
+                <div style="font-size: 12px; color: var(--text-muted);">Avg Views</div>
+            </div>
+            <div style="text-align: center; padding: 12px; background: var(--bg-tertiary); border-radius: 8px;">
+                <div style="font-size: 24px; font-weight: bold;">${formatNumber(seedResult.median_subs)}</div>
+                <div style="font-size: 12px; color: var(--text-muted);">Median Subs</div>
+            </div>
+            <div style="text-align: center; padding: 12px; background: var(--bg-tertiary); border-radius: 8px;">
+                <div style="font-size: 24px; font-weight: bold; color: ${multiplierColor};">${seedResult.multiplier || 0}x</div>
+                <div style="font-size: 12px; color: var(--text-muted);">Multiplier</div>
+            </div>
+            <div style="text-align: center; padding: 12px; background: var(--bg-tertiary); border-radius: 8px;">
+                <div style="font-size: 24px; font-weight: bold; color: var(--success-color);">${seedResult.opportunity_score}</div>
+                <div style="font-size: 12px; color: var(--text-muted);">Opportunity</div>
+            </div>
+        </div>
+        <p style="margin-bottom: 8px;"><strong>Difficulty:</strong> <span style="color: ${difficultyColor};">${seedResult.difficulty_level}</span> | <strong>Region:</strong> ${region}</p>
+        ${seedResult.top_videos ? `
+            <details style="margin-top: 12px;">
+                <summary style="cursor: pointer; color: var(--accent);">Top Competing Videos</summary>
+                <ul style="margin-top: 8px; padding-left: 20px;">
+                    ${seedResult.top_videos.map(v => `
+                        <li style="margin-bottom: 6px;">
+                            <a href="https://youtube.com/watch?v=${v.video_id}" target="_blank" style="color: var(--text-primary);">${v.title}</a>
+                            <span style="color: var(--text-muted);"> - ${formatNumber(v.views)} views, ${formatNumber(v.subs)} subs</span>
+                        </li>
+                    `).join('')}
+                </ul>
+            </details>
+        ` : ''}
+    `;
+    document.getElementById('keyword-seed-result').style.display = 'block';
+}
+
+function renderKeywordSuggestions(suggestions) {
+    if (!suggestions.length) return;
+    const tbody = document.getElementById('keywords-tbody');
+    tbody.innerHTML = suggestions.map(s => {
+        const color = getDifficultyColor(s.difficulty_level);
+        const multColor = s.multiplier >= 5 ? 'var(--success-color)' : s.multiplier >= 2 ? 'var(--warning-color)' : 'var(--text-muted)';
+        return `
+            <tr style="border-bottom: 1px solid var(--border-color);">
+                <td style="padding: 12px;">${s.keyword}</td>
+                <td style="padding: 12px; text-align: center;">
+                    <span style="display: inline-block; padding: 4px 10px; border-radius: 4px; background: ${color}; color: white; font-size: 12px;">
+                        ${s.difficulty_level} (${s.difficulty_score})
+                    </span>
+                </td>
+                <td style="padding: 12px; text-align: right;">${formatNumber(s.avg_views)}</td>
+                <td style="padding: 12px; text-align: right;">${formatNumber(s.median_subs)}</td>
+                <td style="padding: 12px; text-align: center;">
+                    <span style="font-weight: bold; color: ${multColor};">${s.multiplier || 0}x</span>
+                </td>
+                <td style="padding: 12px; text-align: center;">
+                    <span style="font-weight: bold; color: ${s.opportunity_score > 60 ? 'var(--success-color)' : s.opportunity_score > 30 ? 'var(--warning-color)' : 'var(--error)'}">${s.opportunity_score}</span>
+                </td>
+            </tr>
+        `;
+    }).join('');
+    document.getElementById('keyword-suggestions').style.display = 'block';
+}
+
 function getDifficultyColor(level) {
     switch (level) {
         case 'Low': return 'var(--success-color)';
@@ -5021,6 +5199,7 @@ async function generateLockedThumbnail() {
     const topicInput = document.getElementById('locked-topic-input');
     const resultDiv = document.getElementById('locked-result');
     const imgElement = document.getElementById('locked-img');
+    const grid = document.getElementById('locked-candidates');
     const btn = document.querySelector('button[onclick="generateLockedThumbnail()"]');
 
     const topic = topicInput.value.trim();
@@ -5033,21 +5212,66 @@ async function generateLockedThumbnail() {
     btn.disabled = true;
     btn.innerHTML = "⏳ Generating...";
     resultDiv.style.display = 'none';
+    grid.innerHTML = '';
+
+    // Candidates stream in as NDJSON lines; show each one as it lands
+    const showCandidate = (url) => {
+        const src = `${url}?t=${new Date().getTime()}`;
+        const thumb = document.createElement('img');
+        thumb.src = src;
+        thumb.style.cssText = 'width: 100%; border-radius: 6px; border: 2px solid #333; cursor: pointer;';
+        thumb.onclick = () => {
+            imgElement.src = src;
+            grid.querySelectorAll('img').forEach(img => img.style.borderColor = '#333');
+            thumb.style.borderColor = '#FFD700';
+        };
+        grid.appendChild(thumb);
+        // The first candidate to finish is the default pick
+        if (grid.children.length === 1) thumb.onclick();
+        resultDiv.style.display = 'block';
+    };
 
     try {
         const response = await fetch('/api/generate-thumbnail-locked', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ topic: topic })
+            body: JSON.stringify({ topic: topic, stream: true })
         });
 
-        const data = await response.json();
-
-        if (data.success) {
-            imgElement.src = `${data.image_url}?t=${new Date().getTime()}`;
-            resultDiv.style.display = 'block';
+        let data = null;
+        if (!response.ok) {
+            data = await response.json();
         } else {
-            alert("Error: " + data.message);
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+
+            while (true) {
+                const { done, value } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+
+                const lines = buffer.split('\n');
+                buffer = lines.pop();
+
+                for (const line of lines) {
+                    if (!line.trim()) continue;
+                    const event = JSON.parse(line);
+
+                    if (event.event === 'candidate') {
+                        if (event.success) {
+                            showCandidate(event.image_url);
+                            btn.innerHTML = `⏳ ${grid.children.length} ready...`;
+                        }
+                    } else if (event.event === 'done') {
+                        data = event;
+                    }
+                }
+            }
+        }
+
+        if (!data || !data.success) {
+            alert("Error: " + (data?.message || 'Generation failed'));
         }
 
     } catch (e) {